@@ -0,0 +1,196 @@
+# filename: benchmarks/bench_dynamodb.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Benchmark DynamoDB storage throughput with batched and single-item requests.
+
+Reports write and lookup throughput with batched requests against one
+request per record, the latency of a metadata-only listing served by a
+secondary index query against a filtered table scan, and the latency of a
+similarity search on the local vector index, with the DynamoDB requests
+each phase sent.
+
+Runs against moto's in-process DynamoDB by default, which measures the
+client-side cost and the request counts; pass ``--endpoint-url`` to run
+against DynamoDB Local or another endpoint, where the request counts
+dominate the timings.
+
+Usage:
+    python benchmarks/bench_dynamodb.py [--records N] [--endpoint-url URL]
+"""
+
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List
+
+from mcp_server_tribal.models.error_record import (
+    ErrorContext,
+    ErrorQuery,
+    ErrorRecord,
+    ErrorSolution,
+)
+from mcp_server_tribal.services.aws.clients import shared_client
+from mcp_server_tribal.services.aws.storage import DynamoDBStorage
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+
+LANGUAGES = ["python", "javascript", "go", "rust", "java", "ruby", "php", "c"]
+MODULES = ["requests", "numpy", "pandas", "flask", "django", "torch", "yaml"]
+
+
+def make_errors(count: int, seed: int) -> List[ErrorRecord]:
+    """Generate synthetic error records."""
+    rng = random.Random(seed)
+    return [
+        ErrorRecord(
+            error_type=rng.choice(["ImportError", "TypeError", "KeyError"]),
+            context=ErrorContext(
+                language=rng.choice(LANGUAGES),
+                error_message=f"No module named {rng.choice(MODULES)}_{i % 997}",
+            ),
+            solution=ErrorSolution(
+                description=f"Install {rng.choice(MODULES)}", explanation="Missing"
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def request_total(
+    before: Dict[str, Dict[str, int]], after: Dict[str, Dict[str, int]]
+) -> int:
+    """Count the requests sent between two request metrics."""
+    total = sum(sum(counts.values()) for counts in after.values())
+    return total - sum(sum(counts.values()) for counts in before.values())
+
+
+async def run(args: argparse.Namespace, client: Any) -> None:
+    """Run the benchmark phases against one table."""
+    table = f"tribal-bench-{uuid.uuid4().hex[:8]}"
+    errors = make_errors(args.records, seed=1)
+    singles = make_errors(args.single_records, seed=2)
+    with tempfile.TemporaryDirectory() as workdir:
+        storage = DynamoDBStorage(
+            table,
+            client=client,
+            index_directory=os.path.join(workdir, "index"),
+            embedding_function=HashingEmbeddingFunction(args.dim),
+        )
+        rows = []
+
+        async def phase(name: str, items: int, fn: Any) -> None:
+            before = (await storage.get_stats())["requests"]
+            started = time.perf_counter()
+            await fn()
+            elapsed = time.perf_counter() - started
+            after = (await storage.get_stats())["requests"]
+            rows.append((name, items / elapsed, request_total(before, after)))
+
+        async def batch_write() -> None:
+            for start in range(0, len(errors), args.batch_size):
+                await storage.add_errors(errors[start : start + args.batch_size])
+
+        async def single_write() -> None:
+            for error in singles:
+                await storage.add_error(error)
+
+        ids = [error.id for error in errors]
+
+        async def batch_get() -> None:
+            for start in range(0, len(ids), args.batch_size):
+                await storage.get_errors(ids[start : start + args.batch_size])
+
+        async def single_get() -> None:
+            for error_id in ids[: args.single_records]:
+                await storage.get_error(error_id)
+
+        await phase("batch write", len(errors), batch_write)
+        await phase("single put", len(singles), single_write)
+        await phase("batch get", len(ids), batch_get)
+        await phase("single get", args.single_records, single_get)
+
+        language = LANGUAGES[0]
+        listings = args.queries
+
+        async def index_query() -> None:
+            for _ in range(listings):
+                await storage.search_errors(ErrorQuery(language=language))
+
+        def filtered_scan() -> int:
+            # What a listing costs without the secondary index
+            requests = 0
+            for _ in range(listings):
+                kwargs: Dict[str, Any] = {
+                    "TableName": table,
+                    "FilterExpression": "#language = :language",
+                    "ExpressionAttributeNames": {"#language": "language"},
+                    "ExpressionAttributeValues": {":language": {"S": language}},
+                    "Limit": 1000,
+                }
+                while True:
+                    response = client.scan(**kwargs)
+                    requests += 1
+                    if "LastEvaluatedKey" not in response:
+                        break
+                    kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            return requests
+
+        await phase("index query", listings, index_query)
+        started = time.perf_counter()
+        requests = filtered_scan()
+        elapsed = time.perf_counter() - started
+        rows.append(("filtered scan", listings / elapsed, requests))
+
+        texts = [e.context.error_message for e in make_errors(args.queries, seed=3)]
+
+        async def similarity() -> None:
+            for text in texts:
+                await storage.search_similar(text, 10)
+
+        await phase("vector search", len(texts), similarity)
+        await storage.close()
+        client.delete_table(TableName=table)
+
+    print(f"records={args.records} batch={args.batch_size} dim={args.dim}")
+    print(f"{'phase':<16}{'ops/s':>12}{'requests':>10}")
+    for name, rate, requests in rows:
+        print(f"{name:<16}{rate:>12.1f}{requests:>10}")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--single-records", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--endpoint-url", default=None)
+    args = parser.parse_args()
+
+    if args.endpoint_url:
+        mock: Any = contextlib.nullcontext()
+    else:
+        import moto
+
+        for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+            os.environ.setdefault(name, "testing")
+        mock = moto.mock_aws()
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    with mock:
+        client = shared_client("dynamodb", endpoint_url=args.endpoint_url)
+        asyncio.run(run(args, client))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# filename: benchmarks/bench_quantized_vectors.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Benchmark the int8 quantized index against ChromaDB's cosine HNSW index.
+
+Reports vector memory, on-disk size, query latency and recall@k of both
+indexes against an exact float32 search over the same vectors.
+
+Usage:
+    python benchmarks/bench_quantized_vectors.py [--records N] [--queries N]
+"""
+
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+import chromadb
+import numpy as np
+
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.quantized_index import QuantizedVectorIndex
+
+MODULES = ["requests", "numpy", "pandas", "flask", "django", "torch", "yaml"]
+ERRORS = [
+    "ImportError: No module named {module}",
+    "AttributeError: module {module} has no attribute {name}",
+    "TypeError: {name}() got an unexpected keyword argument {arg}",
+    "KeyError: {arg} missing in {module} config",
+    "ValueError: invalid literal for {name} with base 10",
+]
+
+
+def make_texts(count: int, seed: int) -> List[str]:
+    """Generate synthetic error texts."""
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        texts.append(
+            rng.choice(ERRORS).format(
+                module=rng.choice(MODULES),
+                name=f"func_{rng.randrange(500)}",
+                arg=f"arg_{rng.randrange(200)}",
+            )
+            + f" in handler_{i % 997}"
+        )
+    return texts
+
+
+def directory_size(path: str) -> int:
+    """Get the total size of the files below a directory."""
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def recall(found: List[List[str]], exact: np.ndarray, k: int) -> float:
+    """Get the mean fraction of results that belong to the exact top k.
+
+    A result counts if its exact score reaches the k-th best score, so that
+    ties at the boundary are not counted as misses.
+    """
+    hits = []
+    for found_ids, scores in zip(found, exact):
+        threshold = np.sort(scores)[-k] - 1e-6
+        hits.append(sum(scores[int(i)] >= threshold for i in found_ids) / k)
+    return float(np.mean(hits))
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    args = parser.parse_args()
+
+    embedder = HashingEmbeddingFunction(args.dim)
+    ids = [f"{i:036d}" for i in range(args.records)]
+    vectors = np.array(embedder(make_texts(args.records, seed=1)))
+    queries = np.array(embedder(make_texts(args.queries, seed=2)))
+
+    # Ground truth: exact cosine scores at full precision
+    exact = queries @ vectors.T
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Before: ChromaDB collection with a cosine HNSW index
+        chroma_path = os.path.join(workdir, "chroma")
+        collection = chromadb.PersistentClient(path=chroma_path).create_collection(
+            "bench_vectors", metadata={"hnsw:space": "cosine"}
+        )
+        batch = 5000
+        for start in range(0, args.records, batch):
+            collection.add(
+                ids=ids[start : start + batch],
+                embeddings=vectors[start : start + batch].tolist(),
+            )
+        start_time = time.perf_counter()
+        hnsw_found = collection.query(
+            query_embeddings=queries.tolist(), n_results=args.k, include=[]
+        )["ids"]
+        hnsw_ms = (time.perf_counter() - start_time) * 1000 / args.queries
+
+        # After: int8 quantized index with full-precision re-scoring
+        index_path = os.path.join(workdir, "quantized")
+        index = QuantizedVectorIndex(index_path, rescore_factor=args.rescore_factor)
+        for start in range(0, args.records, batch):
+            index.add(ids[start : start + batch], vectors[start : start + batch])
+        start_time = time.perf_counter()
+        quantized_found = [
+            [i for i, _ in matches] for matches in index.search(queries, args.k)
+        ]
+        quantized_ms = (time.perf_counter() - start_time) * 1000 / args.queries
+
+        metrics = index.metrics()
+        chroma_disk = directory_size(chroma_path)
+        quantized_disk = directory_size(index_path)
+
+    float32_bytes = args.records * args.dim * 4
+    print(f"records={args.records} dim={args.dim} k={args.k}")
+    print(
+        f"{'index':<16}{'vector MiB':>12}{'disk MiB':>10}{'ms/query':>10}"
+        f"{'recall':>8}"
+    )
+    print(
+        f"{'hnsw float32':<16}{float32_bytes / 2**20:>12.1f}"
+        f"{chroma_disk / 2**20:>10.1f}{hnsw_ms:>10.2f}"
+        f"{recall(hnsw_found, exact, args.k):>8.3f}"
+    )
+    print(
+        f"{'int8 + rescore':<16}{metrics['quantized_bytes'] / 2**20:>12.1f}"
+        f"{quantized_disk / 2**20:>10.1f}{quantized_ms:>10.2f}"
+        f"{recall(quantized_found, exact, args.k):>8.3f}"
+    )
+    print(
+        f"vector memory saved: "
+        f"{1 - metrics['quantized_bytes'] / float32_bytes:.0%} "
+        f"(full-precision copy stays on disk for re-scoring)"
+    )
+
+
+if __name__ == "__main__":
+    main()
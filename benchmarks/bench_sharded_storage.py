@@ -0,0 +1,114 @@
+# filename: benchmarks/bench_sharded_storage.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Benchmark write and query throughput against the number of shards.
+
+Concurrent writers add batches of records, then concurrent readers run
+similarity searches. One shard is a plain ChromaStorage.
+
+Usage:
+    python benchmarks/bench_sharded_storage.py [--records N] [--queries N]
+        [--workers N] [--shards 1 2 4 8]
+"""
+
+
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Dict, List
+
+from mcp_server_tribal.models.error_record import (
+    ErrorContext,
+    ErrorRecord,
+    ErrorSolution,
+)
+from mcp_server_tribal.services.chroma_storage import ChromaStorage
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.sharded_storage import ShardedStorage
+from mcp_server_tribal.services.storage_interface import StorageInterface
+
+LANGUAGES = ["python", "javascript", "typescript", "go", "rust", "java"]
+BATCH_SIZE = 50
+
+
+def make_errors(count: int) -> List[ErrorRecord]:
+    """Create error records with distinct messages."""
+    return [
+        ErrorRecord(
+            error_type=f"Error{i % 40}",
+            context=ErrorContext(
+                language=LANGUAGES[i % len(LANGUAGES)],
+                error_message=f"failure {i} in module mod_{i % 97} at line {i % 13}",
+            ),
+            solution=ErrorSolution(description="Fix it", explanation="Broken"),
+        )
+        for i in range(count)
+    ]
+
+
+def open_storage(persist_directory: str, shards: int) -> StorageInterface:
+    """Open a store with the given number of shards."""
+    embedding_function = HashingEmbeddingFunction(256)
+    if shards == 1:
+        return ChromaStorage(persist_directory, embedding_function=embedding_function)
+    return ShardedStorage.open(
+        persist_directory, shards, "hash", embedding_function=embedding_function
+    )
+
+
+async def run(
+    storage: StorageInterface, errors: List[ErrorRecord], queries: int, workers: int
+) -> Dict[str, float]:
+    """Write the records, then search them, with concurrent workers."""
+    batches = [
+        errors[start : start + BATCH_SIZE]
+        for start in range(0, len(errors), BATCH_SIZE)
+    ]
+
+    async def write(worker: int) -> None:
+        for batch in batches[worker::workers]:
+            await storage.add_errors(batch)
+
+    async def read(worker: int) -> None:
+        for i in range(worker, queries, workers):
+            await storage.search_similar(f"failure in module mod_{i % 97}", 10)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(write(worker) for worker in range(workers)))
+    write_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    await asyncio.gather(*(read(worker) for worker in range(workers)))
+    read_seconds = time.perf_counter() - start
+    await storage.close()
+    return {
+        "writes": len(errors) / write_seconds,
+        "queries": queries / read_seconds,
+    }
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    errors = make_errors(args.records)
+    print(f"{'shards':<8}{'writes/s':>12}{'queries/s':>12}")
+    for shards in args.shards:
+        with tempfile.TemporaryDirectory() as persist_directory:
+            storage = open_storage(persist_directory, shards)
+            stats = asyncio.run(run(storage, errors, args.queries, args.workers))
+        print(f"{shards:<8}{stats['writes']:>12.0f}{stats['queries']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
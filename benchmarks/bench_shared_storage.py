@@ -0,0 +1,83 @@
+# filename: benchmarks/bench_shared_storage.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Benchmark per-request latency of a shared vs. per-request ChromaStorage.
+
+Usage:
+    python benchmarks/bench_shared_storage.py [--requests N]
+"""
+
+
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from mcp_server_tribal import app as app_module
+from mcp_server_tribal.app import app
+from mcp_server_tribal.services.chroma_storage import ChromaStorage
+from mcp_server_tribal.services.storage_interface import StorageInterface
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "mean": statistics.fmean(ordered) * 1000,
+        "p50": ordered[len(ordered) // 2] * 1000,
+        "p95": ordered[int(len(ordered) * 0.95) - 1] * 1000,
+    }
+
+
+def run(client: TestClient, requests: int) -> List[float]:
+    """Issue lookups for unknown IDs and return per-request latencies."""
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(f"/api/v1/errors/{uuid4()}")
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 404
+    return samples
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as persist_directory:
+        # Before: a fresh ChromaStorage for every request
+        def per_request_storage() -> StorageInterface:
+            return ChromaStorage(persist_directory=persist_directory)
+
+        app.dependency_overrides[StorageInterface] = per_request_storage
+        before = summarize(run(TestClient(app), args.requests))
+
+        # After: one storage opened by the lifespan and shared by all requests
+        app_module.create_storage = lambda: ChromaStorage(
+            persist_directory=persist_directory
+        )
+        app.dependency_overrides[StorageInterface] = app_module.get_storage
+        with TestClient(app) as client:
+            after = summarize(run(client, args.requests))
+
+    print(f"{'mode':<12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, stats in (("per-request", before), ("shared", after)):
+        print(
+            f"{name:<12}{stats['mean']:>10.2f}{stats['p50']:>10.2f}"
+            f"{stats['p95']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+# filename: benchmarks/bench_storage_backends.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Compare the storage backends.
+
+Each backend runs in its own process, which populates a new store in
+batches, then times similarity, lexical and filtered searches and reopens
+the store; the in-memory store has nothing to reopen. Each store is also
+written to an mmap snapshot file, and the time to open that file and run
+one search shows the read-only cold start. Peak RSS is the
+process's high-water mark. Recall@10 is the share of each backend's top 10
+that scores at least the tenth-best exact cosine similarity; counting
+scores rather than IDs keeps tied records from counting as misses.
+
+Usage:
+    python benchmarks/bench_storage_backends.py [--records N] [--queries N]
+        [--backends chroma sqlite memory]
+"""
+
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List
+from uuid import UUID
+
+import numpy as np
+
+from mcp_server_tribal.models.error_record import (
+    ErrorContext,
+    ErrorQuery,
+    ErrorRecord,
+    ErrorSolution,
+    SearchMode,
+)
+from mcp_server_tribal.services.embeddings import (
+    HashingEmbeddingFunction,
+    embedding_text,
+)
+from mcp_server_tribal.services.mmap_storage import (
+    MmapSnapshotStorage,
+    write_mmap_snapshot,
+)
+from mcp_server_tribal.services.storage_factory import create_storage
+
+LANGUAGES = ["python", "javascript", "typescript", "go", "rust", "java"]
+BATCH_SIZE = 500
+DIM = 256
+
+
+def make_errors(count: int) -> List[ErrorRecord]:
+    """Create error records with distinct messages and the same IDs every run."""
+    return [
+        ErrorRecord(
+            id=UUID(int=i + 1),
+            error_type=f"Error{i % 40}",
+            context=ErrorContext(
+                language=LANGUAGES[i % len(LANGUAGES)],
+                error_message=f"failure {i} in module mod_{i % 97} at line {i % 13}",
+            ),
+            solution=ErrorSolution(description="Fix it", explanation="Broken"),
+        )
+        for i in range(count)
+    ]
+
+
+def query_texts(count: int) -> List[str]:
+    """Create the similarity query texts."""
+    return [f"failure in module mod_{i % 97} at line {i % 13}" for i in range(count)]
+
+
+def recall_at_10(records: int, queries: int, top10: List[List[str]]) -> float:
+    """Get the share of results scoring within the exact top 10."""
+    embed = HashingEmbeddingFunction(DIM)
+    errors = make_errors(records)
+    vectors = np.array(embed([embedding_text(error) for error in errors]))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    rows = {str(error.id): row for row, error in enumerate(errors)}
+    hits = []
+    for text, found in zip(query_texts(queries), top10):
+        query = np.array(embed([text])[0])
+        scores = vectors @ (query / np.linalg.norm(query))
+        threshold = np.sort(scores)[-10] - 1e-6
+        hits.append(sum(scores[rows[i]] >= threshold for i in found) / 10)
+    return float(np.mean(hits))
+
+
+def median_ms(samples: List[float]) -> float:
+    """Get the median of durations in seconds, in milliseconds."""
+    return statistics.median(samples) * 1000
+
+
+async def measure(settings: Dict[str, Any], records: int, queries: int) -> Dict:
+    """Populate a store and time its operations."""
+    errors = make_errors(records)
+    texts = query_texts(queries)
+
+    start = time.perf_counter()
+    storage = create_storage(settings)
+    open_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for offset in range(0, len(errors), BATCH_SIZE):
+        await storage.add_errors(errors[offset : offset + BATCH_SIZE])
+    insert_seconds = time.perf_counter() - start
+
+    timings: Dict[str, List[float]] = {"vector": [], "lexical": [], "filtered": []}
+    top10 = []
+    for i, text in enumerate(texts):
+        start = time.perf_counter()
+        found = await storage.search_similar(text, 10)
+        timings["vector"].append(time.perf_counter() - start)
+        top10.append([str(error.id) for error in found])
+
+        start = time.perf_counter()
+        await storage.search_errors(
+            ErrorQuery(error_message=f"mod_{i % 97}", mode=SearchMode.LEXICAL)
+        )
+        timings["lexical"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await storage.search_errors(
+            ErrorQuery(error_message=text, language=LANGUAGES[i % len(LANGUAGES)])
+        )
+        timings["filtered"].append(time.perf_counter() - start)
+
+    snapshot_path = os.path.join(settings["persist_directory"], "bench.mmap")
+    await write_mmap_snapshot(storage, snapshot_path)
+    await storage.close()
+    start = time.perf_counter()
+    snapshot = MmapSnapshotStorage(
+        snapshot_path, embedding_function=HashingEmbeddingFunction(DIM)
+    )
+    await snapshot.search_similar(texts[0], 1)
+    mmap_open_ms = (time.perf_counter() - start) * 1000
+    await snapshot.close()
+
+    # Reopening an existing store is what a restarting server pays
+    reopen_ms = None
+    if settings["storage_backend"] != "memory":
+        start = time.perf_counter()
+        reopened = create_storage(settings)
+        await reopened.search_similar(texts[0], 1)
+        reopen_ms = (time.perf_counter() - start) * 1000
+        await reopened.close()
+
+    return {
+        "open_ms": open_seconds * 1000,
+        "reopen_ms": reopen_ms,
+        "mmap_open_ms": mmap_open_ms,
+        "inserts_per_s": records / insert_seconds,
+        **{f"{name}_ms": median_ms(samples) for name, samples in timings.items()},
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "top10": top10,
+    }
+
+
+def backend_main(backend: str, records: int, queries: int, results: Any) -> None:
+    """Measure one backend in a new store."""
+    with tempfile.TemporaryDirectory() as persist_directory:
+        settings = {
+            "storage_backend": backend,
+            "persist_directory": persist_directory,
+            "embedding_function": "hashing",
+            "embedding_dim": DIM,
+        }
+        try:
+            results.put(asyncio.run(measure(settings, records, queries)))
+        except BaseException as e:
+            # Report the failure rather than leave the parent waiting
+            results.put(repr(e))
+            raise
+
+
+def run_backend(backend: str, records: int, queries: int) -> Dict:
+    """Measure one backend in its own process."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(
+        target=backend_main, args=(backend, records, queries, results)
+    )
+    process.start()
+    stats = results.get()
+    process.join()
+    if isinstance(stats, str):
+        raise RuntimeError(f"{backend} benchmark failed: {stats}")
+    return stats
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--backends", nargs="+", default=["chroma", "sqlite", "memory"])
+    args = parser.parse_args()
+
+    results = {
+        backend: run_backend(backend, args.records, args.queries)
+        for backend in args.backends
+    }
+    for stats in results.values():
+        stats["recall@10"] = recall_at_10(args.records, args.queries, stats["top10"])
+
+    columns = [
+        "open_ms",
+        "reopen_ms",
+        "mmap_open_ms",
+        "inserts_per_s",
+        "vector_ms",
+        "lexical_ms",
+        "filtered_ms",
+        "peak_rss_mb",
+        "recall@10",
+    ]
+    print(f"{'metric':<16}" + "".join(f"{backend:>12}" for backend in results))
+    for column in columns:
+        values = [stats[column] for stats in results.values()]
+        print(
+            f"{column:<16}"
+            + "".join(
+                f"{'-':>12}" if value is None else f"{value:>12.3f}" for value in values
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# filename: benchmarks/bench_storage_workers.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Benchmark throughput of worker processes sharing one storage owner.
+
+A storage owner process serves a pre-populated store; each worker process
+runs a mix of similarity searches and record writes through its own
+RemoteStorage, several calls at a time, as an HTTP worker would. The
+in-process row is the single-process baseline without IPC.
+
+Usage:
+    python benchmarks/bench_storage_workers.py [--records N] [--calls N]
+        [--write-ratio R] [--workers 1 2 4 8]
+"""
+
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from mcp_server_tribal.models.error_record import (
+    ErrorContext,
+    ErrorRecord,
+    ErrorSolution,
+)
+from mcp_server_tribal.services.storage_factory import (
+    create_storage,
+    run_storage_server,
+)
+from mcp_server_tribal.services.storage_interface import StorageInterface
+
+# Calls each worker keeps in flight
+CONCURRENCY = 4
+
+
+def make_errors(count: int, prefix: str = "") -> List[ErrorRecord]:
+    """Create error records with distinct messages."""
+    return [
+        ErrorRecord(
+            error_type=f"Error{i % 40}",
+            context=ErrorContext(
+                language="python",
+                error_message=f"{prefix}failure {i} in module mod_{i % 97}",
+            ),
+            solution=ErrorSolution(description="Fix it", explanation="Broken"),
+        )
+        for i in range(count)
+    ]
+
+
+async def run_calls(
+    storage: StorageInterface, calls: int, write_ratio: float, prefix: str
+) -> Tuple[int, int]:
+    """Run a mix of searches and writes, returning how many of each ran."""
+    writes = int(calls * write_ratio)
+    new_errors = make_errors(writes, prefix)
+    plan = [("write", error) for error in new_errors] + [
+        ("read", f"failure in module mod_{i % 97}") for i in range(calls - writes)
+    ]
+    plan = plan[::2] + plan[1::2]
+
+    async def run_lane(lane: int) -> None:
+        for kind, item in plan[lane::CONCURRENCY]:
+            if kind == "write":
+                await storage.add_error(item)
+            else:
+                await storage.search_similar(item, 5)
+
+    await asyncio.gather(*(run_lane(lane) for lane in range(CONCURRENCY)))
+    return calls - writes, writes
+
+
+def worker_main(
+    settings: Dict[str, Any],
+    calls: int,
+    write_ratio: float,
+    barrier: Any,
+    results: Any,
+) -> None:
+    """Run one worker process's share of the calls."""
+
+    async def run() -> Tuple[int, int]:
+        storage = create_storage(settings)
+        await storage.search_similar("warm up", 1)
+        barrier.wait()
+        try:
+            return await run_calls(storage, calls, write_ratio, f"w{os.getpid()} ")
+        finally:
+            await storage.close()
+
+    try:
+        results.put(asyncio.run(run()))
+    except BaseException as e:
+        # Report the failure rather than leave the parent waiting
+        barrier.abort()
+        results.put(repr(e))
+        raise
+
+
+def run_workers(
+    settings: Dict[str, Any], workers: int, calls: int, write_ratio: float
+) -> Dict[str, float]:
+    """Run worker processes against the owner and measure throughput."""
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=worker_main, args=(settings, calls, write_ratio, barrier, results)
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    start = time.perf_counter()
+    counts = [results.get() for _ in processes]
+    elapsed = time.perf_counter() - start
+    failures = [count for count in counts if isinstance(count, str)]
+    if failures:
+        raise RuntimeError(f"Workers failed: {failures}")
+    for process in processes:
+        process.join()
+    return {
+        "reads": sum(reads for reads, _ in counts) / elapsed,
+        "writes": sum(writes for _, writes in counts) / elapsed,
+    }
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as persist_directory:
+        settings = {
+            "persist_directory": persist_directory,
+            "embedding_function": "hashing",
+            "embedding_dim": 256,
+            "storage_read_workers": 4,
+            "storage_write_workers": 1,
+        }
+
+        async def baseline() -> Dict[str, float]:
+            storage = create_storage(settings)
+            await storage.add_errors(make_errors(args.records))
+            start = time.perf_counter()
+            reads, writes = await run_calls(
+                storage, args.calls, args.write_ratio, "base "
+            )
+            elapsed = time.perf_counter() - start
+            await storage.close()
+            return {"reads": reads / elapsed, "writes": writes / elapsed}
+
+        rows = [("in-process", asyncio.run(baseline()))]
+
+        socket_path = os.path.join(persist_directory, "storage.sock")
+        owner = multiprocessing.get_context("spawn").Process(
+            target=run_storage_server, args=(settings, socket_path)
+        )
+        owner.start()
+        remote_settings = {**settings, "storage_socket": socket_path}
+        try:
+            for workers in args.workers:
+                stats = run_workers(
+                    remote_settings, workers, args.calls, args.write_ratio
+                )
+                rows.append((f"{workers} workers", stats))
+        finally:
+            owner.terminate()
+            owner.join()
+
+    print(f"{'mode':<12}{'reads/s':>10}{'writes/s':>10}")
+    for name, stats in rows:
+        print(f"{name:<12}{stats['reads']:>10.0f}{stats['writes']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
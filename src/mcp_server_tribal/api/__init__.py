@@ -11,9 +11,11 @@
 
 from fastapi import APIRouter
 
+from .admin import router as admin_router
 from .auth import router as auth_router
 from .errors import router as errors_router
 
 api_router = APIRouter()
 api_router.include_router(errors_router)
 api_router.include_router(auth_router)
+api_router.include_router(admin_router)
@@ -0,0 +1,88 @@
+# filename: mcp_server_tribal/api/admin.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Administrative API routes."""
+
+
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ..models.error_record import CompactionReport, SnapshotInfo
+from ..services.auth import ApiKeyAuth
+from ..services.storage_factory import get_storage_settings
+from ..services.storage_interface import StorageInterface
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+# Get authentication configuration
+require_auth = os.environ.get("REQUIRE_AUTH", "false").lower() == "true"
+api_key_auth = ApiKeyAuth(require_auth=require_auth)
+
+
+@router.post("/snapshot", response_model=SnapshotInfo)
+async def create_snapshot(
+    storage: StorageInterface = Depends(),
+    _: str = Depends(api_key_auth),
+) -> SnapshotInfo:
+    """
+    Take a snapshot of the stored data into the snapshot directory.
+
+    Writes are paused while the files changed since the last snapshot are
+    copied; unchanged files are hard-linked.
+
+    Args:
+        storage: Storage service dependency
+        _: API key authentication dependency
+
+    Returns:
+        A summary of the snapshot
+
+    Raises:
+        HTTPException: If the storage backend cannot take snapshots
+    """
+    try:
+        return await storage.snapshot(get_storage_settings()["snapshot_directory"])
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+
+@router.post("/compact", response_model=CompactionReport)
+async def compact_storage(
+    threshold: Optional[float] = Query(default=None, ge=0.0, le=1.0),
+    force: bool = False,
+    storage: StorageInterface = Depends(),
+    _: str = Depends(api_key_auth),
+) -> CompactionReport:
+    """
+    Reclaim space left behind by updated and deleted records.
+
+    Searches keep running while the storage is compacted; writes wait.
+
+    Args:
+        threshold: Only compact if at least this fraction of the index or
+            database is taken by deleted data; defaults to
+            COMPACTION_THRESHOLD
+        force: Compact regardless of the threshold
+        storage: Storage service dependency
+        _: API key authentication dependency
+
+    Returns:
+        The fragmentation found, and the bytes reclaimed and search latency
+        before and after if the storage was compacted
+
+    Raises:
+        HTTPException: If the storage backend cannot be compacted
+    """
+    if threshold is None:
+        threshold = get_storage_settings()["compaction_threshold"]
+    try:
+        return await storage.compact(threshold, force)
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
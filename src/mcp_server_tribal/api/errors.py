@@ -10,14 +10,37 @@
 
 
 import os
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-
-from ..models.error_record import ErrorQuery, ErrorRecord
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from ..models.error_record import (
+    BatchGetResult,
+    BatchItemResult,
+    BatchResult,
+    ErrorQuery,
+    ErrorRecord,
+    FacetCounts,
+    ImportResult,
+    SearchMode,
+    SimilarBatchQuery,
+    SimilarBatchResult,
+)
 from ..services.auth import ApiKeyAuth
 from ..services.storage_interface import StorageInterface
+from ..services.transfer import export_ndjson, import_ndjson, iter_ndjson_lines
 
 router = APIRouter(prefix="/errors", tags=["errors"])
 
@@ -46,6 +69,177 @@ async def create_error(
     return await storage.add_error(error)
 
 
+@router.post("/batch", response_model=BatchResult)
+async def create_errors_batch(
+    errors: List[Dict[str, Any]] = Body(...),
+    storage: StorageInterface = Depends(),
+    _: str = Depends(api_key_auth),
+) -> BatchResult:
+    """
+    Create several error records in one batched write.
+
+    Each item is validated on its own, so invalid items are reported as
+    failures without rejecting the rest of the batch.
+
+    Args:
+        errors: The error records to create
+        storage: Storage service dependency
+        _: API key authentication dependency
+
+    Returns:
+        Per-item success or failure for the batch
+    """
+    results = []
+    records = []
+    positions = []
+    for index, item in enumerate(errors):
+        try:
+            records.append(ErrorRecord.model_validate(item))
+            positions.append(index)
+        except ValidationError as e:
+            results.append(BatchItemResult(index=index, success=False, error=str(e)))
+
+    for result in await storage.add_errors(records):
+        result.index = positions[result.index]
+        results.append(result)
+
+    return BatchResult.from_items(results)
+
+
+@router.get("/batch", response_model=BatchGetResult)
+async def read_errors_batch(
+    ids: List[str] = Query(..., description="Error IDs, repeated or comma-separated"),
+    storage: StorageInterface = Depends(),
+    _: str = Depends(api_key_auth),
+) -> BatchGetResult:
+    """
+    Get several error records by ID in one lookup.
+
+    Args:
+        ids: The UUIDs of the error records
+        storage: Storage service dependency
+        _: API key authentication dependency
+
+    Returns:
+        The records found, in request order, and the IDs that were not found
+
+    Raises:
+        HTTPException: If an ID is not a valid UUID
+    """
+    keys = list(dict.fromkeys(key.strip() for value in ids for key in value.split(",")))
+    try:
+        error_ids = [UUID(key) for key in keys if key]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid error ID")
+
+    records = await storage.get_errors(error_ids)
+    return BatchGetResult(
+        records=[record for record in records if record is not None],
+        missing=[
+            str(error_id)
+            for error_id, record in zip(error_ids, records)
+            if record is None
+        ],
+    )
+
+
+@router.get("/facets", response_model=FacetCounts)
+async def read_error_facets(
+    error_type: Optional[str] = None,
+    language: Optional[str] = None,
+    framework: Optional[str] = None,
+    storage: StorageInterface = Depends(),
+    _: str = Depends(api_key_auth),
+) -> FacetCounts:
+    """
+    Count error records per error type, language and framework.
+
+    Args:
+        error_type: Only count records with this error type
+        language: Only count records in this language
+        framework: Only count records for this framework
+        storage: Storage service dependency
+        _: API key authentication dependency
+
+    Returns:
+        The number of matching records and their counts per facet value
+
+    Raises:
+        HTTPException: If the storage backend cannot count facets
+    """
+    filters = {
+        "error_type": error_type,
+        "language": language,
+        "framework": framework,
+    }
+    try:
+        return await storage.facet_counts(
+            {field: value for field, value in filters.items() if value}
+        )
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+
+@router.get("/export")
+async def export_errors(
+    embeddings: bool = False,
+    batch_size: int = Query(default=500, ge=1, le=10000),
+    storage: StorageInterface = Depends(),
+    _: str = Depends(api_key_auth),
+) -> StreamingResponse:
+    """
+    Stream every error record as NDJSON.
+
+    Args:
+        embeddings: Include the stored vectors, so that importing into a
+            store with the same embedder does not re-embed the records
+        batch_size: Number of records read from storage at a time
+        storage: Storage service dependency
+        _: API key authentication dependency
+
+    Returns:
+        A streaming NDJSON response: a header line, then one record per line
+    """
+    return StreamingResponse(
+        export_ndjson(storage, batch_size, include_embeddings=embeddings),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=tribal-export.ndjson"},
+    )
+
+
+@router.post("/import", response_model=ImportResult)
+async def import_errors(
+    request: Request,
+    batch_size: int = Query(default=500, ge=1, le=10000),
+    storage: StorageInterface = Depends(),
+    _: str = Depends(api_key_auth),
+) -> ImportResult:
+    """
+    Import error records from an NDJSON request body.
+
+    The body is read as it arrives and records are stored in batches, so
+    exports of any size can be imported.
+
+    Args:
+        request: The request, whose body is an NDJSON export
+        batch_size: Number of records stored at a time
+        storage: Storage service dependency
+        _: API key authentication dependency
+
+    Returns:
+        Counts of imported, deduplicated and failed records
+
+    Raises:
+        HTTPException: If the export format version is not supported
+    """
+    try:
+        return await import_ndjson(
+            storage, iter_ndjson_lines(request.stream()), batch_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/{error_id}", response_model=ErrorRecord)
 async def read_error(
     error_id: UUID,
@@ -124,6 +318,7 @@ async def delete_error(
 
 @router.get("/", response_model=List[ErrorRecord])
 async def search_errors(
+    response: Response,
     error_type: Optional[str] = None,
     language: Optional[str] = None,
     framework: Optional[str] = None,
@@ -131,13 +326,19 @@ async def search_errors(
     code_snippet: Optional[str] = None,
     task_description: Optional[str] = None,
     max_results: int = Query(default=5, ge=1, le=50),
+    mode: SearchMode = SearchMode.VECTOR,
+    cursor: Optional[str] = None,
     storage: StorageInterface = Depends(),
     _: str = Depends(api_key_auth),
 ) -> List[ErrorRecord]:
     """
-    Search for error records.
+    Search for error records, one page at a time.
+
+    The cursor of the next page, if any, is returned in the X-Next-Cursor
+    header.
 
     Args:
+        response: The response, to set the next-page cursor header on
         error_type: The error type to filter by
         language: The language to filter by
         framework: The framework to filter by
@@ -145,11 +346,17 @@ async def search_errors(
         code_snippet: The code snippet to search for
         task_description: The task description to search for
         max_results: Maximum number of results to return
+        mode: How the text fields are matched: vector, lexical or hybrid
+        cursor: Cursor of the page to get, from the previous page
         storage: Storage service dependency
         _: API key authentication dependency
 
     Returns:
         A list of matching error records
+
+    Raises:
+        HTTPException: If the cursor is invalid or expired, or the storage
+            backend cannot paginate
     """
     query = ErrorQuery(
         error_type=error_type,
@@ -159,15 +366,26 @@ async def search_errors(
         code_snippet=code_snippet,
         task_description=task_description,
         max_results=max_results,
+        mode=mode,
+        cursor=cursor,
     )
 
-    return await storage.search_errors(query)
+    try:
+        page = await storage.search_errors_page(query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.records
 
 
 @router.get("/similar/", response_model=List[ErrorRecord])
 async def search_similar(
     query: str,
     max_results: int = Query(default=5, ge=1, le=50),
+    mode: SearchMode = SearchMode.VECTOR,
     storage: StorageInterface = Depends(),
     _: str = Depends(api_key_auth),
 ) -> List[ErrorRecord]:
@@ -177,10 +395,39 @@ async def search_similar(
     Args:
         query: The text to search for
         max_results: Maximum number of results to return
+        mode: How the text is matched: vector, lexical or hybrid
         storage: Storage service dependency
         _: API key authentication dependency
 
     Returns:
         A list of similar error records
     """
+    if mode != SearchMode.VECTOR:
+        return await storage.search_errors(
+            ErrorQuery(error_message=query, max_results=max_results, mode=mode)
+        )
     return await storage.search_similar(query, max_results)
+
+
+@router.post("/similar/batch", response_model=List[SimilarBatchResult])
+async def search_similar_batch(
+    batch: SimilarBatchQuery,
+    storage: StorageInterface = Depends(),
+    _: str = Depends(api_key_auth),
+) -> List[SimilarBatchResult]:
+    """
+    Search for error records similar to each of several texts in one pass.
+
+    Args:
+        batch: The query texts and the maximum number of results per query
+        storage: Storage service dependency
+        _: API key authentication dependency
+
+    Returns:
+        The similar error records for each query, in request order
+    """
+    grouped = await storage.search_similar_many(batch.queries, batch.max_results)
+    return [
+        SimilarBatchResult(query=query, results=results)
+        for query, results in zip(batch.queries, grouped)
+    ]
@@ -11,15 +11,23 @@
 
 import argparse
 import logging
+import multiprocessing
 import os
-from typing import Dict
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
 
 import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api import api_router
-from .services.chroma_storage import ChromaStorage
+from .services import storage_factory
+from .services.storage_factory import (
+    get_storage_settings,
+    run_storage_server,
+    storage_socket_path,
+)
 from .services.storage_interface import StorageInterface
 
 # Configure logging
@@ -48,21 +56,70 @@ def get_settings() -> Dict:
         ),
         "require_auth": os.environ.get("REQUIRE_AUTH", "false").lower() == "true",
         "default_port": default_port,
+        **get_storage_settings(),
     }
 
 
-def get_storage() -> StorageInterface:
+_storage_lock = threading.Lock()
+
+
+def create_storage() -> StorageInterface:
+    """
+    Create the storage service from the current settings.
+
+    Returns:
+        A new instance of the storage service
+    """
+    return storage_factory.create_storage(get_settings())
+
+
+def get_storage(request: Request) -> StorageInterface:
     """
     Get the storage service.
 
     This function serves as a FastAPI dependency that provides
-    the storage service to API routes.
+    the storage service to API routes. The storage is opened once by the
+    application lifespan and shared by all requests; if the lifespan has
+    not run (e.g. a TestClient used outside a ``with`` block), it is
+    created lazily on first use.
+
+    Args:
+        request: The incoming request
 
     Returns:
-        An instance of the storage service
+        The shared instance of the storage service
     """
-    settings = get_settings()
-    return ChromaStorage(persist_directory=settings["persist_directory"])
+    state = request.app.state
+    storage = getattr(state, "storage", None)
+    if storage is None:
+        with _storage_lock:
+            storage = getattr(state, "storage", None)
+            if storage is None:
+                storage = create_storage()
+                state.storage = storage
+    return storage
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Open the shared storage at startup and close it at shutdown."""
+    app.state.storage = create_storage()
+    logger.info("Storage opened")
+    scheduler = storage_factory.create_compaction_scheduler(
+        app.state.storage, get_settings()
+    )
+    if scheduler is not None:
+        scheduler.start()
+    try:
+        yield
+    finally:
+        if scheduler is not None:
+            await scheduler.stop()
+        storage = app.state.storage
+        app.state.storage = None
+        if storage is not None:
+            await storage.close()
+            logger.info("Storage closed")
 
 
 # Create FastAPI application
@@ -70,6 +127,7 @@ app = FastAPI(
     title="Tribal",
     description="Knowledge tracking tools for Claude and other LLMs",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -104,6 +162,12 @@ async def health_check() -> Dict:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics(storage: StorageInterface = Depends()) -> Dict:
+    """Storage metrics endpoint for the API."""
+    return {"storage": await storage.get_stats()}
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all incoming requests."""
@@ -139,6 +203,12 @@ def parse_args():
         action="store_true",
         help="Automatically find an available port if the specified port is in use",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes; above 1, a separate process owns the storage",
+    )
     return parser.parse_args()
 
 
@@ -178,12 +248,27 @@ def main():
     logger.info(f"Starting server on {args.host}:{port}")
     logger.info(f"Documentation available at http://{args.host}:{port}/docs")
 
+    owner = None
+    if args.workers > 1 and not os.environ.get("STORAGE_SOCKET"):
+        # Workers must not open the database files themselves
+        settings = get_settings()
+        socket_path = storage_socket_path(settings)
+        owner = multiprocessing.get_context("spawn").Process(
+            target=run_storage_server,
+            args=(settings, socket_path),
+            name="tribal-storage",
+        )
+        owner.start()
+        os.environ["STORAGE_SOCKET"] = socket_path
+        logger.info(f"Storage owner process {owner.pid} serving {socket_path}")
+
     try:
         uvicorn.run(
             "mcp_server_tribal.app:app",
             host=args.host,
             port=port,
             reload=args.reload,
+            workers=args.workers,
         )
     except OSError as e:
         if "Address already in use" in str(e) and not args.auto_port:
@@ -195,6 +280,10 @@ def main():
                 f"You can try using port {next_port} which appears to be available."
             )
         raise
+    finally:
+        if owner is not None:
+            owner.terminate()
+            owner.join()
 
 
 if __name__ == "__main__":
@@ -10,17 +10,37 @@
 
 
 import argparse
+import asyncio
 import json
 import logging
 import os
 import sys
-from typing import Dict, List, Optional
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from typing import AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
 from mcp.server.fastmcp import FastMCP
 
-from .models.error_record import ErrorQuery, ErrorRecord
-from .services.chroma_storage import ChromaStorage
+from .models.error_record import (
+    BatchGetResult,
+    BatchItemResult,
+    BatchResult,
+    ErrorQuery,
+    ErrorRecord,
+    SearchMode,
+)
+from .services.mmap_storage import write_mmap_snapshot
+from .services.storage_factory import (
+    create_compaction_scheduler,
+    create_storage,
+    get_storage_settings,
+    reshard_storage,
+    restore_storage,
+    serve_storage,
+    storage_socket_path,
+)
+from .services.transfer import export_ndjson, import_ndjson
 
 # Configure logging
 logging.basicConfig(
@@ -32,10 +52,26 @@ logger = logging.getLogger(__name__)
 # Initialize FastMCP instance
 from mcp_server_tribal import __version__
 
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[Dict]:
+    """Run scheduled compaction, then flush and close the storage at shutdown."""
+    scheduler = create_compaction_scheduler(storage, settings)
+    if scheduler is not None:
+        scheduler.start()
+    try:
+        yield {}
+    finally:
+        if scheduler is not None:
+            await scheduler.stop()
+        await storage.close()
+
+
 mcp = FastMCP(
     title="Tribal",
     description="Knowledge tracking tools for Claude and other LLMs",
     version=__version__,
+    lifespan=lifespan,
 )
 
 
@@ -74,11 +110,12 @@ def get_settings() -> Dict:
         ),
         "require_auth": os.environ.get("REQUIRE_AUTH", "false").lower() == "true",
         "default_port": default_port,
+        **get_storage_settings(),
     }
 
 
 settings = get_settings()
-storage = ChromaStorage(persist_directory=settings["persist_directory"])
+storage = create_storage(settings)
 
 
 # Create API key validator
@@ -89,6 +126,40 @@ def validate_api_key(api_key: str) -> bool:
     return api_key == settings["api_key"]
 
 
+def _build_error_record(
+    error_type: str,
+    error_message: str,
+    language: str,
+    framework: Optional[str] = None,
+    code_snippet: Optional[str] = None,
+    task_description: Optional[str] = None,
+    solution_description: str = "",
+    solution_code_fix: Optional[str] = None,
+    solution_explanation: str = "",
+    solution_references: Optional[List[str]] = None,
+) -> ErrorRecord:
+    """Build an ErrorRecord from the flat fields used by the MCP tools."""
+    if not solution_references:
+        solution_references = []
+
+    return ErrorRecord(
+        error_type=error_type,
+        context={
+            "language": language,
+            "error_message": error_message,
+            "framework": framework,
+            "code_snippet": code_snippet,
+            "task_description": task_description,
+        },
+        solution={
+            "description": solution_description,
+            "code_fix": solution_code_fix,
+            "explanation": solution_explanation,
+            "references": solution_references,
+        },
+    )
+
+
 # Define MCP tools
 @mcp.tool()
 async def track_error(
@@ -121,24 +192,17 @@ async def track_error(
     Returns:
         The created error record
     """
-    if not solution_references:
-        solution_references = []
-
-    error_data = ErrorRecord(
+    error_data = _build_error_record(
         error_type=error_type,
-        context={
-            "language": language,
-            "error_message": error_message,
-            "framework": framework,
-            "code_snippet": code_snippet,
-            "task_description": task_description,
-        },
-        solution={
-            "description": solution_description,
-            "code_fix": solution_code_fix,
-            "explanation": solution_explanation,
-            "references": solution_references,
-        },
+        error_message=error_message,
+        language=language,
+        framework=framework,
+        code_snippet=code_snippet,
+        task_description=task_description,
+        solution_description=solution_description,
+        solution_code_fix=solution_code_fix,
+        solution_explanation=solution_explanation,
+        solution_references=solution_references,
     )
 
     error_record = await storage.add_error(error_data)
@@ -146,21 +210,90 @@ async def track_error(
 
 
 @mcp.tool()
-async def find_similar_errors(query: str, max_results: int = 5) -> List[Dict]:
+async def track_errors_batch(errors: List[Dict]) -> Dict:
+    """
+    Track several errors and their solutions in one batched write.
+
+    Args:
+        errors: Error entries, each with the same fields as track_error
+            (error_type, error_message, language, framework, code_snippet,
+            task_description, solution_description, solution_code_fix,
+            solution_explanation, solution_references)
+
+    Returns:
+        Per-item success or failure, with the ID of each stored record
+    """
+    results = []
+    records = []
+    positions = []
+    for index, item in enumerate(errors):
+        try:
+            records.append(_build_error_record(**item))
+            positions.append(index)
+        except (TypeError, ValueError) as e:
+            results.append(BatchItemResult(index=index, success=False, error=str(e)))
+
+    for result in await storage.add_errors(records):
+        result.index = positions[result.index]
+        results.append(result)
+
+    return json.loads(BatchResult.from_items(results).model_dump_json())
+
+
+@mcp.tool()
+async def find_similar_errors(
+    query: str, max_results: int = 5, mode: str = "vector"
+) -> List[Dict]:
     """
     Find errors similar to the given query.
 
+    Use mode "lexical" or "hybrid" when the query contains exact identifiers
+    such as module names, error codes or function names.
+
     Args:
         query: Text to search for in the knowledge base
         max_results: Maximum number of results to return
+        mode: How the text is matched: vector, lexical or hybrid
 
     Returns:
         List of similar error records
     """
-    records = await storage.search_similar(query, max_results)
+    if SearchMode(mode) != SearchMode.VECTOR:
+        records = await storage.search_errors(
+            ErrorQuery(error_message=query, max_results=max_results, mode=mode)
+        )
+    else:
+        records = await storage.search_similar(query, max_results)
     return [json.loads(record.model_dump_json()) for record in records]
 
 
+@mcp.tool()
+async def find_similar_errors_batch(
+    queries: List[str], max_results: int = 5
+) -> List[Dict]:
+    """
+    Find errors similar to each of several queries in one pass.
+
+    Use this instead of repeated find_similar_errors calls when triaging
+    several distinct error messages at once.
+
+    Args:
+        queries: Texts to search for in the knowledge base
+        max_results: Maximum number of results to return per query
+
+    Returns:
+        One entry per query with the query text and its similar error records
+    """
+    grouped = await storage.search_similar_many(queries, max_results)
+    return [
+        {
+            "query": query,
+            "results": [json.loads(record.model_dump_json()) for record in records],
+        }
+        for query, records in zip(queries, grouped)
+    ]
+
+
 @mcp.tool()
 async def search_errors(
     error_type: Optional[str] = None,
@@ -170,6 +303,7 @@ async def search_errors(
     code_snippet: Optional[str] = None,
     task_description: Optional[str] = None,
     max_results: int = 5,
+    mode: str = "vector",
 ) -> List[Dict]:
     """
     Search for errors in the knowledge base.
@@ -182,6 +316,7 @@ async def search_errors(
         code_snippet: Code snippet to search for
         task_description: Task description to search for
         max_results: Maximum number of results to return
+        mode: How the text fields are matched: vector, lexical or hybrid
 
     Returns:
         List of matching error records
@@ -194,12 +329,87 @@ async def search_errors(
         code_snippet=code_snippet,
         task_description=task_description,
         max_results=max_results,
+        mode=mode,
     )
 
     records = await storage.search_errors(query)
     return [json.loads(record.model_dump_json()) for record in records]
 
 
+@mcp.tool()
+async def search_errors_page(
+    error_type: Optional[str] = None,
+    language: Optional[str] = None,
+    framework: Optional[str] = None,
+    error_message: Optional[str] = None,
+    code_snippet: Optional[str] = None,
+    task_description: Optional[str] = None,
+    max_results: int = 5,
+    mode: str = "vector",
+    cursor: Optional[str] = None,
+) -> Dict:
+    """
+    Search for errors in the knowledge base, one page at a time.
+
+    Args:
+        error_type: Type of error to filter by
+        language: Programming language to filter by
+        framework: Framework to filter by
+        error_message: Error message to search for
+        code_snippet: Code snippet to search for
+        task_description: Task description to search for
+        max_results: Maximum number of results per page
+        mode: How the text fields are matched: vector, lexical or hybrid
+        cursor: The next_cursor of the previous page, to get the next page
+
+    Returns:
+        The matching error records and the next_cursor of the next page,
+        which is None on the last page
+    """
+    query = ErrorQuery(
+        error_type=error_type,
+        language=language,
+        framework=framework,
+        error_message=error_message,
+        code_snippet=code_snippet,
+        task_description=task_description,
+        max_results=max_results,
+        mode=mode,
+        cursor=cursor,
+    )
+
+    page = await storage.search_errors_page(query)
+    return json.loads(page.model_dump_json())
+
+
+@mcp.tool()
+async def get_error_facets(
+    error_type: Optional[str] = None,
+    language: Optional[str] = None,
+    framework: Optional[str] = None,
+) -> Dict:
+    """
+    Count errors in the knowledge base per error type, language and framework.
+
+    Args:
+        error_type: Only count errors of this type
+        language: Only count errors in this programming language
+        framework: Only count errors for this framework
+
+    Returns:
+        The number of matching errors and their counts per facet value
+    """
+    filters = {
+        "error_type": error_type,
+        "language": language,
+        "framework": framework,
+    }
+    counts = await storage.facet_counts(
+        {field: value for field, value in filters.items() if value}
+    )
+    return json.loads(counts.model_dump_json())
+
+
 @mcp.tool()
 async def get_error_by_id(error_id: str) -> Optional[Dict]:
     """
@@ -221,6 +431,33 @@ async def get_error_by_id(error_id: str) -> Optional[Dict]:
         return None
 
 
+@mcp.tool()
+async def get_errors_by_ids(error_ids: List[str]) -> Dict:
+    """
+    Get several error records by their IDs in one lookup.
+
+    Args:
+        error_ids: UUIDs of the error records
+
+    Returns:
+        The records found, in input order, and the IDs that were not found
+    """
+    keys = list(dict.fromkeys(error_ids))
+    valid_ids = {}
+    for key in keys:
+        try:
+            valid_ids[key] = UUID(key)
+        except ValueError:
+            pass
+
+    found = dict(zip(valid_ids, await storage.get_errors(list(valid_ids.values()))))
+    result = BatchGetResult(
+        records=[found[key] for key in keys if found.get(key) is not None],
+        missing=[key for key in keys if found.get(key) is None],
+    )
+    return json.loads(result.model_dump_json())
+
+
 @mcp.tool()
 async def delete_error(error_id: str) -> bool:
     """
@@ -253,6 +490,7 @@ async def get_api_status() -> Dict:
         "status": "ok",
         "name": "Tribal",
         "version": __version__,
+        "storage": await storage.get_stats(),
     }
 
 
@@ -318,6 +556,135 @@ def parse_args(args=None):
         help="Automatically find an available port if the specified port is in use",
     )
 
+    # Export command
+    export_parser = subparsers.add_parser(
+        "export", help="Export all error records as NDJSON"
+    )
+    export_parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default="-",
+        help="File to write the export to (default: standard output)",
+    )
+    export_parser.add_argument(
+        "--embeddings",
+        action="store_true",
+        help="Include the stored vectors so that imports skip re-embedding",
+    )
+    export_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Records read from storage at a time (default: 500)",
+    )
+
+    # Import command
+    import_parser = subparsers.add_parser(
+        "import", help="Import error records from an NDJSON export"
+    )
+    import_parser.add_argument(
+        "input",
+        type=str,
+        nargs="?",
+        default="-",
+        help="File to import (default: standard input)",
+    )
+    import_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Records stored at a time (default: 500)",
+    )
+
+    # Snapshot command
+    snapshot_parser = subparsers.add_parser(
+        "snapshot", help="Take an incremental snapshot of the stored data"
+    )
+    snapshot_parser.add_argument(
+        "--directory",
+        type=str,
+        default=settings["snapshot_directory"],
+        help="Directory holding the snapshots (default: SNAPSHOT_DIRECTORY)",
+    )
+    snapshot_parser.add_argument(
+        "--format",
+        choices=["directory", "mmap"],
+        default="directory",
+        help="Incremental snapshot directory, or a read-only file for "
+        "STORAGE_BACKEND=mmap (default: directory)",
+    )
+    snapshot_parser.add_argument(
+        "--output",
+        type=str,
+        help="File to write with --format mmap (default: a timestamped file "
+        "in the snapshot directory)",
+    )
+    snapshot_parser.add_argument(
+        "--quantized",
+        action="store_true",
+        help="Store int8 vectors in the mmap file, a quarter of the size",
+    )
+
+    # Restore command
+    restore_parser = subparsers.add_parser(
+        "restore", help="Restore the stored data from a snapshot"
+    )
+    restore_parser.add_argument("snapshot", type=str, help="Snapshot directory")
+
+    # Compact command
+    compact_parser = subparsers.add_parser(
+        "compact", help="Reclaim space left behind by updated and deleted records"
+    )
+    compact_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=settings["compaction_threshold"],
+        help="Fraction of deleted data that triggers compaction "
+        "(default: COMPACTION_THRESHOLD)",
+    )
+    compact_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Compact even if the storage is below the threshold",
+    )
+
+    # Reshard command
+    reshard_parser = subparsers.add_parser(
+        "reshard", help="Copy the stored data into a new shard layout"
+    )
+    reshard_parser.add_argument(
+        "--shards",
+        type=int,
+        required=True,
+        help="Number of shards; 1 for an unsharded store",
+    )
+    reshard_parser.add_argument(
+        "--strategy",
+        choices=["hash", "language"],
+        default="hash",
+        help="Assign records to shards by ID hash or by language (default: hash)",
+    )
+    reshard_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Records copied at a time (default: 500)",
+    )
+
+    # Storage owner command
+    storage_server_parser = subparsers.add_parser(
+        "storage-server",
+        help="Own the storage and serve it to worker processes over a socket",
+    )
+    storage_server_parser.add_argument(
+        "--socket",
+        type=str,
+        default=storage_socket_path(settings),
+        help="Unix socket to listen on (default: STORAGE_SOCKET, or "
+        "storage.sock in PERSIST_DIRECTORY)",
+    )
+
     # Version command
     subparsers.add_parser("version", help="Show version information")
 
@@ -343,6 +710,170 @@ def parse_args(args=None):
     return parsed_args
 
 
+async def export_errors(output: str, include_embeddings: bool, batch_size: int) -> int:
+    """
+    Export all error records to a file or standard output.
+
+    Args:
+        output: Path of the file to write, or "-" for standard output
+        include_embeddings: Include the stored vectors
+        batch_size: Records read from storage at a time
+
+    Returns:
+        The exit code
+    """
+    stream = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    try:
+        async for line in export_ndjson(storage, batch_size, include_embeddings):
+            stream.write(line)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+        await storage.close()
+    return 0
+
+
+async def import_errors(input_path: str, batch_size: int) -> int:
+    """
+    Import error records from a file or standard input.
+
+    Args:
+        input_path: Path of the file to read, or "-" for standard input
+        batch_size: Records stored at a time
+
+    Returns:
+        The exit code: 0 if every record was stored, 1 otherwise
+    """
+    stream = sys.stdin if input_path == "-" else open(input_path, encoding="utf-8")
+    try:
+        result = await import_ndjson(storage, stream, batch_size)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        await storage.close()
+    print(result.model_dump_json(indent=2))
+    return 0 if result.failed == 0 else 1
+
+
+async def snapshot_errors(
+    directory: str,
+    snapshot_format: str = "directory",
+    output: Optional[str] = None,
+    quantized: bool = False,
+) -> int:
+    """
+    Take a snapshot of the stored data.
+
+    Args:
+        directory: Directory holding the snapshots
+        snapshot_format: "directory" for an incremental snapshot, or "mmap"
+            for a read-only file the mmap backend serves
+        output: The mmap file, by default a timestamped file in the directory
+        quantized: Whether the mmap file stores int8 vectors
+
+    Returns:
+        The exit code
+    """
+    try:
+        if snapshot_format == "mmap":
+            if output is None:
+                stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+                os.makedirs(directory, exist_ok=True)
+                output = os.path.join(directory, f"tribal-{stamp}.mmap")
+            info = await write_mmap_snapshot(storage, output, quantized=quantized)
+            print(json.dumps(info, indent=2))
+        else:
+            snapshot = await storage.snapshot(directory)
+            print(snapshot.model_dump_json(indent=2))
+    finally:
+        await storage.close()
+    return 0
+
+
+async def restore_errors(snapshot_path: str) -> int:
+    """
+    Restore the stored data from a snapshot.
+
+    The previous persist directory is kept next to the restored one.
+
+    Args:
+        snapshot_path: The snapshot directory
+
+    Returns:
+        The exit code: 0 if the snapshot was restored, 1 otherwise
+    """
+    await storage.close()
+    try:
+        manifest = restore_storage(snapshot_path, settings)
+    except ValueError as e:
+        print(f"Restore failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Restored snapshot {manifest['name']} into {settings['persist_directory']}")
+    return 0
+
+
+async def compact_storage(threshold: float, force: bool) -> int:
+    """
+    Compact the storage if it is fragmented enough.
+
+    Args:
+        threshold: Fraction of deleted data that triggers compaction
+        force: Compact regardless of the threshold
+
+    Returns:
+        The exit code
+    """
+    try:
+        report = await storage.compact(threshold, force)
+    finally:
+        await storage.close()
+    print(report.model_dump_json(indent=2))
+    return 0
+
+
+async def reshard_errors(shards: int, strategy: str, batch_size: int) -> int:
+    """
+    Copy the stored data into a new shard layout.
+
+    Set SHARD_COUNT and SHARD_STRATEGY to the new layout before restarting.
+
+    Args:
+        shards: The new number of shards
+        strategy: How records are assigned to shards
+        batch_size: Records copied at a time
+
+    Returns:
+        The exit code: 0 if every record was copied, 1 otherwise
+    """
+    await storage.close()
+    try:
+        result = await reshard_storage(settings, max(shards, 1), strategy, batch_size)
+    except ValueError as e:
+        print(f"Reshard failed: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+async def serve_errors(socket_path: str) -> int:
+    """
+    Serve the storage to worker processes until interrupted.
+
+    Args:
+        socket_path: Unix socket to listen on
+
+    Returns:
+        The exit code
+    """
+    await storage.close()
+    try:
+        await serve_storage(settings, socket_path)
+    except RuntimeError as e:
+        print(f"Storage server failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
 def main(sys_args=None):
     """Run the application."""
     args = parse_args(sys_args)
@@ -350,9 +881,33 @@ def main(sys_args=None):
     # Handle different commands
     if args.command == "version":
         from mcp_server_tribal.cli.commands import print_version
+
         print_version()
         return 0
 
+    if args.command == "export":
+        return asyncio.run(export_errors(args.output, args.embeddings, args.batch_size))
+
+    if args.command == "import":
+        return asyncio.run(import_errors(args.input, args.batch_size))
+
+    if args.command == "snapshot":
+        return asyncio.run(
+            snapshot_errors(args.directory, args.format, args.output, args.quantized)
+        )
+
+    if args.command == "restore":
+        return asyncio.run(restore_errors(args.snapshot))
+
+    if args.command == "compact":
+        return asyncio.run(compact_storage(args.threshold, args.force))
+
+    if args.command == "reshard":
+        return asyncio.run(reshard_errors(args.shards, args.strategy, args.batch_size))
+
+    if args.command == "storage-server":
+        return asyncio.run(serve_errors(args.socket))
+
     if args.command == "help":
         parser = argparse.ArgumentParser(
             description="Tribal - Knowledge tracking tools for Claude and other LLMs"
@@ -10,13 +10,14 @@
 
 
 from datetime import datetime, UTC
-from typing import List, Optional
+from enum import Enum
+from typing import Any, Dict, List, Optional
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
 
 # Current schema version - must match the one in chroma_storage.py
-SCHEMA_VERSION = "1.0.0"
+SCHEMA_VERSION = "1.1.0"
 
 
 class ErrorContext(BaseModel):
@@ -73,6 +74,14 @@ class ErrorRecord(BaseModel):
     }
 
 
+class SearchMode(str, Enum):
+    """How the text of a query is matched against error records."""
+
+    VECTOR = "vector"  # Embedding similarity
+    LEXICAL = "lexical"  # BM25 over identifiers and words, no embedding
+    HYBRID = "hybrid"  # Vector and lexical rankings fused
+
+
 class ErrorQuery(BaseModel):
     """Query parameters for searching error records."""
 
@@ -83,3 +92,123 @@ class ErrorQuery(BaseModel):
     code_snippet: Optional[str] = None
     task_description: Optional[str] = None
     max_results: int = Field(default=5, ge=1, le=50)
+    mode: SearchMode = SearchMode.VECTOR
+    cursor: Optional[str] = Field(
+        default=None, description="Cursor returned with the previous page"
+    )
+
+
+class ErrorPage(BaseModel):
+    """One page of search results."""
+
+    records: List[ErrorRecord]
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor of the next page, None on the last page"
+    )
+
+
+class FacetCounts(BaseModel):
+    """Number of records per error type, language and framework."""
+
+    total: int = Field(description="Number of records matching the filters")
+    facets: Dict[str, Dict[str, int]] = Field(
+        description="Per facet field, the number of matching records per value"
+    )
+
+
+class SimilarBatchQuery(BaseModel):
+    """Several similarity queries to run in one batch."""
+
+    queries: List[str] = Field(min_length=1, max_length=100)
+    max_results: int = Field(default=5, ge=1, le=50)
+
+
+class SimilarBatchResult(BaseModel):
+    """Results of one query in a batch similarity search."""
+
+    query: str
+    results: List[ErrorRecord]
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of a single item in a batch operation."""
+
+    index: int = Field(description="Position of the item in the request")
+    id: Optional[UUID] = None
+    success: bool
+    error: Optional[str] = None
+    deduplicated: bool = Field(
+        default=False, description="Merged into an existing record with this ID"
+    )
+
+
+class BatchResult(BaseModel):
+    """Outcome of a batch operation with per-item results."""
+
+    results: List[BatchItemResult]
+    succeeded: int
+    failed: int
+
+    @classmethod
+    def from_items(cls, results: List[BatchItemResult]) -> "BatchResult":
+        """Build a batch result from per-item results ordered by index."""
+        results = sorted(results, key=lambda item: item.index)
+        succeeded = sum(1 for item in results if item.success)
+        return cls(
+            results=results, succeeded=succeeded, failed=len(results) - succeeded
+        )
+
+
+class ImportResult(BaseModel):
+    """Outcome of an NDJSON import."""
+
+    imported: int = 0
+    deduplicated: int = 0
+    failed: int = 0
+    embeddings_reused: int = Field(
+        default=0, description="Records stored with their exported embedding"
+    )
+    failures: List[BatchItemResult] = Field(
+        default_factory=list,
+        description="The first failures; index is the line number in the input",
+    )
+
+
+class SnapshotInfo(BaseModel):
+    """Summary of a storage snapshot."""
+
+    name: str
+    path: str
+    created_at: datetime
+    files: int
+    bytes_copied: int = Field(description="Bytes of files changed since the last")
+    bytes_linked: int = Field(description="Bytes hard-linked to the last snapshot")
+    metadata: Dict[str, Any] = Field(
+        default_factory=dict, description="Storage details, such as schema version"
+    )
+
+
+class CompactionReport(BaseModel):
+    """Outcome of a storage compaction."""
+
+    compacted: bool = Field(description="Whether the storage was rebuilt")
+    records: int
+    deleted_ratio: float = Field(
+        description="Fraction of vector index entries that were deleted records"
+    )
+    free_page_ratio: float = Field(
+        description="Fraction of free pages in the metadata database"
+    )
+    bytes_before: int
+    bytes_after: int
+    bytes_reclaimed: int = 0
+    search_latency_before_ms: Optional[float] = None
+    search_latency_after_ms: Optional[float] = None
+    duration_seconds: float = 0.0
+
+
+class BatchGetResult(BaseModel):
+    """Records found by a batch lookup, in request order, and the IDs not found."""
+
+    records: List[ErrorRecord]
+    missing: List[str]
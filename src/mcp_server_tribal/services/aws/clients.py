@@ -0,0 +1,121 @@
+# filename: mcp_server_tribal/services/aws/clients.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Shared AWS clients and request accounting."""
+
+
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+# HTTP connections each shared client keeps open
+DEFAULT_MAX_POOL_CONNECTIONS = 32
+
+T = TypeVar("T")
+
+_clients: Dict[Tuple[str, Optional[str], Optional[str]], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def shared_client(
+    service: str,
+    endpoint_url: Optional[str] = None,
+    region_name: Optional[str] = None,
+    max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+) -> Any:
+    """
+    Get the process-wide boto3 client of a service, creating it on first use.
+
+    boto3 clients are thread-safe, so one client per service, endpoint and
+    region serves every storage instance and worker thread, and its
+    connection pool is reused across calls instead of reconnecting.
+
+    Args:
+        service: The AWS service, such as "s3" or "dynamodb"
+        endpoint_url: A compatible endpoint, such as MinIO or DynamoDB Local
+        region_name: The region (defaults to the usual AWS settings)
+        max_pool_connections: Connection pool size of a new client; an
+            existing client keeps its own
+
+    Returns:
+        The shared client
+
+    Raises:
+        ImportError: If boto3 is not installed
+    """
+    key = (service, endpoint_url, region_name)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            try:
+                import boto3
+                from botocore.config import Config
+            except ImportError as e:
+                raise ImportError(
+                    f"The {service} storage backend requires boto3; install it "
+                    f"with 'pip install tribal[aws]'"
+                ) from e
+            client = boto3.client(
+                service,
+                endpoint_url=endpoint_url,
+                region_name=region_name,
+                config=Config(
+                    max_pool_connections=max_pool_connections,
+                    retries={"mode": "adaptive", "max_attempts": 10},
+                ),
+            )
+            _clients[key] = client
+        return client
+
+
+class RequestCounter:
+    """Counts the requests sent to a service, per storage operation."""
+
+    def __init__(self) -> None:
+        """Initialize empty counts."""
+        self._counts: Dict[str, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._context = threading.local()
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run a blocking call, counting the requests it sends under its operation.
+
+        The operation is named after the function, without its leading
+        underscore and ``_sync`` suffix.
+
+        Args:
+            fn: The blocking function
+            *args: Positional arguments for the function
+
+        Returns:
+            The function's return value
+        """
+        previous = getattr(self._context, "operation", None)
+        self._context.operation = fn.__name__.strip("_").removesuffix("_sync")
+        try:
+            return fn(*args)
+        finally:
+            self._context.operation = previous
+
+    def count(self, request: str, amount: int = 1) -> None:
+        """
+        Count requests under the running operation.
+
+        Args:
+            request: The request kind, such as "get" or "batch_write_item"
+            amount: Number of requests
+        """
+        operation = getattr(self._context, "operation", None) or "other"
+        with self._lock:
+            self._counts[operation][request] += amount
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        """Get the request counts per operation and request kind."""
+        with self._lock:
+            return {operation: dict(c) for operation, c in self._counts.items()}
@@ -6,107 +6,2233 @@
 #
 # Version: 0.1.0
 
-"""AWS-compatible storage implementations."""
+"""AWS-compatible storage implementations.
 
+S3Storage packs records into append-only segment objects. Every write puts
+one new segment, holding the added or updated records with their
+embeddings or the IDs it deletes, then rewrites a small manifest object
+listing the segments in write order; a record's newest segment wins.
+Opening a store reads the manifest and each segment's index with a ranged
+GET, never the records. Searches download whole segments into a local LRU
+cache on disk and score them with NumPy; lookups in segments that are not
+cached fetch just the records with ranged GETs.
 
-from typing import List, Optional
-from uuid import UUID
+Each store has a single writer. Run one process, or a ``tribal
+storage-server`` owner, per bucket prefix.
 
-from ..storage_interface import StorageInterface
-from ...models.error_record import ErrorQuery, ErrorRecord
+DynamoDBStorage keeps one item per record, holding the record as JSON,
+its embedding and its facet fields, with a global secondary index per
+facet field keyed by the field and the record ID. Metadata-only searches
+query one of those indexes instead of scanning the table. Records are
+written and read with batched requests, whose unprocessed items are
+retried with backoff. Similarity search is delegated to a quantized
+vector index on local disk, which is reconciled with the table on open.
+Both backends send their requests through a pooled client shared by the
+whole process.
+"""
 
 
-class S3Storage(StorageInterface):
+import json
+import logging
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+from urllib.parse import quote, unquote
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from ...models.error_record import (
+    BatchItemResult,
+    CompactionReport,
+    ErrorPage,
+    ErrorQuery,
+    ErrorRecord,
+    FacetCounts,
+    SearchMode,
+)
+from ..compaction import DEFAULT_COMPACTION_THRESHOLD
+from ..embedding_cache import CachedEmbeddingFunction
+from ..embeddings import create_embedding_function, embedding_model_id, embedding_text
+from ..executor import StorageExecutor
+from ..facet_index import FACET_FIELDS, FacetIndex
+from ..lexical_index import (
+    HYBRID_CANDIDATE_FACTOR,
+    BM25Index,
+    reciprocal_rank_fusion,
+)
+from ..pagination import (
+    RankingSnapshots,
+    decode_cursor,
+    encode_cursor,
+    snapshot_depth,
+)
+from ..quantized_index import QuantizedVectorIndex
+from ..storage_interface import StorageInterface, query_filters, query_text
+from .clients import RequestCounter, shared_client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Magic bytes and version of the segment object format
+SEGMENT_MAGIC = b"TRIBSEGM"
+SEGMENT_FORMAT_VERSION = 1
+# Magic bytes, format version and index length
+SEGMENT_PREFIX = struct.Struct("<8sII")
+# Alignment of the vector section, so it can be viewed without copying
+SEGMENT_ALIGNMENT = 8
+
+# Records per segment written by a compaction
+SEGMENT_RECORDS = 10000
+# Segment count above which a compaction runs regardless of deleted data
+MAX_SEGMENTS = 64
+# Local segment cache size
+DEFAULT_CACHE_BYTES = 1 << 30
+# Largest span of a segment fetched in one ranged GET to read several records
+MAX_COALESCED_BYTES = 1 << 20
+
+# Most items DynamoDB accepts in one BatchWriteItem and BatchGetItem request
+BATCH_WRITE_ITEMS = 25
+BATCH_GET_ITEMS = 100
+# Requests sent per batch before its unprocessed items are given up on, and
+# the backoff before the first resend, doubled for each later one
+BATCH_ATTEMPTS = 8
+BATCH_BACKOFF_SECONDS = 0.05
+# ID of the item recording the embedder and dimension of a table
+META_ID = "__tribal_meta__"
+
+T = TypeVar("T")
+
+
+def _aligned(offset: int) -> int:
+    """Round an offset up to the segment alignment."""
+    return -(-offset // SEGMENT_ALIGNMENT) * SEGMENT_ALIGNMENT
+
+
+def _normalize(vectors: Any) -> np.ndarray:
+    """L2-normalize the rows of a matrix, leaving zero rows as they are."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _facet_values(error: ErrorRecord) -> Tuple[str, ...]:
+    """Get the facet field values of a record, in FACET_FIELDS order."""
+    return (
+        error.error_type,
+        error.context.language,
+        error.context.framework or "",
+    )
+
+
+def _key(record_id: str) -> Dict[str, Any]:
+    """Get the DynamoDB key of an item."""
+    return {"id": {"S": record_id}}
+
+
+def _index_name(field: str) -> str:
+    """Get the name of the secondary index of a facet field."""
+    return f"{field}-index"
+
+
+def _item(error: ErrorRecord, vector: np.ndarray) -> Dict[str, Any]:
     """
-    S3-backed implementation of the storage interface.
+    Build the DynamoDB item of a record.
+
+    Empty facet fields are left out, since index keys cannot be empty, so
+    the item is not listed in their indexes.
+    """
+    item = {
+        **_key(str(error.id)),
+        "record": {"S": error.model_dump_json()},
+        "vector": {"B": np.asarray(vector, dtype="<f4").tobytes()},
+    }
+    for field, value in zip(FACET_FIELDS, _facet_values(error)):
+        if value:
+            item[field] = {"S": value}
+    return item
+
+
+def _item_facets(item: Dict[str, Any]) -> Dict[str, str]:
+    """Get the facet field values of a DynamoDB item."""
+    return {field: item[field]["S"] for field in FACET_FIELDS if field in item}
+
+
+def _item_vector(item: Dict[str, Any]) -> np.ndarray:
+    """Get the embedding of a DynamoDB item."""
+    return np.frombuffer(item["vector"]["B"], dtype="<f4")
+
 
-    This is a placeholder class for future AWS integration.
-    Implement this class to use S3 for storage in a cloud deployment.
+def _pack_segment(
+    ids: Sequence[str],
+    payloads: Sequence[bytes],
+    facets: Sequence[Sequence[str]],
+    vectors: np.ndarray,
+    deleted: Sequence[str],
+) -> Tuple[bytes, int]:
     """
+    Build a segment object.
+
+    A segment is a prefix, a JSON index of the row IDs, payload lengths and
+    facet values and the deleted IDs, then the float32 vector matrix and the
+    records as packed JSON.
+
+    Returns:
+        The object and the length of its prefix and index
+    """
+    index = json.dumps(
+        {
+            "ids": list(ids),
+            "lengths": [len(payload) for payload in payloads],
+            "facets": [list(values) for values in facets],
+            "deleted": list(deleted),
+            "dim": int(vectors.shape[1]) if len(ids) else 0,
+        }
+    ).encode("utf-8")
+    index_bytes = SEGMENT_PREFIX.size + len(index)
+    padding = b"\0" * (_aligned(index_bytes) - index_bytes)
+    data = b"".join(
+        [
+            SEGMENT_PREFIX.pack(SEGMENT_MAGIC, SEGMENT_FORMAT_VERSION, len(index)),
+            index,
+            padding,
+            np.ascontiguousarray(vectors, dtype="<f4").tobytes() if len(ids) else b"",
+            *payloads,
+        ]
+    )
+    return data, index_bytes
+
+
+class Segment:
+    """The index of a segment object and the liveness of its rows."""
+
+    def __init__(self, entry: Dict[str, Any], index: bytes):
+        """
+        Parse a segment index.
+
+        Args:
+            entry: The segment's manifest entry
+            index: The start of the object, covering at least its index
+
+        Raises:
+            ValueError: If the object is not a segment of a supported version
+        """
+        magic, version, length = SEGMENT_PREFIX.unpack_from(index)
+        if magic != SEGMENT_MAGIC or version > SEGMENT_FORMAT_VERSION:
+            raise ValueError(f"{entry['key']} is not a supported segment object")
+        header = json.loads(index[SEGMENT_PREFIX.size : SEGMENT_PREFIX.size + length])
+        self.key: str = entry["key"]
+        self.size: int = entry["bytes"]
+        self.ids: List[str] = header["ids"]
+        self.deleted: List[str] = header["deleted"]
+        self.facets: List[List[str]] = header["facets"]
+        self.dim: int = header["dim"]
+        self.offsets = np.concatenate([[0], np.cumsum(header["lengths"])]).astype(
+            np.int64
+        )
+        self.data_start = _aligned(SEGMENT_PREFIX.size + length)
+        self.payload_start = self.data_start + len(self.ids) * self.dim * 4
+        self.codes: Dict[str, np.ndarray] = {}
+        self.alive = np.ones(len(self.ids), dtype=bool)
+
+    def payload_range(self, row: int) -> Tuple[int, int]:
+        """Get the byte range of a row's record in the object."""
+        return (
+            self.payload_start + int(self.offsets[row]),
+            self.payload_start + int(self.offsets[row + 1]),
+        )
+
+
+class SegmentCache:
+    """Segment objects cached as files in a local directory, with LRU eviction."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        Open a cache directory, keeping the segments cached by earlier runs.
+
+        Args:
+            directory: The cache directory
+            max_bytes: Size above which the least recently used segments
+                are removed; the segment being added is always kept
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._files: OrderedDict[str, int] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+        files = []
+        for filename in os.listdir(directory):
+            path = os.path.join(directory, filename)
+            if filename.endswith(".tmp"):
+                os.remove(path)
+                continue
+            stat = os.stat(path)
+            files.append((stat.st_mtime, unquote(filename), stat.st_size))
+        for _, name, size in sorted(files):
+            self._files[name] = size
+            self._bytes += size
 
-    def __init__(self, bucket_name: str, prefix: str = "errors/"):
+    def _path(self, name: str) -> str:
+        """Get the file of a cached object."""
+        return os.path.join(self.directory, quote(name, safe=""))
+
+    def get(self, name: str) -> Optional[str]:
         """
-        Initialize S3 storage.
+        Get the file of a cached object, marking it recently used.
+
+        Args:
+            name: The object name
+
+        Returns:
+            The file, or None if the object is not cached
+        """
+        with self._lock:
+            if name not in self._files:
+                self._misses += 1
+                return None
+            self._files.move_to_end(name)
+            self._hits += 1
+            return self._path(name)
+
+    def put(self, name: str, data: bytes) -> str:
+        """
+        Cache an object, evicting the least recently used ones if needed.
+
+        Args:
+            name: The object name
+            data: The object's content
+
+        Returns:
+            The cached file
+        """
+        path = self._path(name)
+        temp_path = f"{path}.{uuid4().hex}.tmp"
+        with open(temp_path, "wb") as target:
+            target.write(data)
+        os.replace(temp_path, path)
+        with self._lock:
+            self._bytes += len(data) - self._files.pop(name, 0)
+            self._files[name] = len(data)
+            while self._bytes > self.max_bytes and len(self._files) > 1:
+                evicted, size = self._files.popitem(last=False)
+                self._bytes -= size
+                self._evictions += 1
+                try:
+                    os.remove(self._path(evicted))
+                except FileNotFoundError:
+                    pass
+        return path
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get the cache size and hit counts."""
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "files": len(self._files),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+class S3Storage(StorageInterface):
+    """S3-backed error record storage over packed segment objects."""
+
+    def __init__(
+        self,
+        bucket_name: str,
+        prefix: str = "errors/",
+        client: Optional[Any] = None,
+        endpoint_url: Optional[str] = None,
+        cache_directory: Optional[str] = None,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+        read_workers: int = 0,
+        write_workers: int = 0,
+        embedding_function: Optional[Callable[[List[str]], Any]] = None,
+        embedding_cache_size: int = 0,
+        segment_records: int = SEGMENT_RECORDS,
+        max_segments: int = MAX_SEGMENTS,
+    ):
+        """
+        Open the store under a bucket prefix, creating it on the first write.
 
         Args:
             bucket_name: S3 bucket name
-            prefix: Key prefix for error objects
+            prefix: Key prefix of the manifest and segment objects
+            client: A boto3 S3 client (defaults to the shared one)
+            endpoint_url: S3-compatible endpoint, such as MinIO, for the
+                default client
+            cache_directory: Local segment cache directory (defaults to one
+                in the system temporary directory)
+            cache_bytes: Size of the local segment cache
+            read_workers: Thread pool size for reads (0 runs reads inline)
+            write_workers: Thread pool size for writes (0 runs writes inline)
+            embedding_function: Embedding function for documents and queries
+                (defaults to ChromaDB's default model)
+            embedding_cache_size: Vectors kept in the embedding cache (0
+                disables it)
+            segment_records: Records per segment written by a compaction
+            max_segments: Segment count above which a compaction runs
+                regardless of deleted data
+
+        Raises:
+            ImportError: If no client is given and boto3 is not installed
+            ValueError: If the store was embedded with another embedder
         """
+        self.client = client or shared_client("s3", endpoint_url=endpoint_url)
         self.bucket_name = bucket_name
         self.prefix = prefix
-        # In a real implementation, you would initialize boto3 client here
+        self.segment_records = max(segment_records, 1)
+        self.max_segments = max_segments
+        self.cache = SegmentCache(
+            cache_directory or os.path.join(tempfile.gettempdir(), "tribal-s3-cache"),
+            cache_bytes,
+        )
+
+        # Requests per storage operation and S3 request kind
+        self._requests = RequestCounter()
+
+        # Row state: the segments in write order, and the segment and row
+        # of each live record; rows of replaced and deleted records are dead
+        self._segments: Dict[str, Segment] = {}
+        self._locations: Dict[str, Tuple[Segment, int]] = {}
+        self._vocabulary: Dict[str, Dict[str, int]] = {f: {} for f in FACET_FIELDS}
+        self._facets = FacetIndex()
+        self._dead_rows = 0
+        self._tombstones = 0
+        self._compactions = 0
+        self._lexical: Optional[BM25Index] = None
+        self._lexical_lock = threading.Lock()
+        self._snapshots = RankingSnapshots()
+
+        self._generation = 0
+        # Guards the row state; held briefly by reads to take a view
+        self._lock = threading.Lock()
+        # Serializes writes, which each rewrite the manifest
+        self._write_lock = threading.Lock()
+        self._read_executor = (
+            StorageExecutor(read_workers, name="read") if read_workers > 0 else None
+        )
+        self._write_executor = (
+            StorageExecutor(write_workers, name="write") if write_workers > 0 else None
+        )
+
+        if embedding_function is None:
+            embedding_function = create_embedding_function()
+        self.embedding_model_id = embedding_model_id(embedding_function)
+
+        self._manifest = self._requests.run(self._open_sync)
+        recorded = self._manifest.get("embedding_model")
+        if recorded is not None and recorded != self.embedding_model_id:
+            raise ValueError(
+                f"Embedding function mismatch: the store was embedded with "
+                f"{recorded}, but {self.embedding_model_id} is configured. "
+                f"Configure the original embedder, or export and re-import "
+                f"the records to re-embed them."
+            )
+
+        self.embedding_cache: Optional[CachedEmbeddingFunction] = None
+        if embedding_cache_size > 0:
+            self.embedding_cache = CachedEmbeddingFunction(
+                embedding_function, max_entries=embedding_cache_size
+            )
+            embedding_function = self.embedding_cache
+        self.embedding_function = embedding_function
+
+    @property
+    def _manifest_key(self) -> str:
+        """Get the key of the manifest object."""
+        return f"{self.prefix}manifest.json"
+
+    def _cache_name(self, key: str) -> str:
+        """Get the cache name of an object, unique across buckets."""
+        return f"{self.bucket_name}/{key}"
+
+    def _request(self, kind: str, method: Callable[..., Any], **kwargs: Any) -> Any:
+        """Send an S3 request, counting it under the running operation."""
+        self._requests.count(kind)
+        return method(Bucket=self.bucket_name, **kwargs)
+
+    def _get_object(
+        self, key: str, start: Optional[int] = None, end: Optional[int] = None
+    ) -> bytes:
+        """Get an object, or the bytes from ``start`` up to ``end``."""
+        if start is None:
+            response = self._request("get", self.client.get_object, Key=key)
+        else:
+            response = self._request(
+                "ranged_get",
+                self.client.get_object,
+                Key=key,
+                Range=f"bytes={start}-{end - 1}",
+            )
+        return response["Body"].read()
+
+    def _put_object(self, key: str, data: bytes) -> None:
+        """Put an object."""
+        self._request("put", self.client.put_object, Key=key, Body=data)
+
+    def _delete_object(self, key: str) -> None:
+        """Delete an object."""
+        self._request("delete", self.client.delete_object, Key=key)
+
+    def _open_sync(self) -> Dict[str, Any]:
+        """Read the manifest and the index of every segment (blocking).
+
+        Returns:
+            The manifest, or that of an empty store if there is none
+        """
+        try:
+            manifest = json.loads(self._get_object(self._manifest_key))
+        except self.client.exceptions.NoSuchKey:
+            return {
+                "format": "tribal-s3",
+                "version": SEGMENT_FORMAT_VERSION,
+                "embedding_model": None,
+                "dim": None,
+                "next_segment": 0,
+                "segments": [],
+            }
+        for entry in manifest["segments"]:
+            self._apply(self._load_segment(entry))
+        return manifest
+
+    def _load_segment(
+        self, entry: Dict[str, Any], data: Optional[bytes] = None
+    ) -> Segment:
+        """Parse the index of a segment, from the cache or a ranged GET."""
+        if data is None:
+            path = self.cache.get(self._cache_name(entry["key"]))
+            if path is not None:
+                with open(path, "rb") as cached:
+                    data = cached.read(entry["index_bytes"])
+            else:
+                data = self._get_object(entry["key"], 0, entry["index_bytes"])
+        segment = Segment(entry, data)
+        for column, field in enumerate(FACET_FIELDS):
+            vocabulary = self._vocabulary[field]
+            segment.codes[field] = np.array(
+                [
+                    vocabulary.setdefault(v[column], len(vocabulary))
+                    for v in segment.facets
+                ],
+                dtype=np.int32,
+            )
+        return segment
+
+    def _apply(self, segment: Segment) -> List[str]:
+        """Make a segment's rows the live version of their records.
+
+        Returns:
+            The IDs of the records the segment replaced or deleted
+        """
+        removed = []
+        with self._lock:
+            for record_id in segment.deleted + segment.ids:
+                previous = self._locations.pop(record_id, None)
+                if previous is not None:
+                    previous[0].alive[previous[1]] = False
+                    self._dead_rows += 1
+                    removed.append(record_id)
+            self._tombstones += len(segment.deleted)
+            for row, record_id in enumerate(segment.ids):
+                self._locations[record_id] = (segment, row)
+            self._segments[segment.key] = segment
+        self._facets.remove(segment.deleted)
+        self._facets.add(
+            segment.ids,
+            [dict(zip(FACET_FIELDS, values)) for values in segment.facets],
+        )
+        return removed
+
+    def _segment_data(self, segment: Segment) -> np.ndarray:
+        """Get a segment's bytes, downloading it into the cache if needed."""
+        name = self._cache_name(segment.key)
+        path = self.cache.get(name)
+        if path is not None:
+            try:
+                return np.memmap(path, dtype=np.uint8, mode="r")
+            except FileNotFoundError:
+                # Evicted by another thread since the lookup
+                pass
+        data = self._get_object(segment.key)
+        self.cache.put(name, data)
+        return np.frombuffer(data, dtype=np.uint8)
+
+    def _segment_vectors(self, segment: Segment, data: np.ndarray) -> np.ndarray:
+        """View the vector matrix of a segment's bytes, without copying."""
+        end = segment.payload_start
+        return (
+            data[segment.data_start : end]
+            .view("<f4")
+            .reshape(len(segment.ids), segment.dim)
+        )
+
+    def _payloads(self, segment: Segment, rows: Sequence[int]) -> Dict[int, bytes]:
+        """Read the records of rows of a segment.
+
+        Cached segments are read locally. Otherwise the rows are fetched
+        with one ranged GET over their span if it is small enough, or one
+        per row.
+        """
+        ranges = {row: segment.payload_range(row) for row in rows}
+        path = self.cache.get(self._cache_name(segment.key))
+        if path is not None:
+            try:
+                with open(path, "rb") as cached:
+                    payloads = {}
+                    for row, (start, end) in ranges.items():
+                        cached.seek(start)
+                        payloads[row] = cached.read(end - start)
+                    return payloads
+            except FileNotFoundError:
+                pass
+        low = min(start for start, _ in ranges.values())
+        high = max(end for _, end in ranges.values())
+        if high - low <= MAX_COALESCED_BYTES:
+            span = self._get_object(segment.key, low, high)
+            return {
+                row: span[start - low : end - low]
+                for row, (start, end) in ranges.items()
+            }
+        return {
+            row: self._get_object(segment.key, start, end)
+            for row, (start, end) in ranges.items()
+        }
+
+    def _get_rows(self, ids: Sequence[str]) -> List[Optional[ErrorRecord]]:
+        """Read the live records with the given IDs, None for missing ones."""
+        with self._lock:
+            locations = [self._locations.get(record_id) for record_id in ids]
+        rows: Dict[str, List[int]] = defaultdict(list)
+        segments = {}
+        for location in locations:
+            if location is not None:
+                rows[location[0].key].append(location[1])
+                segments[location[0].key] = location[0]
+        payloads = {
+            key: self._payloads(segments[key], segment_rows)
+            for key, segment_rows in rows.items()
+        }
+        return [
+            (
+                None
+                if location is None
+                else ErrorRecord.model_validate_json(
+                    payloads[location[0].key][location[1]]
+                )
+            )
+            for location in locations
+        ]
+
+    def _get_found(self, ids: Sequence[str]) -> List[ErrorRecord]:
+        """Read the live records with the given IDs, skipping missing ones."""
+        return [error for error in self._get_rows(ids) if error is not None]
+
+    async def _read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking read on the read pool, or inline if there is none."""
+        if self._read_executor is None:
+            return self._requests.run(fn, *args)
+        return await self._read_executor.run(self._requests.run, fn, *args)
+
+    async def _write(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking write on the write pool, or inline if there is none."""
+        return await self._on_write_pool(self._locked_write, fn, *args)
+
+    async def _on_write_pool(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call on the write pool, or inline if there is none."""
+        if self._write_executor is None:
+            return fn(*args)
+        return await self._write_executor.run(fn, *args)
+
+    def _locked_write(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking write after the ones before it have finished."""
+        with self._write_lock:
+            result = self._requests.run(fn, *args)
+            self._generation += 1
+            return result
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into normalized float32 rows (blocking)."""
+        return _normalize(self.embedding_function(texts))
+
+    def _commit(
+        self,
+        errors: Sequence[ErrorRecord],
+        vectors: np.ndarray,
+        deleted: Sequence[str] = (),
+    ) -> None:
+        """Write a segment and the manifest listing it (caller holds the write lock).
+
+        The segment is also cached, so reading back what was just written
+        sends no requests.
+        """
+        ids = [str(error.id) for error in errors]
+        data, index_bytes = _pack_segment(
+            ids,
+            [error.model_dump_json().encode("utf-8") for error in errors],
+            [_facet_values(error) for error in errors],
+            vectors,
+            deleted,
+        )
+        sequence = self._manifest["next_segment"]
+        key = f"{self.prefix}segments/{sequence:08d}-{uuid4().hex[:8]}.seg"
+        self._put_object(key, data)
+        entry = {
+            "key": key,
+            "records": len(ids),
+            "deletes": len(deleted),
+            "bytes": len(data),
+            "index_bytes": index_bytes,
+        }
+        manifest = {
+            **self._manifest,
+            "embedding_model": self.embedding_model_id,
+            "dim": self._manifest["dim"] or (int(vectors.shape[1]) if ids else None),
+            "next_segment": sequence + 1,
+            "segments": self._manifest["segments"] + [entry],
+        }
+        self._put_object(self._manifest_key, json.dumps(manifest).encode("utf-8"))
+        self._manifest = manifest
+        self.cache.put(self._cache_name(key), data)
+
+        removed = self._apply(self._load_segment(entry, data))
+        with self._lexical_lock:
+            if self._lexical is not None:
+                self._lexical.remove(removed)
+                self._lexical.add(ids, [embedding_text(error) for error in errors])
+
+    def _check_dim(self, vectors: np.ndarray) -> None:
+        """Check that vectors match the dimension of the stored ones.
+
+        Raises:
+            ValueError: If the dimensions differ
+        """
+        dim = self._manifest["dim"]
+        if dim is not None and vectors.shape[1] != dim:
+            raise ValueError(
+                f"Embedding dimension mismatch: got {vectors.shape[1]}, "
+                f"the store holds {dim}"
+            )
 
     async def add_error(self, error: ErrorRecord) -> ErrorRecord:
         """Add a new error record to storage."""
-        raise NotImplementedError("S3Storage is not yet implemented")
+        return await self._write(self._add_error_sync, error)
+
+    def _add_error_sync(self, error: ErrorRecord) -> ErrorRecord:
+        """Add a new error record to storage (blocking).
+
+        Raises:
+            ValueError: If a record with the same ID is already stored
+        """
+        if str(error.id) in self._locations:
+            raise ValueError(f"Error record already exists: {error.id}")
+        vectors = self._embed([embedding_text(error)])
+        self._check_dim(vectors)
+        self._commit([error], vectors)
+        return error
+
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """Add several error records in one segment."""
+        return await self._write(self._add_errors_sync, errors)
+
+    async def add_errors_with_embeddings(
+        self, errors: List[ErrorRecord], embeddings: Sequence[Optional[List[float]]]
+    ) -> List[BatchItemResult]:
+        """Add several error records in one segment, storing their given embeddings."""
+        return await self._write(self._add_errors_sync, errors, embeddings)
+
+    def _add_errors_sync(
+        self,
+        errors: List[ErrorRecord],
+        embeddings: Optional[Sequence[Optional[List[float]]]] = None,
+    ) -> List[BatchItemResult]:
+        """Add several error records in one segment (blocking).
+
+        Records whose ID is repeated in the batch or already stored are
+        reported as failures, as are records given an embedding of another
+        dimension. Records given an embedding are not re-embedded.
+        """
+        results: Dict[int, BatchItemResult] = {}
+        pending: Dict[int, ErrorRecord] = {}
+        seen = set()
+        for index, error in enumerate(errors):
+            record_id = str(error.id)
+            if record_id in seen or record_id in self._locations:
+                results[index] = BatchItemResult(
+                    index=index,
+                    id=error.id,
+                    success=False,
+                    error=(
+                        "Duplicate ID in batch"
+                        if record_id in seen
+                        else "Error record already exists"
+                    ),
+                )
+                continue
+            seen.add(record_id)
+            pending[index] = error
+
+        vectors: Dict[int, np.ndarray] = {}
+        if embeddings is not None:
+            for index in pending:
+                if embeddings[index]:
+                    vectors[index] = _normalize([embeddings[index]])[0]
+        missing = [index for index in pending if index not in vectors]
+        if missing:
+            embedded = self._embed([embedding_text(pending[i]) for i in missing])
+            vectors.update(zip(missing, embedded))
+
+        dim = self._manifest["dim"] or (len(vectors[min(vectors)]) if vectors else 0)
+        accepted = []
+        for index, error in pending.items():
+            if len(vectors[index]) != dim:
+                results[index] = BatchItemResult(
+                    index=index,
+                    id=error.id,
+                    success=False,
+                    error=f"Embedding dimension mismatch: got "
+                    f"{len(vectors[index])}, the store holds {dim}",
+                )
+                continue
+            accepted.append(index)
+            results[index] = BatchItemResult(index=index, id=error.id, success=True)
+        if accepted:
+            self._commit(
+                [pending[index] for index in accepted],
+                np.stack([vectors[index] for index in accepted]),
+            )
+        return [results[index] for index in range(len(errors))]
 
     async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
         """Retrieve an error record by ID."""
-        raise NotImplementedError("S3Storage is not yet implemented")
+        return (await self._read(self._get_errors_sync, [str(error_id)]))[0]
+
+    async def get_errors(self, error_ids: List[UUID]) -> List[Optional[ErrorRecord]]:
+        """Retrieve several error records by ID, with one request per segment."""
+        return await self._read(self._get_errors_sync, [str(i) for i in error_ids])
+
+    def _get_errors_sync(self, ids: List[str]) -> List[Optional[ErrorRecord]]:
+        """Retrieve error records by ID (blocking)."""
+        return self._get_rows(ids)
+
+    async def iter_errors(self, batch_size: int = 500) -> AsyncIterator[ErrorRecord]:
+        """Iterate over every stored error record, segment by segment."""
+        async for record, _ in self._iter_rows(batch_size, include_embeddings=False):
+            yield record
+
+    async def iter_errors_with_embeddings(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over every stored error record with its stored vector."""
+        async for record, embedding in self._iter_rows(
+            batch_size, include_embeddings=True
+        ):
+            yield record, embedding
+
+    async def _iter_rows(
+        self, batch_size: int, include_embeddings: bool
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over the records live when iteration starts, in batches.
+
+        Records replaced or deleted meanwhile are skipped.
+        """
+        with self._lock:
+            segments = [
+                (segment, np.flatnonzero(segment.alive))
+                for segment in self._segments.values()
+            ]
+        batch_size = max(batch_size, 1)
+        for segment, live in segments:
+            for start in range(0, len(live), batch_size):
+                rows = await self._read(
+                    self._iter_rows_sync,
+                    segment,
+                    live[start : start + batch_size],
+                    include_embeddings,
+                )
+                for row in rows:
+                    yield row
+
+    def _iter_rows_sync(
+        self, segment: Segment, rows: np.ndarray, include_embeddings: bool
+    ) -> List[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Read rows of a segment that are still live, with their vectors."""
+        with self._lock:
+            rows = rows[segment.alive[rows]]
+        if len(rows) == 0:
+            return []
+        data = self._segment_data(segment)
+        vectors = self._segment_vectors(segment, data) if include_embeddings else None
+        results = []
+        for row in rows:
+            start, end = segment.payload_range(row)
+            results.append(
+                (
+                    ErrorRecord.model_validate_json(data[start:end].tobytes()),
+                    None if vectors is None else vectors[row].tolist(),
+                )
+            )
+        return results
 
     async def update_error(
         self, error_id: UUID, error: ErrorRecord
     ) -> Optional[ErrorRecord]:
         """Update an existing error record."""
-        raise NotImplementedError("S3Storage is not yet implemented")
+        return await self._write(self._update_error_sync, error_id, error)
+
+    def _update_error_sync(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record (blocking).
+
+        The updated record is written to a new segment, which replaces the
+        stored version.
+        """
+        stored = self._get_rows([str(error_id)])[0]
+        if stored is None:
+            return None
+
+        # Keep the ID and creation time of the stored record
+        error.id = error_id
+        error.created_at = stored.created_at
+        vectors = self._embed([embedding_text(error)])
+        self._check_dim(vectors)
+        self._commit([error], vectors)
+        return error
 
     async def delete_error(self, error_id: UUID) -> bool:
         """Delete an error record by ID."""
-        raise NotImplementedError("S3Storage is not yet implemented")
+        return await self._write(self._delete_error_sync, error_id)
+
+    def _delete_error_sync(self, error_id: UUID) -> bool:
+        """Delete an error record by ID with a segment listing it (blocking)."""
+        if str(error_id) not in self._locations:
+            return False
+        self._commit([], np.zeros((0, 0), dtype=np.float32), [str(error_id)])
+        return True
+
+    def _vector_search(
+        self, queries: np.ndarray, limit: int, filters: Dict[str, str]
+    ) -> List[List[Tuple[str, float]]]:
+        """Find the records with the highest cosine similarity to each query.
+
+        Every live, matching row of every segment is scored, so the results
+        are exact; segments without such rows are not downloaded.
+        """
+        empty: List[List[Tuple[str, float]]] = [[] for _ in range(len(queries))]
+        if limit <= 0:
+            return empty
+        self._check_dim(queries)
+        codes = {}
+        for field, value in filters.items():
+            code = self._vocabulary[field].get(value)
+            if code is None:
+                return empty
+            codes[field] = code
+        with self._lock:
+            segments = [
+                (segment, segment.alive.copy()) for segment in self._segments.values()
+            ]
+
+        best_ids: List[List[str]] = [[] for _ in range(len(queries))]
+        best_scores = [np.empty(0, np.float32) for _ in range(len(queries))]
+        for segment, mask in segments:
+            for field, code in codes.items():
+                mask &= segment.codes[field] == code
+            rows = np.flatnonzero(mask)
+            if len(rows) == 0:
+                continue
+            vectors = self._segment_vectors(segment, self._segment_data(segment))
+            scores = vectors[rows] @ queries.T
+            for column in range(len(queries)):
+                candidates = np.concatenate([best_scores[column], scores[:, column]])
+                ids = best_ids[column] + [segment.ids[row] for row in rows]
+                if len(candidates) > limit:
+                    keep = np.argpartition(-candidates, limit - 1)[:limit]
+                    candidates = candidates[keep]
+                    ids = [ids[i] for i in keep]
+                best_scores[column], best_ids[column] = candidates, ids
+
+        results = []
+        for ids, scores in zip(best_ids, best_scores):
+            order = np.argsort(-scores, kind="stable")
+            results.append([(ids[i], float(scores[i])) for i in order])
+        return results
+
+    def _lexical_index(self) -> BM25Index:
+        """Get the BM25 index, building it from every segment on first use.
+
+        Writes keep the index up to date once it is built, so stores that
+        only serve similarity searches never download every segment.
+        """
+        with self._lexical_lock:
+            if self._lexical is None:
+                index = BM25Index()
+                with self._lock:
+                    segments = [
+                        (segment, np.flatnonzero(segment.alive))
+                        for segment in self._segments.values()
+                    ]
+                for segment, rows in segments:
+                    if len(rows) == 0:
+                        continue
+                    data = self._segment_data(segment)
+                    texts = []
+                    for row in rows:
+                        start, end = segment.payload_range(row)
+                        error = ErrorRecord.model_validate_json(
+                            data[start:end].tobytes()
+                        )
+                        texts.append(embedding_text(error))
+                    index.add([segment.ids[row] for row in rows], texts)
+                self._lexical = index
+            return self._lexical
+
+    def _ranked_ids_sync(
+        self,
+        text: str,
+        max_results: int,
+        mode: SearchMode,
+        filters: Dict[str, str],
+    ) -> List[str]:
+        """Rank record IDs by vector, lexical or hybrid relevance (blocking).
+
+        Hybrid ranking fuses the lexical and vector rankings with reciprocal
+        rank fusion.
+        """
+        depth = max_results
+        if mode == SearchMode.HYBRID:
+            depth = max_results * HYBRID_CANDIDATE_FACTOR
+
+        rankings = []
+        if mode != SearchMode.VECTOR:
+            allowed = self._facets.match(filters) if filters else None
+            matches = self._lexical_index().search(text, depth, allowed)
+            rankings.append([record_id for record_id, _ in matches])
+        if mode != SearchMode.LEXICAL:
+            matches = self._vector_search(self._embed([text]), depth, filters)[0]
+            rankings.append([record_id for record_id, _ in matches])
+        if len(rankings) == 1:
+            return rankings[0]
+        return reciprocal_rank_fusion(rankings)[:max_results]
 
     async def search_errors(self, query: ErrorQuery) -> List[ErrorRecord]:
         """Search for error records based on the provided query."""
-        raise NotImplementedError("S3Storage is not yet implemented")
+        return await self._read(self._search_errors_sync, query)
+
+    def _search_errors_sync(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query (blocking).
+
+        Without search text, the records matching the metadata filters are
+        returned in ID order, fetching only those records.
+        """
+        if query.cursor:
+            return self._search_errors_page_sync(query).records
+
+        filters = query_filters(query)
+        search_text = query_text(query)
+        if search_text:
+            ids = self._ranked_ids_sync(
+                search_text, query.max_results, query.mode, filters
+            )
+        else:
+            ids = self._facets.page(filters, None, query.max_results)
+        return self._get_found(ids)
+
+    async def search_errors_page(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time."""
+        return await self._read(self._search_errors_page_sync, query)
+
+    def _search_errors_page_sync(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time (blocking).
+
+        Metadata-only listings resume after the last ID of the previous
+        page. Ranked searches snapshot the ranked IDs on the first page and
+        slice the snapshot on later pages.
+
+        Raises:
+            ValueError: If the cursor is invalid or has expired
+        """
+        filters = query_filters(query)
+        search_text = query_text(query)
+        page_size = query.max_results
+        position = decode_cursor(query)
+        next_position: Optional[Dict[str, Any]] = None
+        try:
+            if not search_text:
+                after = position["after"] if position else None
+                ids = self._facets.page(filters, after, page_size + 1)
+                if len(ids) > page_size:
+                    ids = ids[:page_size]
+                    next_position = {"after": ids[-1]}
+            else:
+                if position is None:
+                    ranked = self._ranked_ids_sync(
+                        search_text, snapshot_depth(page_size), query.mode, filters
+                    )
+                    offset, token = 0, None
+                else:
+                    token, offset = position["snapshot"], position["offset"]
+                    ranked = self._snapshots.get(token)
+                ids = ranked[offset : offset + page_size]
+                if offset + page_size < len(ranked):
+                    if token is None:
+                        token = self._snapshots.put(ranked)
+                    next_position = {"snapshot": token, "offset": offset + page_size}
+        except (KeyError, TypeError):
+            raise ValueError("Invalid cursor") from None
+
+        return ErrorPage(
+            # Records deleted since the snapshot was taken are skipped
+            records=self._get_found(ids),
+            next_cursor=encode_cursor(query, next_position) if next_position else None,
+        )
 
     async def search_similar(
         self, text_query: str, max_results: int = 5
     ) -> List[ErrorRecord]:
         """Search for error records with similar text content."""
-        raise NotImplementedError("S3Storage is not yet implemented")
+        return (await self.search_similar_many([text_query], max_results))[0]
 
+    async def search_similar_many(
+        self, text_queries: List[str], max_results: int = 5
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts in one pass over the segments."""
+        return await self._read(
+            self._search_similar_many_sync, text_queries, max_results
+        )
 
-class DynamoDBStorage(StorageInterface):
-    """
-    DynamoDB-backed implementation of the storage interface.
+    def _search_similar_many_sync(
+        self, text_queries: List[str], max_results: int
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts (blocking)."""
+        if not text_queries:
+            return []
+        ranked = self._vector_search(self._embed(list(text_queries)), max_results, {})
+        return [
+            self._get_found([record_id for record_id, _ in matches])
+            for matches in ranked
+        ]
 
-    This is a placeholder class for future AWS integration.
-    Implement this class to use DynamoDB for storage in a cloud deployment.
-    """
+    async def facet_counts(
+        self, filters: Optional[Dict[str, str]] = None
+    ) -> FacetCounts:
+        """Count the records per error type, language and framework."""
+        total, facets = self._facets.counts(filters)
+        return FacetCounts(total=total, facets=facets)
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every committed add, update and delete."""
+        return self._generation
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        """Identify the embedder that produced the stored vectors."""
+        return self.embedding_model_id
+
+    def _deleted_ratio(self) -> float:
+        """Get the share of stored rows and deletes that are dead (caller locks)."""
+        rows = sum(len(segment.ids) for segment in self._segments.values())
+        dead = self._dead_rows + self._tombstones
+        return dead / max(rows + self._tombstones, 1)
+
+    async def compact(
+        self, threshold: float = DEFAULT_COMPACTION_THRESHOLD, force: bool = False
+    ) -> CompactionReport:
+        """Rewrite the live records into fewer segments if the store is fragmented."""
+        return await self._on_write_pool(
+            self._requests.run, self._compact_sync, threshold, force
+        )
+
+    def _compact_sync(self, threshold: float, force: bool) -> CompactionReport:
+        """Rewrite the live records into full segments (blocking).
 
-    def __init__(self, table_name: str):
+        Runs once ``threshold`` of the rows and deletes are dead, or there
+        are more than ``max_segments`` segments. The new segments and
+        manifest are written before the old segments are deleted, so a
+        failed compaction leaves the store as it was.
         """
-        Initialize DynamoDB storage.
+        started = time.perf_counter()
+        with self._write_lock:
+            with self._lock:
+                segments = list(self._segments.values())
+                report = CompactionReport(
+                    compacted=False,
+                    records=len(self._locations),
+                    deleted_ratio=self._deleted_ratio(),
+                    free_page_ratio=0.0,
+                    bytes_before=sum(segment.size for segment in segments),
+                    bytes_after=sum(segment.size for segment in segments),
+                )
+                live = [
+                    (segment, np.flatnonzero(segment.alive)) for segment in segments
+                ]
+            if not force and (
+                report.deleted_ratio < threshold and len(segments) <= self.max_segments
+            ):
+                return report
+
+            sequence = self._manifest["next_segment"]
+            written: List[Tuple[Dict[str, Any], bytes]] = []
+            batch: Dict[str, List[Any]] = defaultdict(list)
+
+            def flush() -> None:
+                nonlocal sequence
+                data, index_bytes = _pack_segment(
+                    batch["ids"],
+                    batch["payloads"],
+                    batch["facets"],
+                    np.stack(batch["vectors"]),
+                    [],
+                )
+                key = f"{self.prefix}segments/{sequence:08d}-{uuid4().hex[:8]}.seg"
+                self._put_object(key, data)
+                written.append(
+                    (
+                        {
+                            "key": key,
+                            "records": len(batch["ids"]),
+                            "deletes": 0,
+                            "bytes": len(data),
+                            "index_bytes": index_bytes,
+                        },
+                        data,
+                    )
+                )
+                sequence += 1
+                batch.clear()
+
+            for segment, rows in live:
+                if len(rows) == 0:
+                    continue
+                data = self._segment_data(segment)
+                vectors = self._segment_vectors(segment, data)
+                for row in rows:
+                    start, end = segment.payload_range(row)
+                    batch["ids"].append(segment.ids[row])
+                    batch["payloads"].append(data[start:end].tobytes())
+                    batch["facets"].append(segment.facets[row])
+                    batch["vectors"].append(np.array(vectors[row]))
+                    if len(batch["ids"]) >= self.segment_records:
+                        flush()
+            if batch["ids"]:
+                flush()
+
+            manifest = {
+                **self._manifest,
+                "next_segment": sequence,
+                "segments": [entry for entry, _ in written],
+            }
+            self._put_object(self._manifest_key, json.dumps(manifest).encode("utf-8"))
+            self._manifest = manifest
+
+            loaded = []
+            for entry, data in written:
+                self.cache.put(self._cache_name(entry["key"]), data)
+                loaded.append(self._load_segment(entry, data))
+            with self._lock:
+                self._segments = {}
+                self._locations = {}
+                self._dead_rows = 0
+                self._tombstones = 0
+            for segment in loaded:
+                self._apply(segment)
+            self._compactions += 1
+            # Searches started before the swap may still read the old
+            # segments from the cache
+            for segment in segments:
+                self._delete_object(segment.key)
+
+        report.compacted = True
+        report.bytes_after = sum(entry["bytes"] for entry, _ in written)
+        report.bytes_reclaimed = max(report.bytes_before - report.bytes_after, 0)
+        report.duration_seconds = time.perf_counter() - started
+        return report
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics, including S3 request counts per operation."""
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "backend": "s3",
+                "bucket": self.bucket_name,
+                "prefix": self.prefix,
+                "records": len(self._locations),
+                "segments": len(self._segments),
+                "segment_bytes": sum(s.size for s in self._segments.values()),
+                "deleted_ratio": self._deleted_ratio(),
+                "compactions": self._compactions,
+                "lexical_index_built": self._lexical is not None,
+            }
+        stats["requests"] = self._requests.metrics()
+        stats["cache"] = self.cache.metrics()
+        if self._read_executor is not None:
+            stats["read_executor"] = self._read_executor.metrics()
+        if self._write_executor is not None:
+            stats["write_executor"] = self._write_executor.metrics()
+        if self.embedding_cache is not None:
+            stats["embedding_cache"] = self.embedding_cache.metrics()
+        return stats
+
+    async def close(self) -> None:
+        """Wait for in-flight calls, then shut down the thread pools."""
+        for executor in (self._write_executor, self._read_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
+
+
+class DynamoDBStorage(StorageInterface):
+    """DynamoDB-backed error record storage with a co-located vector index."""
+
+    def __init__(
+        self,
+        table_name: str,
+        client: Optional[Any] = None,
+        endpoint_url: Optional[str] = None,
+        region_name: Optional[str] = None,
+        index_directory: Optional[str] = None,
+        create_table: bool = True,
+        read_workers: int = 0,
+        write_workers: int = 0,
+        embedding_function: Optional[Callable[[List[str]], Any]] = None,
+        embedding_cache_size: int = 0,
+        rescore_factor: int = 4,
+    ):
+        """
+        Open the store in a table, creating the table if needed.
+
+        Opening scans the facet fields of every item to fill the facet
+        index, and reconciles the local vector index with the table: every
+        vector is loaded into an empty index, otherwise only the missing
+        ones are fetched and stale ones dropped.
 
         Args:
             table_name: DynamoDB table name
+            client: A boto3 DynamoDB client (defaults to the shared one)
+            endpoint_url: DynamoDB-compatible endpoint, such as DynamoDB
+                Local, for the default client
+            region_name: Region of the default client
+            index_directory: Directory of the local vector indexes, one per
+                table (defaults to one in the system temporary directory)
+            create_table: Create the table and its indexes if it is missing
+            read_workers: Thread pool size for reads (0 runs reads inline)
+            write_workers: Thread pool size for writes (0 runs writes inline)
+            embedding_function: Embedding function for documents and queries
+                (defaults to ChromaDB's default model)
+            embedding_cache_size: Vectors kept in the embedding cache (0
+                disables it)
+            rescore_factor: Candidates re-scored per requested result by
+                the local vector index; 0 keeps no full-precision vectors
+
+        Raises:
+            ImportError: If no client is given and boto3 is not installed
+            ValueError: If the table is missing and ``create_table`` is
+                False, or the store was embedded with another embedder
         """
+        self.client = client or shared_client(
+            "dynamodb", endpoint_url=endpoint_url, region_name=region_name
+        )
         self.table_name = table_name
-        # In a real implementation, you would initialize boto3 resource here
+        self.index_directory = os.path.join(
+            index_directory
+            or os.path.join(tempfile.gettempdir(), "tribal-dynamodb-index"),
+            table_name,
+        )
+        self.rescore_factor = rescore_factor
+
+        # Requests per storage operation and DynamoDB request kind
+        self._requests = RequestCounter()
+
+        self._dim: Optional[int] = None
+        self._facets = FacetIndex()
+        self._lexical: Optional[BM25Index] = None
+        self._lexical_lock = threading.Lock()
+        self._snapshots = RankingSnapshots()
+        self.vector_index: Optional[QuantizedVectorIndex] = None
+
+        self._generation = 0
+        # Serializes writes, which update the table and then the local indexes
+        self._write_lock = threading.Lock()
+        self._read_executor = (
+            StorageExecutor(read_workers, name="read") if read_workers > 0 else None
+        )
+        self._write_executor = (
+            StorageExecutor(write_workers, name="write") if write_workers > 0 else None
+        )
+
+        if embedding_function is None:
+            embedding_function = create_embedding_function()
+        self.embedding_model_id = embedding_model_id(embedding_function)
+        self._requests.run(self._open_sync, create_table)
+
+        self.embedding_cache: Optional[CachedEmbeddingFunction] = None
+        if embedding_cache_size > 0:
+            self.embedding_cache = CachedEmbeddingFunction(
+                embedding_function, max_entries=embedding_cache_size
+            )
+            embedding_function = self.embedding_cache
+        self.embedding_function = embedding_function
+
+    def _call(self, operation: str, **kwargs: Any) -> Any:
+        """Send a DynamoDB request, counting it under the running operation."""
+        self._requests.count(operation)
+        return getattr(self.client, operation)(**kwargs)
+
+    def _open_sync(self, create_table: bool) -> None:
+        """Open or create the table, then load the local indexes (blocking).
+
+        Raises:
+            ValueError: If the table is missing and may not be created, or
+                the store was embedded with another embedder
+        """
+        try:
+            self._call("describe_table", TableName=self.table_name)
+        except self.client.exceptions.ResourceNotFoundException:
+            if not create_table:
+                raise ValueError(
+                    f"DynamoDB table {self.table_name} does not exist"
+                ) from None
+            self._create_table()
+
+        meta = self._call(
+            "get_item",
+            TableName=self.table_name,
+            Key=_key(META_ID),
+            ConsistentRead=True,
+        ).get("Item")
+        if meta is not None:
+            recorded = meta["embedding_model"]["S"]
+            if recorded != self.embedding_model_id:
+                raise ValueError(
+                    f"Embedding function mismatch: the store was embedded with "
+                    f"{recorded}, but {self.embedding_model_id} is configured. "
+                    f"Configure the original embedder, or export and re-import "
+                    f"the records to re-embed them."
+                )
+            self._dim = int(meta["dim"]["N"])
+
+        try:
+            self.vector_index = QuantizedVectorIndex(
+                self.index_directory, self._dim, self.rescore_factor
+            )
+        except ValueError:
+            # An index of another dimension was built for an older table of
+            # the same name
+            shutil.rmtree(self.index_directory)
+            self.vector_index = QuantizedVectorIndex(
+                self.index_directory, self._dim, self.rescore_factor
+            )
+        self._sync_indexes()
+
+    def _create_table(self) -> None:
+        """Create the table with an index per facet field, and wait for it.
+
+        Each index is keyed by its field and the record ID, and projects the
+        record and the other facet fields, so a filtered listing is served
+        from one index in ID order. Items without a value for a field, such
+        as records without a framework, are left out of its index.
+        """
+        self._call(
+            "create_table",
+            TableName=self.table_name,
+            AttributeDefinitions=[
+                {"AttributeName": name, "AttributeType": "S"}
+                for name in ("id", *FACET_FIELDS)
+            ],
+            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": _index_name(field),
+                    "KeySchema": [
+                        {"AttributeName": field, "KeyType": "HASH"},
+                        {"AttributeName": "id", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {
+                        "ProjectionType": "INCLUDE",
+                        "NonKeyAttributes": [
+                            "record",
+                            *(other for other in FACET_FIELDS if other != field),
+                        ],
+                    },
+                }
+                for field in FACET_FIELDS
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        self.client.get_waiter("table_exists").wait(TableName=self.table_name)
+        logger.info(f"Created DynamoDB table {self.table_name}")
+
+    def _sync_indexes(self) -> None:
+        """Fill the facet index and reconcile the vector index (blocking).
+
+        A crash between a table write and the index write, or another
+        process writing the table, leaves the vector index out of step;
+        missing vectors are fetched from the table and stale ones dropped.
+        """
+        load_vectors = len(self.vector_index) == 0
+        attributes = list(FACET_FIELDS) + (["vector"] if load_vectors else [])
+        stored = set()
+        for items in self._scan(attributes):
+            ids = [item["id"]["S"] for item in items]
+            stored.update(ids)
+            self._facets.add(ids, [_item_facets(item) for item in items])
+            if load_vectors and items:
+                self.vector_index.add(ids, [_item_vector(item) for item in items])
+
+        indexed = set(self.vector_index.ids())
+        stale = indexed - stored
+        missing = sorted(stored - indexed)
+        if stale:
+            self.vector_index.remove(stale)
+        for start in range(0, len(missing), BATCH_GET_ITEMS):
+            items = self._batch_get(
+                missing[start : start + BATCH_GET_ITEMS], ["vector"]
+            )
+            self.vector_index.add(
+                list(items), [_item_vector(item) for item in items.values()]
+            )
+        if stale or missing:
+            logger.warning(
+                f"Local vector index repaired: {len(missing)} vectors added, "
+                f"{len(stale)} removed"
+            )
+
+    def _scan_page(
+        self,
+        attributes: Sequence[str],
+        start_key: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Scan a page of items, projecting their ID and some attributes.
+
+        Returns:
+            The record items of the page, and the key to resume after or
+            None on the last page
+        """
+        names = {"#id": "id", **{f"#a{n}": a for n, a in enumerate(attributes)}}
+        kwargs: Dict[str, Any] = {
+            "TableName": self.table_name,
+            "ProjectionExpression": ", ".join(names),
+            "ExpressionAttributeNames": names,
+        }
+        if start_key is not None:
+            kwargs["ExclusiveStartKey"] = start_key
+        if limit is not None:
+            kwargs["Limit"] = limit
+        response = self._call("scan", **kwargs)
+        items = [item for item in response["Items"] if item["id"]["S"] != META_ID]
+        return items, response.get("LastEvaluatedKey")
+
+    def _scan(self, attributes: Sequence[str]) -> Iterator[List[Dict[str, Any]]]:
+        """Scan every record item, one page at a time."""
+        start_key = None
+        while True:
+            items, start_key = self._scan_page(attributes, start_key)
+            yield items
+            if start_key is None:
+                return
+
+    def _send_batch(
+        self, operation: str, request_items: Dict[str, Any], unprocessed_key: str
+    ) -> List[Dict[str, Any]]:
+        """Send a batch request, resending its unprocessed part with backoff.
+
+        DynamoDB processes part of a batch when it throttles, and returns
+        the rest to be sent again.
+
+        Returns:
+            The response of every attempt
+
+        Raises:
+            RuntimeError: If items are still unprocessed after BATCH_ATTEMPTS
+        """
+        responses = []
+        attempt = 0
+        while True:
+            response = self._call(operation, RequestItems=request_items)
+            responses.append(response)
+            request_items = response.get(unprocessed_key) or {}
+            if not request_items:
+                return responses
+            attempt += 1
+            if attempt >= BATCH_ATTEMPTS:
+                raise RuntimeError(
+                    f"DynamoDB {operation} left items unprocessed after "
+                    f"{BATCH_ATTEMPTS} attempts"
+                )
+            time.sleep(BATCH_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+    def _batch_write(self, requests: Sequence[Dict[str, Any]]) -> None:
+        """Write items in batches of BATCH_WRITE_ITEMS (blocking)."""
+        for start in range(0, len(requests), BATCH_WRITE_ITEMS):
+            self._send_batch(
+                "batch_write_item",
+                {self.table_name: list(requests[start : start + BATCH_WRITE_ITEMS])},
+                "UnprocessedItems",
+            )
+
+    def _batch_get(
+        self,
+        ids: Sequence[str],
+        attributes: Sequence[str],
+        consistent: bool = False,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get items in batches of BATCH_GET_ITEMS (blocking).
+
+        Args:
+            ids: Record IDs; repeated IDs are fetched once
+            attributes: Attributes to project besides the ID
+            consistent: Use strongly consistent reads
+
+        Returns:
+            The items found, by ID
+        """
+        names = {"#id": "id", **{f"#a{n}": a for n, a in enumerate(attributes)}}
+        unique = list(dict.fromkeys(ids))
+        items = {}
+        for start in range(0, len(unique), BATCH_GET_ITEMS):
+            request = {
+                "Keys": [_key(i) for i in unique[start : start + BATCH_GET_ITEMS]],
+                "ProjectionExpression": ", ".join(names),
+                "ExpressionAttributeNames": names,
+                "ConsistentRead": consistent,
+            }
+            for response in self._send_batch(
+                "batch_get_item", {self.table_name: request}, "UnprocessedKeys"
+            ):
+                for item in response["Responses"].get(self.table_name, []):
+                    items[item["id"]["S"]] = item
+        return items
+
+    def _get_records(self, ids: Sequence[str]) -> Dict[str, ErrorRecord]:
+        """Get the stored records with the given IDs, by ID (blocking)."""
+        return {
+            record_id: ErrorRecord.model_validate_json(item["record"]["S"])
+            for record_id, item in self._batch_get(ids, ["record"]).items()
+        }
+
+    def _get_found(self, ids: Sequence[str]) -> List[ErrorRecord]:
+        """Get the stored records with the given IDs, skipping missing ones."""
+        records = self._get_records(ids)
+        return [records[i] for i in ids if i in records]
+
+    async def _read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking read on the read pool, or inline if there is none."""
+        if self._read_executor is None:
+            return self._requests.run(fn, *args)
+        return await self._read_executor.run(self._requests.run, fn, *args)
+
+    async def _write(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking write on the write pool, or inline if there is none."""
+        return await self._on_write_pool(self._locked_write, fn, *args)
+
+    async def _on_write_pool(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call on the write pool, or inline if there is none."""
+        if self._write_executor is None:
+            return fn(*args)
+        return await self._write_executor.run(fn, *args)
+
+    def _locked_write(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking write after the ones before it have finished."""
+        with self._write_lock:
+            result = self._requests.run(fn, *args)
+            self._generation += 1
+            return result
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into normalized float32 rows (blocking)."""
+        return _normalize(self.embedding_function(texts))
+
+    def _check_dim(self, vectors: np.ndarray) -> None:
+        """Check that vectors match the dimension of the stored ones.
+
+        Raises:
+            ValueError: If the dimensions differ
+        """
+        if self._dim is not None and vectors.shape[1] != self._dim:
+            raise ValueError(
+                f"Embedding dimension mismatch: got {vectors.shape[1]}, "
+                f"the store holds {self._dim}"
+            )
+
+    def _record_dim(self, dim: int) -> None:
+        """Record the embedder and dimension before the first record is written."""
+        if self._dim is not None:
+            return
+        self._call(
+            "put_item",
+            TableName=self.table_name,
+            Item={
+                **_key(META_ID),
+                "embedding_model": {"S": self.embedding_model_id},
+                "dim": {"N": str(dim)},
+            },
+        )
+        self._dim = dim
+
+    def _index(self, errors: Sequence[ErrorRecord], vectors: np.ndarray) -> None:
+        """Add written records to the local indexes (caller holds the write lock)."""
+        ids = [str(error.id) for error in errors]
+        self.vector_index.add(ids, vectors)
+        self._facets.add(
+            ids, [dict(zip(FACET_FIELDS, _facet_values(error))) for error in errors]
+        )
+        with self._lexical_lock:
+            if self._lexical is not None:
+                self._lexical.remove(ids)
+                self._lexical.add(ids, [embedding_text(error) for error in errors])
+
+    def _unindex(self, ids: Sequence[str]) -> None:
+        """Drop deleted records from the local indexes (caller holds the write lock)."""
+        self.vector_index.remove(ids)
+        self._facets.remove(ids)
+        with self._lexical_lock:
+            if self._lexical is not None:
+                self._lexical.remove(ids)
 
     async def add_error(self, error: ErrorRecord) -> ErrorRecord:
         """Add a new error record to storage."""
-        raise NotImplementedError("DynamoDBStorage is not yet implemented")
+        return await self._write(self._add_error_sync, error)
+
+    def _add_error_sync(self, error: ErrorRecord) -> ErrorRecord:
+        """Add a new error record with a conditional put (blocking).
+
+        Raises:
+            ValueError: If a record with the same ID is already stored
+        """
+        vectors = self._embed([embedding_text(error)])
+        self._check_dim(vectors)
+        self._record_dim(vectors.shape[1])
+        try:
+            self._call(
+                "put_item",
+                TableName=self.table_name,
+                Item=_item(error, vectors[0]),
+                ConditionExpression="attribute_not_exists(#id)",
+                ExpressionAttributeNames={"#id": "id"},
+            )
+        except self.client.exceptions.ConditionalCheckFailedException:
+            raise ValueError(f"Error record already exists: {error.id}") from None
+        self._index([error], vectors)
+        return error
+
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """Add several error records with batched writes."""
+        return await self._write(self._add_errors_sync, errors)
+
+    async def add_errors_with_embeddings(
+        self, errors: List[ErrorRecord], embeddings: Sequence[Optional[List[float]]]
+    ) -> List[BatchItemResult]:
+        """Add several error records with batched writes, storing their embeddings."""
+        return await self._write(self._add_errors_sync, errors, embeddings)
+
+    def _add_errors_sync(
+        self,
+        errors: List[ErrorRecord],
+        embeddings: Optional[Sequence[Optional[List[float]]]] = None,
+    ) -> List[BatchItemResult]:
+        """Add several error records with batched writes (blocking).
+
+        Stored IDs are looked up with consistent batched reads first, since
+        a batched put overwrites items unconditionally. Records whose ID is
+        repeated in the batch or already stored are reported as failures,
+        as are records given an embedding of another dimension. Records
+        given an embedding are not re-embedded.
+        """
+        existing = self._batch_get([str(e.id) for e in errors], [], consistent=True)
+        results: Dict[int, BatchItemResult] = {}
+        pending: Dict[int, ErrorRecord] = {}
+        seen = set()
+        for index, error in enumerate(errors):
+            record_id = str(error.id)
+            if record_id in seen or record_id in existing:
+                results[index] = BatchItemResult(
+                    index=index,
+                    id=error.id,
+                    success=False,
+                    error=(
+                        "Duplicate ID in batch"
+                        if record_id in seen
+                        else "Error record already exists"
+                    ),
+                )
+                continue
+            seen.add(record_id)
+            pending[index] = error
+
+        vectors: Dict[int, np.ndarray] = {}
+        if embeddings is not None:
+            for index in pending:
+                if embeddings[index]:
+                    vectors[index] = _normalize([embeddings[index]])[0]
+        missing = [index for index in pending if index not in vectors]
+        if missing:
+            embedded = self._embed([embedding_text(pending[i]) for i in missing])
+            vectors.update(zip(missing, embedded))
+
+        dim = self._dim or (len(vectors[min(vectors)]) if vectors else 0)
+        accepted = []
+        for index, error in pending.items():
+            if len(vectors[index]) != dim:
+                results[index] = BatchItemResult(
+                    index=index,
+                    id=error.id,
+                    success=False,
+                    error=f"Embedding dimension mismatch: got "
+                    f"{len(vectors[index])}, the store holds {dim}",
+                )
+                continue
+            accepted.append(index)
+            results[index] = BatchItemResult(index=index, id=error.id, success=True)
+        if accepted:
+            self._record_dim(dim)
+            self._batch_write(
+                [
+                    {"PutRequest": {"Item": _item(pending[index], vectors[index])}}
+                    for index in accepted
+                ]
+            )
+            self._index(
+                [pending[index] for index in accepted],
+                np.stack([vectors[index] for index in accepted]),
+            )
+        return [results[index] for index in range(len(errors))]
 
     async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
         """Retrieve an error record by ID."""
-        raise NotImplementedError("DynamoDBStorage is not yet implemented")
+        return await self._read(self._get_error_sync, str(error_id))
+
+    def _get_error_sync(self, record_id: str) -> Optional[ErrorRecord]:
+        """Retrieve an error record by ID with a consistent read (blocking)."""
+        item = self._call(
+            "get_item",
+            TableName=self.table_name,
+            Key=_key(record_id),
+            ProjectionExpression="#record",
+            ExpressionAttributeNames={"#record": "record"},
+            ConsistentRead=True,
+        ).get("Item")
+        return (
+            None
+            if item is None
+            else ErrorRecord.model_validate_json(item["record"]["S"])
+        )
+
+    async def get_errors(self, error_ids: List[UUID]) -> List[Optional[ErrorRecord]]:
+        """Retrieve several error records by ID with batched reads."""
+        return await self._read(self._get_errors_sync, [str(i) for i in error_ids])
+
+    def _get_errors_sync(self, ids: List[str]) -> List[Optional[ErrorRecord]]:
+        """Retrieve error records by ID (blocking)."""
+        records = self._get_records(ids)
+        return [records.get(record_id) for record_id in ids]
+
+    async def iter_errors(self, batch_size: int = 500) -> AsyncIterator[ErrorRecord]:
+        """Iterate over every stored error record, one scan page at a time."""
+        async for record, _ in self._iter_rows(batch_size, include_embeddings=False):
+            yield record
+
+    async def iter_errors_with_embeddings(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over every stored error record with its stored vector."""
+        async for record, embedding in self._iter_rows(
+            batch_size, include_embeddings=True
+        ):
+            yield record, embedding
+
+    async def _iter_rows(
+        self, batch_size: int, include_embeddings: bool
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over the stored records with a paginated scan."""
+        start_key = None
+        while True:
+            rows, start_key = await self._read(
+                self._iter_rows_sync, start_key, max(batch_size, 1), include_embeddings
+            )
+            for row in rows:
+                yield row
+            if start_key is None:
+                return
+
+    def _iter_rows_sync(
+        self,
+        start_key: Optional[Dict[str, Any]],
+        batch_size: int,
+        include_embeddings: bool,
+    ) -> Tuple[
+        List[Tuple[ErrorRecord, Optional[List[float]]]], Optional[Dict[str, Any]]
+    ]:
+        """Scan a page of records, with their vectors (blocking)."""
+        attributes = ["record", "vector"] if include_embeddings else ["record"]
+        items, start_key = self._scan_page(attributes, start_key, batch_size)
+        rows = [
+            (
+                ErrorRecord.model_validate_json(item["record"]["S"]),
+                _item_vector(item).tolist() if include_embeddings else None,
+            )
+            for item in items
+        ]
+        return rows, start_key
 
     async def update_error(
         self, error_id: UUID, error: ErrorRecord
     ) -> Optional[ErrorRecord]:
         """Update an existing error record."""
-        raise NotImplementedError("DynamoDBStorage is not yet implemented")
+        return await self._write(self._update_error_sync, error_id, error)
+
+    def _update_error_sync(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record with a conditional put (blocking)."""
+        stored = self._get_error_sync(str(error_id))
+        if stored is None:
+            return None
+
+        # Keep the ID and creation time of the stored record
+        error.id = error_id
+        error.created_at = stored.created_at
+        vectors = self._embed([embedding_text(error)])
+        self._check_dim(vectors)
+        try:
+            self._call(
+                "put_item",
+                TableName=self.table_name,
+                Item=_item(error, vectors[0]),
+                ConditionExpression="attribute_exists(#id)",
+                ExpressionAttributeNames={"#id": "id"},
+            )
+        except self.client.exceptions.ConditionalCheckFailedException:
+            # Deleted by another process since it was read
+            return None
+        self._index([error], vectors)
+        return error
 
     async def delete_error(self, error_id: UUID) -> bool:
         """Delete an error record by ID."""
-        raise NotImplementedError("DynamoDBStorage is not yet implemented")
+        return await self._write(self._delete_error_sync, error_id)
+
+    def _delete_error_sync(self, error_id: UUID) -> bool:
+        """Delete an error record by ID (blocking)."""
+        response = self._call(
+            "delete_item",
+            TableName=self.table_name,
+            Key=_key(str(error_id)),
+            ReturnValues="ALL_OLD",
+        )
+        self._unindex([str(error_id)])
+        return "Attributes" in response
+
+    def _query_page(
+        self, filters: Dict[str, str], after: Optional[str], limit: int
+    ) -> List[ErrorRecord]:
+        """List the records matching metadata filters in ID order (blocking).
+
+        The secondary index of the most selective filter is queried, with
+        the other filters applied by DynamoDB, so only matching records are
+        returned; without filters, the IDs come from the facet index and
+        the records from batched reads.
+
+        Args:
+            filters: Facet field values to match
+            after: Only return records with greater IDs (None from the start)
+            limit: Maximum number of records
+        """
+        if not filters:
+            return self._get_found(self._facets.page({}, after, limit))
+
+        field = min(filters, key=lambda f: len(self._facets.match({f: filters[f]})))
+        names = {"#id": "id", "#record": "record", "#key": field}
+        values = {":key": {"S": filters[field]}}
+        condition = "#key = :key"
+        if after is not None:
+            condition += " AND #id > :after"
+            values[":after"] = {"S": after}
+        kwargs: Dict[str, Any] = {
+            "TableName": self.table_name,
+            "IndexName": _index_name(field),
+            "KeyConditionExpression": condition,
+            "ProjectionExpression": "#id, #record",
+            "ExpressionAttributeNames": names,
+            "ExpressionAttributeValues": values,
+            "Limit": limit,
+        }
+        others = [f for f in filters if f != field]
+        for n, other in enumerate(others):
+            names[f"#f{n}"] = other
+            values[f":f{n}"] = {"S": filters[other]}
+        if others:
+            kwargs["FilterExpression"] = " AND ".join(
+                f"#f{n} = :f{n}" for n in range(len(others))
+            )
+
+        records: List[ErrorRecord] = []
+        while len(records) < limit:
+            response = self._call("query", **kwargs)
+            records.extend(
+                ErrorRecord.model_validate_json(item["record"]["S"])
+                for item in response["Items"]
+            )
+            if "LastEvaluatedKey" not in response:
+                break
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        return records[:limit]
+
+    def _vector_search(
+        self, queries: np.ndarray, limit: int, filters: Dict[str, str]
+    ) -> List[List[Tuple[str, float]]]:
+        """Find the records most similar to each query in the local vector index."""
+        self._check_dim(queries)
+        allowed = self._facets.match(filters) if filters else None
+        return self.vector_index.search(queries, limit, allowed)
+
+    def _lexical_index(self) -> BM25Index:
+        """Get the BM25 index, building it from a scan of the table on first use.
+
+        Writes keep the index up to date once it is built, so stores that
+        only serve similarity searches never scan the records.
+        """
+        with self._lexical_lock:
+            if self._lexical is None:
+                index = BM25Index()
+                for items in self._scan(["record"]):
+                    index.add(
+                        [item["id"]["S"] for item in items],
+                        [
+                            embedding_text(
+                                ErrorRecord.model_validate_json(item["record"]["S"])
+                            )
+                            for item in items
+                        ],
+                    )
+                self._lexical = index
+            return self._lexical
+
+    def _ranked_ids_sync(
+        self,
+        text: str,
+        max_results: int,
+        mode: SearchMode,
+        filters: Dict[str, str],
+    ) -> List[str]:
+        """Rank record IDs by vector, lexical or hybrid relevance (blocking).
+
+        Hybrid ranking fuses the lexical and vector rankings with reciprocal
+        rank fusion.
+        """
+        depth = max_results
+        if mode == SearchMode.HYBRID:
+            depth = max_results * HYBRID_CANDIDATE_FACTOR
+
+        rankings = []
+        if mode != SearchMode.VECTOR:
+            allowed = self._facets.match(filters) if filters else None
+            matches = self._lexical_index().search(text, depth, allowed)
+            rankings.append([record_id for record_id, _ in matches])
+        if mode != SearchMode.LEXICAL:
+            matches = self._vector_search(self._embed([text]), depth, filters)[0]
+            rankings.append([record_id for record_id, _ in matches])
+        if len(rankings) == 1:
+            return rankings[0]
+        return reciprocal_rank_fusion(rankings)[:max_results]
 
     async def search_errors(self, query: ErrorQuery) -> List[ErrorRecord]:
         """Search for error records based on the provided query."""
-        raise NotImplementedError("DynamoDBStorage is not yet implemented")
+        return await self._read(self._search_errors_sync, query)
+
+    def _search_errors_sync(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query (blocking).
+
+        Without search text, the records matching the metadata filters are
+        returned in ID order by a query of a secondary index.
+        """
+        if query.cursor:
+            return self._search_errors_page_sync(query).records
+
+        filters = query_filters(query)
+        search_text = query_text(query)
+        if not search_text:
+            return self._query_page(filters, None, query.max_results)
+        return self._get_found(
+            self._ranked_ids_sync(search_text, query.max_results, query.mode, filters)
+        )
+
+    async def search_errors_page(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time."""
+        return await self._read(self._search_errors_page_sync, query)
+
+    def _search_errors_page_sync(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time (blocking).
+
+        Metadata-only listings resume the index query after the last ID of
+        the previous page. Ranked searches snapshot the ranked IDs on the
+        first page and slice the snapshot on later pages.
+
+        Raises:
+            ValueError: If the cursor is invalid or has expired
+        """
+        filters = query_filters(query)
+        search_text = query_text(query)
+        page_size = query.max_results
+        position = decode_cursor(query)
+        next_position: Optional[Dict[str, Any]] = None
+        try:
+            if not search_text:
+                after = position["after"] if position else None
+                records = self._query_page(filters, after, page_size + 1)
+                if len(records) > page_size:
+                    records = records[:page_size]
+                    next_position = {"after": str(records[-1].id)}
+            else:
+                if position is None:
+                    ranked = self._ranked_ids_sync(
+                        search_text, snapshot_depth(page_size), query.mode, filters
+                    )
+                    offset, token = 0, None
+                else:
+                    token, offset = position["snapshot"], position["offset"]
+                    ranked = self._snapshots.get(token)
+                # Records deleted since the snapshot was taken are skipped
+                records = self._get_found(ranked[offset : offset + page_size])
+                if offset + page_size < len(ranked):
+                    if token is None:
+                        token = self._snapshots.put(ranked)
+                    next_position = {"snapshot": token, "offset": offset + page_size}
+        except (KeyError, TypeError):
+            raise ValueError("Invalid cursor") from None
+
+        return ErrorPage(
+            records=records,
+            next_cursor=encode_cursor(query, next_position) if next_position else None,
+        )
 
     async def search_similar(
         self, text_query: str, max_results: int = 5
     ) -> List[ErrorRecord]:
         """Search for error records with similar text content."""
-        raise NotImplementedError("DynamoDBStorage is not yet implemented")
+        return (await self.search_similar_many([text_query], max_results))[0]
+
+    async def search_similar_many(
+        self, text_queries: List[str], max_results: int = 5
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts, reading the hits in batches."""
+        return await self._read(
+            self._search_similar_many_sync, text_queries, max_results
+        )
+
+    def _search_similar_many_sync(
+        self, text_queries: List[str], max_results: int
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts (blocking)."""
+        if not text_queries:
+            return []
+        ranked = self._vector_search(self._embed(list(text_queries)), max_results, {})
+        records = self._get_records([i for matches in ranked for i, _ in matches])
+        return [[records[i] for i, _ in matches if i in records] for matches in ranked]
+
+    async def facet_counts(
+        self, filters: Optional[Dict[str, str]] = None
+    ) -> FacetCounts:
+        """Count the records per error type, language and framework."""
+        total, facets = self._facets.counts(filters)
+        return FacetCounts(total=total, facets=facets)
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every committed add, update and delete."""
+        return self._generation
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        """Identify the embedder that produced the stored vectors."""
+        return self.embedding_model_id
+
+    def _index_bytes(self) -> int:
+        """Get the size of the local vector index files."""
+        metrics = self.vector_index.metrics()
+        return metrics["quantized_bytes"] + metrics["full_precision_bytes"]
+
+    async def compact(
+        self, threshold: float = DEFAULT_COMPACTION_THRESHOLD, force: bool = False
+    ) -> CompactionReport:
+        """Compact the local vector index if enough of it was removed."""
+        return await self._on_write_pool(self._compact_sync, threshold, force)
+
+    def _compact_sync(self, threshold: float, force: bool) -> CompactionReport:
+        """Compact the local vector index (blocking).
+
+        DynamoDB reclaims the space of deleted items itself, so only the
+        rows freed in the local vector index are rewritten.
+        """
+        started = time.perf_counter()
+        with self._write_lock:
+            bytes_before = self._index_bytes()
+            report = CompactionReport(
+                compacted=False,
+                records=len(self.vector_index),
+                deleted_ratio=self.vector_index.deleted_ratio(),
+                free_page_ratio=0.0,
+                bytes_before=bytes_before,
+                bytes_after=bytes_before,
+            )
+            if not force and report.deleted_ratio < threshold:
+                return report
+            self.vector_index.compact()
+            report.bytes_after = self._index_bytes()
+        report.compacted = True
+        report.bytes_reclaimed = max(report.bytes_before - report.bytes_after, 0)
+        report.duration_seconds = time.perf_counter() - started
+        return report
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics, including DynamoDB request counts per operation."""
+        stats: Dict[str, Any] = {
+            "backend": "dynamodb",
+            "table": self.table_name,
+            "records": len(self._facets),
+            "lexical_index_built": self._lexical is not None,
+            "requests": self._requests.metrics(),
+            "quantized_index": self.vector_index.metrics(),
+        }
+        if self._read_executor is not None:
+            stats["read_executor"] = self._read_executor.metrics()
+        if self._write_executor is not None:
+            stats["write_executor"] = self._write_executor.metrics()
+        if self.embedding_cache is not None:
+            stats["embedding_cache"] = self.embedding_cache.metrics()
+        return stats
+
+    async def close(self) -> None:
+        """Wait for in-flight calls, then shut down the thread pools."""
+        for executor in (self._write_executor, self._read_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
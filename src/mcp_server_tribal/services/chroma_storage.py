@@ -12,119 +12,924 @@
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional, Tuple
+import shutil
+import sqlite3
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 from uuid import UUID
 
 import chromadb
+from chromadb.api.types import Documents, EmbeddingFunction
 
-from ..models.error_record import ErrorQuery, ErrorRecord
-from .migration import migration_manager
-from .storage_interface import StorageInterface
+from ..models.error_record import (
+    BatchItemResult,
+    CompactionReport,
+    ErrorPage,
+    ErrorQuery,
+    ErrorRecord,
+    FacetCounts,
+    SearchMode,
+    SnapshotInfo,
+)
+from .compaction import (
+    DEFAULT_COMPACTION_THRESHOLD,
+    directory_size,
+    median_latency_ms,
+    read_deleted_count,
+    sqlite_free_ratio,
+    vacuum_sqlite,
+    write_deleted_count,
+)
+from .dedup import error_fingerprint, merge_duplicate
+from .embedding_cache import CachedEmbeddingFunction
+from .embeddings import (
+    DEFAULT_EMBEDDING_MODEL_ID,
+    create_embedding_function,
+    embedding_model_id,
+    embedding_text,
+)
+from .executor import StorageExecutor
+from .facet_index import FacetIndex, build_where
+from .lexical_index import (
+    HYBRID_CANDIDATE_FACTOR,
+    BM25Index,
+    reciprocal_rank_fusion,
+)
+from .migration import (
+    collection_creation_metadata,
+    migration_manager,
+    update_collection_metadata,
+)
+from .pagination import (
+    RankingSnapshots,
+    decode_cursor,
+    encode_cursor,
+    snapshot_depth,
+)
+from .quantized_index import QuantizedVectorIndex
+from .snapshot import AccessGate, create_snapshot
+from .storage_interface import StorageInterface, query_filters, query_text
 from mcp_server_tribal import __version__
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Current schema version - this should be updated when the schema changes
-SCHEMA_VERSION = "1.0.0"
+SCHEMA_VERSION = "1.1.0"
+
+# Collection metadata key recording which embedder produced the vectors
+EMBEDDING_FUNCTION_KEY = "embedding_function"
+
+# Stand-in vector stored in ChromaDB when vectors live in the quantized index
+PLACEHOLDER_EMBEDDING = [1.0]
+
+# Files under the persist directory left out of snapshots: caches and the
+# write-behind journal, which are written outside the storage's write path
+SNAPSHOT_EXCLUDE = ("embedding_cache.sqlite3*", "write_behind.journal*", "*-shm")
+
+# File under the persist directory counting deletes since the last compaction
+COMPACTION_STATE_FILE = "compaction.json"
+
+# Suffix of the collection a compaction rebuilds into
+COMPACTING_SUFFIX = "__compacting"
+
+T = TypeVar("T")
 
 
 class ChromaStorage(StorageInterface):
     """ChromaDB implementation of error record storage."""
 
-    def __init__(self, persist_directory: str = "./chroma_db"):
+    def __init__(
+        self,
+        persist_directory: str = "./chroma_db",
+        read_workers: int = 0,
+        write_workers: int = 0,
+        dedup: bool = False,
+        embedding_function: Optional[EmbeddingFunction[Documents]] = None,
+        embedding_cache_size: int = 0,
+        embedding_cache_disk: bool = False,
+        quantized_vectors: bool = False,
+        rescore_factor: int = 4,
+    ):
         """
         Initialize ChromaDB storage.
 
+        ChromaDB calls are blocking. When worker counts are given, reads and
+        writes run on separate bounded thread pools so that embedding and
+        index work does not stall the event loop; with 0 they run inline.
+
         Args:
             persist_directory: Directory to store ChromaDB data
+            read_workers: Thread pool size for reads (0 runs reads inline)
+            write_workers: Thread pool size for writes (0 runs writes inline)
+            dedup: Merge repeats of a stored error instead of inserting them
+            embedding_function: Embedding function for documents and queries
+                (defaults to ChromaDB's default model); it must be the one
+                the collection was created with
+            embedding_cache_size: Vectors kept in the in-memory embedding
+                cache (0 disables the cache unless the disk tier is enabled)
+            embedding_cache_disk: Also cache vectors in a SQLite file under
+                the persist directory
+            quantized_vectors: Keep vectors in an int8 quantized index
+                instead of ChromaDB's float32 HNSW index; this uses a
+                separate collection, so existing records must be re-imported
+            rescore_factor: Candidates re-scored at full precision per
+                result in quantized mode; 0 keeps no full-precision vectors
         """
         self.persist_directory = persist_directory
+        self.dedup = dedup
+        self._duplicates_absorbed = 0
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+        # Serializes the fingerprint lookup and insert of concurrent adds
+        self._add_lock = threading.Lock()
+        # Built on the first lexical or hybrid search, then kept up to date
+        self._lexical: Optional[BM25Index] = None
+        self._lexical_lock = threading.Lock()
+        # Built on the first filtered search or facet count, then kept up to date
+        self._facets: Optional[FacetIndex] = None
+        self._facets_lock = threading.Lock()
+        self._snapshots = RankingSnapshots()
+        # Let snapshots and compactions pause writes, and compactions reads
+        self._write_gate = AccessGate()
+        self._read_gate = AccessGate()
+        self._read_executor = (
+            StorageExecutor(read_workers, name="read") if read_workers > 0 else None
+        )
+        self._write_executor = (
+            StorageExecutor(write_workers, name="write") if write_workers > 0 else None
+        )
         os.makedirs(persist_directory, exist_ok=True)
+        self._compaction_state = os.path.join(persist_directory, COMPACTION_STATE_FILE)
+        self._deleted = read_deleted_count(self._compaction_state)
+
+        if embedding_function is None:
+            embedding_function = create_embedding_function()
+        self.embedding_model_id = embedding_model_id(embedding_function)
+        self.embedding_cache: Optional[CachedEmbeddingFunction] = None
+        if embedding_cache_size > 0 or embedding_cache_disk:
+            self.embedding_cache = CachedEmbeddingFunction(
+                embedding_function,
+                max_entries=embedding_cache_size,
+                disk_path=(
+                    os.path.join(persist_directory, "embedding_cache.sqlite3")
+                    if embedding_cache_disk
+                    else None
+                ),
+            )
+            embedding_function = self.embedding_cache
+        self.embedding_function = embedding_function
+
+        self.collection_name = (
+            "error_records_int8" if quantized_vectors else "error_records"
+        )
+        self.vector_index: Optional[QuantizedVectorIndex] = None
+        if quantized_vectors:
+            self.vector_index = QuantizedVectorIndex(
+                os.path.join(persist_directory, "quantized_index"),
+                rescore_factor=rescore_factor,
+            )
 
         self.client = chromadb.PersistentClient(path=persist_directory)
+        self._recover_compaction()
         self.collection = self.client.get_or_create_collection(
-            name="error_records",
+            name=self.collection_name,
             metadata={
                 "hnsw:space": "cosine",
-                "schema_version": SCHEMA_VERSION
-            }
+                "schema_version": SCHEMA_VERSION,
+                EMBEDDING_FUNCTION_KEY: self.embedding_model_id,
+            },
+            embedding_function=self.embedding_function,
         )
+        self._validate_embedding_function()
 
         # Validate schema version on startup
         self._validate_schema_version()
 
-    def _error_to_document(self, error: ErrorRecord) -> Dict[str, Any]:
-        """Convert ErrorRecord to document format for ChromaDB."""
-        return json.loads(error.model_dump_json())
+        if self.vector_index is not None:
+            self._sync_vector_index()
+
+    def _recover_compaction(self) -> None:
+        """Finish or discard a compaction interrupted by a crash.
+
+        A rebuilt collection is complete once the original has been
+        deleted; until then it may be partial.
+        """
+        names = set(self.client.list_collections())
+        rebuilt = self.collection_name + COMPACTING_SUFFIX
+        if rebuilt not in names:
+            return
+        if self.collection_name in names:
+            logger.warning("Discarding the collection of an interrupted compaction")
+            self.client.delete_collection(rebuilt)
+        else:
+            logger.warning("Completing an interrupted compaction")
+            self.client.get_collection(rebuilt).modify(name=self.collection_name)
 
     def _document_to_error(self, document: Dict[str, Any]) -> ErrorRecord:
         """Convert document from ChromaDB to ErrorRecord."""
         return ErrorRecord.model_validate(document)
 
+    def _result_to_error(
+        self, document: Optional[str], metadata: Optional[Dict[str, Any]]
+    ) -> ErrorRecord:
+        """Convert a ChromaDB result row to ErrorRecord.
+
+        Since schema 1.1.0 the full record is kept in the ``record`` metadata
+        field and the document holds only the embedding text. Rows written by
+        older versions store the record as a JSON document.
+        """
+        if metadata and "record" in metadata:
+            return ErrorRecord.model_validate_json(metadata["record"])
+        return self._document_to_error(json.loads(document))
+
+    def _error_to_metadata(self, error: ErrorRecord) -> Dict[str, Any]:
+        """Build the ChromaDB metadata for an ErrorRecord.
+
+        Holds the filterable fields, the deduplication fingerprint and the
+        full serialized record.
+        """
+        return {
+            "error_type": error.error_type,
+            "language": error.context.language,
+            "framework": error.context.framework or "",
+            "fingerprint": error_fingerprint(error),
+            "record": error.model_dump_json(),
+        }
+
     def _create_embedding_text(self, error: ErrorRecord) -> str:
         """Create text for embedding from ErrorRecord.
 
-        Note: This method is kept for future use, but not currently used as
-        ChromaDB auto-generates embeddings from documents.
+        This text is stored as the ChromaDB document, so the vector is
+        computed over the error and solution content only, not over JSON
+        keys, IDs and timestamps.
         """
-        context_parts = [
-            error.error_type,
-            error.context.language,
-            error.context.framework or "",
-            error.context.error_message,
-            error.context.code_snippet or "",
-            error.context.task_description or "",
-        ]
+        return embedding_text(error)
+
+    async def _read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking read on the read pool, or inline if there is none."""
+        if self._read_executor is None:
+            return self._gated_read(fn, *args)
+        return await self._read_executor.run(self._gated_read, fn, *args)
+
+    def _gated_read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking read unless a compaction is swapping collections."""
+        with self._read_gate.hold():
+            return fn(*args)
+
+    async def _write(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking write on the write pool, or inline if there is none."""
+        return await self._on_write_pool(self._gated_write, fn, *args)
+
+    async def _on_write_pool(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call on the write pool, or inline if there is none."""
+        if self._write_executor is None:
+            return fn(*args)
+        return await self._write_executor.run(fn, *args)
+
+    def _gated_write(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking write unless a snapshot has paused writes."""
+        with self._write_gate.hold():
+            return fn(*args)
+
+    def _write_records(
+        self,
+        method: Callable[..., None],
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: Optional[List[List[float]]] = None,
+    ) -> None:
+        """Add or update records, embedding their documents (blocking).
+
+        ChromaDB embeds the documents itself unless vectors are kept in the
+        quantized index, in which case ChromaDB stores a placeholder vector.
+
+        Args:
+            method: ``self.collection.add`` or ``self.collection.update``
+            ids: Record IDs
+            documents: Embedding texts
+            metadatas: Record metadata
+            embeddings: Precomputed vectors of the documents, if any
+        """
+        if self.vector_index is None:
+            method(
+                ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings
+            )
+        else:
+            vectors = embeddings or self.embedding_function(documents)
+            method(
+                ids=ids,
+                documents=documents,
+                metadatas=metadatas,
+                embeddings=[PLACEHOLDER_EMBEDDING] * len(ids),
+            )
+            self.vector_index.add(ids, vectors)
+
+        with self._lexical_lock:
+            if self._lexical is not None:
+                self._lexical.add(ids, documents)
+        self._index_facets(ids, metadatas)
+
+    def _index_facets(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Record the facet values of written records, if the index is built."""
+        with self._facets_lock:
+            if self._facets is not None:
+                self._facets.add(ids, metadatas)
+
+    def _scan_collection(self, include: List[str]) -> Iterator[Dict[str, Any]]:
+        """Read the whole collection in batches of the client's batch size."""
+        batch_size = max(self.client.get_max_batch_size(), 1)
+        offset = 0
+        while True:
+            rows = self.collection.get(limit=batch_size, offset=offset, include=include)
+            if not rows["ids"]:
+                return
+            yield rows
+            offset += len(rows["ids"])
+
+    def _lexical_index(self) -> BM25Index:
+        """Get the BM25 index, building it on first use (blocking)."""
+        with self._lexical_lock:
+            if self._lexical is None:
+                index = BM25Index()
+                for rows in self._scan_collection(["documents"]):
+                    index.add(rows["ids"], rows["documents"])
+                self._lexical = index
+            return self._lexical
+
+    def _facet_index(self) -> FacetIndex:
+        """Get the facet index, building it on first use (blocking)."""
+        with self._facets_lock:
+            if self._facets is None:
+                index = FacetIndex()
+                for rows in self._scan_collection(["metadatas"]):
+                    index.add(rows["ids"], rows["metadatas"])
+                self._facets = index
+            return self._facets
+
+    def _allowed_ids(self, filters: Dict[str, str]) -> Optional[List[str]]:
+        """Resolve facet filters to the matching IDs (None without filters)."""
+        if not filters:
+            return None
+        return list(self._facet_index().match(filters))
+
+    def _ranked_ids_sync(
+        self,
+        text: str,
+        max_results: int,
+        mode: SearchMode,
+        filters: Optional[Dict[str, str]] = None,
+    ) -> List[str]:
+        """Rank record IDs by vector, lexical or hybrid relevance (blocking).
+
+        Lexical ranking uses the BM25 index only and never calls the
+        embedding model. Hybrid ranking fuses the lexical and vector
+        rankings with reciprocal rank fusion.
+        """
+        if mode == SearchMode.VECTOR:
+            return self._vector_ids_sync(text, max_results, filters)
+
+        depth = max_results
+        if mode == SearchMode.HYBRID:
+            depth = max_results * HYBRID_CANDIDATE_FACTOR
+        allowed = self._allowed_ids(filters or {})
+
+        lexical = [i for i, _ in self._lexical_index().search(text, depth, allowed)]
+        if mode == SearchMode.LEXICAL:
+            return lexical
+
+        vector = self._vector_ids_sync(text, depth, filters)
+        return reciprocal_rank_fusion([vector, lexical])[:max_results]
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts with the storage's embedder.
+
+        Args:
+            texts: The texts to embed
 
-        solution_parts = [
-            error.solution.description,
-            error.solution.code_fix or "",
-            error.solution.explanation,
+        Returns:
+            One vector per text
+        """
+        return await self._read(self._embed_sync, texts)
+
+    def _embed_sync(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts (blocking)."""
+        return [list(map(float, vector)) for vector in self.embedding_function(texts)]
+
+    async def rank_ids(
+        self,
+        text: str,
+        max_results: int,
+        mode: SearchMode = SearchMode.VECTOR,
+        filters: Optional[Dict[str, str]] = None,
+        embedding: Optional[Sequence[float]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank record IDs with scores that can be merged across stores.
+
+        Vector scores are cosine similarities and lexical scores are BM25
+        scores; higher is better. Hybrid rankings have no such score, so
+        callers fuse the two rankings themselves.
+
+        Args:
+            text: The search text
+            max_results: Maximum number of IDs to return
+            mode: VECTOR or LEXICAL
+            filters: Only rank records with these facet values
+            embedding: The embedded search text, to skip embedding it again
+
+        Returns:
+            (ID, score) pairs, best first
+
+        Raises:
+            ValueError: If the mode is HYBRID
+        """
+        return await self._read(
+            self._rank_ids_sync, text, max_results, mode, filters, embedding
+        )
+
+    def _rank_ids_sync(
+        self,
+        text: str,
+        max_results: int,
+        mode: SearchMode,
+        filters: Optional[Dict[str, str]],
+        embedding: Optional[Sequence[float]],
+    ) -> List[Tuple[str, float]]:
+        """Rank record IDs with mergeable scores (blocking)."""
+        if mode == SearchMode.HYBRID:
+            raise ValueError("Hybrid rankings have no mergeable score")
+        if mode == SearchMode.LEXICAL:
+            allowed = self._allowed_ids(filters or {})
+            return self._lexical_index().search(text, max_results, allowed)
+
+        vectors = [embedding] if embedding is not None else self._embed_sync([text])
+        if self.vector_index is not None:
+            return self.vector_index.search(
+                vectors, max_results, allowed=self._allowed_ids(filters or {})
+            )[0]
+        results = self.collection.query(
+            query_embeddings=[list(vectors[0])],
+            n_results=max_results,
+            where=build_where(filters or {}),
+            include=["distances"],
+        )
+        # Cosine distance is one minus the cosine similarity
+        return [
+            (row_id, 1.0 - distance)
+            for row_id, distance in zip(results["ids"][0], results["distances"][0])
         ]
 
-        return " ".join(context_parts + solution_parts)
+    def _vector_ids_sync(
+        self, text: str, n_results: int, filters: Optional[Dict[str, str]] = None
+    ) -> List[str]:
+        """Rank the IDs of the records nearest to a text (blocking)."""
+        if self.vector_index is None:
+            return self.collection.query(
+                query_texts=[text],
+                n_results=n_results,
+                where=build_where(filters or {}),
+                include=[],
+            )["ids"][0]
+
+        ranked = self.vector_index.search(
+            self.embedding_function([text]),
+            n_results,
+            allowed=self._allowed_ids(filters or {}),
+        )
+        return [i for i, _ in ranked[0]]
+
+    def _query_sync(
+        self,
+        query_texts: List[str],
+        n_results: int,
+        filters: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Find the records nearest to each query text (blocking).
+
+        Returns results shaped like ``collection.query``, grouped per query.
+        Facet filters become a ChromaDB ``where`` filter, or an ID set for
+        the quantized index.
+        """
+        if self.vector_index is None:
+            return self.collection.query(
+                query_texts=query_texts,
+                n_results=n_results,
+                where=build_where(filters or {}),
+                include=["documents", "metadatas"],
+            )
+
+        allowed = self._allowed_ids(filters or {})
+        ranked = self.vector_index.search(
+            self.embedding_function(query_texts), n_results, allowed=allowed
+        )
+        ids = list(dict.fromkeys(i for matches in ranked for i, _ in matches))
+        rows = self.collection.get(ids=ids, include=["documents", "metadatas"])
+        found = {
+            row_id: (document, metadata)
+            for row_id, document, metadata in zip(
+                rows["ids"], rows["documents"], rows["metadatas"]
+            )
+        }
+
+        results: Dict[str, Any] = {"ids": [], "documents": [], "metadatas": []}
+        for matches in ranked:
+            hits = [i for i, _ in matches if i in found]
+            results["ids"].append(hits)
+            results["documents"].append([found[i][0] for i in hits])
+            results["metadatas"].append([found[i][1] for i in hits])
+        return results
+
+    def _sync_vector_index(self) -> None:
+        """Reconcile the quantized index with the collection (blocking).
+
+        A crash between a collection write and the index write leaves them
+        out of step; missing vectors are re-embedded and stale ones dropped.
+        """
+        stored = set(self.collection.get(include=[])["ids"])
+        indexed = set(self.vector_index.ids())
+        stale = indexed - stored
+        missing = sorted(stored - indexed)
+        if stale:
+            self.vector_index.remove(stale)
+        batch_size = max(self.client.get_max_batch_size(), 1)
+        for start in range(0, len(missing), batch_size):
+            rows = self.collection.get(
+                ids=missing[start : start + batch_size], include=["documents"]
+            )
+            self.vector_index.add(
+                rows["ids"], self.embedding_function(rows["documents"])
+            )
+        if stale or missing:
+            logger.warning(
+                f"Quantized index repaired: {len(missing)} vectors added, "
+                f"{len(stale)} removed"
+            )
 
     async def add_error(self, error: ErrorRecord) -> ErrorRecord:
         """Add a new error record to storage."""
-        document = self._error_to_document(error)
+        return await self._write(self._add_error_sync, error)
+
+    def _add_error_sync(self, error: ErrorRecord) -> ErrorRecord:
+        """Add a new error record to storage (blocking).
+
+        With deduplication enabled, a repeat of a stored error is merged into
+        that record and the merged record is returned instead.
+        """
+        with self._add_lock:
+            if self.dedup:
+                fingerprint = error_fingerprint(error)
+                existing = self._find_by_fingerprints_sync([fingerprint])
+                if fingerprint in existing and existing[fingerprint].id != error.id:
+                    return self._absorb_duplicates_sync(
+                        [merge_duplicate(existing[fingerprint], error)], 1
+                    )[0]
+            return self._insert_error_sync(error)
 
-        # Store the document and metadata
-        self.collection.add(
+    def _insert_error_sync(self, error: ErrorRecord) -> ErrorRecord:
+        """Insert a new error record into the collection (blocking)."""
+        # Store the embedding text as the document and the record as metadata
+        self._write_records(
+            self.collection.add,
             ids=[str(error.id)],
-            documents=[json.dumps(document)],
-            metadatas=[
-                {
-                    "error_type": error.error_type,
-                    "language": error.context.language,
-                    "framework": error.context.framework or "",
-                }
-            ],
-            # ChromaDB will auto-generate embeddings from the documents
+            documents=[self._create_embedding_text(error)],
+            metadatas=[self._error_to_metadata(error)],
         )
+        self._bump_generation()
 
         return error
 
+    def _find_by_fingerprints_sync(
+        self, fingerprints: List[str]
+    ) -> Dict[str, ErrorRecord]:
+        """Look up stored records by deduplication fingerprint (blocking)."""
+        unique = list(dict.fromkeys(fingerprints))
+        if not unique:
+            return {}
+
+        result = self.collection.get(
+            where={"fingerprint": {"$in": unique}},
+            include=["documents", "metadatas"],
+        )
+        found: Dict[str, ErrorRecord] = {}
+        for document, metadata in zip(result["documents"], result["metadatas"]):
+            if metadata["fingerprint"] not in found:
+                found[metadata["fingerprint"]] = self._result_to_error(
+                    document, metadata
+                )
+        return found
+
+    def _absorb_duplicates_sync(
+        self, merged: List[ErrorRecord], absorbed: int
+    ) -> List[ErrorRecord]:
+        """Store records that absorbed duplicates (blocking).
+
+        Only the metadata is updated: the primary solution is unchanged, so
+        the records do not need to be re-embedded.
+        """
+        if merged:
+            ids = [str(error.id) for error in merged]
+            metadatas = [self._error_to_metadata(error) for error in merged]
+            self.collection.update(ids=ids, metadatas=metadatas)
+            self._index_facets(ids, metadatas)
+        self._duplicates_absorbed += absorbed
+        self._bump_generation()
+        return merged
+
+    def _dedup_batch_sync(
+        self,
+        pending: List[Tuple[int, ErrorRecord]],
+        results: Dict[int, BatchItemResult],
+    ) -> List[Tuple[int, ErrorRecord]]:
+        """Merge repeated errors of a batch (blocking).
+
+        Repeats of stored records are merged into them, and repeats within
+        the batch are merged into the first occurrence. Returns the records
+        that still have to be inserted.
+        """
+        fingerprints = [error_fingerprint(error) for _, error in pending]
+        stored: Dict[str, ErrorRecord] = {}
+        batch_size = max(self.client.get_max_batch_size(), 1)
+        for start in range(0, len(fingerprints), batch_size):
+            stored.update(
+                self._find_by_fingerprints_sync(
+                    fingerprints[start : start + batch_size]
+                )
+            )
+
+        changed: Dict[str, ErrorRecord] = {}
+        new: Dict[str, Tuple[int, ErrorRecord]] = {}
+        absorbed = 0
+        for (index, error), fingerprint in zip(pending, fingerprints):
+            if fingerprint in stored and stored[fingerprint].id != error.id:
+                target = merge_duplicate(stored[fingerprint], error)
+                stored[fingerprint] = changed[fingerprint] = target
+            elif fingerprint in new:
+                first_index, first = new[fingerprint]
+                target = merge_duplicate(first, error)
+                new[fingerprint] = (first_index, target)
+            else:
+                new[fingerprint] = (index, error)
+                continue
+            absorbed += 1
+            results[index] = BatchItemResult(
+                index=index, id=target.id, success=True, deduplicated=True
+            )
+
+        self._absorb_duplicates_sync(list(changed.values()), absorbed)
+        return sorted(new.values(), key=lambda item: item[0])
+
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """Add several error records with batched ChromaDB writes."""
+        return await self._write(self._add_errors_sync, errors)
+
+    async def add_errors_with_embeddings(
+        self, errors: List[ErrorRecord], embeddings: Sequence[Optional[List[float]]]
+    ) -> List[BatchItemResult]:
+        """Add several error records, storing their precomputed embeddings."""
+        return await self._write(self._add_errors_sync, errors, embeddings)
+
+    def _add_errors_sync(
+        self,
+        errors: List[ErrorRecord],
+        embeddings: Optional[Sequence[Optional[List[float]]]] = None,
+    ) -> List[BatchItemResult]:
+        """Add several error records with batched ChromaDB writes (blocking).
+
+        Records are written in chunks of the client's maximum batch size so
+        that each chunk is embedded in a single pass. Records whose ID is
+        repeated in the batch or already stored are reported as failures,
+        and a chunk that ChromaDB rejects is retried record by record to
+        isolate the failing items. With deduplication enabled, repeated
+        errors are merged instead of inserted. Records given an embedding
+        are not re-embedded.
+        """
+        results: Dict[int, BatchItemResult] = {}
+        pending: List[Tuple[int, ErrorRecord]] = []
+        seen = set()
+        for index, error in enumerate(errors):
+            error_id = str(error.id)
+            if error_id in seen:
+                results[index] = BatchItemResult(
+                    index=index,
+                    id=error.id,
+                    success=False,
+                    error="Duplicate ID in batch",
+                )
+                continue
+            seen.add(error_id)
+            pending.append((index, error))
+
+        with self._add_lock:
+            if self.dedup:
+                pending = self._dedup_batch_sync(pending, results)
+            vectors = {
+                index: embeddings[index]
+                for index, _ in pending
+                if embeddings is not None and embeddings[index] is not None
+            }
+            self._insert_errors_sync(pending, results, vectors)
+            self._bump_generation()
+
+        return [results[index] for index in range(len(errors))]
+
+    def _insert_errors_sync(
+        self,
+        pending: List[Tuple[int, ErrorRecord]],
+        results: Dict[int, BatchItemResult],
+        vectors: Optional[Dict[int, List[float]]] = None,
+    ) -> None:
+        """Insert new error records in chunks, recording results (blocking).
+
+        A chunk whose records all have a precomputed vector in ``vectors``
+        is stored without embedding.
+        """
+        batch_size = max(self.client.get_max_batch_size(), 1)
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start : start + batch_size]
+            existing = set(
+                self.collection.get(
+                    ids=[str(error.id) for _, error in chunk], include=[]
+                )["ids"]
+            )
+            new_items = []
+            for index, error in chunk:
+                if str(error.id) in existing:
+                    results[index] = BatchItemResult(
+                        index=index,
+                        id=error.id,
+                        success=False,
+                        error="Error record already exists",
+                    )
+                else:
+                    new_items.append((index, error))
+            if not new_items:
+                continue
+
+            chunk_vectors = None
+            if vectors and all(index in vectors for index, _ in new_items):
+                chunk_vectors = [vectors[index] for index, _ in new_items]
+            try:
+                self._write_records(
+                    self.collection.add,
+                    ids=[str(error.id) for _, error in new_items],
+                    documents=[
+                        self._create_embedding_text(error) for _, error in new_items
+                    ],
+                    metadatas=[
+                        self._error_to_metadata(error) for _, error in new_items
+                    ],
+                    embeddings=chunk_vectors,
+                )
+                for index, error in new_items:
+                    results[index] = BatchItemResult(
+                        index=index, id=error.id, success=True
+                    )
+            except Exception as e:
+                logger.warning(f"Batch add failed, retrying records one by one: {e}")
+                for index, error in new_items:
+                    try:
+                        self._insert_error_sync(error)
+                        results[index] = BatchItemResult(
+                            index=index, id=error.id, success=True
+                        )
+                    except Exception as item_error:
+                        results[index] = BatchItemResult(
+                            index=index,
+                            id=error.id,
+                            success=False,
+                            error=str(item_error),
+                        )
+
     async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
         """Retrieve an error record by ID."""
+        return await self._read(self._get_error_sync, error_id)
+
+    def _get_error_sync(self, error_id: UUID) -> Optional[ErrorRecord]:
+        """Retrieve an error record by ID (blocking)."""
         try:
             result = self.collection.get(
                 ids=[str(error_id)], include=["documents", "metadatas"]
             )
-            if not result["documents"]:
+            if not result["ids"]:
                 return None
 
-            document = json.loads(result["documents"][0])
-            return self._document_to_error(document)
+            return self._result_to_error(result["documents"][0], result["metadatas"][0])
         except Exception:
             return None
 
+    async def get_errors(self, error_ids: List[UUID]) -> List[Optional[ErrorRecord]]:
+        """Retrieve several error records with a single ChromaDB lookup."""
+        return await self._read(self._get_errors_sync, error_ids)
+
+    def _get_errors_sync(self, error_ids: List[UUID]) -> List[Optional[ErrorRecord]]:
+        """Retrieve several error records with a single ChromaDB lookup (blocking)."""
+        keys = [str(error_id) for error_id in error_ids]
+        if not keys:
+            return []
+
+        result = self.collection.get(
+            ids=list(dict.fromkeys(keys)), include=["documents", "metadatas"]
+        )
+        # ChromaDB returns matches in storage order, so restore input order
+        found = {
+            doc_id: self._result_to_error(document, metadata)
+            for doc_id, document, metadata in zip(
+                result["ids"], result["documents"], result["metadatas"]
+            )
+        }
+        return [found.get(key) for key in keys]
+
+    async def iter_errors(self, batch_size: int = 500) -> AsyncIterator[ErrorRecord]:
+        """Iterate over every stored error record, one batch per read."""
+        async for record, _ in self._iter_rows(batch_size, include_embeddings=False):
+            yield record
+
+    async def iter_errors_with_embeddings(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over every stored error record with its stored vector."""
+        async for record, embedding in self._iter_rows(
+            batch_size, include_embeddings=True
+        ):
+            yield record, embedding
+
+    async def _iter_rows(
+        self, batch_size: int, include_embeddings: bool
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over the records in ID order, reading them in batches.
+
+        Each batch of IDs is paged from the facet index after the last ID
+        read, so no list of every ID is held. Records deleted in the
+        meantime are skipped, and records added after the last ID read are
+        visited.
+        """
+        batch_size = max(batch_size, 1)
+        after: Optional[str] = None
+        while True:
+            ids = await self._read(self._id_page_sync, after, batch_size)
+            if not ids:
+                return
+            rows = await self._read(self._get_rows_sync, ids, include_embeddings)
+            for row in rows:
+                yield row
+            after = ids[-1]
+
+    def _id_page_sync(self, after: Optional[str], limit: int) -> List[str]:
+        """Get the lowest record IDs above a key (blocking)."""
+        return self._facet_index().page({}, after, limit)
+
+    def _get_rows_sync(
+        self, ids: List[str], include_embeddings: bool
+    ) -> List[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Get records and, optionally, their vectors in input order (blocking)."""
+        include = ["documents", "metadatas"]
+        if include_embeddings and self.vector_index is None:
+            include.append("embeddings")
+        rows = self.collection.get(ids=ids, include=include)
+
+        vectors: Dict[str, Any] = {}
+        if include_embeddings and self.vector_index is not None:
+            vectors = dict(zip(rows["ids"], self.vector_index.vectors(rows["ids"])))
+        elif include_embeddings:
+            vectors = dict(zip(rows["ids"], rows["embeddings"]))
+        found = {
+            row_id: (
+                self._result_to_error(document, metadata),
+                None if vectors.get(row_id) is None else vectors[row_id].tolist(),
+            )
+            for row_id, document, metadata in zip(
+                rows["ids"], rows["documents"], rows["metadatas"]
+            )
+        }
+        return [found[row_id] for row_id in ids if row_id in found]
+
     async def update_error(
         self, error_id: UUID, error: ErrorRecord
     ) -> Optional[ErrorRecord]:
         """Update an existing error record."""
+        return await self._write(self._update_error_sync, error_id, error)
+
+    def _update_error_sync(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record (blocking)."""
         # Check if the error exists
-        existing_error = await self.get_error(error_id)
+        existing_error = self._get_error_sync(error_id)
         if not existing_error:
             return None
 
@@ -133,87 +938,158 @@ class ChromaStorage(StorageInterface):
         error.created_at = existing_error.created_at
 
         # Update the record
-        document = self._error_to_document(error)
-
-        self.collection.update(
+        self._write_records(
+            self.collection.update,
             ids=[str(error_id)],
-            documents=[json.dumps(document)],
-            metadatas=[
-                {
-                    "error_type": error.error_type,
-                    "language": error.context.language,
-                    "framework": error.context.framework or "",
-                }
-            ],
-            # ChromaDB will auto-generate embeddings from the documents
+            documents=[self._create_embedding_text(error)],
+            metadatas=[self._error_to_metadata(error)],
         )
+        self._bump_generation()
 
         return error
 
     async def delete_error(self, error_id: UUID) -> bool:
         """Delete an error record by ID."""
+        return await self._write(self._delete_error_sync, error_id)
+
+    def _delete_error_sync(self, error_id: UUID) -> bool:
+        """Delete an error record by ID (blocking)."""
         try:
             result = self.collection.get(ids=[str(error_id)])
             if not result["ids"]:
                 return False
 
             self.collection.delete(ids=[str(error_id)])
+            self._deleted += 1
+            if self.vector_index is not None:
+                self.vector_index.remove([str(error_id)])
+            with self._lexical_lock:
+                if self._lexical is not None:
+                    self._lexical.remove([str(error_id)])
+            with self._facets_lock:
+                if self._facets is not None:
+                    self._facets.remove([str(error_id)])
+            self._bump_generation()
             return True
         except Exception:
             return False
 
     async def search_errors(self, query: ErrorQuery) -> List[ErrorRecord]:
         """Search for error records based on the provided query."""
-        # Build metadata filter
-        filter_clauses = []
-
-        if query.error_type:
-            filter_clauses.append({"error_type": query.error_type})
-
-        if query.language:
-            filter_clauses.append({"language": query.language})
+        return await self._read(self._search_errors_sync, query)
 
-        if query.framework:
-            filter_clauses.append({"framework": query.framework})
+    def _search_errors_sync(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query (blocking).
 
-        # Combine text for semantic search
-        search_text = " ".join(
-            [
-                query.error_message or "",
-                query.code_snippet or "",
-                query.task_description or "",
-            ]
-        ).strip()
+        Metadata filters are resolved with the facet index. Without search
+        text, the matching records are returned in ID order.
+        """
+        if query.cursor:
+            return self._search_errors_page_sync(query).records
 
-        # If we have text to search, do a similarity search
+        filters = query_filters(query)
+        search_text = query_text(query)
         if search_text:
-            results = self.collection.query(
-                query_texts=[search_text],
-                n_results=query.max_results,
-                where=filter_clauses if filter_clauses else None,
-                include=["documents"],
+            ids = self._ranked_ids_sync(
+                search_text, query.max_results, query.mode, filters
             )
         else:
-            # Otherwise, just get records matching the metadata filters
-            results = self.collection.get(
-                where=filter_clauses if filter_clauses else None,
-                limit=query.max_results,
-                include=["documents"],
-            )
+            ids = self._facet_index().page(filters, None, query.max_results)
+        return [error for error in self._get_errors_sync(ids) if error]
 
-        # Convert results to ErrorRecord objects
-        error_records = []
-        if results.get("documents"):
-            for doc_str in results["documents"][0]:
-                document = json.loads(doc_str)
-                error_records.append(self._document_to_error(document))
+    async def search_errors_page(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time."""
+        return await self._read(self._search_errors_page_sync, query)
 
-        return error_records
+    def _search_errors_page_sync(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time (blocking).
+
+        Metadata-only listings page through the facet index in ID order,
+        resuming after the last ID of the previous page. Ranked searches
+        snapshot the ranked IDs on the first page and slice the snapshot on
+        later pages. Either way, only the records of the page are fetched.
+
+        Raises:
+            ValueError: If the cursor is invalid or has expired
+        """
+        filters = query_filters(query)
+        search_text = query_text(query)
+        page_size = query.max_results
+        position = decode_cursor(query)
+        next_position: Optional[Dict[str, Any]] = None
+        try:
+            if not search_text:
+                after = position["after"] if position else None
+                ids = self._facet_index().page(filters, after, page_size + 1)
+                if len(ids) > page_size:
+                    ids = ids[:page_size]
+                    next_position = {"after": ids[-1]}
+            else:
+                if position is None:
+                    ranked = self._ranked_ids_sync(
+                        search_text, snapshot_depth(page_size), query.mode, filters
+                    )
+                    offset, token = 0, None
+                else:
+                    token, offset = position["snapshot"], position["offset"]
+                    ranked = self._snapshots.get(token)
+                ids = ranked[offset : offset + page_size]
+                if offset + page_size < len(ranked):
+                    if token is None:
+                        token = self._snapshots.put(ranked)
+                    next_position = {"snapshot": token, "offset": offset + page_size}
+        except (KeyError, TypeError):
+            raise ValueError("Invalid cursor") from None
+
+        return ErrorPage(
+            # Records deleted since the snapshot was taken are skipped
+            records=[error for error in self._get_errors_sync(ids) if error],
+            next_cursor=encode_cursor(query, next_position) if next_position else None,
+        )
+
+    async def facet_counts(
+        self, filters: Optional[Dict[str, str]] = None
+    ) -> FacetCounts:
+        """Count the records per error type, language and framework."""
+        return await self._read(self._facet_counts_sync, filters)
+
+    def _facet_counts_sync(self, filters: Optional[Dict[str, str]]) -> FacetCounts:
+        """Count the records per facet value (blocking)."""
+        total, facets = self._facet_index().counts(filters)
+        return FacetCounts(total=total, facets=facets)
+
+    def _validate_embedding_function(self) -> None:
+        """Check that the collection was embedded with the configured embedder.
+
+        Vectors from different embedders are not comparable, so a mismatch
+        is an error. Collections created before the embedder was recorded
+        were embedded with ChromaDB's default model.
+
+        Raises:
+            ValueError: If the collection was embedded with another embedder
+        """
+        recorded = (self.collection.metadata or {}).get(EMBEDDING_FUNCTION_KEY)
+        if recorded is None:
+            if self.collection.count() == 0:
+                recorded = self.embedding_model_id
+            else:
+                recorded = DEFAULT_EMBEDDING_MODEL_ID
+            if recorded == self.embedding_model_id:
+                update_collection_metadata(
+                    self.collection, {EMBEDDING_FUNCTION_KEY: recorded}
+                )
+
+        if recorded != self.embedding_model_id:
+            raise ValueError(
+                f"Embedding function mismatch: the collection was embedded with "
+                f"{recorded}, but {self.embedding_model_id} is configured. "
+                f"Configure the original embedder or re-import into a new store."
+            )
 
     def _validate_schema_version(self) -> None:
         """Validate and potentially migrate the schema version."""
         try:
-            collection_info = self.client.get_collection(name="error_records")
+            collection_info = self.client.get_collection(name=self.collection_name)
             current_version = collection_info.metadata.get("schema_version", "0.0.0")
 
             if current_version != SCHEMA_VERSION:
@@ -246,17 +1122,275 @@ class ChromaStorage(StorageInterface):
         self, text_query: str, max_results: int = 5
     ) -> List[ErrorRecord]:
         """Search for error records with similar text content."""
-        results = self.collection.query(
-            query_texts=[text_query],
-            n_results=max_results,
-            include=["documents", "distances"],
+        return await self._read(self._search_similar_sync, text_query, max_results)
+
+    def _search_similar_sync(
+        self, text_query: str, max_results: int
+    ) -> List[ErrorRecord]:
+        """Search for error records with similar text content (blocking)."""
+        return self._search_similar_many_sync([text_query], max_results)[0]
+
+    async def search_similar_many(
+        self, text_queries: List[str], max_results: int = 5
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts in one ChromaDB query."""
+        return await self._read(
+            self._search_similar_many_sync, text_queries, max_results
         )
 
+    def _search_similar_many_sync(
+        self, text_queries: List[str], max_results: int
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts (blocking).
+
+        All query texts are embedded in one batch and searched with a single
+        index query; results come back grouped per query.
+        """
+        if not text_queries:
+            return []
+
+        results = self._query_sync(list(text_queries), max_results)
+
         # Convert results to ErrorRecord objects
-        error_records = []
-        if results.get("documents") and results["documents"][0]:
-            for doc_str in results["documents"][0]:
-                document = json.loads(doc_str)
-                error_records.append(self._document_to_error(document))
+        grouped = []
+        documents = results.get("documents") or [[] for _ in text_queries]
+        metadatas = results.get("metadatas") or [[] for _ in text_queries]
+        for query_documents, query_metadatas in zip(documents, metadatas):
+            grouped.append(
+                [
+                    self._result_to_error(doc_str, metadata)
+                    for doc_str, metadata in zip(
+                        query_documents or [], query_metadatas or []
+                    )
+                ]
+            )
+
+        return grouped
+
+    def _bump_generation(self) -> None:
+        """Record that a write was committed."""
+        with self._generation_lock:
+            self._generation += 1
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every committed add, update and delete."""
+        return self._generation
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        """Identify the embedder that produced the stored vectors."""
+        return self.embedding_model_id
+
+    async def snapshot(self, directory: str) -> SnapshotInfo:
+        """Take an incremental snapshot of the persist directory."""
+        return await self._on_write_pool(self._snapshot_sync, directory)
+
+    def _snapshot_sync(self, directory: str) -> SnapshotInfo:
+        """Take a snapshot while writes are paused (blocking).
+
+        Running writes finish first and new ones wait until the changed
+        files have been copied.
+        """
+        with self._write_gate.quiesce():
+            metadata = self.collection.metadata or {}
+            return create_snapshot(
+                self.persist_directory,
+                directory,
+                metadata={
+                    "schema_version": metadata.get("schema_version"),
+                    "embedding_model": self.embedding_model_id,
+                    "collection_name": self.collection_name,
+                    "records": self.collection.count(),
+                },
+                exclude=SNAPSHOT_EXCLUDE,
+            )
+
+    @classmethod
+    def validate_restore(
+        cls, persist_directory: str, manifest: Dict[str, Any], **kwargs: Any
+    ) -> None:
+        """
+        Check that a restored persist directory can be opened.
+
+        The snapshot's schema version must be compatible with this version.
+        Opening the storage then validates the embedder and runs
+        ``_validate_schema_version``, which migrates older schemas.
+
+        Args:
+            persist_directory: The restored directory
+            manifest: The snapshot manifest
+            **kwargs: Storage options, such as the embedding function
+
+        Raises:
+            ValueError: If the schema or the embedder is incompatible
+        """
+        version = manifest.get("metadata", {}).get("schema_version")
+        if version and not migration_manager.is_compatible(version):
+            raise ValueError(
+                f"Incompatible schema version: {version}. "
+                f"This version of Tribal requires schema version {SCHEMA_VERSION}."
+            )
+        storage = cls(persist_directory, **kwargs)
+        collection_name = manifest.get("metadata", {}).get("collection_name")
+        if collection_name and collection_name != storage.collection_name:
+            raise ValueError(
+                f"Snapshot holds collection {collection_name}, but the storage "
+                f"is configured for {storage.collection_name}"
+            )
+        count = storage.collection.count()
+        expected = manifest.get("metadata", {}).get("records")
+        if expected is not None and count != expected:
+            raise ValueError(
+                f"Restored collection holds {count} records, "
+                f"the snapshot recorded {expected}"
+            )
+
+    async def compact(
+        self, threshold: float = DEFAULT_COMPACTION_THRESHOLD, force: bool = False
+    ) -> CompactionReport:
+        """Rebuild the collection and vacuum the database if fragmented."""
+        return await self._on_write_pool(self._compact_sync, threshold, force)
+
+    @property
+    def _sqlite_path(self) -> str:
+        """Get the path of ChromaDB's metadata database."""
+        return os.path.join(self.persist_directory, "chroma.sqlite3")
+
+    def _compact_sync(self, threshold: float, force: bool) -> CompactionReport:
+        """Compact the storage if it is fragmented enough (blocking).
+
+        Writes are paused for the whole compaction. Reads keep using the
+        old collection while the new one is built and are held only while
+        the two are swapped.
+        """
+        started = time.perf_counter()
+        records = self.collection.count()
+        deleted_ratio = self._deleted / max(records + self._deleted, 1)
+        if self.vector_index is not None:
+            deleted_ratio = max(deleted_ratio, self.vector_index.deleted_ratio())
+        bytes_before = directory_size(self.persist_directory)
+        report = CompactionReport(
+            compacted=False,
+            records=records,
+            deleted_ratio=deleted_ratio,
+            free_page_ratio=sqlite_free_ratio(self._sqlite_path),
+            bytes_before=bytes_before,
+            bytes_after=bytes_before,
+        )
+        if not force and max(report.deleted_ratio, report.free_page_ratio) < threshold:
+            return report
+
+        probe = self._latency_probe()
+        if probe is not None:
+            report.search_latency_before_ms = median_latency_ms(probe)
+        with self._write_gate.quiesce():
+            self._rebuild_collection()
+            if self.vector_index is not None:
+                self.vector_index.compact()
+            vacuum_sqlite(self._sqlite_path)
+            self._deleted = 0
+            write_deleted_count(self._compaction_state, 0)
+        probe = self._latency_probe()
+        if probe is not None:
+            report.search_latency_after_ms = median_latency_ms(probe)
+
+        report.compacted = True
+        report.bytes_after = directory_size(self.persist_directory)
+        report.bytes_reclaimed = max(report.bytes_before - report.bytes_after, 0)
+        report.duration_seconds = time.perf_counter() - started
+        logger.info(
+            f"Compacted {records} records: {report.bytes_reclaimed} bytes "
+            f"reclaimed in {report.duration_seconds:.2f}s"
+        )
+        return report
+
+    def _latency_probe(self) -> Optional[Callable[[], Any]]:
+        """Get a nearest-neighbour search for timing the vector index."""
+        documents = self.collection.peek(1)["documents"]
+        if not documents:
+            return None
+        vector = self.embedding_function([documents[0]])[0]
+        if self.vector_index is not None:
+            return lambda: self.vector_index.search([vector], 10)
+        return lambda: self.collection.query(
+            query_embeddings=[vector], n_results=10, include=[]
+        )
+
+    def _rebuild_collection(self) -> None:
+        """Copy the live records into a new collection and swap it in (blocking).
+
+        The new vector index holds no deleted entries. The caller pauses
+        writes.
+        """
+        name = self.collection_name + COMPACTING_SUFFIX
+        if name in set(self.client.list_collections()):
+            self.client.delete_collection(name)
+        # Scores are cosine similarities whatever the recorded metadata holds
+        metadata = collection_creation_metadata(self.collection.metadata)
+        rebuilt = self.client.create_collection(
+            name=name,
+            metadata={"hnsw:space": "cosine", **metadata},
+            embedding_function=self.embedding_function,
+        )
+        for rows in self._scan_collection(["documents", "metadatas", "embeddings"]):
+            rebuilt.add(
+                ids=rows["ids"],
+                embeddings=rows["embeddings"],
+                documents=rows["documents"],
+                metadatas=rows["metadatas"],
+            )
+        with self._read_gate.quiesce():
+            self.client.delete_collection(self.collection_name)
+            rebuilt.modify(name=self.collection_name)
+            self.collection = rebuilt
+        self._remove_orphaned_segments()
+
+    def _remove_orphaned_segments(self) -> None:
+        """Delete index directories of segments ChromaDB no longer knows.
+
+        ChromaDB keeps each vector segment in a directory named by its UUID
+        and does not always remove it when a collection is deleted.
+        """
+        connection = sqlite3.connect(f"file:{self._sqlite_path}?mode=ro", uri=True)
+        try:
+            known = {row[0] for row in connection.execute("SELECT id FROM segments")}
+        finally:
+            connection.close()
+        for name in os.listdir(self.persist_directory):
+            path = os.path.join(self.persist_directory, name)
+            try:
+                UUID(name)
+            except ValueError:
+                continue
+            if name not in known and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics, including executor queue metrics."""
+        stats: Dict[str, Any] = {
+            "backend": "chroma",
+            "dedup": {
+                "enabled": self.dedup,
+                "duplicates_absorbed": self._duplicates_absorbed,
+            },
+            "compaction": {"deleted_since_compaction": self._deleted},
+        }
+        if self._read_executor is not None:
+            stats["read_executor"] = self._read_executor.metrics()
+        if self._write_executor is not None:
+            stats["write_executor"] = self._write_executor.metrics()
+        if self.embedding_cache is not None:
+            stats["embedding_cache"] = self.embedding_cache.metrics()
+        if self.vector_index is not None:
+            stats["quantized_index"] = self.vector_index.metrics()
+        return stats
 
-        return error_records
+    async def close(self) -> None:
+        """Wait for in-flight calls, then release thread pools and caches."""
+        for executor in (self._write_executor, self._read_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
+        write_deleted_count(self._compaction_state, self._deleted)
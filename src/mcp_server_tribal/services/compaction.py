@@ -0,0 +1,191 @@
+# filename: mcp_server_tribal/services/compaction.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Compaction of storage left fragmented by updates and deletes.
+
+Deleted records stay in the vector index as tombstones and leave free
+pages in the SQLite metadata store, so a store with heavy update and
+delete traffic keeps growing. Compaction rebuilds the index from the live
+records and vacuums the database. The scheduler runs it periodically,
+whenever the fragmentation crosses a threshold.
+"""
+
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import statistics
+import time
+from typing import Callable, Optional
+
+from .storage_interface import StorageInterface
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Fraction of deleted index entries or free database pages that triggers
+# a compaction
+DEFAULT_COMPACTION_THRESHOLD = 0.2
+
+# Searches timed before and after a compaction
+LATENCY_PROBES = 5
+
+# Seconds to wait for SQLite locks held by other connections
+SQLITE_BUSY_TIMEOUT = 30.0
+
+
+def directory_size(path: str) -> int:
+    """
+    Get the total size of the files under a directory.
+
+    Args:
+        path: The directory
+
+    Returns:
+        The size in bytes
+    """
+    total = 0
+    for root, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(root, filename))
+            except OSError:
+                continue
+    return total
+
+
+def sqlite_free_ratio(path: str) -> float:
+    """
+    Get the fraction of free pages in a SQLite database.
+
+    Args:
+        path: The database file
+
+    Returns:
+        Free pages divided by all pages, or 0 if the file does not exist
+    """
+    if not os.path.exists(path):
+        return 0.0
+    connection = sqlite3.connect(
+        f"file:{path}?mode=ro", uri=True, timeout=SQLITE_BUSY_TIMEOUT
+    )
+    try:
+        pages = connection.execute("PRAGMA page_count").fetchone()[0]
+        free = connection.execute("PRAGMA freelist_count").fetchone()[0]
+    finally:
+        connection.close()
+    return free / pages if pages else 0.0
+
+
+def vacuum_sqlite(path: str) -> None:
+    """
+    Rebuild a SQLite database file without its free pages.
+
+    Other connections may keep reading; they wait for the database lock
+    only while the rebuilt file is written back.
+
+    Args:
+        path: The database file
+    """
+    connection = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT)
+    try:
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+
+def median_latency_ms(probe: Callable[[], object]) -> float:
+    """
+    Time a search several times.
+
+    Args:
+        probe: Runs one search
+
+    Returns:
+        The median duration in milliseconds
+    """
+    durations = []
+    for _ in range(LATENCY_PROBES):
+        start = time.perf_counter()
+        probe()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def read_deleted_count(path: str) -> int:
+    """Read the deletes recorded since the last compaction."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return int(json.load(f).get("deleted", 0))
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def write_deleted_count(path: str, deleted: int) -> None:
+    """Atomically record the deletes since the last compaction."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"deleted": deleted}, f)
+    os.replace(temp_path, path)
+
+
+class CompactionScheduler:
+    """Periodically compacts a storage when it is fragmented enough."""
+
+    def __init__(
+        self,
+        storage: StorageInterface,
+        interval: float,
+        threshold: float = DEFAULT_COMPACTION_THRESHOLD,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            storage: The storage to compact
+            interval: Seconds between fragmentation checks
+            threshold: Fraction of deleted index entries or free database
+                pages that triggers a compaction
+        """
+        self.storage = storage
+        self.interval = interval
+        self.threshold = threshold
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start checking in the background on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop checking for fragmentation."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        """Check the storage every interval, compacting it when needed."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                report = await self.storage.compact(threshold=self.threshold)
+            except NotImplementedError:
+                logger.info("Storage backend does not support compaction")
+                return
+            except Exception as e:
+                logger.error(f"Scheduled compaction failed: {e}")
+                continue
+            if report.compacted:
+                logger.info(
+                    f"Compaction reclaimed {report.bytes_reclaimed} bytes in "
+                    f"{report.duration_seconds:.2f}s"
+                )
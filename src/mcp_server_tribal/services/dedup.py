@@ -0,0 +1,90 @@
+# filename: mcp_server_tribal/services/dedup.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Fingerprinting and merging of duplicate error records."""
+
+
+import hashlib
+import re
+from datetime import UTC, datetime
+
+from ..models.error_record import ErrorRecord
+
+# Record metadata keys maintained when duplicates are merged
+OCCURRENCE_COUNT_KEY = "occurrence_count"
+ADDITIONAL_SOLUTIONS_KEY = "additional_solutions"
+
+# Locations that differ between repeats of the same error
+_FILE_LOCATION_PATTERN = re.compile(r'File ".*?", line \d+')
+_LINE_NUMBER_PATTERN = re.compile(r"\bline \d+")
+
+
+def _normalize_locations(message: str) -> str:
+    """Replace file names and line numbers in an error message."""
+    message = _FILE_LOCATION_PATTERN.sub('File "FILE", line N', message)
+    return _LINE_NUMBER_PATTERN.sub("line N", message).strip()
+
+
+def error_fingerprint(error: ErrorRecord) -> str:
+    """
+    Compute the deduplication fingerprint of an error record.
+
+    Two records with the same error type, language, framework and error
+    message, apart from file names and line numbers, are considered repeats
+    of the same error. Quoted names are kept, so a missing ``fastapi`` and a
+    missing ``numpy`` module are different errors.
+
+    Args:
+        error: The error record to fingerprint
+
+    Returns:
+        Hex digest identifying the error
+    """
+    parts = [
+        error.error_type,
+        error.context.language,
+        error.context.framework or "",
+        _normalize_locations(error.context.error_message),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def merge_duplicate(existing: ErrorRecord, duplicate: ErrorRecord) -> ErrorRecord:
+    """
+    Merge a repeated error into the record it duplicates.
+
+    The occurrence counts are added up and any solution not yet known is
+    appended to the ``additional_solutions`` list of the record metadata.
+    The primary solution, and therefore the embedding text, is unchanged.
+
+    Args:
+        existing: The stored record
+        duplicate: The repeated record
+
+    Returns:
+        A merged copy of the stored record
+    """
+    merged = existing.model_copy(deep=True)
+    metadata = merged.metadata
+
+    metadata[OCCURRENCE_COUNT_KEY] = metadata.get(
+        OCCURRENCE_COUNT_KEY, 1
+    ) + duplicate.metadata.get(OCCURRENCE_COUNT_KEY, 1)
+
+    known = [merged.solution.model_dump(mode="json")]
+    known.extend(metadata.get(ADDITIONAL_SOLUTIONS_KEY, []))
+    candidates = [duplicate.solution.model_dump(mode="json")]
+    candidates.extend(duplicate.metadata.get(ADDITIONAL_SOLUTIONS_KEY, []))
+    for solution in candidates:
+        if solution not in known:
+            known.append(solution)
+    if len(known) > 1:
+        metadata[ADDITIONAL_SOLUTIONS_KEY] = known[1:]
+
+    merged.updated_at = datetime.now(UTC)
+    return merged
@@ -0,0 +1,177 @@
+# filename: mcp_server_tribal/services/embedding_cache.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Caching wrapper for ChromaDB embedding functions."""
+
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+from .embeddings import embedding_model_id
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Embedding function that caches the vectors of another one.
+
+    Vectors are keyed by a hash of the model ID and the text. Recently used
+    vectors are kept in an in-process LRU; an optional SQLite file holds
+    every vector computed so far, so the cache survives restarts.
+    """
+
+    def __init__(
+        self,
+        embedding_function: EmbeddingFunction[Documents],
+        max_entries: int = 10000,
+        disk_path: Optional[str] = None,
+        model_id: Optional[str] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            embedding_function: The embedding function to cache
+            max_entries: Maximum number of vectors kept in memory
+            disk_path: SQLite file for the on-disk tier (None disables it)
+            model_id: Model identifier used in cache keys
+        """
+        self.embedding_function = embedding_function
+        self.max_entries = max(max_entries, 0)
+        self.model_id = model_id or embedding_model_id(embedding_function)
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        self._disk: Optional[sqlite3.Connection] = None
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._disk.commit()
+
+    def _key(self, text: str) -> str:
+        """Compute the cache key of a text."""
+        return hashlib.sha256(f"{self.model_id}\0{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Store a vector in the in-memory LRU (caller holds the lock)."""
+        if self.max_entries == 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load_from_disk(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Read vectors from the on-disk tier (caller holds the lock)."""
+        if self._disk is None or not keys:
+            return {}
+        found = {}
+        # Stay well below SQLite's limit on query parameters
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            rows = self._disk.execute(
+                "SELECT key, vector FROM embeddings WHERE key IN "
+                f"({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def _save_to_disk(self, vectors: Dict[str, np.ndarray]) -> None:
+        """Write vectors to the on-disk tier (caller holds the lock)."""
+        if self._disk is None or not vectors:
+            return
+        self._disk.executemany(
+            "INSERT OR IGNORE INTO embeddings (key, vector) VALUES (?, ?)",
+            [(key, vector.tobytes()) for key, vector in vectors.items()],
+        )
+        self._disk.commit()
+
+    def __call__(self, input: Documents) -> Embeddings:
+        """Embed texts, computing only those not found in the cache."""
+        keys = [self._key(text) for text in input]
+        vectors: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for key in keys:
+                if key in vectors:
+                    continue
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    vectors[key] = vector
+                    self._hits += 1
+
+            missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+            for key, vector in self._load_from_disk(missing).items():
+                self._remember(key, vector)
+                vectors[key] = vector
+                self._disk_hits += 1
+
+        texts = {}
+        for key, text in zip(keys, input):
+            if key not in vectors:
+                texts.setdefault(key, text)
+
+        if texts:
+            computed = self.embedding_function(list(texts.values()))
+            new_vectors = {
+                key: np.asarray(vector, dtype=np.float32)
+                for key, vector in zip(texts, computed)
+            }
+            with self._lock:
+                self._misses += len(new_vectors)
+                for key, vector in new_vectors.items():
+                    self._remember(key, vector)
+                self._save_to_disk(new_vectors)
+            vectors.update(new_vectors)
+
+        return [vectors[key] for key in keys]
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Entry counts and hit and miss counters
+        """
+        with self._lock:
+            hits = self._hits + self._disk_hits
+            lookups = hits + self._misses
+            return {
+                "model_id": self.model_id,
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_enabled": self._disk is not None,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        """Close the on-disk tier."""
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
@@ -0,0 +1,210 @@
+# filename: mcp_server_tribal/services/embeddings.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Registry of embedding functions selectable by settings."""
+
+
+import os
+import re
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from chromadb.utils import embedding_functions
+from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import ONNXMiniLM_L6_V2
+
+from ..models.error_record import ErrorRecord
+
+# Identity of ChromaDB's default model, which collections created before the
+# embedder was recorded in their metadata were embedded with
+DEFAULT_EMBEDDING_MODEL_ID = ONNXMiniLM_L6_V2.MODEL_NAME
+
+# Words and numbers, used as hashing embedder features
+_TOKEN_PATTERN = re.compile(r"[a-z0-9_]+")
+
+
+def embedding_model_id(embedding_function: Any) -> str:
+    """
+    Identify the model behind an embedding function.
+
+    Args:
+        embedding_function: A ChromaDB embedding function
+
+    Returns:
+        The model name if the function declares one, else its class name
+    """
+    return (
+        getattr(embedding_function, "MODEL_NAME", None)
+        or type(embedding_function).__name__
+    )
+
+
+def embedding_text(error: ErrorRecord) -> str:
+    """
+    Build the text a record is embedded and lexically indexed by.
+
+    Only the error and solution content is used, not JSON keys, IDs and
+    timestamps.
+
+    Args:
+        error: The error record
+
+    Returns:
+        The non-empty context and solution fields joined by spaces
+    """
+    context_parts = [
+        error.error_type,
+        error.context.language,
+        error.context.framework or "",
+        error.context.error_message,
+        error.context.code_snippet or "",
+        error.context.task_description or "",
+    ]
+
+    solution_parts = [
+        error.solution.description,
+        error.solution.code_fix or "",
+        error.solution.explanation,
+    ]
+
+    return " ".join(part for part in context_parts + solution_parts if part)
+
+
+class HashingEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Deterministic embedder that needs no model files.
+
+    Words and word bigrams are hashed into a fixed number of signed buckets
+    and the resulting vector is L2-normalized. Texts sharing vocabulary get
+    similar vectors, which is enough for air-gapped nodes and for benchmarks
+    that should measure storage rather than model inference.
+    """
+
+    def __init__(self, dim: int = 384):
+        """
+        Initialize the embedder.
+
+        Args:
+            dim: Dimension of the vectors
+        """
+        if dim < 1:
+            raise ValueError("Embedding dimension must be positive")
+        self.dim = dim
+        self.MODEL_NAME = f"hashing-{dim}"
+
+    def __call__(self, input: Documents) -> Embeddings:
+        """Embed texts by hashing their words and word bigrams."""
+        vectors = np.zeros((len(input), self.dim), dtype=np.float32)
+        for row, text in enumerate(input):
+            tokens = _TOKEN_PATTERN.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            if not features:
+                continue
+            digests = np.fromiter(
+                (zlib.crc32(feature.encode("utf-8")) for feature in features),
+                dtype=np.uint32,
+                count=len(features),
+            )
+            signs = np.where(digests >> 31, -1.0, 1.0).astype(np.float32)
+            np.add.at(vectors[row], (digests & 0x7FFFFFFF) % self.dim, signs)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return list(vectors / norms)
+
+
+class LocalONNXEmbeddingFunction(ONNXMiniLM_L6_V2):
+    """ChromaDB's ONNX embedder loading a model from a local directory.
+
+    The directory must hold an exported MiniLM-style model: ``model.onnx``,
+    ``tokenizer.json`` and the tokenizer configuration files. Nothing is
+    downloaded.
+    """
+
+    EXTRACTED_FOLDER_NAME = ""
+
+    def __init__(self, model_path: str):
+        """
+        Initialize the embedder.
+
+        Args:
+            model_path: Directory holding the ONNX model and tokenizer
+        """
+        model_path = os.path.abspath(model_path)
+        if not os.path.isfile(os.path.join(model_path, "model.onnx")):
+            raise ValueError(f"No model.onnx found in {model_path}")
+        self.DOWNLOAD_PATH = model_path
+        self.MODEL_NAME = f"onnx:{model_path}"
+        super().__init__()
+
+
+def _create_default(model_path: Optional[str], dim: int) -> EmbeddingFunction:
+    """Create ChromaDB's default embedder (downloads MiniLM on first use)."""
+    return embedding_functions.DefaultEmbeddingFunction()
+
+
+def _create_onnx(model_path: Optional[str], dim: int) -> EmbeddingFunction:
+    """Create an ONNX embedder from a local model directory."""
+    if not model_path:
+        raise ValueError("EMBEDDING_MODEL_PATH is required for the onnx embedder")
+    return LocalONNXEmbeddingFunction(model_path)
+
+
+def _create_sentence_transformers(
+    model_path: Optional[str], dim: int
+) -> EmbeddingFunction:
+    """Create a sentence-transformers embedder from a model name or path."""
+    if not model_path:
+        raise ValueError(
+            "EMBEDDING_MODEL_PATH is required for the sentence-transformers embedder"
+        )
+    embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
+        model_name=model_path
+    )
+    embedding_function.MODEL_NAME = f"sentence-transformers:{model_path}"
+    return embedding_function
+
+
+def _create_hashing(model_path: Optional[str], dim: int) -> EmbeddingFunction:
+    """Create the model-free hashing embedder."""
+    return HashingEmbeddingFunction(dim)
+
+
+EMBEDDING_FUNCTIONS: Dict[
+    str, Callable[[Optional[str], int], EmbeddingFunction[Documents]]
+] = {
+    "default": _create_default,
+    "onnx": _create_onnx,
+    "sentence-transformers": _create_sentence_transformers,
+    "hashing": _create_hashing,
+}
+
+
+def create_embedding_function(
+    name: str = "default", model_path: Optional[str] = None, dim: int = 384
+) -> EmbeddingFunction[Documents]:
+    """
+    Create a registered embedding function.
+
+    Args:
+        name: Registry name: default, onnx, sentence-transformers or hashing
+        model_path: Model directory or name for the onnx and
+            sentence-transformers embedders
+        dim: Vector dimension for the hashing embedder
+
+    Returns:
+        The embedding function
+    """
+    try:
+        factory = EMBEDDING_FUNCTIONS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown embedding function: {name}. "
+            f"Choose one of: {', '.join(EMBEDDING_FUNCTIONS)}"
+        ) from None
+    return factory(model_path, dim)
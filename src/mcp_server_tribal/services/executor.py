@@ -0,0 +1,107 @@
+# filename: mcp_server_tribal/services/executor.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Bounded thread pools for running blocking storage calls off the event loop."""
+
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class StorageExecutor:
+    """Thread pool with queue depth and wait time metrics."""
+
+    def __init__(self, max_workers: int, name: str = "storage"):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Number of worker threads
+            name: Name used for worker threads and metrics
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"tribal-{name}"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking function on the pool and await its result.
+
+        Args:
+            fn: The blocking function to run
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            The function's return value
+        """
+        submitted = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def task() -> T:
+            wait = time.perf_counter() - submitted
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, task)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of the executor metrics.
+
+        Returns:
+            Worker count, queue depth, active and completed tasks, and
+            average and maximum queue wait time in milliseconds
+        """
+        with self._lock:
+            started = self._completed + self._active
+            avg_wait = self._total_wait / started if started else 0.0
+            return {
+                "workers": self.max_workers,
+                "queue_depth": self._queued,
+                "active": self._active,
+                "completed": self._completed,
+                "avg_wait_ms": round(avg_wait * 1000, 3),
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down the pool.
+
+        Args:
+            wait: Whether to wait for queued calls to finish
+        """
+        self._pool.shutdown(wait=wait)
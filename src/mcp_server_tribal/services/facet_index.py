@@ -0,0 +1,238 @@
+# filename: mcp_server_tribal/services/facet_index.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""In-memory index of record IDs by metadata facet."""
+
+
+import bisect
+import threading
+from collections import defaultdict
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+# Metadata fields that records can be filtered and counted by
+FACET_FIELDS = ("error_type", "language", "framework")
+
+
+def _insert_sorted(ids: List[str], new: Iterable[str]) -> None:
+    """Insert IDs into a sorted list of IDs."""
+    new = sorted(new)
+    if len(new) == 1:
+        bisect.insort(ids, new[0])
+    elif new:
+        # Timsort merges the two sorted runs in linear time
+        ids.extend(new)
+        ids.sort()
+
+
+def _discard_sorted(ids: List[str], record_id: str) -> None:
+    """Remove an ID from a sorted list of IDs if present."""
+    position = bisect.bisect_left(ids, record_id)
+    if position < len(ids) and ids[position] == record_id:
+        del ids[position]
+
+
+def build_where(filters: Mapping[str, str]) -> Optional[Dict[str, Any]]:
+    """
+    Build a ChromaDB ``where`` filter matching all the given fields.
+
+    Args:
+        filters: Field values to match
+
+    Returns:
+        None without filters, a single-field filter, or an ``$and`` of
+        single-field filters
+    """
+    clauses = [{field: value} for field, value in filters.items()]
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+class FacetIndex:
+    """
+    Sets of record IDs per value of each facet field.
+
+    Resolves equality filters on the facet fields by intersecting ID sets,
+    without touching the underlying collection, and counts the records per
+    facet value. The IDs of each value, and of all records, are also kept
+    in sorted lists, so pages in ID order start with a binary search.
+    """
+
+    def __init__(self, fields: Sequence[str] = FACET_FIELDS):
+        """
+        Initialize an empty index.
+
+        Args:
+            fields: The metadata fields to index
+        """
+        self.fields = tuple(fields)
+        self._ids: Dict[str, Dict[str, Set[str]]] = {
+            field: defaultdict(set) for field in self.fields
+        }
+        self._sorted: Dict[str, Dict[str, List[str]]] = {
+            field: defaultdict(list) for field in self.fields
+        }
+        self._values: Dict[str, Tuple[str, ...]] = {}
+        self._all_sorted: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of indexed records."""
+        return len(self._values)
+
+    def ids(self) -> List[str]:
+        """Get the indexed record IDs."""
+        with self._lock:
+            return list(self._values)
+
+    def _remove(self, record_id: str) -> None:
+        """Remove a record (caller holds the lock)."""
+        values = self._values.pop(record_id, None)
+        if values is None:
+            return
+        _discard_sorted(self._all_sorted, record_id)
+        for field, value in zip(self.fields, values):
+            ids = self._ids[field][value]
+            ids.discard(record_id)
+            _discard_sorted(self._sorted[field][value], record_id)
+            if not ids:
+                del self._ids[field][value]
+                del self._sorted[field][value]
+
+    def add(self, ids: Sequence[str], metadatas: Sequence[Mapping[str, Any]]) -> None:
+        """
+        Add or replace records.
+
+        Args:
+            ids: Record IDs
+            metadatas: Record metadata holding the facet fields
+        """
+        with self._lock:
+            added: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+            for record_id, metadata in zip(ids, metadatas):
+                self._remove(record_id)
+                values = tuple(str(metadata.get(f) or "") for f in self.fields)
+                self._values[record_id] = values
+                for field, value in zip(self.fields, values):
+                    self._ids[field][value].add(record_id)
+                    added[field, value].add(record_id)
+
+            # Replacing removed the IDs from the sorted lists; a record
+            # replaced again within the batch keeps only its last values
+            _insert_sorted(self._all_sorted, set(ids))
+            for (field, value), new in added.items():
+                current = self._ids[field].get(value, set())
+                _insert_sorted(self._sorted[field][value], new & current)
+
+    def remove(self, ids: Iterable[str]) -> None:
+        """
+        Remove records.
+
+        Args:
+            ids: IDs of the records to remove; unknown IDs are ignored
+        """
+        with self._lock:
+            for record_id in ids:
+                self._remove(record_id)
+
+    def match(self, filters: Mapping[str, str]) -> Set[str]:
+        """
+        Get the IDs of the records matching all the filters.
+
+        Args:
+            filters: Facet field values to match
+
+        Returns:
+            The matching record IDs (all records without filters)
+        """
+        with self._lock:
+            if not filters:
+                return set(self._values)
+            sets = sorted(
+                (
+                    self._ids[field].get(value, set())
+                    for field, value in filters.items()
+                ),
+                key=len,
+            )
+            return set(sets[0]).intersection(*sets[1:])
+
+    def page(
+        self, filters: Mapping[str, str], after: Optional[str], limit: int
+    ) -> List[str]:
+        """
+        Get the lowest IDs above a key among the records matching the filters.
+
+        The sorted IDs of the most selective filter are searched for the
+        key and walked from there, checking the other filters, so a page of
+        a single filter costs O(log N + limit) at any depth.
+
+        Args:
+            filters: Facet field values to match
+            after: Only return IDs greater than this one (None from the start)
+            limit: Maximum number of IDs
+
+        Returns:
+            Matching IDs in ascending order
+        """
+        with self._lock:
+            if any(value not in self._ids[f] for f, value in filters.items()):
+                return []
+            fields = sorted(filters, key=lambda f: len(self._ids[f][filters[f]]))
+            if fields:
+                candidates = self._sorted[fields[0]][filters[fields[0]]]
+            else:
+                candidates = self._all_sorted
+            others = [self._ids[field][filters[field]] for field in fields[1:]]
+            start = 0 if after is None else bisect.bisect_right(candidates, after)
+
+            page: List[str] = []
+            for position in range(start, len(candidates)):
+                if len(page) >= limit:
+                    break
+                record_id = candidates[position]
+                if all(record_id in ids for ids in others):
+                    page.append(record_id)
+            return page
+
+    def counts(
+        self, filters: Optional[Mapping[str, str]] = None
+    ) -> Tuple[int, Dict[str, Dict[str, int]]]:
+        """
+        Count the records per facet value.
+
+        Args:
+            filters: Only count records matching these facet values
+
+        Returns:
+            The number of matching records and, per facet field, the number
+            of matching records with each value
+        """
+        matching = self.match(filters or {})
+        with self._lock:
+            counts: Dict[str, Dict[str, int]] = {}
+            for field in self.fields:
+                counts[field] = {
+                    value: len(ids & matching) if filters else len(ids)
+                    for value, ids in self._ids[field].items()
+                }
+                # Records without a value, such as no framework, are not counted
+                counts[field] = {v: n for v, n in counts[field].items() if v and n}
+            return len(matching), counts
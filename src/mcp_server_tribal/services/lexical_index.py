@@ -0,0 +1,179 @@
+# filename: mcp_server_tribal/services/lexical_index.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""BM25 inverted index and rank fusion for hybrid search."""
+
+
+import heapq
+import math
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..utils.text_processing import tokenize_code
+
+# Constant of reciprocal rank fusion; dampens the weight of top ranks
+RRF_K = 60
+
+# Candidates taken from each ranking per hybrid search result
+HYBRID_CANDIDATE_FACTOR = 4
+
+
+def lexical_tokens(text: str) -> List[str]:
+    """
+    Split text into lowercased identifier and number tokens.
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        Tokens without punctuation
+    """
+    return [
+        token.lower()
+        for token in tokenize_code(text)
+        if token[0].isalnum() or token[0] == "_"
+    ]
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[str]], k: int = RRF_K
+) -> List[str]:
+    """
+    Fuse several rankings of IDs with reciprocal rank fusion.
+
+    Each ID scores the sum of ``1 / (k + rank)`` over the rankings that
+    contain it, which needs no calibration between the rankings' scores.
+
+    Args:
+        rankings: Rankings of IDs, best first
+        k: Fusion constant
+
+    Returns:
+        All ranked IDs, best fused score first
+    """
+    scores: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] += 1.0 / (k + rank)
+    return sorted(scores, key=lambda item: -scores[item])
+
+
+class BM25Index:
+    """
+    In-memory BM25 inverted index maintained incrementally.
+
+    Documents are added, replaced and removed one at a time, and document
+    frequencies and lengths are kept up to date, so no rebuild is needed.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, List[str]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of indexed documents."""
+        return len(self._lengths)
+
+    def _remove(self, doc_id: str) -> None:
+        """Remove a document (caller holds the lock)."""
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._terms.pop(doc_id):
+            del self._postings[term][doc_id]
+            if not self._postings[term]:
+                del self._postings[term]
+
+    def add(self, ids: Sequence[str], texts: Sequence[str]) -> None:
+        """
+        Add or replace documents.
+
+        Args:
+            ids: Document IDs
+            texts: Document texts, one per ID
+        """
+        with self._lock:
+            for doc_id, text in zip(ids, texts):
+                if doc_id in self._lengths:
+                    self._remove(doc_id)
+                terms = Counter(lexical_tokens(text))
+                for term, count in terms.items():
+                    self._postings[term][doc_id] = count
+                self._terms[doc_id] = list(terms)
+                length = sum(terms.values())
+                self._lengths[doc_id] = length
+                self._total_length += length
+
+    def remove(self, ids: Iterable[str]) -> None:
+        """
+        Remove documents.
+
+        Args:
+            ids: IDs of the documents to remove; unknown IDs are ignored
+        """
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def search(
+        self,
+        text: str,
+        k: int,
+        allowed: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the documents that best match the query terms.
+
+        Args:
+            text: The query text
+            k: Number of results
+            allowed: Restrict results to these IDs (None allows all)
+
+        Returns:
+            (ID, BM25 score) pairs, best first
+        """
+        allowed_ids = set(allowed) if allowed is not None else None
+        with self._lock:
+            count = len(self._lengths)
+            if count == 0 or k <= 0:
+                return []
+            average_length = self._total_length / count
+
+            scores: Dict[str, float] = defaultdict(float)
+            for term in set(lexical_tokens(text)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(
+                    1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for doc_id, frequency in postings.items():
+                    if allowed_ids is not None and doc_id not in allowed_ids:
+                        continue
+                    norm = self.k1 * (
+                        1 - self.b + self.b * self._lengths[doc_id] / average_length
+                    )
+                    scores[doc_id] += (
+                        idf * frequency * (self.k1 + 1) / (frequency + norm)
+                    )
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,786 @@
+# filename: mcp_server_tribal/services/memory_storage.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""In-memory implementation of storage interface.
+
+Records are kept in a dictionary and their embeddings in one contiguous
+float32 matrix that doubles in size when it fills up, so a similarity
+search is a single matrix product. Deleted and replaced rows are
+tombstoned, and the matrix is compacted once enough of it is dead.
+Nothing is persisted: the store suits ephemeral agents, such as CI jobs,
+and serves as the performance baseline of the persistent backends.
+"""
+
+
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID
+
+import numpy as np
+
+from ..models.error_record import (
+    BatchItemResult,
+    CompactionReport,
+    ErrorPage,
+    ErrorQuery,
+    ErrorRecord,
+    FacetCounts,
+    SearchMode,
+)
+from .compaction import DEFAULT_COMPACTION_THRESHOLD
+from .dedup import error_fingerprint, merge_duplicate
+from .embedding_cache import CachedEmbeddingFunction
+from .embeddings import create_embedding_function, embedding_model_id, embedding_text
+from .executor import StorageExecutor
+from .facet_index import FACET_FIELDS, FacetIndex
+from .lexical_index import (
+    HYBRID_CANDIDATE_FACTOR,
+    BM25Index,
+    reciprocal_rank_fusion,
+)
+from .pagination import (
+    RankingSnapshots,
+    decode_cursor,
+    encode_cursor,
+    snapshot_depth,
+)
+from .storage_interface import StorageInterface, query_filters, query_text
+
+# Rows allocated for the first embeddings
+INITIAL_CAPACITY = 1024
+
+T = TypeVar("T")
+
+
+def _normalize(vectors: Any) -> np.ndarray:
+    """L2-normalize the rows of a matrix, leaving zero rows as they are."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _resized(array: np.ndarray, capacity: int) -> np.ndarray:
+    """Copy an array into a new one with room for ``capacity`` rows."""
+    grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    rows = min(len(array), capacity)
+    grown[:rows] = array[:rows]
+    return grown
+
+
+def _facet_values(error: ErrorRecord) -> Dict[str, str]:
+    """Get the facet field values of a record."""
+    return {
+        "error_type": error.error_type,
+        "language": error.context.language,
+        "framework": error.context.framework or "",
+    }
+
+
+class InMemoryVectorStorage(StorageInterface):
+    """In-memory error record storage, with exact vector search."""
+
+    def __init__(
+        self,
+        read_workers: int = 0,
+        write_workers: int = 0,
+        dedup: bool = False,
+        embedding_function: Optional[Callable[[List[str]], Any]] = None,
+        embedding_cache_size: int = 0,
+        compaction_threshold: float = DEFAULT_COMPACTION_THRESHOLD,
+        initial_capacity: int = INITIAL_CAPACITY,
+    ):
+        """
+        Initialize in-memory storage.
+
+        Writes never change a row that a search may be reading: new rows
+        are appended past the searched ones, and growing or compacting the
+        matrix builds a new one. Searches therefore run concurrently with
+        writes and only lock to take a view of the matrix.
+
+        Args:
+            read_workers: Thread pool size for reads (0 runs reads inline)
+            write_workers: Thread pool size for writes (0 runs writes inline)
+            dedup: Merge repeats of a stored error instead of inserting them
+            embedding_function: Embedding function for documents and queries
+                (defaults to ChromaDB's default model)
+            embedding_cache_size: Vectors kept in the embedding cache (0
+                disables it)
+            compaction_threshold: Fraction of tombstoned rows that triggers
+                a compaction after a delete or update
+            initial_capacity: Rows allocated for the first embeddings
+        """
+        self.dedup = dedup
+        self.compaction_threshold = compaction_threshold
+        self.initial_capacity = max(initial_capacity, 1)
+        self._records: Dict[str, ErrorRecord] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._lexical = BM25Index()
+        self._facets = FacetIndex()
+        self._snapshots = RankingSnapshots()
+
+        # Row state: the matrix and per-row arrays hold ``capacity`` rows,
+        # of which the first ``_size`` are used; tombstoned rows keep their
+        # ID in ``_row_ids`` until the next compaction
+        self._dim: Optional[int] = None
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._codes = {field: np.zeros(0, dtype=np.int32) for field in FACET_FIELDS}
+        self._vocabulary: Dict[str, Dict[str, int]] = {f: {} for f in FACET_FIELDS}
+        self._row_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._size = 0
+        self._tombstones = 0
+        self._compactions = 0
+
+        self._generation = 0
+        self._duplicates_absorbed = 0
+        # Guards the row state; held briefly by searches to take a view
+        self._lock = threading.Lock()
+        # Serializes writes, including embedding and deduplication lookups
+        self._write_lock = threading.Lock()
+        self._read_executor = (
+            StorageExecutor(read_workers, name="read") if read_workers > 0 else None
+        )
+        self._write_executor = (
+            StorageExecutor(write_workers, name="write") if write_workers > 0 else None
+        )
+
+        if embedding_function is None:
+            embedding_function = create_embedding_function()
+        self.embedding_model_id = embedding_model_id(embedding_function)
+        self.embedding_cache: Optional[CachedEmbeddingFunction] = None
+        if embedding_cache_size > 0:
+            self.embedding_cache = CachedEmbeddingFunction(
+                embedding_function, max_entries=embedding_cache_size
+            )
+            embedding_function = self.embedding_cache
+        self.embedding_function = embedding_function
+
+    async def _read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking read on the read pool, or inline if there is none."""
+        if self._read_executor is None:
+            return fn(*args)
+        return await self._read_executor.run(fn, *args)
+
+    async def _write(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking write on the write pool, or inline if there is none."""
+        return await self._on_write_pool(self._locked_write, fn, *args)
+
+    async def _on_write_pool(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call on the write pool, or inline if there is none."""
+        if self._write_executor is None:
+            return fn(*args)
+        return await self._write_executor.run(fn, *args)
+
+    def _locked_write(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking write after the ones before it have finished."""
+        with self._write_lock:
+            result = fn(*args)
+            self._generation += 1
+            return result
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into normalized float32 rows (blocking)."""
+        return _normalize(self.embedding_function(texts))
+
+    def _check_dim(self, vectors: np.ndarray) -> None:
+        """Check that vectors match the dimension of the stored ones.
+
+        Raises:
+            ValueError: If the dimensions differ
+        """
+        if self._dim is not None and vectors.shape[1] != self._dim:
+            raise ValueError(
+                f"Embedding dimension mismatch: got {vectors.shape[1]}, "
+                f"the store holds {self._dim}"
+            )
+
+    def _reserve(self, rows: int, dim: int) -> None:
+        """Make room for more rows, doubling the capacity (caller locks)."""
+        if self._dim is None:
+            self._dim = dim
+            self._matrix = np.zeros((0, dim), dtype=np.float32)
+        needed = self._size + rows
+        capacity = len(self._matrix)
+        if needed <= capacity:
+            return
+        capacity = max(capacity, self.initial_capacity)
+        while capacity < needed:
+            capacity *= 2
+        self._matrix = _resized(self._matrix, capacity)
+        self._alive = _resized(self._alive, capacity)
+        for field in FACET_FIELDS:
+            self._codes[field] = _resized(self._codes[field], capacity)
+
+    def _append(self, errors: List[ErrorRecord], vectors: np.ndarray) -> None:
+        """Store new records and their normalized vectors (caller holds the write lock).
+
+        Raises:
+            ValueError: If the vectors do not match the stored dimension
+        """
+        if not errors:
+            return
+        self._check_dim(vectors)
+        stored = [error.model_copy(deep=True) for error in errors]
+        ids = [str(error.id) for error in stored]
+        facets = [_facet_values(error) for error in stored]
+        with self._lock:
+            self._reserve(len(stored), vectors.shape[1])
+            start = self._size
+            end = start + len(stored)
+            self._matrix[start:end] = vectors
+            self._alive[start:end] = True
+            for field in FACET_FIELDS:
+                vocabulary = self._vocabulary[field]
+                self._codes[field][start:end] = [
+                    vocabulary.setdefault(values[field], len(vocabulary))
+                    for values in facets
+                ]
+            self._row_ids.extend(ids)
+            for row, (record_id, error) in enumerate(zip(ids, stored), start):
+                self._rows[record_id] = row
+                self._records[record_id] = error
+            # Rows become visible to searches once the size covers them
+            self._size = end
+        for record_id, error in zip(ids, stored):
+            self._fingerprints.setdefault(error_fingerprint(error), record_id)
+        self._lexical.add(ids, [embedding_text(error) for error in stored])
+        self._facets.add(ids, facets)
+
+    def _tombstone(self, record_id: str) -> None:
+        """Mark a stored record's row dead (caller holds the write lock)."""
+        with self._lock:
+            row = self._rows.pop(record_id)
+            error = self._records.pop(record_id)
+            self._alive[row] = False
+            self._tombstones += 1
+        fingerprint = error_fingerprint(error)
+        if self._fingerprints.get(fingerprint) == record_id:
+            del self._fingerprints[fingerprint]
+        self._lexical.remove([record_id])
+        self._facets.remove([record_id])
+
+    def _compact_rows(self) -> None:
+        """Drop the tombstoned rows into a new, smaller matrix (caller locks)."""
+        live = np.flatnonzero(self._alive[: self._size])
+        capacity = self.initial_capacity
+        while capacity < len(live):
+            capacity *= 2
+        self._matrix = _resized(self._matrix[live], capacity)
+        self._alive = _resized(self._alive[live], capacity)
+        for field in FACET_FIELDS:
+            self._codes[field] = _resized(self._codes[field][live], capacity)
+        self._row_ids = [self._row_ids[row] for row in live]
+        self._rows = {record_id: row for row, record_id in enumerate(self._row_ids)}
+        self._size = len(live)
+        self._tombstones = 0
+        self._compactions += 1
+
+    def _maybe_compact(self) -> None:
+        """Compact once enough rows are tombstoned (caller holds the write lock)."""
+        with self._lock:
+            if self._tombstones and (
+                self._tombstones >= self.compaction_threshold * self._size
+            ):
+                self._compact_rows()
+
+    def _copies(self, errors: Sequence[Optional[ErrorRecord]]) -> List[Any]:
+        """Copy stored records, so callers cannot change them in place."""
+        return [error.model_copy(deep=True) if error else None for error in errors]
+
+    async def add_error(self, error: ErrorRecord) -> ErrorRecord:
+        """Add a new error record to storage."""
+        return await self._write(self._add_error_sync, error)
+
+    def _add_error_sync(self, error: ErrorRecord) -> ErrorRecord:
+        """Add a new error record to storage (blocking).
+
+        With deduplication enabled, a repeat of a stored error is merged into
+        that record and the merged record is returned instead.
+
+        Raises:
+            ValueError: If a record with the same ID is already stored
+        """
+        if str(error.id) in self._records:
+            raise ValueError(f"Error record already exists: {error.id}")
+        if self.dedup:
+            existing = self._fingerprints.get(error_fingerprint(error))
+            if existing is not None:
+                merged = merge_duplicate(self._records[existing], error)
+                self._records[existing] = merged
+                self._duplicates_absorbed += 1
+                return merged.model_copy(deep=True)
+        self._append([error], self._embed([embedding_text(error)]))
+        return error
+
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """Add several error records, embedding them in one pass."""
+        return await self._write(self._add_errors_sync, errors)
+
+    async def add_errors_with_embeddings(
+        self, errors: List[ErrorRecord], embeddings: Sequence[Optional[List[float]]]
+    ) -> List[BatchItemResult]:
+        """Add several error records, storing their precomputed embeddings."""
+        return await self._write(self._add_errors_sync, errors, embeddings)
+
+    def _add_errors_sync(
+        self,
+        errors: List[ErrorRecord],
+        embeddings: Optional[Sequence[Optional[List[float]]]] = None,
+    ) -> List[BatchItemResult]:
+        """Add several error records (blocking).
+
+        Records whose ID is repeated in the batch or already stored are
+        reported as failures, as are records given an embedding of another
+        dimension. With deduplication enabled, repeated errors are merged
+        instead of inserted. Records given an embedding are not re-embedded.
+        """
+        results: Dict[int, BatchItemResult] = {}
+        pending: Dict[int, ErrorRecord] = {}
+        seen = set()
+        for index, error in enumerate(errors):
+            record_id = str(error.id)
+            if record_id in seen or record_id in self._records:
+                results[index] = BatchItemResult(
+                    index=index,
+                    id=error.id,
+                    success=False,
+                    error=(
+                        "Duplicate ID in batch"
+                        if record_id in seen
+                        else "Error record already exists"
+                    ),
+                )
+                continue
+            seen.add(record_id)
+            pending[index] = error
+
+        if self.dedup:
+            self._dedup_batch(pending, results)
+
+        vectors: Dict[int, np.ndarray] = {}
+        if embeddings is not None:
+            given = [index for index in pending if embeddings[index]]
+            for index in given:
+                vectors[index] = _normalize([embeddings[index]])[0]
+        missing = [index for index in pending if index not in vectors]
+        if missing:
+            embedded = self._embed([embedding_text(pending[i]) for i in missing])
+            vectors.update(zip(missing, embedded))
+
+        dim = self._dim or (len(vectors[min(vectors)]) if vectors else 0)
+        accepted = []
+        for index, error in pending.items():
+            if len(vectors[index]) != dim:
+                results[index] = BatchItemResult(
+                    index=index,
+                    id=error.id,
+                    success=False,
+                    error=f"Embedding dimension mismatch: got "
+                    f"{len(vectors[index])}, the store holds {dim}",
+                )
+                continue
+            accepted.append(index)
+            results[index] = BatchItemResult(index=index, id=error.id, success=True)
+        if accepted:
+            self._append(
+                [pending[index] for index in accepted],
+                np.stack([vectors[index] for index in accepted]),
+            )
+        return [results[index] for index in range(len(errors))]
+
+    def _dedup_batch(
+        self, pending: Dict[int, ErrorRecord], results: Dict[int, BatchItemResult]
+    ) -> None:
+        """Merge repeated errors of a batch (blocking).
+
+        Repeats of stored records are merged into them, and repeats within
+        the batch are merged into the first occurrence; merged records are
+        removed from ``pending``.
+        """
+        first: Dict[str, int] = {}
+        for index in list(pending):
+            error = pending[index]
+            fingerprint = error_fingerprint(error)
+            existing = self._fingerprints.get(fingerprint)
+            if existing is not None:
+                target = merge_duplicate(self._records[existing], error)
+                self._records[existing] = target
+            elif fingerprint in first:
+                target = merge_duplicate(pending[first[fingerprint]], error)
+                pending[first[fingerprint]] = target
+            else:
+                first[fingerprint] = index
+                continue
+            del pending[index]
+            self._duplicates_absorbed += 1
+            results[index] = BatchItemResult(
+                index=index, id=target.id, success=True, deduplicated=True
+            )
+
+    async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
+        """Retrieve an error record by ID."""
+        return self._copies([self._records.get(str(error_id))])[0]
+
+    async def get_errors(self, error_ids: List[UUID]) -> List[Optional[ErrorRecord]]:
+        """Retrieve several error records by ID."""
+        return self._copies([self._records.get(str(i)) for i in error_ids])
+
+    def _get_found(self, ids: List[str]) -> List[ErrorRecord]:
+        """Copy the stored records with the given IDs, skipping missing ones."""
+        return self._copies([self._records[i] for i in ids if i in self._records])
+
+    async def iter_errors(self, batch_size: int = 500) -> AsyncIterator[ErrorRecord]:
+        """Iterate over every stored error record."""
+        async for record, _ in self._iter_rows(batch_size, include_embeddings=False):
+            yield record
+
+    async def iter_errors_with_embeddings(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over every stored error record with its stored vector."""
+        async for record, embedding in self._iter_rows(
+            batch_size, include_embeddings=True
+        ):
+            yield record, embedding
+
+    async def _iter_rows(
+        self, batch_size: int, include_embeddings: bool
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over the records stored when iteration starts, in batches.
+
+        Records deleted meanwhile are skipped.
+        """
+        ids = list(self._records)
+        batch_size = max(batch_size, 1)
+        for start in range(0, len(ids), batch_size):
+            rows = await self._read(
+                self._rows_sync, ids[start : start + batch_size], include_embeddings
+            )
+            for row in rows:
+                yield row
+
+    def _rows_sync(
+        self, ids: List[str], include_embeddings: bool
+    ) -> List[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Copy the records with the given IDs, and their vectors."""
+        rows = []
+        with self._lock:
+            for record_id in ids:
+                row = self._rows.get(record_id)
+                if row is None:
+                    continue
+                embedding = self._matrix[row].tolist() if include_embeddings else None
+                rows.append((self._records[record_id], embedding))
+        return [(error.model_copy(deep=True), vector) for error, vector in rows]
+
+    async def update_error(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record."""
+        return await self._write(self._update_error_sync, error_id, error)
+
+    def _update_error_sync(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record (blocking).
+
+        The record's row is tombstoned and the updated record is appended
+        with its new embedding, so no row changes under a running search.
+        """
+        stored = self._records.get(str(error_id))
+        if stored is None:
+            return None
+
+        # Keep the ID and creation time of the stored record
+        error.id = error_id
+        error.created_at = stored.created_at
+        vectors = self._embed([embedding_text(error)])
+        self._check_dim(vectors)
+        self._tombstone(str(error_id))
+        self._append([error], vectors)
+        self._maybe_compact()
+        return error
+
+    async def delete_error(self, error_id: UUID) -> bool:
+        """Delete an error record by ID."""
+        return await self._write(self._delete_error_sync, error_id)
+
+    def _delete_error_sync(self, error_id: UUID) -> bool:
+        """Delete an error record by ID (blocking)."""
+        if str(error_id) not in self._records:
+            return False
+        self._tombstone(str(error_id))
+        self._maybe_compact()
+        return True
+
+    def _vector_search(
+        self, queries: np.ndarray, limit: int, filters: Dict[str, str]
+    ) -> List[List[Tuple[str, float]]]:
+        """Find the records with the highest cosine similarity to each query.
+
+        Every live, matching row is scored, so the results are exact. The
+        filters and tombstones become one boolean mask; when it excludes
+        most rows, only the matching rows are multiplied.
+        """
+        empty: List[List[Tuple[str, float]]] = [[] for _ in range(len(queries))]
+        with self._lock:
+            size = self._size
+            matrix = self._matrix[:size]
+            mask = self._alive[:size].copy()
+            codes = {field: self._codes[field][:size] for field in filters}
+            row_ids = self._row_ids
+        if size == 0 or limit <= 0:
+            return empty
+        self._check_dim(queries)
+        for field, value in filters.items():
+            code = self._vocabulary[field].get(value)
+            if code is None:
+                return empty
+            mask &= codes[field] == code
+
+        rows = np.flatnonzero(mask)
+        if len(rows) == 0:
+            return empty
+        if len(rows) == size:
+            scores = matrix @ queries.T
+        elif len(rows) * 2 < size:
+            scores = matrix[rows] @ queries.T
+        else:
+            scores = (matrix @ queries.T)[rows]
+
+        k = min(limit, len(rows))
+        results = []
+        for column in scores.T:
+            top = np.argpartition(-column, k - 1)[:k]
+            top = top[np.argsort(-column[top], kind="stable")]
+            results.append([(row_ids[rows[i]], float(column[i])) for i in top])
+        return results
+
+    def _ranked_ids_sync(
+        self,
+        text: str,
+        max_results: int,
+        mode: SearchMode,
+        filters: Dict[str, str],
+    ) -> List[str]:
+        """Rank record IDs by vector, lexical or hybrid relevance (blocking).
+
+        Lexical ranking uses the BM25 index only and never calls the
+        embedding model. Hybrid ranking fuses the lexical and vector
+        rankings with reciprocal rank fusion.
+        """
+        depth = max_results
+        if mode == SearchMode.HYBRID:
+            depth = max_results * HYBRID_CANDIDATE_FACTOR
+
+        rankings = []
+        if mode != SearchMode.VECTOR:
+            allowed = self._facets.match(filters) if filters else None
+            matches = self._lexical.search(text, depth, allowed)
+            rankings.append([record_id for record_id, _ in matches])
+        if mode != SearchMode.LEXICAL:
+            matches = self._vector_search(self._embed([text]), depth, filters)[0]
+            rankings.append([record_id for record_id, _ in matches])
+        if len(rankings) == 1:
+            return rankings[0]
+        return reciprocal_rank_fusion(rankings)[:max_results]
+
+    async def search_errors(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query."""
+        return await self._read(self._search_errors_sync, query)
+
+    def _search_errors_sync(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query (blocking).
+
+        Without search text, the records matching the metadata filters are
+        returned in ID order.
+        """
+        if query.cursor:
+            return self._search_errors_page_sync(query).records
+
+        filters = query_filters(query)
+        search_text = query_text(query)
+        if search_text:
+            ids = self._ranked_ids_sync(
+                search_text, query.max_results, query.mode, filters
+            )
+        else:
+            ids = self._facets.page(filters, None, query.max_results)
+        return self._get_found(ids)
+
+    async def search_errors_page(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time."""
+        return await self._read(self._search_errors_page_sync, query)
+
+    def _search_errors_page_sync(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time (blocking).
+
+        Metadata-only listings resume after the last ID of the previous
+        page. Ranked searches snapshot the ranked IDs on the first page and
+        slice the snapshot on later pages.
+
+        Raises:
+            ValueError: If the cursor is invalid or has expired
+        """
+        filters = query_filters(query)
+        search_text = query_text(query)
+        page_size = query.max_results
+        position = decode_cursor(query)
+        next_position: Optional[Dict[str, Any]] = None
+        try:
+            if not search_text:
+                after = position["after"] if position else None
+                ids = self._facets.page(filters, after, page_size + 1)
+                if len(ids) > page_size:
+                    ids = ids[:page_size]
+                    next_position = {"after": ids[-1]}
+            else:
+                if position is None:
+                    ranked = self._ranked_ids_sync(
+                        search_text, snapshot_depth(page_size), query.mode, filters
+                    )
+                    offset, token = 0, None
+                else:
+                    token, offset = position["snapshot"], position["offset"]
+                    ranked = self._snapshots.get(token)
+                ids = ranked[offset : offset + page_size]
+                if offset + page_size < len(ranked):
+                    if token is None:
+                        token = self._snapshots.put(ranked)
+                    next_position = {"snapshot": token, "offset": offset + page_size}
+        except (KeyError, TypeError):
+            raise ValueError("Invalid cursor") from None
+
+        return ErrorPage(
+            # Records deleted since the snapshot was taken are skipped
+            records=self._get_found(ids),
+            next_cursor=encode_cursor(query, next_position) if next_position else None,
+        )
+
+    async def search_similar(
+        self, text_query: str, max_results: int = 5
+    ) -> List[ErrorRecord]:
+        """Search for error records with similar text content."""
+        return (await self.search_similar_many([text_query], max_results))[0]
+
+    async def search_similar_many(
+        self, text_queries: List[str], max_results: int = 5
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts with one matrix product."""
+        return await self._read(
+            self._search_similar_many_sync, text_queries, max_results
+        )
+
+    def _search_similar_many_sync(
+        self, text_queries: List[str], max_results: int
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts (blocking)."""
+        if not text_queries:
+            return []
+        ranked = self._vector_search(self._embed(list(text_queries)), max_results, {})
+        return [
+            self._get_found([record_id for record_id, _ in matches])
+            for matches in ranked
+        ]
+
+    async def facet_counts(
+        self, filters: Optional[Dict[str, str]] = None
+    ) -> FacetCounts:
+        """Count the records per error type, language and framework."""
+        total, facets = self._facets.counts(filters)
+        return FacetCounts(total=total, facets=facets)
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every committed add, update and delete."""
+        return self._generation
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        """Identify the embedder that produced the stored vectors."""
+        return self.embedding_model_id
+
+    def _matrix_bytes(self) -> int:
+        """Get the memory held by the row arrays."""
+        return (
+            self._matrix.nbytes
+            + self._alive.nbytes
+            + sum(codes.nbytes for codes in self._codes.values())
+        )
+
+    async def compact(
+        self, threshold: float = DEFAULT_COMPACTION_THRESHOLD, force: bool = False
+    ) -> CompactionReport:
+        """Drop tombstoned rows if enough of the matrix is dead."""
+        return await self._on_write_pool(self._compact_sync, threshold, force)
+
+    def _compact_sync(self, threshold: float, force: bool) -> CompactionReport:
+        """Drop tombstoned rows if enough of the matrix is dead (blocking)."""
+        started = time.perf_counter()
+        with self._write_lock, self._lock:
+            bytes_before = self._matrix_bytes()
+            report = CompactionReport(
+                compacted=False,
+                records=len(self._rows),
+                deleted_ratio=self._tombstones / max(self._size, 1),
+                free_page_ratio=0.0,
+                bytes_before=bytes_before,
+                bytes_after=bytes_before,
+            )
+            if not force and report.deleted_ratio < threshold:
+                return report
+            self._compact_rows()
+            report.bytes_after = self._matrix_bytes()
+        report.compacted = True
+        report.bytes_reclaimed = max(report.bytes_before - report.bytes_after, 0)
+        report.duration_seconds = time.perf_counter() - started
+        return report
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics, including executor queue metrics."""
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "backend": "memory",
+                "records": len(self._rows),
+                "capacity": len(self._matrix),
+                "tombstones": self._tombstones,
+                "compactions": self._compactions,
+                "matrix_bytes": self._matrix_bytes(),
+                "dedup": {
+                    "enabled": self.dedup,
+                    "duplicates_absorbed": self._duplicates_absorbed,
+                },
+            }
+        if self._read_executor is not None:
+            stats["read_executor"] = self._read_executor.metrics()
+        if self._write_executor is not None:
+            stats["write_executor"] = self._write_executor.metrics()
+        if self.embedding_cache is not None:
+            stats["embedding_cache"] = self.embedding_cache.metrics()
+        return stats
+
+    async def close(self) -> None:
+        """Wait for in-flight calls, then shut down the thread pools."""
+        for executor in (self._write_executor, self._read_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
@@ -9,11 +9,14 @@
 """Schema migration framework for Tribal database."""
 
 
+import json
 import logging
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from mcp_server_tribal import __version__
 
+from ..models.error_record import ErrorRecord
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -29,7 +32,7 @@ class MigrationManager:
         """Initialize the migration manager."""
         self.migrations: Dict[str, Dict[str, MigrationFn]] = {}
         self.compatibility_matrix: Dict[str, List[str]] = {
-            "0.1.0": ["1.0.0"],  # App version 0.1.0 works with schema 1.0.0
+            "0.1.0": ["1.0.0", "1.1.0"],  # App version 0.1.0 works with 1.0.0-1.1.0
         }
 
     def register_migration(self, from_version: str, to_version: str, migration_fn: MigrationFn) -> None:
@@ -155,6 +158,78 @@ class MigrationManager:
 # Initialize the global migration manager
 migration_manager = MigrationManager()
 
+# Number of records re-embedded per batch by data migrations
+MIGRATION_BATCH_SIZE = 100
+
+# Collection metadata key holding the offset of an interrupted migration
+MIGRATION_CURSOR_KEY = "migration_cursor"
+
+
+# Prefix of ChromaDB's HNSW index settings in collection metadata
+HNSW_KEY_PREFIX = "hnsw:"
+
+# Prefix of the copies of the HNSW settings kept through metadata updates
+PRESERVED_HNSW_KEY_PREFIX = "tribal:hnsw:"
+
+
+def update_collection_metadata(
+    collection: Any, updates: Dict[str, Any], remove: Iterable[str] = ()
+) -> None:
+    """
+    Update selected keys of a ChromaDB collection's metadata.
+
+    ChromaDB replaces the whole metadata on modify and refuses HNSW keys, so
+    the current metadata is merged with the updates and HNSW keys are passed
+    under a preserved prefix instead. The index keeps its settings, and
+    collection_creation_metadata reads them back for a rebuild or copy.
+
+    Args:
+        collection: The ChromaDB collection
+        updates: Keys and values to set
+        remove: Keys to remove
+    """
+    removed = set(remove)
+    current = collection.metadata or {}
+    metadata = {
+        key: value
+        for key, value in current.items()
+        if not key.startswith(HNSW_KEY_PREFIX) and key not in removed
+    }
+    for key, value in collection_creation_metadata(current).items():
+        if key.startswith(HNSW_KEY_PREFIX):
+            name = key[len(HNSW_KEY_PREFIX) :]
+            metadata[PRESERVED_HNSW_KEY_PREFIX + name] = value
+    metadata.update(updates)
+    collection.modify(metadata=metadata)
+
+
+def collection_creation_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Get the metadata to create a copy of a collection with.
+
+    HNSW settings preserved by update_collection_metadata are restored to
+    their ChromaDB keys, so the copy uses the same distance function.
+
+    Args:
+        metadata: The collection's metadata
+
+    Returns:
+        The metadata with the HNSW settings under their ChromaDB keys
+    """
+    restored: Dict[str, Any] = {}
+    settings: Dict[str, Any] = {}
+    for key, value in (metadata or {}).items():
+        if key.startswith(PRESERVED_HNSW_KEY_PREFIX):
+            name = key[len(PRESERVED_HNSW_KEY_PREFIX) :]
+            settings.setdefault(HNSW_KEY_PREFIX + name, value)
+        elif key.startswith(HNSW_KEY_PREFIX):
+            settings[key] = value
+        else:
+            restored[key] = value
+    restored.update(settings)
+    return restored
+
+
 # Register migrations
 
 # Initial schema migration (0.0.0 -> 1.0.0)
@@ -162,15 +237,58 @@ def migrate_initial_to_v1(storage: Any) -> None:
     """Migrate from initial schema (0.0.0) to version 1.0.0."""
     # For ChromaDB this is just updating the metadata
     if hasattr(storage, 'collection'):
-        storage.collection.modify(metadata={"schema_version": "1.0.0"})
+        update_collection_metadata(storage.collection, {"schema_version": "1.0.0"})
         logger.info("Updated schema version to 1.0.0")
 
 migration_manager.register_migration("0.0.0", "1.0.0", migrate_initial_to_v1)
 
-# Example migration for future use (1.0.0 -> 1.1.0)
-# def migrate_v1_to_v1_1(storage: Any) -> None:
-#     """Migrate from schema 1.0.0 to 1.1.0."""
-#     # Example: Add new fields, update embeddings, etc.
-#     pass
-#
-# migration_manager.register_migration("1.0.0", "1.1.0", migrate_v1_to_v1_1)
+
+# Dedicated embedding text migration (1.0.0 -> 1.1.0)
+def migrate_v1_to_v1_1(storage: Any, batch_size: int = MIGRATION_BATCH_SIZE) -> None:
+    """Migrate from schema 1.0.0 to 1.1.0.
+
+    Schema 1.0.0 stored each record as a JSON document, so embeddings were
+    computed over JSON keys, IDs and timestamps. This re-embeds every record
+    from its curated embedding text and moves the record into metadata.
+
+    Records are processed in batches in ChromaDB's insertion order, and the
+    offset reached is saved in the collection metadata after each batch, so an
+    interrupted migration resumes where it stopped.
+    """
+    collection = storage.collection
+    offset = int((collection.metadata or {}).get(MIGRATION_CURSOR_KEY, 0))
+    if offset:
+        logger.info(f"Resuming schema 1.1.0 migration at record {offset}")
+
+    while True:
+        batch = collection.get(
+            limit=batch_size, offset=offset, include=["documents", "metadatas"]
+        )
+        if not batch["ids"]:
+            break
+
+        ids, documents, metadatas = [], [], []
+        for record_id, document, metadata in zip(
+            batch["ids"], batch["documents"], batch["metadatas"]
+        ):
+            if metadata and "record" in metadata:
+                continue  # Already migrated
+            record = ErrorRecord.model_validate(json.loads(document))
+            record.schema_version = "1.1.0"
+            ids.append(record_id)
+            documents.append(storage._create_embedding_text(record))
+            metadatas.append(storage._error_to_metadata(record))
+
+        if ids:
+            collection.update(ids=ids, documents=documents, metadatas=metadatas)
+
+        offset += len(batch["ids"])
+        update_collection_metadata(collection, {MIGRATION_CURSOR_KEY: offset})
+        logger.info(f"Re-embedded {offset} records for schema 1.1.0")
+
+    update_collection_metadata(
+        collection, {"schema_version": "1.1.0"}, remove=[MIGRATION_CURSOR_KEY]
+    )
+    logger.info("Updated schema version to 1.1.0")
+
+migration_manager.register_migration("1.0.0", "1.1.0", migrate_v1_to_v1_1)
@@ -0,0 +1,804 @@
+# filename: mcp_server_tribal/services/mmap_storage.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Memory-mapped, read-only snapshot files.
+
+A snapshot file holds every record of a store in a layout that can be
+served without loading it:
+
+- a 16-byte prefix: magic bytes, format version and header length;
+- a JSON header with the record count, vector dimension and type, the
+  embedder, the facet values and the position of each section;
+- 64-byte aligned sections: record IDs in ascending order, the normalized
+  embedding matrix (float32, or int8 codes with per-row float32 scales),
+  per-row facet value codes, record payload offsets, and the records as
+  packed JSON.
+
+Opening a file maps it and wraps each section in a NumPy array without
+copying, so startup takes the same time for any store size and pages are
+read from disk only when a search or lookup touches them.
+"""
+
+
+import asyncio
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from datetime import UTC, datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID
+
+import numpy as np
+
+from ..models.error_record import (
+    BatchItemResult,
+    ErrorPage,
+    ErrorQuery,
+    ErrorRecord,
+    FacetCounts,
+    SearchMode,
+)
+from .embedding_cache import CachedEmbeddingFunction
+from .embeddings import create_embedding_function, embedding_model_id, embedding_text
+from .executor import StorageExecutor
+from .facet_index import FACET_FIELDS
+from .lexical_index import (
+    HYBRID_CANDIDATE_FACTOR,
+    BM25Index,
+    reciprocal_rank_fusion,
+)
+from .pagination import (
+    RankingSnapshots,
+    decode_cursor,
+    encode_cursor,
+    snapshot_depth,
+)
+from .quantized_index import ID_WIDTH, SCAN_BLOCK_ROWS, QuantizedVectorIndex
+from .storage_interface import StorageInterface, query_filters, query_text
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Magic bytes and version of the snapshot file format
+MMAP_MAGIC = b"TRIBMMAP"
+MMAP_FORMAT_VERSION = 1
+
+# Magic bytes, format version and JSON header length
+MMAP_PREFIX = struct.Struct("<8sII")
+
+# Alignment of each section, so the arrays can be mapped in place
+SECTION_ALIGNMENT = 64
+
+# Element types of the sections; all little-endian
+ID_DTYPE = np.dtype(f"S{ID_WIDTH}")
+VECTOR_DTYPES = {"float32": np.dtype("<f4"), "int8": np.dtype("i1")}
+SCALE_DTYPE = np.dtype("<f4")
+FACET_DTYPE = np.dtype("<i4")
+OFFSET_DTYPE = np.dtype("<u8")
+
+T = TypeVar("T")
+
+
+def _aligned(offset: int) -> int:
+    """Round an offset up to the section alignment."""
+    return -(-offset // SECTION_ALIGNMENT) * SECTION_ALIGNMENT
+
+
+async def write_mmap_snapshot(
+    storage: StorageInterface,
+    path: str,
+    quantized: bool = False,
+    batch_size: int = 500,
+) -> Dict[str, Any]:
+    """
+    Write every record of a storage, with its stored vector, to a snapshot file.
+
+    Records and vectors are streamed to scratch files next to the target,
+    then written out in ID order. The file is replaced atomically, so
+    servers can keep serving the previous file until they reopen.
+
+    Args:
+        storage: The storage to snapshot
+        path: The snapshot file to write
+        quantized: Store int8 codes with per-row scales instead of float32
+            vectors, a quarter of the size; similarity scores become
+            approximate
+        batch_size: Number of records read per storage call
+
+    Returns:
+        The path, record count, vector dimension and type, and file size
+
+    Raises:
+        ValueError: If a record has no stored vector or vectors differ in
+            dimension
+    """
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    ids: List[str] = []
+    lengths: List[int] = []
+    facets: List[Tuple[int, ...]] = []
+    values: Dict[str, Dict[str, int]] = {field: {} for field in FACET_FIELDS}
+    dim: Optional[int] = None
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(path)) as scratch:
+        payload_path = os.path.join(scratch, "payload")
+        vectors_path = os.path.join(scratch, "vectors")
+        with open(payload_path, "wb") as payload, open(vectors_path, "wb") as vectors:
+            async for record, embedding in storage.iter_errors_with_embeddings(
+                batch_size
+            ):
+                if embedding is None:
+                    raise ValueError(f"Record {record.id} has no stored vector")
+                if dim is None:
+                    dim = len(embedding)
+                if len(embedding) != dim:
+                    raise ValueError(
+                        f"Record {record.id} has a vector of dimension "
+                        f"{len(embedding)}, expected {dim}"
+                    )
+                data = record.model_dump_json().encode("utf-8")
+                payload.write(data)
+                vectors.write(np.asarray(embedding, dtype="<f4").tobytes())
+                ids.append(str(record.id))
+                lengths.append(len(data))
+                facets.append(
+                    tuple(
+                        values[field].setdefault(value, len(values[field]))
+                        for field, value in (
+                            ("error_type", record.error_type),
+                            ("language", record.context.language),
+                            ("framework", record.context.framework or ""),
+                        )
+                    )
+                )
+
+        header = {
+            "format": "tribal-mmap",
+            "created_at": datetime.now(UTC).isoformat(),
+            "embedding_model": storage.embedding_model,
+            "count": len(ids),
+            "dim": dim or 0,
+            "dtype": "int8" if quantized else "float32",
+            "facets": {field: list(values[field]) for field in FACET_FIELDS},
+        }
+        await asyncio.to_thread(
+            _write_sections,
+            path,
+            header,
+            ids,
+            lengths,
+            facets,
+            payload_path,
+            vectors_path,
+        )
+
+    return {
+        "path": path,
+        "records": header["count"],
+        "dim": header["dim"],
+        "dtype": header["dtype"],
+        "bytes": os.path.getsize(path),
+    }
+
+
+def _write_sections(
+    path: str,
+    header: Dict[str, Any],
+    ids: List[str],
+    lengths: List[int],
+    facets: List[Tuple[int, ...]],
+    payload_path: str,
+    vectors_path: str,
+) -> None:
+    """Write the snapshot file from the scratch files, in ID order (blocking)."""
+    count, dim, dtype = header["count"], header["dim"], header["dtype"]
+    order = np.argsort(np.array(ids, dtype=ID_DTYPE), kind="stable")
+    lengths_array = np.array(lengths, dtype=np.int64)
+    source_offsets = np.concatenate([[0], np.cumsum(lengths_array)])
+    offsets = np.concatenate([[0], np.cumsum(lengths_array[order])]).astype(
+        OFFSET_DTYPE
+    )
+
+    sizes = {
+        "ids": count * ID_DTYPE.itemsize,
+        "vectors": count * dim * VECTOR_DTYPES[dtype].itemsize,
+        "scales": count * SCALE_DTYPE.itemsize if dtype == "int8" else 0,
+        "facets": count * len(FACET_FIELDS) * FACET_DTYPE.itemsize,
+        "offsets": (count + 1) * OFFSET_DTYPE.itemsize,
+        "payload": int(offsets[-1]),
+    }
+    sections: Dict[str, List[int]] = {}
+    position = 0
+    for name, size in sizes.items():
+        sections[name] = [position, size]
+        position = _aligned(position + size)
+    header = {**header, "sections": sections}
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = _aligned(MMAP_PREFIX.size + len(header_bytes))
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as target:
+
+        def seek(name: str) -> None:
+            target.write(b"\0" * (data_start + sections[name][0] - target.tell()))
+
+        target.write(
+            MMAP_PREFIX.pack(MMAP_MAGIC, MMAP_FORMAT_VERSION, len(header_bytes))
+        )
+        target.write(header_bytes)
+
+        seek("ids")
+        target.write(np.array(ids, dtype=ID_DTYPE)[order].tobytes())
+
+        if count:
+            source = np.memmap(vectors_path, dtype="<f4", mode="r", shape=(count, dim))
+            scales = []
+            seek("vectors")
+            for start in range(0, count, SCAN_BLOCK_ROWS):
+                normalized, codes, block_scales = QuantizedVectorIndex.quantize(
+                    source[order[start : start + SCAN_BLOCK_ROWS]]
+                )
+                block = codes if dtype == "int8" else normalized.astype("<f4")
+                target.write(block.tobytes())
+                scales.append(block_scales)
+            del source
+            if dtype == "int8":
+                seek("scales")
+                target.write(np.concatenate(scales).astype(SCALE_DTYPE).tobytes())
+
+        seek("facets")
+        facet_codes = np.array(facets, dtype=FACET_DTYPE).reshape(
+            count, len(FACET_FIELDS)
+        )
+        target.write(facet_codes[order].tobytes())
+
+        seek("offsets")
+        target.write(offsets.tobytes())
+
+        seek("payload")
+        with open(payload_path, "rb") as payload:
+            for row in order:
+                payload.seek(int(source_offsets[row]))
+                target.write(payload.read(int(lengths_array[row])))
+
+        target.flush()
+        os.fsync(target.fileno())
+    os.replace(temp_path, path)
+
+
+class MmapSnapshotStorage(StorageInterface):
+    """Read-only storage served from a memory-mapped snapshot file."""
+
+    def __init__(
+        self,
+        path: str,
+        read_workers: int = 0,
+        embedding_function: Optional[Callable[[List[str]], Any]] = None,
+        embedding_cache_size: int = 0,
+    ):
+        """
+        Open a snapshot file.
+
+        Only the prefix and header are read; the sections are mapped and
+        read lazily by the searches and lookups that touch them.
+
+        Args:
+            path: The snapshot file
+            read_workers: Thread pool size for reads (0 runs reads inline)
+            embedding_function: Embedding function for queries (defaults to
+                ChromaDB's default model); it must be the one the snapshot
+                was embedded with
+            embedding_cache_size: Query vectors kept in the embedding cache
+                (0 disables it)
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported format
+                version, or was embedded with another embedder
+        """
+        self.path = path
+        with open(path, "rb") as snapshot:
+            self._mmap = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open_sections()
+        except Exception:
+            self._unmap()
+            raise
+
+        if embedding_function is None:
+            embedding_function = create_embedding_function()
+        self.embedding_model_id = embedding_model_id(embedding_function)
+        recorded = self.header.get("embedding_model")
+        if recorded is not None and recorded != self.embedding_model_id:
+            self._unmap()
+            raise ValueError(
+                f"Embedding function mismatch: the snapshot was embedded with "
+                f"{recorded}, but {self.embedding_model_id} is configured. "
+                f"Configure the original embedder."
+            )
+        self.embedding_cache: Optional[CachedEmbeddingFunction] = None
+        if embedding_cache_size > 0:
+            self.embedding_cache = CachedEmbeddingFunction(
+                embedding_function, max_entries=embedding_cache_size
+            )
+            embedding_function = self.embedding_cache
+        self.embedding_function = embedding_function
+
+        self._read_executor = (
+            StorageExecutor(read_workers, name="read") if read_workers > 0 else None
+        )
+        self._snapshots = RankingSnapshots()
+        self._lexical: Optional[BM25Index] = None
+        self._lexical_lock = threading.Lock()
+
+    def _open_sections(self) -> None:
+        """Parse the header and wrap the sections in arrays (no copies)."""
+        if len(self._mmap) < MMAP_PREFIX.size:
+            raise ValueError(f"{self.path} is not a Tribal mmap snapshot")
+        magic, version, header_length = MMAP_PREFIX.unpack_from(self._mmap)
+        if magic != MMAP_MAGIC:
+            raise ValueError(f"{self.path} is not a Tribal mmap snapshot")
+        if version > MMAP_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported mmap snapshot version: {version}. This version "
+                f"of Tribal supports version {MMAP_FORMAT_VERSION}."
+            )
+        header_end = MMAP_PREFIX.size + header_length
+        self.header: Dict[str, Any] = json.loads(
+            self._mmap[MMAP_PREFIX.size : header_end]
+        )
+        data_start = _aligned(header_end)
+        self.count = self.header["count"]
+        self.dim = self.header["dim"]
+        self.dtype = self.header["dtype"]
+        self._facet_values = [self.header["facets"][f] for f in FACET_FIELDS]
+
+        def section(name: str, dtype: np.dtype, count: int) -> np.ndarray:
+            offset, size = self.header["sections"][name]
+            if size != count * dtype.itemsize:
+                raise ValueError(f"Corrupt mmap snapshot section: {name}")
+            return np.frombuffer(
+                self._mmap, dtype=dtype, count=count, offset=data_start + offset
+            )
+
+        self._ids = section("ids", ID_DTYPE, self.count)
+        self._vectors = section(
+            "vectors", VECTOR_DTYPES[self.dtype], self.count * self.dim
+        ).reshape(self.count, self.dim)
+        self._scales = (
+            section("scales", SCALE_DTYPE, self.count) if self.dtype == "int8" else None
+        )
+        self._facets = section(
+            "facets", FACET_DTYPE, self.count * len(FACET_FIELDS)
+        ).reshape(self.count, len(FACET_FIELDS))
+        self._offsets = section("offsets", OFFSET_DTYPE, self.count + 1)
+        self._payload_start = data_start + self.header["sections"]["payload"][0]
+
+    async def _read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking read on the read pool, or inline if there is none."""
+        if self._read_executor is None:
+            return fn(*args)
+        return await self._read_executor.run(fn, *args)
+
+    def _read_only(self) -> NotImplementedError:
+        """Build the error raised by writes."""
+        return NotImplementedError("Mmap snapshots are read-only")
+
+    async def add_error(self, error: ErrorRecord) -> ErrorRecord:
+        """Refuse to add a record; snapshots are read-only."""
+        raise self._read_only()
+
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """Refuse to add records; snapshots are read-only."""
+        raise self._read_only()
+
+    async def add_errors_with_embeddings(
+        self, errors: List[ErrorRecord], embeddings: Any
+    ) -> List[BatchItemResult]:
+        """Refuse to add records; snapshots are read-only."""
+        raise self._read_only()
+
+    async def update_error(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Refuse to update a record; snapshots are read-only."""
+        raise self._read_only()
+
+    async def delete_error(self, error_id: UUID) -> bool:
+        """Refuse to delete a record; snapshots are read-only."""
+        raise self._read_only()
+
+    def _record(self, row: int) -> ErrorRecord:
+        """Decode the record of a row."""
+        start = self._payload_start + int(self._offsets[row])
+        end = self._payload_start + int(self._offsets[row + 1])
+        return ErrorRecord.model_validate_json(self._mmap[start:end])
+
+    def _row_of(self, record_id: str) -> Optional[int]:
+        """Find the row of an ID by binary search over the sorted IDs."""
+        key = record_id.encode("ascii")
+        row = int(np.searchsorted(self._ids, key))
+        if row < self.count and self._ids[row] == key:
+            return row
+        return None
+
+    def _get_rows(self, ids: List[str]) -> List[Optional[ErrorRecord]]:
+        """Decode the records of IDs, None for unknown ones (blocking)."""
+        rows = [self._row_of(record_id) for record_id in ids]
+        return [None if row is None else self._record(row) for row in rows]
+
+    def _get_found(self, ids: List[str]) -> List[ErrorRecord]:
+        """Decode the records of IDs, skipping unknown ones (blocking)."""
+        return [error for error in self._get_rows(ids) if error]
+
+    async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
+        """Retrieve an error record by ID."""
+        return (await self._read(self._get_rows, [str(error_id)]))[0]
+
+    async def get_errors(self, error_ids: List[UUID]) -> List[Optional[ErrorRecord]]:
+        """Retrieve several error records by ID."""
+        return await self._read(self._get_rows, [str(i) for i in error_ids])
+
+    async def iter_errors(self, batch_size: int = 500) -> AsyncIterator[ErrorRecord]:
+        """Iterate over every record in ID order."""
+        async for record, _ in self._iter_rows(batch_size, include_embeddings=False):
+            yield record
+
+    async def iter_errors_with_embeddings(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over every record with its vector (dequantized if int8)."""
+        async for record, embedding in self._iter_rows(
+            batch_size, include_embeddings=True
+        ):
+            yield record, embedding
+
+    async def _iter_rows(
+        self, batch_size: int, include_embeddings: bool
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over the rows, one batch per read."""
+        batch_size = max(batch_size, 1)
+        for start in range(0, self.count, batch_size):
+            rows = await self._read(
+                self._rows_sync, start, start + batch_size, include_embeddings
+            )
+            for row in rows:
+                yield row
+
+    def _rows_sync(
+        self, start: int, end: int, include_embeddings: bool
+    ) -> List[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Decode a range of rows and, optionally, their vectors."""
+        end = min(end, self.count)
+        vectors = self._block_vectors(start, end) if include_embeddings else None
+        return [
+            (
+                self._record(row),
+                None if vectors is None else vectors[row - start].tolist(),
+            )
+            for row in range(start, end)
+        ]
+
+    def _block_vectors(self, start: int, end: int) -> np.ndarray:
+        """Get the float32 vectors of a range of rows."""
+        block = self._vectors[start:end]
+        if self._scales is None:
+            return block
+        return block.astype(np.float32) * self._scales[start:end, None]
+
+    def _facet_mask(self, filters: Dict[str, str]) -> Optional[np.ndarray]:
+        """Build a boolean mask of the rows matching facet filters.
+
+        Returns:
+            The mask, or None without filters
+        """
+        mask = None
+        for column, field in enumerate(FACET_FIELDS):
+            if field not in filters:
+                continue
+            try:
+                code = self._facet_values[column].index(filters[field])
+            except ValueError:
+                return np.zeros(self.count, dtype=bool)
+            matches = self._facets[:, column] == code
+            mask = matches if mask is None else mask & matches
+        return mask
+
+    def _vector_search(
+        self, queries: np.ndarray, limit: int, filters: Dict[str, str]
+    ) -> List[List[Tuple[str, float]]]:
+        """Find the rows with the highest cosine similarity to each query.
+
+        Rows are scored a block at a time, so only the scratch memory of one
+        block is used and the file is paged in as it is scanned. With int8
+        vectors the scores are approximate.
+        """
+        results: List[List[Tuple[int, float]]] = [[] for _ in range(len(queries))]
+        if self.count == 0 or limit <= 0:
+            return [[] for _ in range(len(queries))]
+        if queries.shape[1] != self.dim:
+            raise ValueError(
+                f"Embedding dimension mismatch: got {queries.shape[1]}, "
+                f"the snapshot holds {self.dim}"
+            )
+        mask = self._facet_mask(filters)
+        best_rows = [np.empty(0, np.int64) for _ in range(len(queries))]
+        best_scores = [np.empty(0, np.float32) for _ in range(len(queries))]
+        for start in range(0, self.count, SCAN_BLOCK_ROWS):
+            end = min(start + SCAN_BLOCK_ROWS, self.count)
+            rows = np.arange(start, end)
+            if mask is not None:
+                rows = rows[mask[start:end]]
+                if len(rows) == 0:
+                    continue
+                block = self._vectors[rows]
+                scales = None if self._scales is None else self._scales[rows]
+            else:
+                block = self._vectors[start:end]
+                scales = None if self._scales is None else self._scales[start:end]
+            scores = block.astype(np.float32, copy=False) @ queries.T
+            if scales is not None:
+                scores *= scales[:, None]
+            for column in range(len(queries)):
+                candidates = np.concatenate([best_scores[column], scores[:, column]])
+                candidate_rows = np.concatenate([best_rows[column], rows])
+                if len(candidates) > limit:
+                    keep = np.argpartition(-candidates, limit - 1)[:limit]
+                    candidates, candidate_rows = candidates[keep], candidate_rows[keep]
+                best_scores[column], best_rows[column] = candidates, candidate_rows
+
+        for column in range(len(queries)):
+            order = np.argsort(-best_scores[column], kind="stable")
+            results[column] = [
+                (
+                    self._ids[best_rows[column][i]].decode("ascii"),
+                    float(best_scores[column][i]),
+                )
+                for i in order
+            ]
+        return results
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed query texts into normalized float32 rows (blocking)."""
+        vectors = np.asarray(self.embedding_function(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _lexical_index(self) -> BM25Index:
+        """Get the BM25 index, building it from the records on first use."""
+        with self._lexical_lock:
+            if self._lexical is None:
+                index = BM25Index()
+                for start in range(0, self.count, SCAN_BLOCK_ROWS):
+                    rows = range(start, min(start + SCAN_BLOCK_ROWS, self.count))
+                    records = [self._record(row) for row in rows]
+                    index.add(
+                        [str(record.id) for record in records],
+                        [embedding_text(record) for record in records],
+                    )
+                self._lexical = index
+            return self._lexical
+
+    def _ranked_ids_sync(
+        self,
+        text: str,
+        max_results: int,
+        mode: SearchMode,
+        filters: Dict[str, str],
+    ) -> List[str]:
+        """Rank record IDs by vector, lexical or hybrid relevance (blocking).
+
+        The BM25 index is built on the first lexical or hybrid search, so
+        servers that only run similarity searches never decode every record.
+        """
+        depth = max_results
+        if mode == SearchMode.HYBRID:
+            depth = max_results * HYBRID_CANDIDATE_FACTOR
+
+        rankings = []
+        if mode != SearchMode.VECTOR:
+            mask = self._facet_mask(filters)
+            allowed = (
+                None
+                if mask is None
+                else [
+                    record_id.decode("ascii")
+                    for record_id in self._ids[np.flatnonzero(mask)]
+                ]
+            )
+            matches = self._lexical_index().search(text, depth, allowed)
+            rankings.append([record_id for record_id, _ in matches])
+        if mode != SearchMode.LEXICAL:
+            matches = self._vector_search(self._embed([text]), depth, filters)[0]
+            rankings.append([record_id for record_id, _ in matches])
+        if len(rankings) == 1:
+            return rankings[0]
+        return reciprocal_rank_fusion(rankings)[:max_results]
+
+    def _page_ids_sync(
+        self, filters: Dict[str, str], after: Optional[str], limit: int
+    ) -> List[str]:
+        """Get the lowest matching IDs above a key, using the ID order of rows."""
+        start = 0
+        if after is not None:
+            start = int(np.searchsorted(self._ids, after.encode("ascii"), "right"))
+        mask = self._facet_mask(filters)
+        if mask is None:
+            rows = np.arange(start, min(start + limit, self.count))
+        else:
+            rows = np.flatnonzero(mask[start:])[:limit] + start
+        return [record_id.decode("ascii") for record_id in self._ids[rows]]
+
+    async def search_errors(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query."""
+        return await self._read(self._search_errors_sync, query)
+
+    def _search_errors_sync(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query (blocking).
+
+        Without search text, the records matching the metadata filters are
+        returned in ID order.
+        """
+        if query.cursor:
+            return self._search_errors_page_sync(query).records
+
+        filters = query_filters(query)
+        search_text = query_text(query)
+        if search_text:
+            ids = self._ranked_ids_sync(
+                search_text, query.max_results, query.mode, filters
+            )
+        else:
+            ids = self._page_ids_sync(filters, None, query.max_results)
+        return self._get_found(ids)
+
+    async def search_errors_page(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time."""
+        return await self._read(self._search_errors_page_sync, query)
+
+    def _search_errors_page_sync(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time (blocking).
+
+        Metadata-only listings resume after the last ID of the previous
+        page. Ranked searches snapshot the ranked IDs on the first page and
+        slice the snapshot on later pages.
+
+        Raises:
+            ValueError: If the cursor is invalid or has expired
+        """
+        filters = query_filters(query)
+        search_text = query_text(query)
+        page_size = query.max_results
+        position = decode_cursor(query)
+        next_position: Optional[Dict[str, Any]] = None
+        try:
+            if not search_text:
+                after = position["after"] if position else None
+                ids = self._page_ids_sync(filters, after, page_size + 1)
+                if len(ids) > page_size:
+                    ids = ids[:page_size]
+                    next_position = {"after": ids[-1]}
+            else:
+                if position is None:
+                    ranked = self._ranked_ids_sync(
+                        search_text, snapshot_depth(page_size), query.mode, filters
+                    )
+                    offset, token = 0, None
+                else:
+                    token, offset = position["snapshot"], position["offset"]
+                    ranked = self._snapshots.get(token)
+                ids = ranked[offset : offset + page_size]
+                if offset + page_size < len(ranked):
+                    if token is None:
+                        token = self._snapshots.put(ranked)
+                    next_position = {"snapshot": token, "offset": offset + page_size}
+        except (KeyError, TypeError):
+            raise ValueError("Invalid cursor") from None
+
+        return ErrorPage(
+            records=self._get_found(ids),
+            next_cursor=encode_cursor(query, next_position) if next_position else None,
+        )
+
+    async def search_similar(
+        self, text_query: str, max_results: int = 5
+    ) -> List[ErrorRecord]:
+        """Search for error records with similar text content."""
+        return (await self.search_similar_many([text_query], max_results))[0]
+
+    async def search_similar_many(
+        self, text_queries: List[str], max_results: int = 5
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts in one scan."""
+        return await self._read(
+            self._search_similar_many_sync, text_queries, max_results
+        )
+
+    def _search_similar_many_sync(
+        self, text_queries: List[str], max_results: int
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts (blocking)."""
+        if not text_queries:
+            return []
+        ranked = self._vector_search(self._embed(list(text_queries)), max_results, {})
+        return [self._get_found([i for i, _ in matches]) for matches in ranked]
+
+    async def facet_counts(
+        self, filters: Optional[Dict[str, str]] = None
+    ) -> FacetCounts:
+        """Count the records per error type, language and framework."""
+        return await self._read(self._facet_counts_sync, filters or {})
+
+    def _facet_counts_sync(self, filters: Dict[str, str]) -> FacetCounts:
+        """Count the records per facet value over the facet code columns."""
+        mask = self._facet_mask(filters)
+        codes = self._facets if mask is None else self._facets[mask]
+        facets: Dict[str, Dict[str, int]] = {}
+        for column, field in enumerate(FACET_FIELDS):
+            values = self._facet_values[column]
+            counts = np.bincount(codes[:, column], minlength=len(values))
+            # Records without a value, such as no framework, are not counted
+            facets[field] = {
+                value: int(count)
+                for value, count in zip(values, counts)
+                if value and count
+            }
+        return FacetCounts(total=len(codes), facets=facets)
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        """Identify the embedder that produced the stored vectors."""
+        return self.header.get("embedding_model")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics."""
+        stats: Dict[str, Any] = {
+            "backend": "mmap",
+            "path": self.path,
+            "records": self.count,
+            "dim": self.dim,
+            "dtype": self.dtype,
+            "file_bytes": len(self._mmap),
+            "created_at": self.header.get("created_at"),
+        }
+        if self._read_executor is not None:
+            stats["read_executor"] = self._read_executor.metrics()
+        if self.embedding_cache is not None:
+            stats["embedding_cache"] = self.embedding_cache.metrics()
+        return stats
+
+    async def close(self) -> None:
+        """Wait for in-flight reads, then unmap the file."""
+        if self._read_executor is not None:
+            self._read_executor.shutdown(wait=True)
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
+        self._unmap()
+
+    def _unmap(self) -> None:
+        """Release the section arrays, then unmap the file."""
+        # The arrays export the map's buffer, which must be released first
+        for name in ("_ids", "_vectors", "_scales", "_facets", "_offsets"):
+            self.__dict__.pop(name, None)
+        try:
+            self._mmap.close()
+        except BufferError:
+            logger.warning(f"{self.path} is still referenced and stays mapped")
@@ -0,0 +1,167 @@
+# filename: mcp_server_tribal/services/pagination.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Opaque cursors and ranking snapshots for paginated searches."""
+
+
+import base64
+import binascii
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models.error_record import ErrorQuery
+
+# Maximum number of pages of a ranked search kept in its snapshot
+RANKED_SNAPSHOT_PAGES = 20
+
+# Maximum number of IDs kept in a ranked search snapshot
+RANKED_SNAPSHOT_LIMIT = 1000
+
+
+def query_key(query: ErrorQuery) -> str:
+    """
+    Identify the search a query pages through.
+
+    The page size and cursor are left out, so every page of a search has
+    the same key.
+
+    Args:
+        query: The search query
+
+    Returns:
+        A short digest of the query parameters
+    """
+    fields = query.model_dump(mode="json", exclude={"cursor", "max_results"})
+    digest = hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def encode_cursor(query: ErrorQuery, position: Dict[str, Any]) -> str:
+    """
+    Encode the position after a page into an opaque cursor.
+
+    Args:
+        query: The search query the cursor belongs to
+        position: Backend-specific position of the next page
+
+    Returns:
+        A URL-safe cursor string
+    """
+    payload = json.dumps({"q": query_key(query), **position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(query: ErrorQuery) -> Optional[Dict[str, Any]]:
+    """
+    Decode the cursor of a query.
+
+    Args:
+        query: The search query holding the cursor
+
+    Returns:
+        The position of the requested page, or None for the first page
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another search
+    """
+    if not query.cursor:
+        return None
+    try:
+        padded = query.cursor + "=" * (-len(query.cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(position, dict) or position.pop("q", None) != query_key(query):
+        raise ValueError("Cursor does not belong to this search")
+    return position
+
+
+def snapshot_depth(page_size: int) -> int:
+    """
+    Get the number of ranked IDs to keep for a search.
+
+    Args:
+        page_size: Results per page
+
+    Returns:
+        The snapshot size, bounded by ``RANKED_SNAPSHOT_LIMIT``
+    """
+    return min(page_size * RANKED_SNAPSHOT_PAGES, RANKED_SNAPSHOT_LIMIT)
+
+
+class RankingSnapshots:
+    """
+    Bounded store of ranked ID lists for paging through ranked searches.
+
+    Vector and lexical rankings cannot be resumed from a key, so the first
+    page of a ranked search stores the ranked IDs, and later pages slice
+    them. Pages keep a stable order while records are added, and fetching
+    a page costs the same at any depth. Snapshots expire after ``ttl``
+    seconds, and the least recently used are evicted beyond
+    ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 600.0):
+        """
+        Initialize an empty store.
+
+        Args:
+            max_entries: Maximum number of stored snapshots
+            ttl: Lifetime of a snapshot, in seconds
+        """
+        self.max_entries = max(max_entries, 1)
+        self.ttl = ttl
+        self._snapshots: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of stored snapshots."""
+        return len(self._snapshots)
+
+    def put(self, ids: List[str]) -> str:
+        """
+        Store a ranking.
+
+        Args:
+            ids: Ranked IDs, best first
+
+        Returns:
+            The snapshot token
+        """
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._snapshots[token] = (time.monotonic() + self.ttl, list(ids))
+            while len(self._snapshots) > self.max_entries:
+                self._snapshots.popitem(last=False)
+        return token
+
+    def get(self, token: str) -> List[str]:
+        """
+        Get a stored ranking.
+
+        Args:
+            token: The snapshot token
+
+        Returns:
+            The ranked IDs
+
+        Raises:
+            ValueError: If the snapshot has expired or was evicted
+        """
+        with self._lock:
+            entry = self._snapshots.get(token)
+            if entry is None or entry[0] < time.monotonic():
+                self._snapshots.pop(token, None)
+                raise ValueError("Cursor has expired; restart the search")
+            self._snapshots.move_to_end(token)
+            return entry[1]
@@ -0,0 +1,433 @@
+# filename: mcp_server_tribal/services/quantized_index.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Scalar-quantized (int8) vector index with full-precision re-scoring."""
+
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Width of a stored ID; record IDs are UUID strings
+ID_WIDTH = 36
+
+# Rows scored per block, bounding the float32 scratch memory of a search
+SCAN_BLOCK_ROWS = 65536
+
+
+class QuantizedVectorIndex:
+    """
+    Cosine-similarity index storing vectors as int8 with a per-vector scale.
+
+    Vectors are L2-normalized and quantized symmetrically: each is stored as
+    int8 codes and a float32 scale, a quarter of the float32 size. Searches
+    score every vector with a blocked NumPy dot product over the codes,
+    then re-score the best candidates with the full-precision vectors.
+
+    All arrays are memory-mapped files in one directory. The full-precision
+    vectors are only read for the candidates being re-scored, so they stay
+    on disk rather than in memory, but they take four times the disk space
+    of the codes. With a rescore factor of 0 they are not kept at all and
+    searches return the approximate int8 scores.
+    """
+
+    def __init__(self, path: str, dim: Optional[int] = None, rescore_factor: int = 4):
+        """
+        Open or create an index.
+
+        Args:
+            path: Directory holding the index files
+            dim: Vector dimension; if None, an existing index keeps its own
+                and a new one takes that of the first vectors added
+            rescore_factor: Candidates re-scored per requested result; 0
+                keeps no full-precision vectors and disables re-scoring. An
+                existing index keeps whether it has full-precision vectors.
+
+        Raises:
+            ValueError: If an existing index has a different dimension
+        """
+        self.path = path
+        self.dim = dim
+        self.rescore_factor = max(rescore_factor, 0)
+        self.full_precision = self.rescore_factor > 0
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._capacity = 0
+        self._size = 0
+        os.makedirs(path, exist_ok=True)
+
+        header = self._read_header()
+        if header is None:
+            if dim is not None:
+                self._open(0)
+            return
+        if dim is not None and header["dim"] != dim:
+            raise ValueError(
+                f"Quantized index at {path} has dimension {header['dim']}, "
+                f"expected {dim}"
+            )
+        self.dim = header["dim"]
+        self._size = header["size"]
+        full_precision = header.get("full_precision", True)
+        if full_precision != self.full_precision:
+            logger.warning(
+                f"Quantized index at {path} was created "
+                f"{'with' if full_precision else 'without'} full-precision "
+                f"vectors and keeps them that way; rebuild it to change this"
+            )
+            self.full_precision = full_precision
+        self._open(header["capacity"])
+
+        # Map IDs to rows and collect rows freed by removals
+        for row, raw in enumerate(self._ids[: self._size]):
+            if raw:
+                self._rows[raw.decode("ascii")] = row
+            else:
+                self._free.append(row)
+
+    def _file(self, name: str) -> str:
+        """Get the path of an index file."""
+        return os.path.join(self.path, name)
+
+    def _read_header(self) -> Optional[Dict[str, int]]:
+        """Read the index header, or None for a new index."""
+        try:
+            with open(self._file("index.json"), "r", encoding="utf-8") as header:
+                return json.load(header)
+        except FileNotFoundError:
+            return None
+
+    def _write_header(self) -> None:
+        """Atomically write the index header."""
+        temp_path = self._file("index.json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as header:
+            json.dump(
+                {
+                    "dim": self.dim,
+                    "capacity": self._capacity,
+                    "size": self._size,
+                    "full_precision": self.full_precision,
+                },
+                header,
+            )
+        os.replace(temp_path, self._file("index.json"))
+
+    def _map(self, name: str, dtype: np.dtype, shape: Tuple[int, ...]) -> np.memmap:
+        """Memory-map an index file, growing it to the given shape."""
+        path = self._file(name)
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        with open(path, "ab") as data:
+            if data.tell() < nbytes:
+                data.truncate(nbytes)
+        return np.memmap(path, dtype=dtype, mode="r+", shape=shape)
+
+    def _open(self, capacity: int) -> None:
+        """Map the index files with room for the given number of rows."""
+        if self._capacity:
+            self._flush_arrays()
+        rows = max(capacity, 1)
+        self._codes = self._map("codes.i8", np.int8, (rows, self.dim))
+        self._scales = self._map("scales.f32", np.float32, (rows,))
+        self._vectors: Optional[np.memmap] = None
+        if self.full_precision:
+            self._vectors = self._map("vectors.f32", np.float32, (rows, self.dim))
+        self._ids = self._map("ids.bin", np.dtype(f"S{ID_WIDTH}"), (rows,))
+        self._capacity = capacity
+
+    def _allocate(self) -> int:
+        """Get a free row, growing the files when full (caller holds the lock)."""
+        if self._free:
+            return self._free.pop()
+        if self._size >= self._capacity:
+            self._open(max(self._capacity * 2, 1024))
+        self._size += 1
+        return self._size - 1
+
+    def _arrays(self) -> Dict[str, np.memmap]:
+        """Get the mapped arrays by file name."""
+        arrays = {
+            "codes.i8": self._codes,
+            "scales.f32": self._scales,
+            "ids.bin": self._ids,
+        }
+        if self._vectors is not None:
+            arrays["vectors.f32"] = self._vectors
+        return arrays
+
+    def _flush_arrays(self) -> None:
+        """Flush the mapped files (caller holds the lock)."""
+        for array in self._arrays().values():
+            array.flush()
+
+    def _flush(self) -> None:
+        """Flush the mapped files and the header (caller holds the lock)."""
+        self._flush_arrays()
+        self._write_header()
+
+    def __len__(self) -> int:
+        """Get the number of indexed vectors."""
+        return len(self._rows)
+
+    def __contains__(self, vector_id: str) -> bool:
+        """Check whether an ID is indexed."""
+        return vector_id in self._rows
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get index metrics.
+
+        Returns:
+            Vector count and the bytes used by the quantized and
+            full-precision vectors
+        """
+        with self._lock:
+            dim = self.dim or 0
+            return {
+                "vectors": len(self._rows),
+                "dim": dim,
+                "quantized_bytes": self._size * (dim + 4),
+                "full_precision_bytes": (
+                    self._size * dim * 4 if self.full_precision else 0
+                ),
+            }
+
+    def ids(self) -> List[str]:
+        """Get the indexed IDs."""
+        with self._lock:
+            return list(self._rows)
+
+    def vectors(self, ids: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Get the vectors of IDs.
+
+        Without full-precision vectors, the vectors are decoded from the
+        int8 codes and approximate the stored ones.
+
+        Args:
+            ids: Vector IDs
+
+        Returns:
+            The L2-normalized vector of each ID, or None for unknown IDs
+        """
+        with self._lock:
+            return [
+                self._vector(self._rows[i]) if i in self._rows else None
+                for i in ids
+            ]
+
+    def _vector(self, row: int) -> np.ndarray:
+        """Get the vector of a row (caller holds the lock)."""
+        if self._vectors is not None:
+            return np.array(self._vectors[row])
+        return self._codes[row].astype(np.float32) * self._scales[row]
+
+    @staticmethod
+    def quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Normalize and quantize vectors.
+
+        Args:
+            vectors: Float vectors, one per row
+
+        Returns:
+            The normalized vectors, their int8 codes and per-vector scales
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        normalized = vectors / norms
+        scales = np.abs(normalized).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.rint(normalized / scales[:, None]).astype(np.int8)
+        return normalized, codes, scales.astype(np.float32)
+
+    def add(self, ids: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """
+        Add or replace vectors.
+
+        Args:
+            ids: Vector IDs
+            vectors: Vectors of the index dimension, one per ID
+        """
+        if not ids:
+            return
+        normalized, codes, scales = self.quantize(np.asarray(vectors))
+        with self._lock:
+            if self.dim is None:
+                self.dim = normalized.shape[1]
+                self._open(0)
+            if normalized.shape[1] != self.dim:
+                raise ValueError(
+                    f"Expected vectors of dimension {self.dim}, "
+                    f"got {normalized.shape[1]}"
+                )
+            for vector_id, vector, code, scale in zip(ids, normalized, codes, scales):
+                row = self._rows.get(vector_id)
+                if row is None:
+                    row = self._allocate()
+                    self._rows[vector_id] = row
+                    self._ids[row] = vector_id.encode("ascii")
+                self._codes[row] = code
+                self._scales[row] = scale
+                if self._vectors is not None:
+                    self._vectors[row] = vector
+            self._flush()
+
+    def remove(self, ids: Iterable[str]) -> None:
+        """
+        Remove vectors.
+
+        Args:
+            ids: IDs of the vectors to remove; unknown IDs are ignored
+        """
+        with self._lock:
+            removed = False
+            for vector_id in ids:
+                row = self._rows.pop(vector_id, None)
+                if row is None:
+                    continue
+                self._ids[row] = b""
+                self._scales[row] = 0.0
+                self._free.append(row)
+                removed = True
+            if removed:
+                self._flush()
+
+    def deleted_ratio(self) -> float:
+        """Get the fraction of allocated rows freed by removals."""
+        with self._lock:
+            return len(self._free) / self._size if self._size else 0.0
+
+    def compact(self) -> int:
+        """
+        Rewrite the index files without the rows freed by removals.
+
+        The new files are written while searches continue on the old ones,
+        which are then swapped in. The caller must hold off writes meanwhile.
+
+        Returns:
+            The number of rows reclaimed
+        """
+        with self._lock:
+            if not self._free or self.dim is None:
+                return 0
+            live = sorted(self._rows.items(), key=lambda item: item[1])
+        rows = np.array([row for _, row in live], dtype=np.int64)
+        size = len(live)
+
+        arrays = self._arrays()
+        for name, array in arrays.items():
+            target = np.memmap(
+                self._file(f"{name}.compact"),
+                dtype=array.dtype,
+                mode="w+",
+                shape=(max(size, 1),) + array.shape[1:],
+            )
+            for start in range(0, size, SCAN_BLOCK_ROWS):
+                block = rows[start : start + SCAN_BLOCK_ROWS]
+                target[start : start + len(block)] = array[block]
+            target.flush()
+            del target
+
+        with self._lock:
+            reclaimed = self._size - size
+            self._flush_arrays()
+            for name in arrays:
+                os.replace(self._file(f"{name}.compact"), self._file(name))
+            self._rows = {vector_id: row for row, (vector_id, _) in enumerate(live)}
+            self._free = []
+            self._size = size
+            self._capacity = 0
+            self._open(size)
+            self._write_header()
+        return reclaimed
+
+    def search(
+        self,
+        queries: Sequence[Sequence[float]],
+        k: int,
+        allowed: Optional[Iterable[str]] = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Find the vectors most similar to each query.
+
+        Args:
+            queries: Query vectors
+            k: Number of results per query
+            allowed: Restrict results to these IDs (None allows all)
+
+        Returns:
+            For each query, (ID, cosine similarity) pairs, best first
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if len(queries) == 0:
+            return []
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        queries = queries / norms
+
+        with self._lock:
+            if allowed is not None:
+                rows = np.array(
+                    sorted(self._rows[i] for i in allowed if i in self._rows),
+                    dtype=np.int64,
+                )
+            else:
+                rows = np.arange(self._size, dtype=np.int64)
+            if k <= 0 or len(rows) == 0 or self.dim is None:
+                return [[] for _ in queries]
+
+            # Approximate scores from the int8 codes; removed rows score -inf
+            approximate = np.empty((len(queries), len(rows)), dtype=np.float32)
+            for start in range(0, len(rows), SCAN_BLOCK_ROWS):
+                block = rows[start : start + SCAN_BLOCK_ROWS]
+                codes = self._codes[block].astype(np.float32)
+                scales = self._scales[block]
+                scores = (queries @ codes.T) * scales
+                scores[:, scales == 0] = -np.inf
+                approximate[:, start : start + len(block)] = scores
+
+            # Without full-precision vectors to re-score, the approximate top k
+            # is the answer, whatever rescore factor the index was opened with
+            factor = 1 if self._vectors is None else max(self.rescore_factor, 1)
+            candidates = min(k * factor, len(rows))
+            results = []
+            for query, scores in zip(queries, approximate):
+                top = np.argpartition(-scores, candidates - 1)[:candidates]
+                top = top[np.isfinite(scores[top])]
+                if self._vectors is None:
+                    top = top[np.argsort(-scores[top])]
+                    results.append(
+                        [
+                            (self._ids[rows[i]].decode("ascii"), float(scores[i]))
+                            for i in top
+                        ]
+                    )
+                    continue
+                candidate_rows = np.sort(rows[top])
+                # Re-score the candidates at full precision
+                exact = self._vectors[candidate_rows] @ query
+                order = np.argsort(-exact)[:k]
+                results.append(
+                    [
+                        (
+                            self._ids[candidate_rows[i]].decode("ascii"),
+                            float(exact[i]),
+                        )
+                        for i in order
+                    ]
+                )
+            return results
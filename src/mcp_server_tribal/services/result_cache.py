@@ -0,0 +1,209 @@
+# filename: mcp_server_tribal/services/result_cache.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Search result cache layered over any storage backend."""
+
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from ..models.error_record import BatchItemResult, ErrorQuery, ErrorRecord
+from .storage_interface import StorageInterface
+from .storage_wrapper import StorageWrapper
+
+# Cache entry: (generation, expiry time, results)
+CacheEntry = Tuple[Tuple[int, int], float, List[ErrorRecord]]
+
+
+class ResultCacheStorage(StorageWrapper):
+    """
+    Storage decorator that caches search results.
+
+    Results of ``search_errors`` and ``search_similar`` are cached under the
+    normalized query parameters. Each entry remembers the write generation
+    it was computed at: the wrapper's own counter, bumped by every write
+    made through it, and the inner storage's ``generation``, bumped when a
+    backend commits writes it buffered. An entry is served only while both
+    are unchanged and its TTL has not expired, and the least recently used
+    entries are evicted beyond ``max_entries``.
+
+    Cached records are shared between callers and must not be modified.
+    """
+
+    def __init__(
+        self, inner: StorageInterface, max_entries: int = 1024, ttl: float = 30.0
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            inner: The storage backend to cache results of
+            max_entries: Maximum number of cached queries
+            ttl: Maximum age of a cached result, in seconds
+        """
+        super().__init__(inner)
+        self.max_entries = max(max_entries, 1)
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._writes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def _generation(self) -> Tuple[int, int]:
+        """Get the write generation that cache entries are validated against."""
+        return (self._writes, self.inner.generation)
+
+    def _lookup(self, key: Hashable) -> Optional[List[ErrorRecord]]:
+        """Get cached results, dropping them if they are stale or expired."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            generation, expires_at, results = entry
+            if generation == self._generation() and time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return list(results)
+            del self._entries[key]
+        self._misses += 1
+        return None
+
+    def _store(
+        self,
+        key: Hashable,
+        generation: Tuple[int, int],
+        results: List[ErrorRecord],
+    ) -> None:
+        """Cache results computed at the given generation."""
+        if generation != self._generation():
+            # A write completed while the search ran, so results may be stale
+            return
+        self._entries[key] = (generation, time.monotonic() + self.ttl, list(results))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _written(self) -> None:
+        """Invalidate all cached results after a write."""
+        self._writes += 1
+        self._entries.clear()
+
+    @staticmethod
+    def _query_key(query: ErrorQuery) -> Hashable:
+        """Normalize a structured query into a cache key."""
+        fields = {
+            name: value.strip() if isinstance(value, str) else value
+            for name, value in query.model_dump().items()
+        }
+        return ("search", json.dumps(fields, sort_keys=True))
+
+    @staticmethod
+    def _similar_key(text_query: str, max_results: int) -> Hashable:
+        """Normalize a similarity query into a cache key."""
+        return ("similar", " ".join(text_query.split()), max_results)
+
+    async def add_error(self, error: ErrorRecord) -> ErrorRecord:
+        """Add a new error record and invalidate cached results."""
+        try:
+            return await self.inner.add_error(error)
+        finally:
+            self._written()
+
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """Add several error records and invalidate cached results."""
+        try:
+            return await self.inner.add_errors(errors)
+        finally:
+            self._written()
+
+    async def add_errors_with_embeddings(
+        self, errors: List[ErrorRecord], embeddings: Sequence[Optional[List[float]]]
+    ) -> List[BatchItemResult]:
+        """Add several embedded error records and invalidate cached results."""
+        try:
+            return await self.inner.add_errors_with_embeddings(errors, embeddings)
+        finally:
+            self._written()
+
+    async def update_error(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record and invalidate cached results."""
+        try:
+            return await self.inner.update_error(error_id, error)
+        finally:
+            self._written()
+
+    async def delete_error(self, error_id: UUID) -> bool:
+        """Delete an error record and invalidate cached results."""
+        try:
+            return await self.inner.delete_error(error_id)
+        finally:
+            self._written()
+
+    async def search_errors(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records, serving repeated queries from the cache."""
+        key = self._query_key(query)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        generation = self._generation()
+        results = await self.inner.search_errors(query)
+        self._store(key, generation, results)
+        return results
+
+    async def search_similar(
+        self, text_query: str, max_results: int = 5
+    ) -> List[ErrorRecord]:
+        """Search for similar error records, serving repeats from the cache."""
+        key = self._similar_key(text_query, max_results)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        generation = self._generation()
+        results = await self.inner.search_similar(text_query, max_results)
+        self._store(key, generation, results)
+        return results
+
+    async def search_similar_many(
+        self, text_queries: List[str], max_results: int = 5
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts, querying only misses."""
+        grouped: List[Optional[List[ErrorRecord]]] = [
+            self._lookup(self._similar_key(text_query, max_results))
+            for text_query in text_queries
+        ]
+        missing = [index for index, results in enumerate(grouped) if results is None]
+        if missing:
+            generation = self._generation()
+            found = await self.inner.search_similar_many(
+                [text_queries[index] for index in missing], max_results
+            )
+            for index, results in zip(missing, found):
+                grouped[index] = results
+                self._store(
+                    self._similar_key(text_queries[index], max_results),
+                    generation,
+                    results,
+                )
+        return [results or [] for results in grouped]
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics, including result cache counters."""
+        stats = await self.inner.get_stats()
+        stats["result_cache"] = {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+        return stats
@@ -0,0 +1,553 @@
+# filename: mcp_server_tribal/services/sharded_storage.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Storage partitioned across several ChromaDB stores.
+
+Each shard is a ChromaStorage in its own subdirectory, with its own HNSW
+graph, SQLite database and write pool, so writes to different shards do
+not contend. Records are placed by a jump consistent hash of their ID or
+of their language.
+"""
+
+
+import asyncio
+import hashlib
+import heapq
+import json
+import logging
+import os
+from itertools import chain
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from uuid import UUID
+
+from ..models.error_record import (
+    BatchItemResult,
+    CompactionReport,
+    ErrorPage,
+    ErrorQuery,
+    ErrorRecord,
+    FacetCounts,
+    SearchMode,
+)
+from .chroma_storage import ChromaStorage
+from .lexical_index import HYBRID_CANDIDATE_FACTOR, reciprocal_rank_fusion
+from .pagination import RankingSnapshots, decode_cursor, encode_cursor, snapshot_depth
+from .storage_interface import StorageInterface, query_filters, query_text
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Ways of assigning records to shards
+SHARD_STRATEGIES = ("hash", "language")
+
+# File in the persist directory recording the shard layout
+SHARD_LAYOUT_FILE = "shards.json"
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Map a key to a bucket with Lamping and Veach's jump consistent hash.
+
+    Growing the number of buckets from n to n + 1 moves only 1 / (n + 1)
+    of the keys, all of them to the new bucket.
+
+    Args:
+        key: A 64-bit key
+        buckets: The number of buckets
+
+    Returns:
+        The bucket, from 0 to ``buckets - 1``
+    """
+    key &= 0xFFFFFFFFFFFFFFFF
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+def language_key(language: str) -> int:
+    """Get the 64-bit shard key of a language, ignoring case."""
+    digest = hashlib.sha256(language.lower().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def shard_directory(persist_directory: str, index: int) -> str:
+    """Get the directory of a shard."""
+    return os.path.join(persist_directory, f"shard-{index:02d}")
+
+
+def read_shard_layout(persist_directory: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the shard layout of a persist directory.
+
+    Args:
+        persist_directory: The persist directory
+
+    Returns:
+        The strategy and shard count, or None if the directory is not sharded
+    """
+    try:
+        with open(
+            os.path.join(persist_directory, SHARD_LAYOUT_FILE), encoding="utf-8"
+        ) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class ShardedStorage(StorageInterface):
+    """
+    Storage that partitions records across several ChromaStorage shards.
+
+    With the ``hash`` strategy records are spread evenly by ID, and lookups
+    by ID go to a single shard. With the ``language`` strategy all records
+    of a language share a shard, so searches filtered by language go to a
+    single shard. Every other search fans out to all shards concurrently
+    and merges their rankings: vector results by cosine similarity, lexical
+    results by BM25 score, and hybrid results by reciprocal rank fusion of
+    the merged vector and lexical rankings. BM25 statistics are per shard,
+    so lexical scores are only comparable when shards hold similar data.
+
+    Deduplication happens within a shard. Under the ``hash`` strategy a
+    duplicate may land on another shard than the record it repeats.
+    """
+
+    def __init__(self, shards: Sequence[ChromaStorage], strategy: str = "hash"):
+        """
+        Initialize the sharded storage.
+
+        Args:
+            shards: The shards, in shard order
+            strategy: How records are assigned to shards: hash or language
+
+        Raises:
+            ValueError: If there are no shards or the strategy is unknown
+        """
+        if not shards:
+            raise ValueError("Sharded storage needs at least one shard")
+        if strategy not in SHARD_STRATEGIES:
+            raise ValueError(
+                f"Unknown shard strategy {strategy}; "
+                f"expected one of {', '.join(SHARD_STRATEGIES)}"
+            )
+        self.shards = list(shards)
+        self.strategy = strategy
+        self._snapshots = RankingSnapshots()
+
+    @classmethod
+    def open(
+        cls,
+        persist_directory: str,
+        shard_count: int,
+        strategy: str = "hash",
+        **kwargs: Any,
+    ) -> "ShardedStorage":
+        """
+        Open or create a sharded store.
+
+        Args:
+            persist_directory: Directory holding one subdirectory per shard
+            shard_count: The number of shards
+            strategy: How records are assigned to shards: hash or language
+            **kwargs: Options for each ChromaStorage shard
+
+        Returns:
+            The sharded storage
+
+        Raises:
+            ValueError: If the directory holds data in another layout
+        """
+        layout = {"strategy": strategy, "count": shard_count}
+        existing = read_shard_layout(persist_directory)
+        if existing is None and os.path.exists(
+            os.path.join(persist_directory, "chroma.sqlite3")
+        ):
+            raise ValueError(
+                f"{persist_directory} holds an unsharded store; "
+                f"run 'tribal reshard' to shard it"
+            )
+        if existing is not None and existing != layout:
+            raise ValueError(
+                f"{persist_directory} is sharded as {existing}, not {layout}; "
+                f"run 'tribal reshard' to change the layout"
+            )
+        os.makedirs(persist_directory, exist_ok=True)
+        shards = [
+            ChromaStorage(shard_directory(persist_directory, index), **kwargs)
+            for index in range(shard_count)
+        ]
+        if existing is None:
+            with open(
+                os.path.join(persist_directory, SHARD_LAYOUT_FILE),
+                "w",
+                encoding="utf-8",
+            ) as f:
+                json.dump(layout, f)
+        return cls(shards, strategy)
+
+    def _shard_of(self, error: ErrorRecord) -> int:
+        """Get the index of the shard a record belongs to."""
+        if self.strategy == "language":
+            return jump_hash(language_key(error.context.language), len(self.shards))
+        return jump_hash(error.id.int, len(self.shards))
+
+    def _shards_holding(self, error_id: UUID) -> List[ChromaStorage]:
+        """Get the shards that may hold a record ID."""
+        if self.strategy == "hash":
+            return [self.shards[jump_hash(error_id.int, len(self.shards))]]
+        return self.shards
+
+    def _shards_for(self, filters: Dict[str, str]) -> List[ChromaStorage]:
+        """Get the shards that may hold records matching facet filters."""
+        if self.strategy == "language" and filters.get("language"):
+            index = jump_hash(language_key(filters["language"]), len(self.shards))
+            return [self.shards[index]]
+        return self.shards
+
+    def _group(self, errors: Sequence[ErrorRecord]) -> Dict[int, List[int]]:
+        """Group record positions by shard."""
+        groups: Dict[int, List[int]] = {}
+        for position, error in enumerate(errors):
+            groups.setdefault(self._shard_of(error), []).append(position)
+        return groups
+
+    async def add_error(self, error: ErrorRecord) -> ErrorRecord:
+        """Add an error record to its shard."""
+        return await self.shards[self._shard_of(error)].add_error(error)
+
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """Add error records, writing to each shard concurrently."""
+        return await self.add_errors_with_embeddings(errors, [None] * len(errors))
+
+    async def add_errors_with_embeddings(
+        self, errors: List[ErrorRecord], embeddings: Sequence[Optional[List[float]]]
+    ) -> List[BatchItemResult]:
+        """Add error records with precomputed embeddings, per shard concurrently."""
+        groups = self._group(errors)
+
+        async def add(index: int, positions: List[int]) -> List[BatchItemResult]:
+            batch = [errors[position] for position in positions]
+            vectors = [embeddings[position] for position in positions]
+            if any(vector is not None for vector in vectors):
+                return await self.shards[index].add_errors_with_embeddings(
+                    batch, vectors
+                )
+            return await self.shards[index].add_errors(batch)
+
+        results: List[Optional[BatchItemResult]] = [None] * len(errors)
+        shard_results = await asyncio.gather(
+            *(add(index, positions) for index, positions in groups.items())
+        )
+        for positions, items in zip(groups.values(), shard_results):
+            for position, item in zip(positions, items):
+                results[position] = item.model_copy(update={"index": position})
+        return results
+
+    async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
+        """Retrieve an error record from the shards that may hold it."""
+        return (await self.get_errors([error_id]))[0]
+
+    async def get_errors(self, error_ids: List[UUID]) -> List[Optional[ErrorRecord]]:
+        """Retrieve several error records, reading the shards concurrently."""
+        if self.strategy == "hash":
+            groups: Dict[int, List[int]] = {}
+            for position, error_id in enumerate(error_ids):
+                index = jump_hash(error_id.int, len(self.shards))
+                groups.setdefault(index, []).append(position)
+            requests = [
+                (self.shards[index], positions) for index, positions in groups.items()
+            ]
+        else:
+            positions = list(range(len(error_ids)))
+            requests = [(shard, positions) for shard in self.shards]
+
+        found: List[Optional[ErrorRecord]] = [None] * len(error_ids)
+        shard_results = await asyncio.gather(
+            *(
+                shard.get_errors([error_ids[position] for position in positions])
+                for shard, positions in requests
+            )
+        )
+        for (_, positions), records in zip(requests, shard_results):
+            for position, record in zip(positions, records):
+                if record is not None:
+                    found[position] = record
+        return found
+
+    async def _get_by_string_ids(self, ids: Sequence[str]) -> List[ErrorRecord]:
+        """Fetch records by ID string in order, skipping missing ones."""
+        records = await self.get_errors([UUID(row_id) for row_id in ids])
+        return [record for record in records if record is not None]
+
+    async def update_error(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an error record, moving it if its language changed shard."""
+        if self.strategy == "hash":
+            return await self._shards_holding(error_id)[0].update_error(error_id, error)
+
+        records = await asyncio.gather(
+            *(shard.get_error(error_id) for shard in self.shards)
+        )
+        current = next(
+            (index for index, record in enumerate(records) if record is not None),
+            None,
+        )
+        if current is None:
+            return None
+        error.id = error_id
+        target = self._shard_of(error)
+        if target == current:
+            return await self.shards[current].update_error(error_id, error)
+
+        # Add to the new shard before deleting, so a failure loses nothing
+        error.created_at = records[current].created_at
+        added = await self.shards[target].add_error(error)
+        await self.shards[current].delete_error(error_id)
+        return added
+
+    async def delete_error(self, error_id: UUID) -> bool:
+        """Delete an error record from the shards that may hold it."""
+        deleted = await asyncio.gather(
+            *(shard.delete_error(error_id) for shard in self._shards_holding(error_id))
+        )
+        return any(deleted)
+
+    async def _rank(
+        self,
+        shards: Sequence[ChromaStorage],
+        text: str,
+        depth: int,
+        mode: SearchMode,
+        filters: Dict[str, str],
+    ) -> List[str]:
+        """Rank record IDs across shards, best first."""
+        if mode == SearchMode.HYBRID:
+            candidates = depth * HYBRID_CANDIDATE_FACTOR
+            vector, lexical = await asyncio.gather(
+                self._rank(shards, text, candidates, SearchMode.VECTOR, filters),
+                self._rank(shards, text, candidates, SearchMode.LEXICAL, filters),
+            )
+            return reciprocal_rank_fusion([vector, lexical])[:depth]
+
+        embedding = None
+        if mode == SearchMode.VECTOR:
+            # Embed once rather than once per shard
+            embedding = (await shards[0].embed([text]))[0]
+        rankings = await asyncio.gather(
+            *(shard.rank_ids(text, depth, mode, filters, embedding) for shard in shards)
+        )
+        best = heapq.nlargest(depth, chain(*rankings), key=lambda item: item[1])
+        return [row_id for row_id, _ in best]
+
+    async def search_errors(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records on the shards that may hold matches."""
+        filters = query_filters(query)
+        shards = self._shards_for(filters)
+        if len(shards) == 1:
+            return await shards[0].search_errors(query)
+        if query.cursor:
+            return (await self.search_errors_page(query)).records
+
+        search_text = query_text(query)
+        if not search_text:
+            return (await self._list_page(shards, query, None))[0]
+        ids = await self._rank(
+            shards, search_text, query.max_results, query.mode, filters
+        )
+        return await self._get_by_string_ids(ids)
+
+    async def search_errors_page(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time.
+
+        A search routed to one shard is paginated by that shard. Fanned-out
+        listings page in ID order across all shards; fanned-out ranked
+        searches snapshot the merged ranking on the first page.
+
+        Raises:
+            ValueError: If the cursor is invalid or has expired
+        """
+        filters = query_filters(query)
+        shards = self._shards_for(filters)
+        if len(shards) == 1:
+            return await shards[0].search_errors_page(query)
+
+        search_text = query_text(query)
+        page_size = query.max_results
+        position = decode_cursor(query)
+        next_position: Optional[Dict[str, Any]] = None
+        try:
+            if not search_text:
+                records, more = await self._list_page(shards, query, position)
+                if more:
+                    next_position = {"after": str(records[-1].id)}
+            else:
+                if position is None:
+                    ranked = await self._rank(
+                        shards,
+                        search_text,
+                        snapshot_depth(page_size),
+                        query.mode,
+                        filters,
+                    )
+                    offset, token = 0, None
+                else:
+                    token, offset = position["snapshot"], position["offset"]
+                    ranked = self._snapshots.get(token)
+                records = await self._get_by_string_ids(
+                    ranked[offset : offset + page_size]
+                )
+                if offset + page_size < len(ranked):
+                    if token is None:
+                        token = self._snapshots.put(ranked)
+                    next_position = {"snapshot": token, "offset": offset + page_size}
+        except (KeyError, TypeError):
+            raise ValueError("Invalid cursor") from None
+
+        return ErrorPage(
+            records=records,
+            next_cursor=encode_cursor(query, next_position) if next_position else None,
+        )
+
+    async def _list_page(
+        self,
+        shards: Sequence[ChromaStorage],
+        query: ErrorQuery,
+        position: Optional[Dict[str, Any]],
+    ) -> Tuple[List[ErrorRecord], bool]:
+        """List a page of matching records in ID order across shards.
+
+        Returns:
+            The records of the page, and whether more records follow
+        """
+        shard_query = query.model_copy(
+            update={"cursor": encode_cursor(query, position) if position else None}
+        )
+        pages = await asyncio.gather(
+            *(shard.search_errors_page(shard_query) for shard in shards)
+        )
+        merged = sorted(
+            chain(*(page.records for page in pages)), key=lambda error: str(error.id)
+        )
+        more = len(merged) > query.max_results or any(
+            page.next_cursor for page in pages
+        )
+        return merged[: query.max_results], more
+
+    async def search_similar(
+        self, text_query: str, max_results: int = 5
+    ) -> List[ErrorRecord]:
+        """Search every shard concurrently and merge by similarity."""
+        ids = await self._rank(
+            self.shards, text_query, max_results, SearchMode.VECTOR, {}
+        )
+        return await self._get_by_string_ids(ids)
+
+    async def search_similar_many(
+        self, text_queries: List[str], max_results: int = 5
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts, concurrently."""
+        return list(
+            await asyncio.gather(
+                *(self.search_similar(text, max_results) for text in text_queries)
+            )
+        )
+
+    async def facet_counts(
+        self, filters: Optional[Dict[str, str]] = None
+    ) -> FacetCounts:
+        """Sum the facet counts of the shards that may hold matches."""
+        counts = await asyncio.gather(
+            *(shard.facet_counts(filters) for shard in self._shards_for(filters or {}))
+        )
+        facets: Dict[str, Dict[str, int]] = {}
+        for shard_counts in counts:
+            for field, values in shard_counts.facets.items():
+                totals = facets.setdefault(field, {})
+                for value, count in values.items():
+                    totals[value] = totals.get(value, 0) + count
+        return FacetCounts(total=sum(c.total for c in counts), facets=facets)
+
+    async def iter_errors(self, batch_size: int = 500) -> AsyncIterator[ErrorRecord]:
+        """Iterate over every stored error record, one shard after another."""
+        for shard in self.shards:
+            async for record in shard.iter_errors(batch_size):
+                yield record
+
+    async def iter_errors_with_embeddings(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over every record with its embedding, shard by shard."""
+        for shard in self.shards:
+            async for item in shard.iter_errors_with_embeddings(batch_size):
+                yield item
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        """Identify the embedder that produced the stored vectors."""
+        return self.shards[0].embedding_model
+
+    async def compact(
+        self, threshold: float = 0.2, force: bool = False
+    ) -> CompactionReport:
+        """Compact the shards concurrently and combine their reports."""
+        reports = await asyncio.gather(
+            *(shard.compact(threshold, force) for shard in self.shards)
+        )
+        latencies_before = [
+            r.search_latency_before_ms
+            for r in reports
+            if r.search_latency_before_ms is not None
+        ]
+        latencies_after = [
+            r.search_latency_after_ms
+            for r in reports
+            if r.search_latency_after_ms is not None
+        ]
+        return CompactionReport(
+            compacted=any(r.compacted for r in reports),
+            records=sum(r.records for r in reports),
+            deleted_ratio=max(r.deleted_ratio for r in reports),
+            free_page_ratio=max(r.free_page_ratio for r in reports),
+            bytes_before=sum(r.bytes_before for r in reports),
+            bytes_after=sum(r.bytes_after for r in reports),
+            bytes_reclaimed=sum(r.bytes_reclaimed for r in reports),
+            search_latency_before_ms=max(latencies_before, default=None),
+            search_latency_after_ms=max(latencies_after, default=None),
+            duration_seconds=max(r.duration_seconds for r in reports),
+        )
+
+    @property
+    def generation(self) -> int:
+        """Sum of the shards' write generations."""
+        return sum(shard.generation for shard in self.shards)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics, per shard."""
+        shard_stats = await asyncio.gather(
+            *(shard.get_stats() for shard in self.shards)
+        )
+        return {
+            "backend": "sharded",
+            "strategy": self.strategy,
+            "shards": list(shard_stats),
+        }
+
+    async def close(self) -> None:
+        """Close every shard."""
+        await asyncio.gather(*(shard.close() for shard in self.shards))
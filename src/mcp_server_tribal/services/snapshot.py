@@ -0,0 +1,300 @@
+# filename: mcp_server_tribal/services/snapshot.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Incremental point-in-time snapshots of a storage directory.
+
+Each snapshot is a directory holding a copy of every file of the storage
+directory and a manifest with their sizes, modification times and SHA-256
+checksums. Files unchanged since the previous snapshot are hard-linked to
+it instead of copied, so taking a snapshot costs time in proportion to the
+data changed since the last one. Snapshot files are never modified, which
+keeps the shared links safe.
+"""
+
+
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from ..models.error_record import SnapshotInfo
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Name of the manifest file in a snapshot directory
+MANIFEST_NAME = "manifest.json"
+
+# Version of the manifest format
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Bytes read at a time while copying and checksumming files
+COPY_CHUNK_SIZE = 1 << 20
+
+# Suffix of a snapshot or restore that is still being written
+PARTIAL_SUFFIX = ".partial"
+
+
+class AccessGate:
+    """
+    Lets operations run concurrently while allowing them to be paused.
+
+    Operations hold the gate for their duration. Quiescing waits for running
+    operations to finish and holds new ones until it is released.
+    """
+
+    def __init__(self):
+        """Initialize an open gate."""
+        self._condition = threading.Condition()
+        self._active = 0
+        self._paused = False
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        """Hold the gate open for an operation, waiting while paused."""
+        with self._condition:
+            while self._paused:
+                self._condition.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+    @contextmanager
+    def quiesce(self) -> Iterator[None]:
+        """Pause operations, once the running ones have finished."""
+        with self._condition:
+            while self._paused:
+                self._condition.wait()
+            self._paused = True
+            while self._active:
+                self._condition.wait()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._paused = False
+                self._condition.notify_all()
+
+
+def _copy_with_checksum(source: str, target: str) -> str:
+    """Copy a file and return the SHA-256 checksum of its contents."""
+    digest = hashlib.sha256()
+    with open(source, "rb") as reader, open(target, "wb") as writer:
+        while chunk := reader.read(COPY_CHUNK_SIZE):
+            digest.update(chunk)
+            writer.write(chunk)
+    shutil.copystat(source, target)
+    return digest.hexdigest()
+
+
+def read_manifest(snapshot_path: str) -> Dict[str, Any]:
+    """
+    Read the manifest of a snapshot.
+
+    Args:
+        snapshot_path: The snapshot directory
+
+    Returns:
+        The manifest
+
+    Raises:
+        ValueError: If the directory is not a snapshot of a supported version
+    """
+    try:
+        with open(os.path.join(snapshot_path, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"No valid snapshot manifest in {snapshot_path}: {e}")
+    if manifest.get("format_version", 0) > SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot format {manifest.get('format_version')} "
+            f"in {snapshot_path}"
+        )
+    return manifest
+
+
+def latest_snapshot(directory: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Find the most recent complete snapshot in a directory.
+
+    Args:
+        directory: The directory holding the snapshots
+
+    Returns:
+        The path and manifest of the latest snapshot, or None if there is none
+    """
+    if not os.path.isdir(directory):
+        return None
+    for name in sorted(os.listdir(directory), reverse=True):
+        path = os.path.join(directory, name)
+        if name.endswith(PARTIAL_SUFFIX) or not os.path.isdir(path):
+            continue
+        try:
+            return path, read_manifest(path)
+        except ValueError:
+            continue
+    return None
+
+
+def create_snapshot(
+    source: str,
+    directory: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    exclude: Sequence[str] = (),
+) -> SnapshotInfo:
+    """
+    Take a snapshot of a directory.
+
+    The caller must keep the directory from being written to meanwhile.
+
+    Args:
+        source: The directory to snapshot
+        directory: The directory holding the snapshots
+        metadata: Storage details recorded in the manifest
+        exclude: Glob patterns of relative paths to leave out
+
+    Returns:
+        A summary of the snapshot
+    """
+    os.makedirs(directory, exist_ok=True)
+    source = os.path.abspath(source)
+    directory = os.path.abspath(directory)
+    previous = latest_snapshot(directory)
+    previous_files = previous[1]["files"] if previous else {}
+
+    created_at = datetime.now(UTC)
+    name = created_at.strftime("%Y%m%dT%H%M%S%fZ")
+    final_path = os.path.join(directory, name)
+    staging = final_path + PARTIAL_SUFFIX
+
+    files: Dict[str, Dict[str, Any]] = {}
+    bytes_copied = bytes_linked = 0
+    for root, dirnames, filenames in os.walk(source):
+        # Never snapshot the snapshots, if they are kept inside the source
+        dirnames[:] = sorted(d for d in dirnames if os.path.join(root, d) != directory)
+        for filename in sorted(filenames):
+            path = os.path.join(root, filename)
+            relative = os.path.relpath(path, source)
+            if any(fnmatch.fnmatch(relative, pattern) for pattern in exclude):
+                continue
+            stat = os.stat(path)
+            target = os.path.join(staging, relative)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+
+            known = previous_files.get(relative)
+            if (
+                known is not None
+                and known["size"] == stat.st_size
+                and known["mtime_ns"] == stat.st_mtime_ns
+            ):
+                try:
+                    os.link(os.path.join(previous[0], relative), target)
+                    checksum = known["sha256"]
+                    bytes_linked += stat.st_size
+                except OSError:
+                    checksum = _copy_with_checksum(path, target)
+                    bytes_copied += stat.st_size
+            else:
+                checksum = _copy_with_checksum(path, target)
+                bytes_copied += stat.st_size
+            files[relative] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": checksum,
+            }
+
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "name": name,
+        "created_at": created_at.isoformat(),
+        "metadata": metadata or {},
+        "files": files,
+    }
+    os.makedirs(staging, exist_ok=True)
+    with open(os.path.join(staging, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.rename(staging, final_path)
+
+    logger.info(
+        f"Snapshot {name}: {len(files)} files, {bytes_copied} bytes copied, "
+        f"{bytes_linked} bytes linked"
+    )
+    return SnapshotInfo(
+        name=name,
+        path=final_path,
+        created_at=created_at,
+        files=len(files),
+        bytes_copied=bytes_copied,
+        bytes_linked=bytes_linked,
+        metadata=manifest["metadata"],
+    )
+
+
+def restore_snapshot(
+    snapshot_path: str,
+    target: str,
+    validate: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Restore a snapshot into a storage directory.
+
+    The snapshot is copied next to the target, checking every file against
+    the manifest, then checked by ``validate``, and only then swapped in.
+    An existing target directory is kept, renamed with a
+    ``.pre-restore-<time>`` suffix. The storage must not be running.
+
+    Args:
+        snapshot_path: The snapshot directory
+        target: The storage directory to restore into
+        validate: Called with the restored directory and the manifest;
+            raises to abort the restore
+
+    Returns:
+        The manifest of the restored snapshot
+
+    Raises:
+        ValueError: If the snapshot is invalid or fails validation
+    """
+    manifest = read_manifest(snapshot_path)
+    target = os.path.abspath(target)
+    staging = target + PARTIAL_SUFFIX
+    if os.path.exists(staging):
+        shutil.rmtree(staging)
+    os.makedirs(staging)
+
+    try:
+        # Copy rather than link: the storage modifies its files in place
+        for relative, expected in manifest["files"].items():
+            source = os.path.join(snapshot_path, relative)
+            if not os.path.isfile(source):
+                raise ValueError(f"Snapshot file missing: {relative}")
+            destination = os.path.join(staging, relative)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            if _copy_with_checksum(source, destination) != expected["sha256"]:
+                raise ValueError(f"Snapshot file is corrupt: {relative}")
+        if validate is not None:
+            validate(staging, manifest)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if os.path.exists(target):
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+        os.rename(target, f"{target}.pre-restore-{stamp}")
+    os.rename(staging, target)
+    return manifest
@@ -0,0 +1,1156 @@
+# filename: mcp_server_tribal/services/sqlite_storage.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""SQLite implementation of storage interface.
+
+Records are kept one row each in a single SQLite database in WAL mode, so
+readers never wait for the writer. An FTS5 index over the error message,
+code snippet and solution text serves lexical searches. Vectors are stored
+L2-normalized as float32 BLOBs and vector searches scan them exactly with
+NumPy, one block of rows at a time, so no index has to be loaded or held in
+memory. This suits stores of up to a few hundred thousand records.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID
+
+import numpy as np
+
+from ..models.error_record import (
+    BatchItemResult,
+    CompactionReport,
+    ErrorPage,
+    ErrorQuery,
+    ErrorRecord,
+    FacetCounts,
+    SearchMode,
+    SnapshotInfo,
+)
+from .compaction import (
+    DEFAULT_COMPACTION_THRESHOLD,
+    SQLITE_BUSY_TIMEOUT,
+    directory_size,
+    median_latency_ms,
+    sqlite_free_ratio,
+)
+from .dedup import error_fingerprint, merge_duplicate
+from .embedding_cache import CachedEmbeddingFunction
+from .embeddings import create_embedding_function, embedding_model_id, embedding_text
+from .executor import StorageExecutor
+from .facet_index import FACET_FIELDS
+from .lexical_index import (
+    HYBRID_CANDIDATE_FACTOR,
+    lexical_tokens,
+    reciprocal_rank_fusion,
+)
+from .pagination import (
+    RankingSnapshots,
+    decode_cursor,
+    encode_cursor,
+    snapshot_depth,
+)
+from .snapshot import AccessGate, create_snapshot
+from .storage_interface import StorageInterface, query_filters, query_text
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Name of the database file in the persist directory
+DATABASE_NAME = "tribal.sqlite3"
+
+# Version of the database layout, kept in PRAGMA user_version
+SQLITE_SCHEMA_VERSION = 1
+
+# Rows scored per NumPy block during a vector scan
+SCAN_BLOCK_SIZE = 4096
+
+# Records written per transaction by batch adds, and IDs per IN (...) lookup
+BATCH_SIZE = 500
+
+# Files under the persist directory left out of snapshots; the WAL is
+# checkpointed into the database before a snapshot is taken
+SNAPSHOT_EXCLUDE = (
+    "embedding_cache.sqlite3*",
+    "write_behind.journal*",
+    "*-shm",
+    "*-wal",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    error_type TEXT NOT NULL,
+    language TEXT NOT NULL,
+    framework TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    error_message TEXT NOT NULL,
+    code_snippet TEXT NOT NULL,
+    solution TEXT NOT NULL,
+    record TEXT NOT NULL,
+    embedding BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_error_type ON records (error_type, id);
+CREATE INDEX IF NOT EXISTS records_language ON records (language, id);
+CREATE INDEX IF NOT EXISTS records_framework ON records (framework, id);
+CREATE INDEX IF NOT EXISTS records_fingerprint ON records (fingerprint);
+CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(
+    error_message,
+    code_snippet,
+    solution,
+    content = 'records',
+    content_rowid = 'seq',
+    tokenize = "unicode61 tokenchars '_'"
+);
+CREATE TRIGGER IF NOT EXISTS records_fts_insert AFTER INSERT ON records BEGIN
+    INSERT INTO records_fts (rowid, error_message, code_snippet, solution)
+    VALUES (new.seq, new.error_message, new.code_snippet, new.solution);
+END;
+CREATE TRIGGER IF NOT EXISTS records_fts_delete AFTER DELETE ON records BEGIN
+    INSERT INTO records_fts (records_fts, rowid, error_message, code_snippet, solution)
+    VALUES ('delete', old.seq, old.error_message, old.code_snippet, old.solution);
+END;
+CREATE TRIGGER IF NOT EXISTS records_fts_update AFTER UPDATE ON records BEGIN
+    INSERT INTO records_fts (records_fts, rowid, error_message, code_snippet, solution)
+    VALUES ('delete', old.seq, old.error_message, old.code_snippet, old.solution);
+    INSERT INTO records_fts (rowid, error_message, code_snippet, solution)
+    VALUES (new.seq, new.error_message, new.code_snippet, new.solution);
+END;
+"""
+
+# Columns written for each record, in INSERT order
+RECORD_COLUMNS = (
+    "id",
+    "error_type",
+    "language",
+    "framework",
+    "fingerprint",
+    "error_message",
+    "code_snippet",
+    "solution",
+    "record",
+    "embedding",
+)
+
+T = TypeVar("T")
+
+
+def _where(
+    filters: Dict[str, str], after: Optional[str] = None
+) -> Tuple[str, List[str]]:
+    """Build a WHERE clause matching facet filters and, optionally, IDs above a key."""
+    clauses = [f"{field} = ?" for field in filters if field in FACET_FIELDS]
+    params = [value for field, value in filters.items() if field in FACET_FIELDS]
+    if after is not None:
+        clauses.append("id > ?")
+        params.append(after)
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def _match_expression(text: str) -> Optional[str]:
+    """Build an FTS5 query matching any token of a text, or None if it has none."""
+    tokens = list(dict.fromkeys(lexical_tokens(text)))
+    if not tokens:
+        return None
+    return " OR ".join('"' + token.replace('"', '""') + '"' for token in tokens)
+
+
+def _normalize(vectors: Any) -> np.ndarray:
+    """L2-normalize the rows of a matrix, leaving zero rows as they are."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class SQLiteStorage(StorageInterface):
+    """SQLite implementation of error record storage, with exact vector search."""
+
+    def __init__(
+        self,
+        persist_directory: str = "./chroma_db",
+        read_workers: int = 0,
+        write_workers: int = 0,
+        dedup: bool = False,
+        embedding_function: Optional[Callable[[List[str]], Any]] = None,
+        embedding_cache_size: int = 0,
+        embedding_cache_disk: bool = False,
+    ):
+        """
+        Initialize SQLite storage.
+
+        Each reading thread gets its own connection, and all writes go
+        through one connection, so reads on the read pool run concurrently
+        with each other and with the writer.
+
+        Args:
+            persist_directory: Directory holding the database file
+            read_workers: Thread pool size for reads (0 runs reads inline)
+            write_workers: Thread pool size for writes (0 runs writes inline)
+            dedup: Merge repeats of a stored error instead of inserting them
+            embedding_function: Embedding function for documents and queries
+                (defaults to ChromaDB's default model); it must be the one
+                the database was created with
+            embedding_cache_size: Vectors kept in the in-memory embedding
+                cache (0 disables the cache unless the disk tier is enabled)
+            embedding_cache_disk: Also cache vectors in a SQLite file under
+                the persist directory
+
+        Raises:
+            ValueError: If the database was created by a newer version or
+                embedded with another embedder
+        """
+        self.persist_directory = persist_directory
+        self.database_path = os.path.join(persist_directory, DATABASE_NAME)
+        self.dedup = dedup
+        self._duplicates_absorbed = 0
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+        self._snapshots = RankingSnapshots()
+        # Let snapshots and compactions pause writes
+        self._write_gate = AccessGate()
+        self._read_executor = (
+            StorageExecutor(read_workers, name="read") if read_workers > 0 else None
+        )
+        self._write_executor = (
+            StorageExecutor(write_workers, name="write") if write_workers > 0 else None
+        )
+        os.makedirs(persist_directory, exist_ok=True)
+
+        if embedding_function is None:
+            embedding_function = create_embedding_function()
+        self.embedding_model_id = embedding_model_id(embedding_function)
+        self.embedding_cache: Optional[CachedEmbeddingFunction] = None
+        if embedding_cache_size > 0 or embedding_cache_disk:
+            self.embedding_cache = CachedEmbeddingFunction(
+                embedding_function,
+                max_entries=embedding_cache_size,
+                disk_path=(
+                    os.path.join(persist_directory, "embedding_cache.sqlite3")
+                    if embedding_cache_disk
+                    else None
+                ),
+            )
+            embedding_function = self.embedding_cache
+        self.embedding_function = embedding_function
+
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        # Serializes writes, including the fingerprint lookup of deduplication
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode = WAL")
+        self._create_schema()
+        self._dim = self._get_setting("dim")
+        self._validate_embedding_function()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the database."""
+        connection = sqlite3.connect(
+            self.database_path, timeout=SQLITE_BUSY_TIMEOUT, check_same_thread=False
+        )
+        connection.execute("PRAGMA synchronous = NORMAL")
+        with self._connections_lock:
+            self._connections.append(connection)
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        """Get the calling thread's read connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def _create_schema(self) -> None:
+        """Create the tables of a new database and check the layout version."""
+        version = self._writer.execute("PRAGMA user_version").fetchone()[0]
+        if version > SQLITE_SCHEMA_VERSION:
+            raise ValueError(
+                f"Incompatible database version: {version}. This version of "
+                f"Tribal supports version {SQLITE_SCHEMA_VERSION}."
+            )
+        with self._writer:
+            self._writer.executescript(SCHEMA)
+            self._writer.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+            self._writer.execute(
+                "INSERT OR IGNORE INTO settings (key, value) VALUES ('deleted', '0')"
+            )
+
+    def _get_setting(self, key: str) -> Optional[str]:
+        """Read a value from the settings table."""
+        row = self._writer.execute(
+            "SELECT value FROM settings WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_setting(self, key: str, value: Any) -> None:
+        """Write a value to the settings table (caller commits)."""
+        self._writer.execute(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+            (key, str(value)),
+        )
+
+    def _validate_embedding_function(self) -> None:
+        """Check that the database was embedded with the configured embedder.
+
+        Raises:
+            ValueError: If the database was embedded with another embedder
+        """
+        recorded = self._get_setting("embedding_model")
+        if recorded is None:
+            with self._writer:
+                self._set_setting("embedding_model", self.embedding_model_id)
+            return
+        if recorded != self.embedding_model_id:
+            raise ValueError(
+                f"Embedding function mismatch: the database was embedded with "
+                f"{recorded}, but {self.embedding_model_id} is configured. "
+                f"Configure the original embedder or re-import into a new store."
+            )
+
+    async def _read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking read on the read pool, or inline if there is none."""
+        if self._read_executor is None:
+            return fn(*args)
+        return await self._read_executor.run(fn, *args)
+
+    async def _write(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking write on the write pool, or inline if there is none."""
+        return await self._on_write_pool(self._gated_write, fn, *args)
+
+    async def _on_write_pool(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call on the write pool, or inline if there is none."""
+        if self._write_executor is None:
+            return fn(*args)
+        return await self._write_executor.run(fn, *args)
+
+    def _gated_write(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking write unless a snapshot has paused writes."""
+        with self._write_gate.hold(), self._write_lock:
+            return fn(*args)
+
+    def _bump_generation(self) -> None:
+        """Record that a write was committed."""
+        with self._generation_lock:
+            self._generation += 1
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into normalized float32 rows (blocking)."""
+        return _normalize(self.embedding_function(texts))
+
+    def _vector_blob(self, vector: np.ndarray) -> bytes:
+        """Check a normalized vector's dimension and serialize it (caller writes)."""
+        if self._dim is None:
+            self._dim = str(len(vector))
+            self._set_setting("dim", self._dim)
+        if len(vector) != int(self._dim):
+            raise ValueError(
+                f"Embedding dimension mismatch: got {len(vector)}, "
+                f"the database holds {self._dim}"
+            )
+        return vector.astype(np.float32).tobytes()
+
+    def _row(self, error: ErrorRecord, vector: np.ndarray) -> Tuple[Any, ...]:
+        """Build the column values of a record (caller writes)."""
+        solution = error.solution
+        return (
+            str(error.id),
+            error.error_type,
+            error.context.language,
+            error.context.framework or "",
+            error_fingerprint(error),
+            error.context.error_message,
+            error.context.code_snippet or "",
+            " ".join(
+                part
+                for part in (solution.description, solution.code_fix or "")
+                + (solution.explanation,)
+                if part
+            ),
+            error.model_dump_json(),
+            self._vector_blob(vector),
+        )
+
+    def _insert_rows(self, rows: List[Tuple[Any, ...]]) -> None:
+        """Insert record rows (caller commits)."""
+        self._writer.executemany(
+            f"INSERT INTO records ({', '.join(RECORD_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(RECORD_COLUMNS))})",
+            rows,
+        )
+
+    def _existing_ids(self, ids: List[str]) -> set:
+        """Get which of the IDs are stored (blocking)."""
+        found = set()
+        for start in range(0, len(ids), BATCH_SIZE):
+            chunk = ids[start : start + BATCH_SIZE]
+            rows = self._writer.execute(
+                f"SELECT id FROM records WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def _find_by_fingerprints(self, fingerprints: List[str]) -> Dict[str, ErrorRecord]:
+        """Look up the first stored record of each fingerprint (blocking)."""
+        unique = list(dict.fromkeys(fingerprints))
+        found: Dict[str, ErrorRecord] = {}
+        for start in range(0, len(unique), BATCH_SIZE):
+            chunk = unique[start : start + BATCH_SIZE]
+            rows = self._writer.execute(
+                "SELECT fingerprint, record FROM records WHERE fingerprint IN "
+                f"({','.join('?' * len(chunk))}) ORDER BY seq",
+                chunk,
+            )
+            for fingerprint, record in rows:
+                if fingerprint not in found:
+                    found[fingerprint] = ErrorRecord.model_validate_json(record)
+        return found
+
+    def _absorb_duplicates(self, merged: List[ErrorRecord], absorbed: int) -> None:
+        """Store records that absorbed duplicates (blocking).
+
+        Only the serialized record changes: the primary solution is
+        unchanged, so the records are not re-embedded or re-indexed.
+        """
+        with self._writer:
+            self._writer.executemany(
+                "UPDATE records SET record = ? WHERE id = ?",
+                [(error.model_dump_json(), str(error.id)) for error in merged],
+            )
+        self._duplicates_absorbed += absorbed
+        self._bump_generation()
+
+    async def add_error(self, error: ErrorRecord) -> ErrorRecord:
+        """Add a new error record to storage."""
+        return await self._write(self._add_error_sync, error)
+
+    def _add_error_sync(self, error: ErrorRecord) -> ErrorRecord:
+        """Add a new error record to storage (blocking).
+
+        With deduplication enabled, a repeat of a stored error is merged into
+        that record and the merged record is returned instead.
+
+        Raises:
+            ValueError: If a record with the same ID is already stored
+        """
+        if self.dedup:
+            fingerprint = error_fingerprint(error)
+            existing = self._find_by_fingerprints([fingerprint])
+            if fingerprint in existing and existing[fingerprint].id != error.id:
+                merged = merge_duplicate(existing[fingerprint], error)
+                self._absorb_duplicates([merged], 1)
+                return merged
+
+        vector = self._embed([embedding_text(error)])[0]
+        try:
+            with self._writer:
+                self._insert_rows([self._row(error, vector)])
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Error record already exists: {error.id}") from None
+        self._bump_generation()
+        return error
+
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """Add several error records in batched transactions."""
+        return await self._write(self._add_errors_sync, errors)
+
+    async def add_errors_with_embeddings(
+        self, errors: List[ErrorRecord], embeddings: Sequence[Optional[List[float]]]
+    ) -> List[BatchItemResult]:
+        """Add several error records, storing their precomputed embeddings."""
+        return await self._write(self._add_errors_sync, errors, embeddings)
+
+    def _add_errors_sync(
+        self,
+        errors: List[ErrorRecord],
+        embeddings: Optional[Sequence[Optional[List[float]]]] = None,
+    ) -> List[BatchItemResult]:
+        """Add several error records in batched transactions (blocking).
+
+        Records are written in chunks of ``BATCH_SIZE``, each embedded in a
+        single pass and inserted in one transaction. Records whose ID is
+        repeated in the batch or already stored are reported as failures,
+        and a chunk that fails is retried record by record. With
+        deduplication enabled, repeated errors are merged instead of
+        inserted. Records given an embedding are not re-embedded.
+        """
+        results: Dict[int, BatchItemResult] = {}
+        pending: List[Tuple[int, ErrorRecord]] = []
+        seen = set()
+        for index, error in enumerate(errors):
+            if str(error.id) in seen:
+                results[index] = BatchItemResult(
+                    index=index,
+                    id=error.id,
+                    success=False,
+                    error="Duplicate ID in batch",
+                )
+                continue
+            seen.add(str(error.id))
+            pending.append((index, error))
+
+        if self.dedup:
+            pending = self._dedup_batch(pending, results)
+        for start in range(0, len(pending), BATCH_SIZE):
+            self._insert_chunk(pending[start : start + BATCH_SIZE], results, embeddings)
+        self._bump_generation()
+        return [results[index] for index in range(len(errors))]
+
+    def _dedup_batch(
+        self,
+        pending: List[Tuple[int, ErrorRecord]],
+        results: Dict[int, BatchItemResult],
+    ) -> List[Tuple[int, ErrorRecord]]:
+        """Merge repeated errors of a batch (blocking).
+
+        Repeats of stored records are merged into them, and repeats within
+        the batch are merged into the first occurrence. Returns the records
+        that still have to be inserted.
+        """
+        fingerprints = [error_fingerprint(error) for _, error in pending]
+        stored = self._find_by_fingerprints(fingerprints)
+        changed: Dict[str, ErrorRecord] = {}
+        new: Dict[str, Tuple[int, ErrorRecord]] = {}
+        absorbed = 0
+        for (index, error), fingerprint in zip(pending, fingerprints):
+            if fingerprint in stored and stored[fingerprint].id != error.id:
+                target = merge_duplicate(stored[fingerprint], error)
+                stored[fingerprint] = changed[fingerprint] = target
+            elif fingerprint in new:
+                first_index, first = new[fingerprint]
+                target = merge_duplicate(first, error)
+                new[fingerprint] = (first_index, target)
+            else:
+                new[fingerprint] = (index, error)
+                continue
+            absorbed += 1
+            results[index] = BatchItemResult(
+                index=index, id=target.id, success=True, deduplicated=True
+            )
+
+        self._absorb_duplicates(list(changed.values()), absorbed)
+        return sorted(new.values(), key=lambda item: item[0])
+
+    def _insert_chunk(
+        self,
+        chunk: List[Tuple[int, ErrorRecord]],
+        results: Dict[int, BatchItemResult],
+        embeddings: Optional[Sequence[Optional[List[float]]]],
+    ) -> None:
+        """Insert new error records in one transaction, recording results."""
+        existing = self._existing_ids([str(error.id) for _, error in chunk])
+        new_items = []
+        for index, error in chunk:
+            if str(error.id) in existing:
+                results[index] = BatchItemResult(
+                    index=index,
+                    id=error.id,
+                    success=False,
+                    error="Error record already exists",
+                )
+            else:
+                new_items.append((index, error))
+        if not new_items:
+            return
+
+        vectors: Dict[int, np.ndarray] = {}
+        if embeddings is not None:
+            given = [(i, embeddings[i]) for i, _ in new_items if embeddings[i]]
+            if given:
+                vectors = dict(
+                    zip((i for i, _ in given), _normalize([v for _, v in given]))
+                )
+        missing = [(index, error) for index, error in new_items if index not in vectors]
+        if missing:
+            embedded = self._embed([embedding_text(error) for _, error in missing])
+            vectors.update(zip((index for index, _ in missing), embedded))
+
+        try:
+            with self._writer:
+                self._insert_rows(
+                    [self._row(error, vectors[index]) for index, error in new_items]
+                )
+            for index, error in new_items:
+                results[index] = BatchItemResult(index=index, id=error.id, success=True)
+        except Exception as e:
+            logger.warning(f"Batch add failed, retrying records one by one: {e}")
+            for index, error in new_items:
+                try:
+                    with self._writer:
+                        self._insert_rows([self._row(error, vectors[index])])
+                    results[index] = BatchItemResult(
+                        index=index, id=error.id, success=True
+                    )
+                except Exception as item_error:
+                    results[index] = BatchItemResult(
+                        index=index, id=error.id, success=False, error=str(item_error)
+                    )
+
+    async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
+        """Retrieve an error record by ID."""
+        return (await self._read(self._get_errors_sync, [str(error_id)]))[0]
+
+    async def get_errors(self, error_ids: List[UUID]) -> List[Optional[ErrorRecord]]:
+        """Retrieve several error records by ID."""
+        return await self._read(
+            self._get_errors_sync, [str(error_id) for error_id in error_ids]
+        )
+
+    def _get_errors_sync(self, ids: List[str]) -> List[Optional[ErrorRecord]]:
+        """Retrieve records by ID string, in input order (blocking)."""
+        found: Dict[str, ErrorRecord] = {}
+        unique = list(dict.fromkeys(ids))
+        for start in range(0, len(unique), BATCH_SIZE):
+            chunk = unique[start : start + BATCH_SIZE]
+            rows = self._reader().execute(
+                "SELECT id, record FROM records WHERE id IN "
+                f"({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for row_id, record in rows:
+                found[row_id] = ErrorRecord.model_validate_json(record)
+        return [found.get(row_id) for row_id in ids]
+
+    def _get_found(self, ids: List[str]) -> List[ErrorRecord]:
+        """Retrieve records by ID string, skipping missing ones (blocking)."""
+        return [error for error in self._get_errors_sync(ids) if error]
+
+    async def iter_errors(self, batch_size: int = 500) -> AsyncIterator[ErrorRecord]:
+        """Iterate over every stored error record, one batch per read."""
+        async for record, _ in self._iter_rows(batch_size, include_embeddings=False):
+            yield record
+
+    async def iter_errors_with_embeddings(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over every stored error record with its stored vector."""
+        async for record, embedding in self._iter_rows(
+            batch_size, include_embeddings=True
+        ):
+            yield record, embedding
+
+    async def _iter_rows(
+        self, batch_size: int, include_embeddings: bool
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over the records in ID order, resuming after each batch."""
+        after = ""
+        while True:
+            rows = await self._read(
+                self._rows_after_sync, after, max(batch_size, 1), include_embeddings
+            )
+            if not rows:
+                return
+            for row in rows:
+                yield row
+            after = str(rows[-1][0].id)
+
+    def _rows_after_sync(
+        self, after: str, limit: int, include_embeddings: bool
+    ) -> List[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Get the records with the lowest IDs above a key (blocking)."""
+        column = "embedding" if include_embeddings else "NULL"
+        rows = self._reader().execute(
+            f"SELECT record, {column} FROM records WHERE id > ? ORDER BY id LIMIT ?",
+            (after, limit),
+        )
+        return [
+            (
+                ErrorRecord.model_validate_json(record),
+                None if blob is None else np.frombuffer(blob, np.float32).tolist(),
+            )
+            for record, blob in rows
+        ]
+
+    async def update_error(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record."""
+        return await self._write(self._update_error_sync, error_id, error)
+
+    def _update_error_sync(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record (blocking)."""
+        row = self._writer.execute(
+            "SELECT record FROM records WHERE id = ?", (str(error_id),)
+        ).fetchone()
+        if row is None:
+            return None
+
+        # Keep the ID and creation time of the stored record
+        error.id = error_id
+        error.created_at = ErrorRecord.model_validate_json(row[0]).created_at
+        values = self._row(error, self._embed([embedding_text(error)])[0])
+        with self._writer:
+            self._writer.execute(
+                f"UPDATE records SET {', '.join(f'{c} = ?' for c in RECORD_COLUMNS)} "
+                "WHERE id = ?",
+                values + (str(error_id),),
+            )
+        self._bump_generation()
+        return error
+
+    async def delete_error(self, error_id: UUID) -> bool:
+        """Delete an error record by ID."""
+        return await self._write(self._delete_error_sync, error_id)
+
+    def _delete_error_sync(self, error_id: UUID) -> bool:
+        """Delete an error record by ID (blocking)."""
+        with self._writer:
+            deleted = self._writer.execute(
+                "DELETE FROM records WHERE id = ?", (str(error_id),)
+            ).rowcount
+            if deleted:
+                self._writer.execute(
+                    "UPDATE settings SET value = value + ? WHERE key = 'deleted'",
+                    (deleted,),
+                )
+        if not deleted:
+            return False
+        self._bump_generation()
+        return True
+
+    def _scan_blocks(
+        self, filters: Dict[str, str]
+    ) -> Iterator[Tuple[List[str], np.ndarray]]:
+        """Read the IDs and vectors of matching records, a block at a time."""
+        if self._dim is None:
+            return
+        dim = int(self._dim)
+        where, params = _where(filters)
+        cursor = self._reader().execute(
+            f"SELECT id, embedding FROM records {where}", params
+        )
+        while True:
+            rows = cursor.fetchmany(SCAN_BLOCK_SIZE)
+            if not rows:
+                return
+            ids = [row[0] for row in rows]
+            block = np.frombuffer(b"".join(row[1] for row in rows), np.float32)
+            yield ids, block.reshape(len(ids), dim)
+
+    def _vector_search(
+        self, queries: np.ndarray, limit: int, filters: Dict[str, str]
+    ) -> List[List[Tuple[str, float]]]:
+        """Find the records with the highest cosine similarity to each query.
+
+        Every matching vector is scored, so the results are exact. Each
+        block is scored against all queries with one matrix product, and
+        only the running top ``limit`` per query is kept.
+        """
+        best_ids: List[List[str]] = [[] for _ in range(len(queries))]
+        best_scores = [np.empty(0, np.float32) for _ in range(len(queries))]
+        if limit <= 0:
+            return [[] for _ in range(len(queries))]
+        for ids, block in self._scan_blocks(filters):
+            scores = block @ queries.T
+            for column in range(len(queries)):
+                candidates = np.concatenate([best_scores[column], scores[:, column]])
+                candidate_ids = best_ids[column] + ids
+                if len(candidates) > limit:
+                    keep = np.argpartition(-candidates, limit - 1)[:limit]
+                else:
+                    keep = np.arange(len(candidates))
+                best_scores[column] = candidates[keep]
+                best_ids[column] = [candidate_ids[i] for i in keep]
+
+        results = []
+        for ids, scores in zip(best_ids, best_scores):
+            order = np.argsort(-scores, kind="stable")
+            results.append([(ids[i], float(scores[i])) for i in order])
+        return results
+
+    def _lexical_search(
+        self, text: str, limit: int, filters: Dict[str, str]
+    ) -> List[Tuple[str, float]]:
+        """Rank records by BM25 relevance to a text with the FTS5 index."""
+        expression = _match_expression(text)
+        if expression is None:
+            return []
+        clauses = " ".join(f"AND r.{field} = ?" for field in filters)
+        rows = self._reader().execute(
+            "SELECT r.id, bm25(records_fts) AS rank FROM records_fts "
+            "JOIN records AS r ON r.seq = records_fts.rowid "
+            f"WHERE records_fts MATCH ? {clauses} ORDER BY rank LIMIT ?",
+            [expression, *filters.values(), limit],
+        )
+        # FTS5 reports BM25 scores negated, so that lower ranks first
+        return [(row_id, -rank) for row_id, rank in rows]
+
+    def _ranked_ids_sync(
+        self,
+        text: str,
+        max_results: int,
+        mode: SearchMode,
+        filters: Dict[str, str],
+    ) -> List[str]:
+        """Rank record IDs by vector, lexical or hybrid relevance (blocking).
+
+        Lexical ranking uses the FTS5 index only and never calls the
+        embedding model. Hybrid ranking fuses the lexical and vector
+        rankings with reciprocal rank fusion.
+        """
+        filters = {f: v for f, v in filters.items() if f in FACET_FIELDS}
+        depth = max_results
+        if mode == SearchMode.HYBRID:
+            depth = max_results * HYBRID_CANDIDATE_FACTOR
+
+        rankings = []
+        if mode != SearchMode.VECTOR:
+            rankings.append([i for i, _ in self._lexical_search(text, depth, filters)])
+        if mode != SearchMode.LEXICAL:
+            matches = self._vector_search(self._embed([text]), depth, filters)[0]
+            rankings.append([i for i, _ in matches])
+        if len(rankings) == 1:
+            return rankings[0]
+        return reciprocal_rank_fusion(rankings)[:max_results]
+
+    def _page_ids_sync(
+        self, filters: Dict[str, str], after: Optional[str], limit: int
+    ) -> List[str]:
+        """Get the lowest matching IDs above a key (blocking)."""
+        where, params = _where(filters, after)
+        rows = self._reader().execute(
+            f"SELECT id FROM records {where} ORDER BY id LIMIT ?", params + [limit]
+        )
+        return [row[0] for row in rows]
+
+    async def search_errors(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query."""
+        return await self._read(self._search_errors_sync, query)
+
+    def _search_errors_sync(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query (blocking).
+
+        Without search text, the records matching the metadata filters are
+        returned in ID order.
+        """
+        if query.cursor:
+            return self._search_errors_page_sync(query).records
+
+        filters = query_filters(query)
+        search_text = query_text(query)
+        if search_text:
+            ids = self._ranked_ids_sync(
+                search_text, query.max_results, query.mode, filters
+            )
+        else:
+            ids = self._page_ids_sync(filters, None, query.max_results)
+        return self._get_found(ids)
+
+    async def search_errors_page(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time."""
+        return await self._read(self._search_errors_page_sync, query)
+
+    def _search_errors_page_sync(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time (blocking).
+
+        Metadata-only listings resume after the last ID of the previous
+        page. Ranked searches snapshot the ranked IDs on the first page and
+        slice the snapshot on later pages.
+
+        Raises:
+            ValueError: If the cursor is invalid or has expired
+        """
+        filters = query_filters(query)
+        search_text = query_text(query)
+        page_size = query.max_results
+        position = decode_cursor(query)
+        next_position: Optional[Dict[str, Any]] = None
+        try:
+            if not search_text:
+                after = position["after"] if position else None
+                ids = self._page_ids_sync(filters, after, page_size + 1)
+                if len(ids) > page_size:
+                    ids = ids[:page_size]
+                    next_position = {"after": ids[-1]}
+            else:
+                if position is None:
+                    ranked = self._ranked_ids_sync(
+                        search_text, snapshot_depth(page_size), query.mode, filters
+                    )
+                    offset, token = 0, None
+                else:
+                    token, offset = position["snapshot"], position["offset"]
+                    ranked = self._snapshots.get(token)
+                ids = ranked[offset : offset + page_size]
+                if offset + page_size < len(ranked):
+                    if token is None:
+                        token = self._snapshots.put(ranked)
+                    next_position = {"snapshot": token, "offset": offset + page_size}
+        except (KeyError, TypeError):
+            raise ValueError("Invalid cursor") from None
+
+        return ErrorPage(
+            # Records deleted since the snapshot was taken are skipped
+            records=self._get_found(ids),
+            next_cursor=encode_cursor(query, next_position) if next_position else None,
+        )
+
+    async def search_similar(
+        self, text_query: str, max_results: int = 5
+    ) -> List[ErrorRecord]:
+        """Search for error records with similar text content."""
+        return (await self.search_similar_many([text_query], max_results))[0]
+
+    async def search_similar_many(
+        self, text_queries: List[str], max_results: int = 5
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts in one scan."""
+        return await self._read(
+            self._search_similar_many_sync, text_queries, max_results
+        )
+
+    def _search_similar_many_sync(
+        self, text_queries: List[str], max_results: int
+    ) -> List[List[ErrorRecord]]:
+        """Search for records similar to several texts (blocking).
+
+        All query texts are embedded in one batch and scored in the same
+        pass over the stored vectors.
+        """
+        if not text_queries:
+            return []
+        ranked = self._vector_search(self._embed(list(text_queries)), max_results, {})
+        records = {
+            str(error.id): error
+            for error in self._get_found(
+                list(dict.fromkeys(i for matches in ranked for i, _ in matches))
+            )
+        }
+        return [[records[i] for i, _ in matches if i in records] for matches in ranked]
+
+    async def facet_counts(
+        self, filters: Optional[Dict[str, str]] = None
+    ) -> FacetCounts:
+        """Count the records per error type, language and framework."""
+        return await self._read(self._facet_counts_sync, filters or {})
+
+    def _facet_counts_sync(self, filters: Dict[str, str]) -> FacetCounts:
+        """Count the records per facet value with GROUP BY queries (blocking)."""
+        where, params = _where(filters)
+        connection = self._reader()
+        total = connection.execute(
+            f"SELECT COUNT(*) FROM records {where}", params
+        ).fetchone()[0]
+        facets: Dict[str, Dict[str, int]] = {}
+        for field in FACET_FIELDS:
+            rows = connection.execute(
+                f"SELECT {field}, COUNT(*) FROM records {where} GROUP BY {field}",
+                params,
+            )
+            # Records without a value, such as no framework, are not counted
+            facets[field] = {value: count for value, count in rows if value}
+        return FacetCounts(total=total, facets=facets)
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every committed add, update and delete."""
+        return self._generation
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        """Identify the embedder that produced the stored vectors."""
+        return self.embedding_model_id
+
+    def _count(self) -> int:
+        """Count the stored records (blocking)."""
+        return self._reader().execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    async def snapshot(self, directory: str) -> SnapshotInfo:
+        """Take an incremental snapshot of the persist directory."""
+        return await self._on_write_pool(self._snapshot_sync, directory)
+
+    def _checkpoint(self) -> bool:
+        """Move the WAL into the database file and truncate it (blocking).
+
+        SQLite waits up to the busy timeout for readers still in a read
+        transaction, then reports them rather than raising.
+
+        Returns:
+            Whether the database file now holds every committed write
+        """
+        busy, _, _ = self._writer.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        return not busy
+
+    def _snapshot_sync(self, directory: str) -> SnapshotInfo:
+        """Take a snapshot while writes are paused (blocking).
+
+        The WAL is checkpointed into the database file first, so the
+        database file alone holds every committed write.
+
+        Raises:
+            RuntimeError: If readers kept the WAL from being checkpointed
+        """
+        with self._write_gate.quiesce(), self._write_lock:
+            if not self._checkpoint():
+                raise RuntimeError(
+                    "Could not checkpoint the WAL: readers are still active"
+                )
+            return create_snapshot(
+                self.persist_directory,
+                directory,
+                metadata={
+                    "backend": "sqlite",
+                    "schema_version": SQLITE_SCHEMA_VERSION,
+                    "embedding_model": self.embedding_model_id,
+                    "records": self._count(),
+                },
+                exclude=SNAPSHOT_EXCLUDE,
+            )
+
+    @classmethod
+    def validate_restore(
+        cls, persist_directory: str, manifest: Dict[str, Any], **kwargs: Any
+    ) -> None:
+        """
+        Check that a restored persist directory can be opened.
+
+        Args:
+            persist_directory: The restored directory
+            manifest: The snapshot manifest
+            **kwargs: Storage options, such as the embedding function
+
+        Raises:
+            ValueError: If the snapshot is of another backend, or the schema
+                or the embedder is incompatible
+        """
+        metadata = manifest.get("metadata", {})
+        if metadata.get("backend") != "sqlite":
+            raise ValueError("The snapshot was not taken of a SQLite store")
+        storage = cls(persist_directory, **kwargs)
+        try:
+            count = storage._count()
+        finally:
+            storage._close_connections()
+        expected = metadata.get("records")
+        if expected is not None and count != expected:
+            raise ValueError(
+                f"Restored database holds {count} records, "
+                f"the snapshot recorded {expected}"
+            )
+
+    async def compact(
+        self, threshold: float = DEFAULT_COMPACTION_THRESHOLD, force: bool = False
+    ) -> CompactionReport:
+        """Optimize the full-text index and vacuum the database if fragmented."""
+        return await self._on_write_pool(self._compact_sync, threshold, force)
+
+    def _compact_sync(self, threshold: float, force: bool) -> CompactionReport:
+        """Compact the storage if it is fragmented enough (blocking).
+
+        Writes are paused for the whole compaction; reads continue.
+        """
+        started = time.perf_counter()
+        records = self._count()
+        deleted = int(self._get_setting("deleted") or 0)
+        bytes_before = directory_size(self.persist_directory)
+        report = CompactionReport(
+            compacted=False,
+            records=records,
+            deleted_ratio=deleted / max(records + deleted, 1),
+            free_page_ratio=sqlite_free_ratio(self.database_path),
+            bytes_before=bytes_before,
+            bytes_after=bytes_before,
+        )
+        if not force and max(report.deleted_ratio, report.free_page_ratio) < threshold:
+            return report
+
+        probe = self._latency_probe()
+        if probe is not None:
+            report.search_latency_before_ms = median_latency_ms(probe)
+        with self._write_gate.quiesce(), self._write_lock:
+            with self._writer:
+                self._writer.execute(
+                    "INSERT INTO records_fts (records_fts) VALUES ('optimize')"
+                )
+                self._set_setting("deleted", 0)
+            self._writer.execute("VACUUM")
+            if not self._checkpoint():
+                # The next checkpoint moves the vacuumed pages over
+                logger.warning("WAL not truncated after compaction: readers active")
+        if probe is not None:
+            report.search_latency_after_ms = median_latency_ms(probe)
+
+        report.compacted = True
+        report.bytes_after = directory_size(self.persist_directory)
+        report.bytes_reclaimed = max(report.bytes_before - report.bytes_after, 0)
+        report.duration_seconds = time.perf_counter() - started
+        logger.info(
+            f"Compacted {records} records: {report.bytes_reclaimed} bytes "
+            f"reclaimed in {report.duration_seconds:.2f}s"
+        )
+        return report
+
+    def _latency_probe(self) -> Optional[Callable[[], Any]]:
+        """Get a vector search for timing scans."""
+        row = self._reader().execute("SELECT embedding FROM records LIMIT 1").fetchone()
+        if row is None:
+            return None
+        vector = np.frombuffer(row[0], np.float32).reshape(1, -1)
+        return lambda: self._vector_search(vector, 10, {})
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics, including executor queue metrics."""
+        stats: Dict[str, Any] = {
+            "backend": "sqlite",
+            "records": await self._read(self._count),
+            "database_bytes": directory_size(self.persist_directory),
+            "dedup": {
+                "enabled": self.dedup,
+                "duplicates_absorbed": self._duplicates_absorbed,
+            },
+            "compaction": {
+                "deleted_since_compaction": int(self._get_setting("deleted") or 0)
+            },
+        }
+        if self._read_executor is not None:
+            stats["read_executor"] = self._read_executor.metrics()
+        if self._write_executor is not None:
+            stats["write_executor"] = self._write_executor.metrics()
+        if self.embedding_cache is not None:
+            stats["embedding_cache"] = self.embedding_cache.metrics()
+        return stats
+
+    def _close_connections(self) -> None:
+        """Close every connection opened to the database."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+    async def close(self) -> None:
+        """Wait for in-flight calls, then close the connections and caches."""
+        for executor in (self._write_executor, self._read_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._close_connections()
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
@@ -0,0 +1,467 @@
+# filename: mcp_server_tribal/services/storage_factory.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Construction of the configured storage backend."""
+
+
+import asyncio
+import logging
+import os
+import shutil
+import signal
+from datetime import UTC, datetime
+from typing import Any, Dict, Optional
+
+from .aws.storage import DEFAULT_CACHE_BYTES, DynamoDBStorage, S3Storage
+from .chroma_storage import ChromaStorage
+from .compaction import DEFAULT_COMPACTION_THRESHOLD, CompactionScheduler
+from .embeddings import create_embedding_function
+from .memory_storage import InMemoryVectorStorage
+from .mmap_storage import MmapSnapshotStorage
+from .result_cache import ResultCacheStorage
+from .sharded_storage import ShardedStorage, read_shard_layout
+from .snapshot import restore_snapshot
+from .sqlite_storage import SQLiteStorage
+from .storage_interface import StorageInterface
+from .storage_ipc import RemoteStorage, StorageServer
+from .transfer import copy_records
+from .write_behind import WriteBehindStorage
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def _get_int_env(name: str, default: int) -> int:
+    """Read a non-negative integer from the environment."""
+    try:
+        value = int(os.environ.get(name, default))
+    except ValueError:
+        logger.warning(f"Invalid {name} value, using default: {default}")
+        return default
+    return max(value, 0)
+
+
+def _get_float_env(name: str, default: float) -> float:
+    """Read a non-negative number from the environment."""
+    try:
+        value = float(os.environ.get(name, default))
+    except ValueError:
+        logger.warning(f"Invalid {name} value, using default: {default}")
+        return default
+    return max(value, 0.0)
+
+
+def _get_bool_env(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    return os.environ.get(name, str(default)).lower() == "true"
+
+
+def get_storage_settings() -> Dict[str, Any]:
+    """Get storage settings from environment variables."""
+    return {
+        "storage_backend": os.environ.get("STORAGE_BACKEND", "chroma").lower(),
+        "mmap_snapshot_path": os.environ.get("MMAP_SNAPSHOT_PATH") or None,
+        "s3_bucket": os.environ.get("S3_BUCKET") or None,
+        "s3_prefix": os.environ.get("S3_PREFIX", "errors/"),
+        "s3_endpoint_url": os.environ.get("S3_ENDPOINT_URL") or None,
+        "s3_cache_bytes": _get_int_env("S3_CACHE_BYTES", DEFAULT_CACHE_BYTES),
+        "dynamodb_table": os.environ.get("DYNAMODB_TABLE") or None,
+        "dynamodb_endpoint_url": os.environ.get("DYNAMODB_ENDPOINT_URL") or None,
+        "storage_read_workers": _get_int_env("STORAGE_READ_WORKERS", 4),
+        "storage_write_workers": _get_int_env("STORAGE_WRITE_WORKERS", 1),
+        "embedding_function": os.environ.get("EMBEDDING_FUNCTION", "default"),
+        "embedding_model_path": os.environ.get("EMBEDDING_MODEL_PATH"),
+        "embedding_dim": _get_int_env("EMBEDDING_DIM", 384),
+        "quantized_vectors": _get_bool_env("QUANTIZED_VECTORS", False),
+        "quantized_rescore_factor": _get_int_env("QUANTIZED_RESCORE_FACTOR", 4),
+        "dedup_enabled": _get_bool_env("DEDUP_ENABLED", False),
+        "embedding_cache_size": _get_int_env("EMBEDDING_CACHE_SIZE", 10000),
+        "embedding_cache_disk": _get_bool_env("EMBEDDING_CACHE_DISK", False),
+        "write_behind_enabled": _get_bool_env("WRITE_BEHIND_ENABLED", False),
+        "write_behind_max_batch": _get_int_env("WRITE_BEHIND_MAX_BATCH", 64),
+        "write_behind_max_delay_ms": _get_int_env("WRITE_BEHIND_MAX_DELAY_MS", 50),
+        "result_cache_size": _get_int_env("RESULT_CACHE_SIZE", 0),
+        "result_cache_ttl_seconds": _get_int_env("RESULT_CACHE_TTL_SECONDS", 30),
+        "snapshot_directory": os.environ.get("SNAPSHOT_DIRECTORY", "./snapshots"),
+        "compaction_interval_seconds": _get_int_env("COMPACTION_INTERVAL_SECONDS", 0),
+        "compaction_threshold": _get_float_env(
+            "COMPACTION_THRESHOLD", DEFAULT_COMPACTION_THRESHOLD
+        ),
+        "shard_count": max(_get_int_env("SHARD_COUNT", 1), 1),
+        "shard_strategy": os.environ.get("SHARD_STRATEGY", "hash"),
+        "storage_socket": os.environ.get("STORAGE_SOCKET") or None,
+    }
+
+
+def storage_socket_path(settings: Dict[str, Any]) -> str:
+    """
+    Get the Unix socket the storage owner process listens on.
+
+    Args:
+        settings: Application settings as returned by ``get_settings()``
+
+    Returns:
+        STORAGE_SOCKET if set, else ``storage.sock`` in the persist directory
+    """
+    return settings.get("storage_socket") or os.path.join(
+        os.path.abspath(settings["persist_directory"]), "storage.sock"
+    )
+
+
+def _open_backend(
+    settings: Dict[str, Any], persist_directory: Optional[str] = None, **overrides: Any
+) -> StorageInterface:
+    """
+    Open the store described by the settings.
+
+    ``STORAGE_BACKEND`` selects ChromaDB, which may be sharded, SQLite,
+    the in-memory store, a read-only mmap snapshot file, S3 or DynamoDB;
+    the in-memory and mmap stores ignore the persist directory, S3 keeps
+    its segment cache there and DynamoDB its local vector index.
+
+    Args:
+        settings: Application settings as returned by ``get_settings()``
+        persist_directory: Directory to open instead of the configured one
+        **overrides: Settings to override
+
+    Returns:
+        A new storage instance
+
+    Raises:
+        ValueError: If the backend is unknown or misconfigured, or the
+            directory holds a store sharded differently
+    """
+    settings = {**settings, **overrides}
+    persist_directory = persist_directory or settings["persist_directory"]
+    backend = settings.get("storage_backend", "chroma")
+    if backend not in ("chroma", "sqlite", "memory", "mmap", "s3", "dynamodb"):
+        raise ValueError(f"Unknown storage backend: {backend}")
+    options = {
+        "read_workers": settings.get("storage_read_workers", 0),
+        "write_workers": settings.get("storage_write_workers", 0),
+        "dedup": settings.get("dedup_enabled", False),
+        "embedding_function": create_embedding_function(
+            settings.get("embedding_function", "default"),
+            model_path=settings.get("embedding_model_path"),
+            dim=settings.get("embedding_dim", 384),
+        ),
+        "embedding_cache_size": settings.get("embedding_cache_size", 0),
+        "embedding_cache_disk": settings.get("embedding_cache_disk", False),
+        "quantized_vectors": settings.get("quantized_vectors", False),
+        "rescore_factor": settings.get("quantized_rescore_factor", 4),
+    }
+
+    shard_count = settings.get("shard_count", 1)
+    if backend != "chroma" and shard_count > 1:
+        raise ValueError(f"The {backend} backend does not support SHARD_COUNT > 1")
+    if backend == "s3":
+        if not settings.get("s3_bucket"):
+            raise ValueError("Set S3_BUCKET to store records in S3")
+        return S3Storage(
+            settings["s3_bucket"],
+            prefix=settings.get("s3_prefix", "errors/"),
+            endpoint_url=settings.get("s3_endpoint_url"),
+            cache_directory=os.path.join(persist_directory, "s3_cache"),
+            cache_bytes=settings.get("s3_cache_bytes", DEFAULT_CACHE_BYTES),
+            read_workers=options["read_workers"],
+            write_workers=options["write_workers"],
+            embedding_function=options["embedding_function"],
+            embedding_cache_size=options["embedding_cache_size"],
+        )
+    if backend == "dynamodb":
+        if not settings.get("dynamodb_table"):
+            raise ValueError("Set DYNAMODB_TABLE to store records in DynamoDB")
+        return DynamoDBStorage(
+            settings["dynamodb_table"],
+            endpoint_url=settings.get("dynamodb_endpoint_url"),
+            index_directory=os.path.join(persist_directory, "dynamodb_index"),
+            read_workers=options["read_workers"],
+            write_workers=options["write_workers"],
+            embedding_function=options["embedding_function"],
+            embedding_cache_size=options["embedding_cache_size"],
+            rescore_factor=options["rescore_factor"],
+        )
+    if backend == "mmap":
+        if not settings.get("mmap_snapshot_path"):
+            raise ValueError("Set MMAP_SNAPSHOT_PATH to serve an mmap snapshot")
+        return MmapSnapshotStorage(
+            settings["mmap_snapshot_path"],
+            read_workers=options["read_workers"],
+            embedding_function=options["embedding_function"],
+            embedding_cache_size=options["embedding_cache_size"],
+        )
+    if backend == "memory":
+        return InMemoryVectorStorage(
+            read_workers=options["read_workers"],
+            write_workers=options["write_workers"],
+            dedup=options["dedup"],
+            embedding_function=options["embedding_function"],
+            embedding_cache_size=options["embedding_cache_size"],
+            compaction_threshold=settings.get(
+                "compaction_threshold", DEFAULT_COMPACTION_THRESHOLD
+            ),
+        )
+    if backend == "sqlite":
+        # Quantized vectors are ChromaDB-specific; SQLite scans exact vectors
+        options.pop("quantized_vectors")
+        options.pop("rescore_factor")
+        return SQLiteStorage(persist_directory=persist_directory, **options)
+    if shard_count > 1:
+        return ShardedStorage.open(
+            persist_directory,
+            shard_count,
+            settings.get("shard_strategy", "hash"),
+            **options,
+        )
+    layout = read_shard_layout(persist_directory)
+    if layout is not None:
+        raise ValueError(
+            f"{persist_directory} is sharded as {layout}; set SHARD_COUNT and "
+            f"SHARD_STRATEGY to match, or run 'tribal reshard --shards 1'"
+        )
+    return ChromaStorage(persist_directory=persist_directory, **options)
+
+
+def create_storage(settings: Dict[str, Any]) -> StorageInterface:
+    """
+    Create the storage backend described by the settings.
+
+    Args:
+        settings: Application settings as returned by ``get_settings()``
+
+    Returns:
+        A new storage instance; a client of the storage owner process if
+        STORAGE_SOCKET is set
+    """
+    if settings.get("storage_socket"):
+        # The owner buffers writes and caches results
+        storage: StorageInterface = RemoteStorage(settings["storage_socket"])
+    else:
+        storage = _open_backend(settings)
+
+    # Remote clients leave buffering to the owner; snapshots take no writes
+    write_behind = (
+        settings.get("write_behind_enabled")
+        and not settings.get("storage_socket")
+        and settings.get("storage_backend") != "mmap"
+    )
+    if write_behind and settings.get("dedup_enabled"):
+        # A buffered repeat is merged into the stored record only at flush,
+        # after add_error has returned an ID that will never exist
+        logger.warning("WRITE_BEHIND_ENABLED is ignored while DEDUP_ENABLED is set")
+    elif write_behind:
+        storage = WriteBehindStorage(
+            storage,
+            journal_path=os.path.join(
+                settings["persist_directory"], "write_behind.journal"
+            ),
+            max_batch=settings.get("write_behind_max_batch", 64),
+            max_delay=settings.get("write_behind_max_delay_ms", 50) / 1000,
+        )
+
+    # A cache in a worker would miss writes made through other workers, since
+    # a hit sends no request that could bring back the owner's generation
+    if settings.get("result_cache_size", 0) > 0 and not settings.get(
+        "storage_socket"
+    ):
+        storage = ResultCacheStorage(
+            storage,
+            max_entries=settings["result_cache_size"],
+            ttl=settings.get("result_cache_ttl_seconds", 30),
+        )
+
+    return storage
+
+
+def create_compaction_scheduler(
+    storage: StorageInterface, settings: Dict[str, Any]
+) -> Optional[CompactionScheduler]:
+    """
+    Create the background compaction job described by the settings.
+
+    Args:
+        storage: The storage to compact
+        settings: Application settings as returned by ``get_settings()``
+
+    Returns:
+        A scheduler to start, or None if scheduled compaction is disabled or
+        is run by the storage owner process
+    """
+    interval = settings.get("compaction_interval_seconds", 0)
+    if interval <= 0 or settings.get("storage_socket"):
+        return None
+    return CompactionScheduler(
+        storage,
+        interval=interval,
+        threshold=settings.get("compaction_threshold", DEFAULT_COMPACTION_THRESHOLD),
+    )
+
+
+async def serve_storage(
+    settings: Dict[str, Any],
+    socket_path: str,
+    stop: Optional[asyncio.Event] = None,
+) -> None:
+    """
+    Open the configured storage and serve it to worker processes.
+
+    Runs until ``stop`` is set, or until SIGINT or SIGTERM when no event is
+    given, then finishes the calls in progress and closes the storage.
+
+    Args:
+        settings: Application settings as returned by ``get_settings()``
+        socket_path: Path of the Unix socket to listen on
+        stop: Event that stops the server
+
+    Raises:
+        RuntimeError: If another process is serving the socket
+    """
+    settings = {**settings, "storage_socket": None}
+    storage = create_storage(settings)
+    server = StorageServer(storage, socket_path)
+    scheduler = create_compaction_scheduler(storage, settings)
+    if stop is None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+    try:
+        await server.start()
+        if scheduler is not None:
+            scheduler.start()
+        await stop.wait()
+    finally:
+        if scheduler is not None:
+            await scheduler.stop()
+        await server.close()
+        await storage.close()
+        logger.info("Storage owner stopped")
+
+
+def run_storage_server(settings: Dict[str, Any], socket_path: str) -> None:
+    """
+    Run the storage owner process until it is terminated.
+
+    Args:
+        settings: Application settings as returned by ``get_settings()``
+        socket_path: Path of the Unix socket to listen on
+    """
+    asyncio.run(serve_storage(settings, socket_path))
+
+
+def restore_storage(snapshot_path: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Restore a snapshot into the configured persist directory.
+
+    The restored files are opened with the configured embedder before they
+    replace the persist directory, which checks the schema version. The
+    storage must not be running.
+
+    Args:
+        snapshot_path: The snapshot directory
+        settings: Application settings as returned by ``get_settings()``
+
+    Returns:
+        The manifest of the restored snapshot
+
+    Raises:
+        ValueError: If the snapshot is corrupt or incompatible
+    """
+
+    def validate(path: str, manifest: Dict[str, Any]) -> None:
+        embedding_function = create_embedding_function(
+            settings.get("embedding_function", "default"),
+            model_path=settings.get("embedding_model_path"),
+            dim=settings.get("embedding_dim", 384),
+        )
+        backend = settings.get("storage_backend", "chroma")
+        if backend in ("memory", "mmap", "s3", "dynamodb"):
+            raise ValueError(f"The {backend} backend does not restore snapshots")
+        if backend == "sqlite":
+            SQLiteStorage.validate_restore(
+                path, manifest, embedding_function=embedding_function
+            )
+            return
+        if manifest.get("metadata", {}).get("backend") == "sqlite":
+            raise ValueError("The snapshot was taken of a SQLite store")
+        ChromaStorage.validate_restore(
+            path,
+            manifest,
+            embedding_function=embedding_function,
+            quantized_vectors=settings.get("quantized_vectors", False),
+        )
+
+    return restore_snapshot(snapshot_path, settings["persist_directory"], validate)
+
+
+async def reshard_storage(
+    settings: Dict[str, Any], shard_count: int, strategy: str, batch_size: int = 500
+) -> Dict[str, Any]:
+    """
+    Copy the configured store into a new shard layout and swap it in.
+
+    Records are copied with their stored vectors, so nothing is re-embedded.
+    The old persist directory is kept next to the new one. The storage
+    must not be running.
+
+    Args:
+        settings: Application settings as returned by ``get_settings()``
+        shard_count: The new number of shards; 1 for an unsharded store
+        strategy: How records are assigned to shards: hash or language
+        batch_size: Records copied at a time
+
+    Returns:
+        The new layout, the number of records copied and the path of the
+        old directory
+
+    Raises:
+        ValueError: If a record could not be copied; the store is unchanged
+    """
+    persist_directory = os.path.abspath(settings["persist_directory"])
+    layout = read_shard_layout(persist_directory) or {"strategy": "hash", "count": 1}
+    # Open the old store with its write-behind journal, which is replayed
+    source = create_storage(
+        {
+            **settings,
+            "shard_count": layout["count"],
+            "shard_strategy": layout["strategy"],
+            "result_cache_size": 0,
+        }
+    )
+    staging = f"{persist_directory}.reshard"
+    if os.path.exists(staging):
+        shutil.rmtree(staging)
+    target = _open_backend(
+        settings,
+        staging,
+        shard_count=shard_count,
+        shard_strategy=strategy,
+        dedup_enabled=False,
+    )
+    try:
+        result = await copy_records(source, target, batch_size)
+    finally:
+        await target.close()
+        await source.close()
+    if result.failed:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise ValueError(
+            f"{result.failed} records could not be copied: "
+            f"{[item.error for item in result.failures[:5]]}"
+        )
+
+    stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%fZ")
+    previous = f"{persist_directory}.pre-reshard-{stamp}"
+    os.rename(persist_directory, previous)
+    os.rename(staging, persist_directory)
+    return {
+        "strategy": strategy,
+        "count": shard_count,
+        "records": result.imported + result.deduplicated,
+        "previous_directory": previous,
+    }
@@ -10,10 +10,39 @@
 
 
 import abc
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from ..models.error_record import ErrorQuery, ErrorRecord
+from ..models.error_record import (
+    BatchItemResult,
+    CompactionReport,
+    ErrorPage,
+    ErrorQuery,
+    ErrorRecord,
+    FacetCounts,
+    SnapshotInfo,
+)
+
+
+def query_text(query: ErrorQuery) -> str:
+    """Combine the text fields of a query for text search."""
+    return " ".join(
+        [
+            query.error_message or "",
+            query.code_snippet or "",
+            query.task_description or "",
+        ]
+    ).strip()
+
+
+def query_filters(query: ErrorQuery) -> Dict[str, str]:
+    """Get the facet filters set on a query."""
+    filters = {
+        "error_type": query.error_type,
+        "language": query.language,
+        "framework": query.framework,
+    }
+    return {field: value for field, value in filters.items() if value}
 
 
 class StorageInterface(abc.ABC):
@@ -32,6 +61,32 @@ class StorageInterface(abc.ABC):
         """
         pass
 
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """
+        Add several error records to storage.
+
+        Backends should override this with a batched write. The default
+        implementation adds the records one at a time.
+
+        Args:
+            errors: The error records to add
+
+        Returns:
+            One result per record, in input order, reporting success or failure
+        """
+        results = []
+        for index, error in enumerate(errors):
+            try:
+                added = await self.add_error(error)
+                results.append(BatchItemResult(index=index, id=added.id, success=True))
+            except Exception as e:
+                results.append(
+                    BatchItemResult(
+                        index=index, id=error.id, success=False, error=str(e)
+                    )
+                )
+        return results
+
     @abc.abstractmethod
     async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
         """
@@ -45,6 +100,21 @@ class StorageInterface(abc.ABC):
         """
         pass
 
+    async def get_errors(self, error_ids: List[UUID]) -> List[Optional[ErrorRecord]]:
+        """
+        Retrieve several error records by ID.
+
+        Backends should override this with a single batched read. The
+        default implementation looks the records up one at a time.
+
+        Args:
+            error_ids: The UUIDs of the error records
+
+        Returns:
+            One entry per ID, in input order: the record, or None if not found
+        """
+        return [await self.get_error(error_id) for error_id in error_ids]
+
     @abc.abstractmethod
     async def update_error(
         self, error_id: UUID, error: ErrorRecord
@@ -87,6 +157,101 @@ class StorageInterface(abc.ABC):
         """
         pass
 
+    async def add_errors_with_embeddings(
+        self, errors: List[ErrorRecord], embeddings: Sequence[Optional[List[float]]]
+    ) -> List[BatchItemResult]:
+        """
+        Add several error records whose embeddings are already computed.
+
+        Used by imports to avoid re-embedding exported records. The
+        embeddings must come from the embedder named by
+        ``embedding_model``. Backends that do not store vectors, or that
+        cannot take them, embed the records themselves; the default
+        implementation ignores the embeddings.
+
+        Args:
+            errors: The error records to add
+            embeddings: One embedding per record, or None to embed it
+
+        Returns:
+            One result per input record, in input order
+        """
+        return await self.add_errors(errors)
+
+    async def iter_errors(self, batch_size: int = 500) -> AsyncIterator[ErrorRecord]:
+        """
+        Iterate over every stored error record.
+
+        Records are read one batch at a time, so memory use does not grow
+        with the size of the store. The default implementation pages
+        through ``search_errors_page`` in pages of at most 50 records.
+
+        Args:
+            batch_size: Number of records read per storage call
+
+        Yields:
+            Each error record
+        """
+        query = ErrorQuery(max_results=min(max(batch_size, 1), 50))
+        while True:
+            page = await self.search_errors_page(query)
+            for record in page.records:
+                yield record
+            if page.next_cursor is None:
+                return
+            query = query.model_copy(update={"cursor": page.next_cursor})
+
+    async def iter_errors_with_embeddings(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """
+        Iterate over every stored error record with its embedding.
+
+        The default implementation yields no embeddings.
+
+        Args:
+            batch_size: Number of records read per storage call
+
+        Yields:
+            Each error record and its embedding, or None if unavailable
+        """
+        async for record in self.iter_errors(batch_size):
+            yield record, None
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        """
+        Identify the embedder that produced the stored vectors.
+
+        Returns:
+            The embedding model ID, or None if the backend stores no vectors
+        """
+        return None
+
+    async def search_errors_page(self, query: ErrorQuery) -> ErrorPage:
+        """
+        Search for error records one page at a time.
+
+        The first page is requested without a cursor, and each page returns
+        the cursor of the next one. Backends should override this with a
+        paginated search. The default implementation only serves the first
+        page.
+
+        Args:
+            query: Search parameters; ``max_results`` is the page size
+
+        Returns:
+            The matching records and the cursor of the next page
+
+        Raises:
+            ValueError: If the cursor is invalid or has expired
+            NotImplementedError: If a cursor is given to a backend that
+                cannot paginate
+        """
+        if query.cursor:
+            raise NotImplementedError("This storage backend does not paginate")
+        return ErrorPage(records=await self.search_errors(query))
+
     @abc.abstractmethod
     async def search_similar(
         self, text_query: str, max_results: int = 5
@@ -102,3 +267,113 @@ class StorageInterface(abc.ABC):
             A list of matching error records ordered by similarity
         """
         pass
+
+    async def search_similar_many(
+        self, text_queries: List[str], max_results: int = 5
+    ) -> List[List[ErrorRecord]]:
+        """
+        Search for error records similar to each of several texts.
+
+        Backends should override this to embed and search all queries in
+        one pass. The default implementation runs the queries one at a time.
+
+        Args:
+            text_queries: The texts to search for
+            max_results: Maximum number of results to return per query
+
+        Returns:
+            One list of matching error records per query, in input order
+        """
+        return [
+            await self.search_similar(text_query, max_results)
+            for text_query in text_queries
+        ]
+
+    async def facet_counts(
+        self, filters: Optional[Dict[str, str]] = None
+    ) -> FacetCounts:
+        """
+        Count the records per error type, language and framework.
+
+        Args:
+            filters: Only count records with these facet values, keyed by
+                error_type, language or framework
+
+        Returns:
+            The number of matching records and their counts per facet value
+
+        Raises:
+            NotImplementedError: If the backend cannot count facets
+        """
+        raise NotImplementedError("This storage backend does not count facets")
+
+    async def snapshot(self, directory: str) -> SnapshotInfo:
+        """
+        Take a point-in-time snapshot of the stored data.
+
+        Writes are paused while the snapshot is taken.
+
+        Args:
+            directory: The directory holding the snapshots; each snapshot
+                is written to a new subdirectory
+
+        Returns:
+            A summary of the snapshot
+
+        Raises:
+            NotImplementedError: If the backend cannot take snapshots
+        """
+        raise NotImplementedError("This storage backend does not take snapshots")
+
+    async def compact(
+        self, threshold: float = 0.2, force: bool = False
+    ) -> CompactionReport:
+        """
+        Reclaim space left behind by updated and deleted records.
+
+        Reads continue while the storage is compacted; writes wait.
+
+        Args:
+            threshold: Only compact if at least this fraction of the index
+                or database is taken by deleted data
+            force: Compact regardless of the threshold
+
+        Returns:
+            The fragmentation found, and the space and search latency
+            before and after if the storage was compacted
+
+        Raises:
+            NotImplementedError: If the backend cannot be compacted
+        """
+        raise NotImplementedError("This storage backend cannot be compacted")
+
+    @property
+    def generation(self) -> int:
+        """
+        Counter that changes whenever a write is committed.
+
+        Caches compare it to detect that results may be stale. Backends that
+        do not track writes always report 0.
+
+        Returns:
+            The current write generation
+        """
+        return 0
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get operational statistics for the storage backend.
+
+        Returns:
+            A dictionary of backend-specific counters and metrics
+        """
+        return {}
+
+    async def close(self) -> None:
+        """
+        Release any resources held by the storage backend.
+
+        Called once when the application shuts down. The default
+        implementation does nothing.
+        """
+        return None
@@ -0,0 +1,603 @@
+# filename: mcp_server_tribal/services/storage_ipc.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Storage shared between processes through a single owner process.
+
+One process opens the storage and serves it on a Unix socket; any number of
+HTTP or MCP worker processes use it through ``RemoteStorage``. Messages are
+framed as a 4-byte big-endian length followed by compact JSON. A client
+sends ``[id, call, args]`` and the owner answers ``[id, kind, payload,
+generation]``, so many calls can be in flight on one connection and are
+answered as they complete.
+
+Only the owner touches the database files. Reads from all workers run
+concurrently on its read pool, and writes are serialized by its writer.
+"""
+
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import socket
+import struct
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from ..models import error_record
+from ..models.error_record import (
+    BatchItemResult,
+    CompactionReport,
+    ErrorPage,
+    ErrorQuery,
+    ErrorRecord,
+    FacetCounts,
+    SnapshotInfo,
+)
+from .storage_interface import StorageInterface
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Frame header: the payload length as a 4-byte big-endian integer
+FRAME_HEADER = struct.Struct(">I")
+
+# Largest payload accepted, in bytes
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Records returned per round trip when iterating over the store
+STREAM_CHUNK = 100
+
+# Response kinds
+RESULT = "r"
+ERROR = "e"
+
+# Storage calls served to clients
+CALLS = frozenset(
+    {
+        "add_error",
+        "add_errors",
+        "add_errors_with_embeddings",
+        "get_error",
+        "get_errors",
+        "update_error",
+        "delete_error",
+        "search_errors",
+        "search_errors_page",
+        "search_similar",
+        "search_similar_many",
+        "facet_counts",
+        "snapshot",
+        "compact",
+        "get_stats",
+    }
+)
+
+# Iterations served a chunk at a time
+STREAMS = frozenset({"iter_errors", "iter_errors_with_embeddings"})
+
+# Exceptions raised on the client as the type raised by the storage
+REMOTE_EXCEPTIONS = {
+    exception.__name__: exception
+    for exception in (ValueError, KeyError, TypeError, NotImplementedError)
+}
+
+# Models that can be sent over the socket, by class name
+MODELS = {
+    name: value
+    for name, value in vars(error_record).items()
+    if isinstance(value, type) and issubclass(value, BaseModel)
+}
+
+
+def encode_value(value: Any) -> Any:
+    """
+    Convert a storage argument or result to JSON-compatible data.
+
+    Models and UUIDs are tagged so ``decode_value`` can rebuild them.
+
+    Args:
+        value: The value to encode
+
+    Returns:
+        The encoded value
+    """
+    if isinstance(value, BaseModel):
+        return {"$m": type(value).__name__, "v": value.model_dump(mode="json")}
+    if isinstance(value, UUID):
+        return {"$u": str(value)}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: encode_value(item) for key, item in value.items()}
+    if hasattr(value, "tolist"):
+        # NumPy vectors and scalars
+        return value.tolist()
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    """
+    Rebuild a value encoded by ``encode_value``.
+
+    Args:
+        value: The encoded value
+
+    Returns:
+        The decoded value
+
+    Raises:
+        ValueError: If the value names an unknown model
+    """
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if isinstance(value, dict):
+        if "$m" in value:
+            model = MODELS.get(value["$m"])
+            if model is None:
+                raise ValueError(f"Unknown model: {value['$m']}")
+            return model.model_validate(value["v"])
+        if "$u" in value:
+            return UUID(value["$u"])
+        return {key: decode_value(item) for key, item in value.items()}
+    return value
+
+
+def pack_frame(message: Any) -> bytes:
+    """Encode a message as a length-prefixed JSON frame."""
+    payload = json.dumps(message, separators=(",", ":"), default=str).encode()
+    if len(payload) > MAX_FRAME_SIZE:
+        raise ValueError(f"Message of {len(payload)} bytes is too large to send")
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Any]:
+    """
+    Read one frame from a stream.
+
+    Args:
+        reader: The stream to read from
+
+    Returns:
+        The decoded message, or None if the stream ended between frames
+
+    Raises:
+        ValueError: If the frame is too large or not valid JSON
+        asyncio.IncompleteReadError: If the stream ended inside a frame
+    """
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise
+        return None
+    (size,) = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {size} bytes exceeds the limit")
+    return json.loads(await reader.readexactly(size))
+
+
+def _raise_remote(payload: Sequence[str]) -> None:
+    """Raise the exception described by an error response."""
+    name, message = payload
+    exception = REMOTE_EXCEPTIONS.get(name)
+    if exception is None:
+        raise RuntimeError(f"Storage owner failed with {name}: {message}")
+    raise exception(message)
+
+
+class StorageServer:
+    """
+    Serve a storage backend on a Unix socket.
+
+    Each request runs as its own task, so slow calls such as a compaction
+    do not hold up searches from the same or other clients.
+    """
+
+    def __init__(self, storage: StorageInterface, socket_path: str):
+        """
+        Initialize the server.
+
+        Args:
+            storage: The storage backend to serve
+            socket_path: Path of the Unix socket to listen on
+        """
+        self.storage = storage
+        self.socket_path = socket_path
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: set = set()
+        self._tasks: set = set()
+
+    async def start(self) -> None:
+        """
+        Start listening for clients.
+
+        Raises:
+            RuntimeError: If another process is serving the socket
+        """
+        if os.path.exists(self.socket_path):
+            try:
+                _, writer = await asyncio.open_unix_connection(self.socket_path)
+            except OSError:
+                # Left behind by an owner that did not shut down cleanly
+                os.unlink(self.socket_path)
+            else:
+                writer.close()
+                raise RuntimeError(f"Storage is already served on {self.socket_path}")
+        self._server = await asyncio.start_unix_server(
+            self._handle, path=self.socket_path
+        )
+        os.chmod(self.socket_path, 0o600)
+        logger.info(f"Serving storage on {self.socket_path}")
+
+    async def close(self) -> None:
+        """Stop accepting calls, finish the ones in progress and disconnect."""
+        if self._server is None:
+            return
+        self._server.close()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Read a client's requests and run each as a task."""
+        self._writers.add(writer)
+        streams: Dict[int, AsyncIterator[Any]] = {}
+        try:
+            while True:
+                try:
+                    message = await read_frame(reader)
+                except (ValueError, asyncio.IncompleteReadError, ConnectionError) as e:
+                    logger.warning(f"Dropping storage client: {e}")
+                    break
+                if message is None:
+                    break
+                task = asyncio.create_task(self._dispatch(writer, streams, *message))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            for stream in streams.values():
+                await stream.aclose()
+
+    async def _dispatch(
+        self,
+        writer: asyncio.StreamWriter,
+        streams: Dict[int, AsyncIterator[Any]],
+        request_id: int,
+        call: str,
+        args: List[Any],
+    ) -> None:
+        """Run one request and send its response."""
+        try:
+            result = await self._run(streams, request_id, call, decode_value(args))
+            response = [request_id, RESULT, encode_value(result)]
+        except Exception as e:
+            if type(e).__name__ not in REMOTE_EXCEPTIONS:
+                logger.exception(f"Storage call {call} failed")
+            response = [request_id, ERROR, [type(e).__name__, str(e)]]
+        response.append(self.storage.generation)
+        try:
+            writer.write(pack_frame(response))
+            await writer.drain()
+        except (ValueError, ConnectionError) as e:
+            logger.warning(f"Could not answer storage call {call}: {e}")
+
+    async def _run(
+        self,
+        streams: Dict[int, AsyncIterator[Any]],
+        request_id: int,
+        call: str,
+        args: List[Any],
+    ) -> Any:
+        """Run one request against the storage."""
+        if call in CALLS:
+            return await getattr(self.storage, call)(*args)
+        if call == "hello":
+            return {"embedding_model": self.storage.embedding_model}
+        if call in STREAMS:
+            streams[request_id] = getattr(self.storage, call)(*args)
+            return await self._next_chunk(streams, request_id)
+        if call == "next":
+            return await self._next_chunk(streams, args[0])
+        if call == "close_stream":
+            stream = streams.pop(args[0], None)
+            if stream is not None:
+                await stream.aclose()
+            return None
+        raise ValueError(f"Unknown storage call: {call}")
+
+    async def _next_chunk(
+        self, streams: Dict[int, AsyncIterator[Any]], stream_id: int
+    ) -> Tuple[List[Any], bool]:
+        """Take the next chunk of an iteration and whether it is finished."""
+        stream = streams.get(stream_id)
+        if stream is None:
+            raise ValueError(f"Unknown stream: {stream_id}")
+        items = []
+        try:
+            while len(items) < STREAM_CHUNK:
+                items.append(await stream.__anext__())
+        except StopAsyncIteration:
+            del streams[stream_id]
+            return items, True
+        return items, False
+
+
+class RemoteStorage(StorageInterface):
+    """
+    Storage served by another process through ``StorageServer``.
+
+    The connection is opened on first use in each event loop, waiting up to
+    ``connect_timeout`` seconds for the owner to start listening. Closing a
+    remote storage only disconnects; the owner keeps the storage open.
+    """
+
+    def __init__(self, socket_path: str, connect_timeout: float = 10.0):
+        """
+        Initialize the client.
+
+        Args:
+            socket_path: Path of the owner's Unix socket
+            connect_timeout: Seconds to wait for the owner to accept
+        """
+        self.socket_path = socket_path
+        self.connect_timeout = connect_timeout
+        self._ids = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._receiver: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._generation = 0
+        self._hello: Optional[Dict[str, Any]] = None
+
+    async def _connect(self) -> asyncio.StreamWriter:
+        """Get the connection for the running event loop, opening it if needed."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Connections cannot be shared between event loops
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._writer = None
+            self._receiver = None
+            self._pending = {}
+        if self._writer is not None and not self._writer.is_closing():
+            return self._writer
+
+        async with self._lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return self._writer
+            deadline = time.monotonic() + self.connect_timeout
+            while True:
+                try:
+                    reader, writer = await asyncio.open_unix_connection(
+                        self.socket_path
+                    )
+                    break
+                except OSError as e:
+                    if time.monotonic() >= deadline:
+                        raise ConnectionError(
+                            f"No storage owner is serving {self.socket_path}: {e}"
+                        ) from e
+                    await asyncio.sleep(0.1)
+            self._writer = writer
+            self._receiver = loop.create_task(self._receive(reader, writer))
+            if self._hello is None:
+                _, future = await self._request("hello")
+                self._hello = self._result(*await future)
+            return writer
+
+    async def _receive(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Hand each response to the call waiting for it."""
+        error: Exception = ConnectionError(
+            f"Storage owner at {self.socket_path} closed the connection"
+        )
+        try:
+            while True:
+                message = await read_frame(reader)
+                if message is None:
+                    break
+                request_id, kind, payload, generation = message
+                self._generation = generation
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((kind, payload))
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError) as e:
+            error = ConnectionError(f"Lost the storage owner connection: {e}")
+        finally:
+            if self._writer is writer:
+                self._writer = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def _request(self, call: str, *args: Any) -> Tuple[int, asyncio.Future]:
+        """Send a storage call to the owner without waiting for its result."""
+        writer = await self._connect()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            writer.write(pack_frame([request_id, call, encode_value(list(args))]))
+            await writer.drain()
+        except (ValueError, ConnectionError):
+            self._pending.pop(request_id, None)
+            raise
+        return request_id, future
+
+    @staticmethod
+    def _result(kind: str, payload: Any) -> Any:
+        """Decode a response, raising the error it carries."""
+        if kind == ERROR:
+            _raise_remote(payload)
+        return decode_value(payload)
+
+    async def _call(self, call: str, *args: Any) -> Any:
+        """Make a storage call in the owner process and return its result."""
+        _, future = await self._request(call, *args)
+        return self._result(*await future)
+
+    async def _stream(self, call: str, *args: Any) -> AsyncIterator[Any]:
+        """Iterate over a storage iteration in the owner, a chunk at a time."""
+        # The owner names a stream after the request that opened it
+        stream_id, future = await self._request(call, *args)
+        items, done = self._result(*await future)
+        try:
+            while True:
+                for item in items:
+                    yield item
+                if done:
+                    return
+                items, done = await self._call("next", stream_id)
+        finally:
+            if not done and self._writer is not None:
+                await self._call("close_stream", stream_id)
+
+    def _hello_sync(self) -> Dict[str, Any]:
+        """Ask the owner for the storage's properties, blocking."""
+        if self._hello is None:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.connect_timeout)
+                sock.connect(self.socket_path)
+                sock.sendall(pack_frame([0, "hello", []]))
+                with sock.makefile("rb") as stream:
+                    (size,) = FRAME_HEADER.unpack(stream.read(FRAME_HEADER.size))
+                    _, kind, payload, generation = json.loads(stream.read(size))
+            if kind == ERROR:
+                _raise_remote(payload)
+            self._generation = max(self._generation, generation)
+            self._hello = payload
+        return self._hello
+
+    async def add_error(self, error: ErrorRecord) -> ErrorRecord:
+        """Add a new error record to storage."""
+        return await self._call("add_error", error)
+
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """Add several error records to storage."""
+        return await self._call("add_errors", errors)
+
+    async def add_errors_with_embeddings(
+        self, errors: List[ErrorRecord], embeddings: Sequence[Optional[List[float]]]
+    ) -> List[BatchItemResult]:
+        """Add several error records whose embeddings are already computed."""
+        return await self._call("add_errors_with_embeddings", errors, embeddings)
+
+    async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
+        """Retrieve an error record by ID."""
+        return await self._call("get_error", error_id)
+
+    async def get_errors(self, error_ids: List[UUID]) -> List[Optional[ErrorRecord]]:
+        """Retrieve several error records by ID."""
+        return await self._call("get_errors", error_ids)
+
+    async def update_error(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record."""
+        return await self._call("update_error", error_id, error)
+
+    async def delete_error(self, error_id: UUID) -> bool:
+        """Delete an error record by ID."""
+        return await self._call("delete_error", error_id)
+
+    async def search_errors(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query."""
+        return await self._call("search_errors", query)
+
+    async def iter_errors(self, batch_size: int = 500) -> AsyncIterator[ErrorRecord]:
+        """Iterate over every stored error record."""
+        async for record in self._stream("iter_errors", batch_size):
+            yield record
+
+    async def iter_errors_with_embeddings(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over every stored error record with its embedding."""
+        async for record, embedding in self._stream(
+            "iter_errors_with_embeddings", batch_size
+        ):
+            yield record, embedding
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        """Identify the embedder that produced the stored vectors."""
+        return self._hello_sync()["embedding_model"]
+
+    async def search_errors_page(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time."""
+        return await self._call("search_errors_page", query)
+
+    async def search_similar(
+        self, text_query: str, max_results: int = 5
+    ) -> List[ErrorRecord]:
+        """Search for error records with similar text content."""
+        return await self._call("search_similar", text_query, max_results)
+
+    async def search_similar_many(
+        self, text_queries: List[str], max_results: int = 5
+    ) -> List[List[ErrorRecord]]:
+        """Search for error records similar to each of several texts."""
+        return await self._call("search_similar_many", text_queries, max_results)
+
+    async def facet_counts(
+        self, filters: Optional[Dict[str, str]] = None
+    ) -> FacetCounts:
+        """Count the records per error type, language and framework."""
+        return await self._call("facet_counts", filters)
+
+    async def snapshot(self, directory: str) -> SnapshotInfo:
+        """Take a snapshot in the owner process; the path is on its host."""
+        return await self._call("snapshot", directory)
+
+    async def compact(
+        self, threshold: float = 0.2, force: bool = False
+    ) -> CompactionReport:
+        """Compact the storage in the owner process."""
+        return await self._call("compact", threshold, force)
+
+    @property
+    def generation(self) -> int:
+        """The owner's write generation as of the latest response."""
+        return self._generation
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get the owner's statistics for the storage backend."""
+        stats = await self._call("get_stats")
+        stats["remote"] = {"socket": self.socket_path, "pending": len(self._pending)}
+        return stats
+
+    async def close(self) -> None:
+        """Disconnect from the owner, which keeps the storage open."""
+        if self._loop is not asyncio.get_running_loop():
+            # The connection belonged to an event loop that has ended
+            self._writer = self._receiver = None
+            return
+        writer = self._writer
+        self._writer = None
+        if writer is not None:
+            writer.close()
+        if self._receiver is not None:
+            await asyncio.gather(self._receiver, return_exceptions=True)
+            self._receiver = None
@@ -0,0 +1,140 @@
+# filename: mcp_server_tribal/services/storage_wrapper.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Base class for storage decorators that wrap another storage backend."""
+
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from ..models.error_record import (
+    BatchItemResult,
+    CompactionReport,
+    ErrorPage,
+    ErrorQuery,
+    ErrorRecord,
+    FacetCounts,
+    SnapshotInfo,
+)
+from .storage_interface import StorageInterface
+
+
+class StorageWrapper(StorageInterface):
+    """
+    Storage that forwards every call to an inner storage backend.
+
+    Subclasses override the calls they want to change, which lets features
+    such as buffering or caching be layered over any backend.
+    """
+
+    def __init__(self, inner: StorageInterface):
+        """
+        Initialize the wrapper.
+
+        Args:
+            inner: The storage backend to forward calls to
+        """
+        self.inner = inner
+
+    async def add_error(self, error: ErrorRecord) -> ErrorRecord:
+        """Add a new error record to storage."""
+        return await self.inner.add_error(error)
+
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """Add several error records to storage."""
+        return await self.inner.add_errors(errors)
+
+    async def add_errors_with_embeddings(
+        self, errors: List[ErrorRecord], embeddings: Sequence[Optional[List[float]]]
+    ) -> List[BatchItemResult]:
+        """Add several error records whose embeddings are already computed."""
+        return await self.inner.add_errors_with_embeddings(errors, embeddings)
+
+    async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
+        """Retrieve an error record by ID."""
+        return await self.inner.get_error(error_id)
+
+    async def get_errors(self, error_ids: List[UUID]) -> List[Optional[ErrorRecord]]:
+        """Retrieve several error records by ID."""
+        return await self.inner.get_errors(error_ids)
+
+    async def update_error(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record."""
+        return await self.inner.update_error(error_id, error)
+
+    async def delete_error(self, error_id: UUID) -> bool:
+        """Delete an error record by ID."""
+        return await self.inner.delete_error(error_id)
+
+    async def search_errors(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query."""
+        return await self.inner.search_errors(query)
+
+    async def iter_errors(self, batch_size: int = 500) -> AsyncIterator[ErrorRecord]:
+        """Iterate over every stored error record."""
+        async for record in self.inner.iter_errors(batch_size):
+            yield record
+
+    async def iter_errors_with_embeddings(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over every stored error record with its embedding."""
+        async for item in self.inner.iter_errors_with_embeddings(batch_size):
+            yield item
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        """Identify the embedder that produced the stored vectors."""
+        return self.inner.embedding_model
+
+    async def search_errors_page(self, query: ErrorQuery) -> ErrorPage:
+        """Search for error records one page at a time."""
+        return await self.inner.search_errors_page(query)
+
+    async def search_similar(
+        self, text_query: str, max_results: int = 5
+    ) -> List[ErrorRecord]:
+        """Search for error records with similar text content."""
+        return await self.inner.search_similar(text_query, max_results)
+
+    async def search_similar_many(
+        self, text_queries: List[str], max_results: int = 5
+    ) -> List[List[ErrorRecord]]:
+        """Search for error records similar to each of several texts."""
+        return await self.inner.search_similar_many(text_queries, max_results)
+
+    async def facet_counts(
+        self, filters: Optional[Dict[str, str]] = None
+    ) -> FacetCounts:
+        """Count the records per error type, language and framework."""
+        return await self.inner.facet_counts(filters)
+
+    async def snapshot(self, directory: str) -> SnapshotInfo:
+        """Take a point-in-time snapshot of the stored data."""
+        return await self.inner.snapshot(directory)
+
+    async def compact(
+        self, threshold: float = 0.2, force: bool = False
+    ) -> CompactionReport:
+        """Reclaim space left behind by updated and deleted records."""
+        return await self.inner.compact(threshold, force)
+
+    @property
+    def generation(self) -> int:
+        """Counter that changes whenever a write is committed."""
+        return self.inner.generation
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get operational statistics for the storage backend."""
+        return await self.inner.get_stats()
+
+    async def close(self) -> None:
+        """Release any resources held by the storage backend."""
+        await self.inner.close()
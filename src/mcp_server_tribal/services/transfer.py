@@ -0,0 +1,316 @@
+# filename: mcp_server_tribal/services/transfer.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Streaming NDJSON export and import of error records.
+
+An export starts with a header line naming the format and, when
+embeddings are included, the embedder that produced them. Each following
+line is one error record as JSON, optionally with an ``embedding`` field
+holding its vector as base64-encoded little-endian float32 values.
+"""
+
+
+import base64
+import json
+import logging
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from uuid import UUID
+
+import numpy as np
+from pydantic import ValidationError
+
+from ..models.error_record import BatchItemResult, ErrorRecord, ImportResult
+from .storage_interface import StorageInterface
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Identifier and version of the export format, written in the header line
+EXPORT_FORMAT = "tribal-ndjson"
+EXPORT_FORMAT_VERSION = 1
+
+# Failures listed in an import result; the rest are only counted
+IMPORT_MAX_REPORTED_FAILURES = 100
+
+
+def encode_embedding(vector: Sequence[float]) -> str:
+    """
+    Encode a vector as base64 of little-endian float32 values.
+
+    Args:
+        vector: The vector
+
+    Returns:
+        The encoded vector
+    """
+    data = np.asarray(vector, dtype="<f4").tobytes()
+    return base64.b64encode(data).decode("ascii")
+
+
+def decode_embedding(encoded: str) -> List[float]:
+    """
+    Decode a vector encoded by ``encode_embedding``.
+
+    Args:
+        encoded: The encoded vector
+
+    Returns:
+        The vector
+    """
+    return np.frombuffer(base64.b64decode(encoded), dtype="<f4").tolist()
+
+
+async def export_ndjson(
+    storage: StorageInterface, batch_size: int = 500, include_embeddings: bool = False
+) -> AsyncIterator[str]:
+    """
+    Export every stored error record as NDJSON lines.
+
+    Records are read from storage one batch at a time, so memory use does
+    not grow with the size of the store.
+
+    Args:
+        storage: The storage to export
+        batch_size: Number of records read per storage call
+        include_embeddings: Include the stored vectors, so that an import
+            into a store with the same embedder does not re-embed
+
+    Yields:
+        The header line, then one line per record, each ending in a newline
+    """
+    embedding_model = storage.embedding_model if include_embeddings else None
+    header = {
+        "format": EXPORT_FORMAT,
+        "version": EXPORT_FORMAT_VERSION,
+        "embedding_model": embedding_model,
+    }
+    yield json.dumps(header) + "\n"
+
+    if embedding_model is None:
+        async for record in storage.iter_errors(batch_size):
+            yield record.model_dump_json() + "\n"
+        return
+
+    async for record, embedding in storage.iter_errors_with_embeddings(batch_size):
+        line = record.model_dump(mode="json")
+        if embedding is not None:
+            line["embedding"] = encode_embedding(embedding)
+        yield json.dumps(line) + "\n"
+
+
+async def iter_ndjson_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of byte chunks into text lines.
+
+    Args:
+        chunks: UTF-8 encoded NDJSON, in chunks of any size
+
+    Yields:
+        Each line, without its line ending
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8")
+    if buffer:
+        yield buffer.decode("utf-8")
+
+
+async def _aiter(
+    lines: Union[Iterable[str], AsyncIterable[str]],
+) -> AsyncIterator[str]:
+    """Iterate over lines from a synchronous or an asynchronous source."""
+    if hasattr(lines, "__aiter__"):
+        async for line in lines:
+            yield line
+    else:
+        for line in lines:
+            yield line
+
+
+class _Importer:
+    """Accumulates parsed records and adds them to storage in batches."""
+
+    def __init__(self, storage: StorageInterface, batch_size: int):
+        """
+        Initialize the importer.
+
+        Args:
+            storage: The storage to import into
+            batch_size: Number of records added per storage call
+        """
+        self.storage = storage
+        self.batch_size = max(batch_size, 1)
+        self.result = ImportResult()
+        self.reuse_embeddings = False
+        self._batch: List[Tuple[int, ErrorRecord, Optional[List[float]]]] = []
+
+    def read_header(self, header: dict) -> None:
+        """Check an export header and decide whether to reuse embeddings."""
+        if header.get("version", 0) > EXPORT_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported export version {header.get('version')}; "
+                f"this version of Tribal reads version {EXPORT_FORMAT_VERSION}"
+            )
+        exported_model = header.get("embedding_model")
+        if exported_model is None:
+            return
+        if exported_model == self.storage.embedding_model:
+            self.reuse_embeddings = True
+        else:
+            logger.warning(
+                f"Export was embedded with {exported_model}, but the store uses "
+                f"{self.storage.embedding_model}; records will be re-embedded"
+            )
+
+    def fail(
+        self, line_number: int, error: str, record_id: Optional[UUID] = None
+    ) -> None:
+        """Record a line that could not be imported."""
+        self.result.failed += 1
+        if len(self.result.failures) < IMPORT_MAX_REPORTED_FAILURES:
+            self.result.failures.append(
+                BatchItemResult(
+                    index=line_number, id=record_id, success=False, error=error
+                )
+            )
+
+    async def add(self, line_number: int, data: dict) -> None:
+        """Queue a parsed record line, adding the batch to storage when full."""
+        encoded = data.pop("embedding", None)
+        try:
+            record = ErrorRecord.model_validate(data)
+        except ValidationError as e:
+            self.fail(line_number, f"Invalid record: {e.error_count()} errors")
+            return
+        embedding = None
+        if self.reuse_embeddings and isinstance(encoded, str):
+            embedding = decode_embedding(encoded)
+        await self.queue(line_number, record, embedding)
+
+    async def queue(
+        self, index: int, record: ErrorRecord, embedding: Optional[List[float]]
+    ) -> None:
+        """Queue a record, adding the batch to storage when full."""
+        self._batch.append((index, record, embedding))
+        if len(self._batch) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Add the queued records to storage."""
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        records = [record for _, record, _ in batch]
+        embeddings = [embedding for _, _, embedding in batch]
+        if any(embedding is not None for embedding in embeddings):
+            results = await self.storage.add_errors_with_embeddings(records, embeddings)
+        else:
+            results = await self.storage.add_errors(records)
+
+        for (line_number, record, embedding), item in zip(batch, results):
+            if not item.success:
+                self.fail(line_number, item.error or "Not stored", record.id)
+            elif item.deduplicated:
+                self.result.deduplicated += 1
+            else:
+                self.result.imported += 1
+                if embedding is not None:
+                    self.result.embeddings_reused += 1
+
+
+async def import_ndjson(
+    storage: StorageInterface,
+    lines: Union[Iterable[str], AsyncIterable[str]],
+    batch_size: int = 500,
+) -> ImportResult:
+    """
+    Import error records from NDJSON lines.
+
+    Lines are consumed as they arrive and records are added one batch at a
+    time, so memory use does not grow with the size of the input. Records
+    whose ID is already stored are reported as failures. Exported
+    embeddings are reused only if they come from the store's embedder.
+
+    Args:
+        storage: The storage to import into
+        lines: NDJSON lines, as written by ``export_ndjson``
+        batch_size: Number of records added per storage call
+
+    Returns:
+        Counts of imported, deduplicated and failed records
+
+    Raises:
+        ValueError: If the export was written by a newer format version
+    """
+    importer = _Importer(storage, batch_size)
+    line_number = 0
+    async for line in _aiter(lines):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            importer.fail(line_number, "Invalid JSON")
+            continue
+        if not isinstance(data, dict):
+            importer.fail(line_number, "Expected a JSON object")
+        elif data.get("format") == EXPORT_FORMAT:
+            importer.read_header(data)
+        else:
+            await importer.add(line_number, data)
+
+    await importer.flush()
+    return importer.result
+
+
+async def copy_records(
+    source: StorageInterface, target: StorageInterface, batch_size: int = 500
+) -> ImportResult:
+    """
+    Copy every error record from one storage to another.
+
+    Stored vectors are copied along when both storages use the same
+    embedder, so the records are not embedded again.
+
+    Args:
+        source: The storage to copy from
+        target: The storage to copy into
+        batch_size: Number of records read and added per storage call
+
+    Returns:
+        Counts of copied, deduplicated and failed records, indexed by
+        their position in the source
+    """
+    importer = _Importer(target, batch_size)
+    reuse = source.embedding_model is not None and (
+        source.embedding_model == target.embedding_model
+    )
+    index = 0
+    if reuse:
+        async for record, embedding in source.iter_errors_with_embeddings(batch_size):
+            await importer.queue(index, record, embedding)
+            index += 1
+    else:
+        async for record in source.iter_errors(batch_size):
+            await importer.queue(index, record, None)
+            index += 1
+    await importer.flush()
+    return importer.result
@@ -0,0 +1,409 @@
+# filename: mcp_server_tribal/services/write_behind.py
+#
+# Copyright (c) 2025 Agentience.ai
+# Author: Troy Molander
+# License: MIT License - See LICENSE file for details
+#
+# Version: 0.1.0
+
+"""Write-behind buffer that groups single-record writes into batches."""
+
+
+import asyncio
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from ..models.error_record import (
+    BatchItemResult,
+    CompactionReport,
+    ErrorRecord,
+    SnapshotInfo,
+)
+from .storage_interface import StorageInterface
+from .storage_wrapper import StorageWrapper
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Upper bound for the retry delay after a failed flush, in seconds
+MAX_RETRY_DELAY = 5.0
+
+
+class WriteBehindStorage(StorageWrapper):
+    """
+    Storage decorator that coalesces add_error calls into batched writes.
+
+    Each record is appended to an on-disk journal before add_error returns
+    and is then held in memory. Journal writes run on a worker thread, and
+    records arriving while one is in progress are written and fsynced
+    together by the next, so the event loop never blocks on the disk and
+    concurrent adds share one fsync. The buffer is written to the inner
+    storage with a single add_errors call once ``max_batch`` records are
+    waiting or ``max_delay`` seconds after the first one arrived, and on
+    close.
+
+    Buffered records are returned by get_error immediately; searches see
+    them after the next flush. Records still in the journal after a crash
+    are replayed when the storage is opened again. Records the inner
+    storage rejects, such as duplicates, are moved to a rejected journal
+    next to it rather than dropped, one record per line as ``tribal
+    import`` reads them.
+
+    add_error returns the caller's record, so do not wrap a store that
+    merges repeats into stored records: the returned ID would not exist.
+    """
+
+    def __init__(
+        self,
+        inner: StorageInterface,
+        journal_path: str,
+        max_batch: int = 64,
+        max_delay: float = 0.05,
+        fsync: bool = True,
+    ):
+        """
+        Initialize the write-behind buffer.
+
+        Args:
+            inner: The storage backend to write batches to
+            journal_path: Path of the journal file for buffered records
+            max_batch: Number of buffered records that triggers a flush
+            max_delay: Seconds to wait for more records before flushing
+            fsync: Whether to fsync the journal on every group of appends
+        """
+        super().__init__(inner)
+        self.journal_path = journal_path
+        self.max_batch = max(max_batch, 1)
+        self.max_delay = max_delay
+        self.fsync = fsync
+
+        self._pending: Dict[str, ErrorRecord] = {}
+        self._flushing: Dict[str, ErrorRecord] = {}
+        self._flush_lock = asyncio.Lock()
+        # Serializes the journal appends with the moves of the journal file
+        self._journal_lock = asyncio.Lock()
+        self._journal_queue: List[Tuple[ErrorRecord, asyncio.Future]] = []
+        self._journal_writer: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._closed = False
+        self._stats = {
+            "buffered": 0,
+            "flushes": 0,
+            "flushed_records": 0,
+            "failed_records": 0,
+            "journal_syncs": 0,
+            "recovered_records": 0,
+        }
+
+        directory = os.path.dirname(os.path.abspath(journal_path))
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+        self._journal = open(journal_path, "a", encoding="utf-8")
+
+    @property
+    def _flushing_path(self) -> str:
+        """Path of the journal segment that is currently being flushed."""
+        return f"{self.journal_path}.flushing"
+
+    @property
+    def rejected_path(self) -> str:
+        """Path of the journal of records the inner storage rejected."""
+        return f"{self.journal_path}.rejected"
+
+    def _recover(self) -> None:
+        """Load records left in the journal by a previous run."""
+        for path in (self._flushing_path, self.journal_path):
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as journal:
+                for line in journal:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = ErrorRecord.model_validate_json(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-write
+                        logger.warning(f"Skipping unreadable journal entry in {path}")
+                        continue
+                    self._pending[str(record.id)] = record
+
+        if self._pending:
+            self._stats["recovered_records"] = len(self._pending)
+            logger.info(f"Recovered {len(self._pending)} buffered records from journal")
+        self._write_journal(list(self._pending.values()))
+        if os.path.exists(self._flushing_path):
+            os.remove(self._flushing_path)
+
+    def _write_journal(self, records: List[ErrorRecord]) -> None:
+        """Atomically replace the journal with the given records."""
+        temp_path = f"{self.journal_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as journal:
+            journal.writelines(record.model_dump_json() + "\n" for record in records)
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(temp_path, self.journal_path)
+
+    def _write_lines(self, lines: List[str]) -> None:
+        """Append lines to the journal and sync it once (blocking)."""
+        self._journal.writelines(lines)
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    async def _append(self, record: ErrorRecord) -> None:
+        """Journal and buffer a record, returning once it is written.
+
+        Raises:
+            OSError: If the journal cannot be written
+        """
+        loop = asyncio.get_running_loop()
+        written = loop.create_future()
+        self._journal_queue.append((record, written))
+        if self._journal_writer is None or self._journal_writer.done():
+            self._journal_writer = loop.create_task(self._write_queued())
+        await written
+
+    async def _write_queued(self) -> None:
+        """Write the queued records to the journal, a group per thread call.
+
+        Records are buffered once their lines are written and before the
+        journal can be moved aside, so a flush takes exactly the records
+        journaled in the file it moves.
+        """
+        while self._journal_queue:
+            group, self._journal_queue = self._journal_queue, []
+            lines = [record.model_dump_json() + "\n" for record, _ in group]
+            try:
+                async with self._journal_lock:
+                    await asyncio.to_thread(self._write_lines, lines)
+                    for record, _ in group:
+                        self._pending[str(record.id)] = record
+            except Exception as e:
+                for _, written in group:
+                    if not written.done():
+                        written.set_exception(e)
+                continue
+            self._stats["journal_syncs"] += 1
+            for _, written in group:
+                if not written.done():
+                    written.set_result(None)
+
+    def _rotate_journal(self) -> None:
+        """Move the journal aside for a flush and start a new one (blocking)."""
+        self._journal.close()
+        os.replace(self.journal_path, self._flushing_path)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def _restore_journal(self, records: List[ErrorRecord]) -> None:
+        """Rewrite the journal with the records of a failed flush (blocking)."""
+        self._journal.close()
+        self._write_journal(records)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        os.remove(self._flushing_path)
+
+    def _finish_flush(self, rejected: List[ErrorRecord]) -> None:
+        """Keep the rejected records, then drop the flushed journal (blocking)."""
+        if rejected:
+            with open(self.rejected_path, "a", encoding="utf-8") as journal:
+                journal.writelines(r.model_dump_json() + "\n" for r in rejected)
+                journal.flush()
+                os.fsync(journal.fileno())
+        os.remove(self._flushing_path)
+
+    def _is_buffered(self, error_id: UUID) -> bool:
+        """Check whether a record has not been written to the inner storage yet."""
+        key = str(error_id)
+        return key in self._pending or key in self._flushing
+
+    def _schedule(self) -> None:
+        """Make sure the background flusher is running and wake it up."""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._run_flusher())
+        self._wakeup.set()
+        if len(self._pending) >= self.max_batch:
+            self._batch_full.set()
+
+    async def _run_flusher(self) -> None:
+        """Flush the buffer whenever it fills up or the delay expires."""
+        failures = 0
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if len(self._pending) < self.max_batch and not self._closed:
+                try:
+                    await asyncio.wait_for(
+                        self._batch_full.wait(), timeout=self.max_delay
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            self._batch_full.clear()
+
+            try:
+                await self.flush()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                delay = min(self.max_delay * 2**failures, MAX_RETRY_DELAY)
+                logger.error(f"Write-behind flush failed, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+
+            if self._closed:
+                return
+            if self._pending:
+                self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Write all buffered records to the inner storage."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+
+            # Move the journal aside so records arriving during the flush
+            # go to a fresh journal
+            async with self._journal_lock:
+                batch = self._pending
+                self._pending = {}
+                self._flushing = batch
+                await asyncio.to_thread(self._rotate_journal)
+
+            try:
+                results = await self.inner.add_errors(list(batch.values()))
+            except BaseException:
+                # Put the batch back ahead of records that arrived meanwhile
+                self._pending = {**batch, **self._pending}
+                self._flushing = {}
+                async with self._journal_lock:
+                    await asyncio.to_thread(
+                        self._restore_journal, list(self._pending.values())
+                    )
+                raise
+
+            rejected = []
+            records = list(batch.values())
+            for result in results:
+                if result.success:
+                    self._stats["flushed_records"] += 1
+                else:
+                    self._stats["failed_records"] += 1
+                    rejected.append(records[result.index])
+                    logger.warning(
+                        f"Buffered record {result.id} was not stored, keeping it "
+                        f"in {self.rejected_path}: {result.error}"
+                    )
+            await asyncio.to_thread(self._finish_flush, rejected)
+            self._flushing = {}
+            self._stats["flushes"] += 1
+
+    async def add_error(self, error: ErrorRecord) -> ErrorRecord:
+        """Journal and buffer a new error record."""
+        if self._closed:
+            raise RuntimeError("Write-behind storage is closed")
+
+        await self._append(error)
+        self._stats["buffered"] += 1
+        self._schedule()
+        return error
+
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """Add several error records directly, after flushing the buffer."""
+        await self.flush()
+        return await self.inner.add_errors(errors)
+
+    async def add_errors_with_embeddings(
+        self, errors: List[ErrorRecord], embeddings: Sequence[Optional[List[float]]]
+    ) -> List[BatchItemResult]:
+        """Add several embedded error records directly, after flushing the buffer."""
+        await self.flush()
+        return await self.inner.add_errors_with_embeddings(errors, embeddings)
+
+    async def iter_errors(self, batch_size: int = 500) -> AsyncIterator[ErrorRecord]:
+        """Iterate over every stored error record, after flushing the buffer."""
+        await self.flush()
+        async for record in self.inner.iter_errors(batch_size):
+            yield record
+
+    async def iter_errors_with_embeddings(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Tuple[ErrorRecord, Optional[List[float]]]]:
+        """Iterate over records with embeddings, after flushing the buffer."""
+        await self.flush()
+        async for item in self.inner.iter_errors_with_embeddings(batch_size):
+            yield item
+
+    async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
+        """Retrieve an error record by ID, including buffered records."""
+        key = str(error_id)
+        record = self._pending.get(key) or self._flushing.get(key)
+        if record is not None:
+            return record
+        return await self.inner.get_error(error_id)
+
+    async def get_errors(self, error_ids: List[UUID]) -> List[Optional[ErrorRecord]]:
+        """Retrieve several error records by ID, including buffered records."""
+        records: List[Optional[ErrorRecord]] = []
+        stored_ids = []
+        for error_id in error_ids:
+            key = str(error_id)
+            record = self._pending.get(key) or self._flushing.get(key)
+            records.append(record)
+            if record is None:
+                stored_ids.append(error_id)
+
+        if stored_ids:
+            stored = iter(await self.inner.get_errors(stored_ids))
+            records = [record or next(stored) for record in records]
+        return records
+
+    async def update_error(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record, flushing it first if buffered."""
+        if self._is_buffered(error_id):
+            await self.flush()
+        return await self.inner.update_error(error_id, error)
+
+    async def delete_error(self, error_id: UUID) -> bool:
+        """Delete an error record by ID, flushing it first if buffered."""
+        if self._is_buffered(error_id):
+            await self.flush()
+        return await self.inner.delete_error(error_id)
+
+    async def snapshot(self, directory: str) -> SnapshotInfo:
+        """Take a snapshot of the stored data, after flushing the buffer."""
+        await self.flush()
+        return await self.inner.snapshot(directory)
+
+    async def compact(
+        self, threshold: float = 0.2, force: bool = False
+    ) -> CompactionReport:
+        """Compact the inner storage, after flushing the buffer."""
+        await self.flush()
+        return await self.inner.compact(threshold, force)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics, including write-behind counters."""
+        stats = await self.inner.get_stats()
+        stats["write_behind"] = {
+            **self._stats,
+            "pending": len(self._pending) + len(self._flushing),
+        }
+        return stats
+
+    async def close(self) -> None:
+        """Flush the buffer, stop the flusher and close the inner storage."""
+        self._closed = True
+        if self._flusher is not None and not self._flusher.done():
+            self._wakeup.set()
+            self._batch_full.set()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        try:
+            if self._journal_writer is not None:
+                await asyncio.gather(self._journal_writer, return_exceptions=True)
+            await self.flush()
+        finally:
+            self._journal.close()
+            await self.inner.close()
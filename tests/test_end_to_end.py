@@ -309,3 +309,71 @@ def test_real_world_workflow(client, sample_error_records):
             break
 
     assert found_pandas_solution, "Should find the pandas solution with astype"
+
+
+def test_create_errors_batch(client, sample_error_records):
+    """Test creating several error records in one batch with per-item results."""
+    payload = [record.model_dump(mode="json") for record in sample_error_records]
+    payload.insert(1, {"error_type": "MissingContext"})
+
+    response = client.post("/api/v1/errors/batch", json=payload)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["succeeded"] == 3
+    assert result["failed"] == 1
+    assert [item["index"] for item in result["results"]] == [0, 1, 2, 3]
+    assert result["results"][1]["success"] is False
+    assert result["results"][1]["error"]
+
+    # Stored items are retrievable by the IDs reported in the results
+    for item in result["results"]:
+        if item["success"]:
+            response = client.get(f"/api/v1/errors/{item['id']}")
+            assert response.status_code == 200
+
+
+def test_get_errors_batch(client, sample_error_records):
+    """Test fetching several error records by ID in request order."""
+    created = [
+        client.post("/api/v1/errors/", json=record.model_dump(mode="json")).json()
+        for record in sample_error_records
+    ]
+    unknown_id = str(uuid.uuid4())
+    ids = [created[2]["id"], unknown_id, created[0]["id"]]
+
+    response = client.get(
+        "/api/v1/errors/batch", params={"ids": ",".join(ids[:2]) + "," + ids[2]}
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert [record["id"] for record in result["records"]] == [ids[0], ids[2]]
+    assert result["missing"] == [unknown_id]
+
+    # Repeated query parameters are accepted as well
+    response = client.get("/api/v1/errors/batch", params=[("ids", i) for i in ids])
+    assert response.status_code == 200
+    assert response.json()["missing"] == [unknown_id]
+
+    response = client.get("/api/v1/errors/batch", params={"ids": "not-a-uuid"})
+    assert response.status_code == 422
+
+
+def test_search_similar_batch(client, sample_error_records):
+    """Test running several similarity queries in one request."""
+    for record in sample_error_records:
+        client.post("/api/v1/errors/", json=record.model_dump(mode="json"))
+
+    queries = ["fastapi module missing", "print syntax"]
+    response = client.post(
+        "/api/v1/errors/similar/batch",
+        json={"queries": queries, "max_results": 2},
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert [group["query"] for group in results] == queries
+    assert any(r["error_type"] == "ImportError" for r in results[0]["results"])
+    assert any(r["error_type"] == "SyntaxError" for r in results[1]["results"])
+    assert all(len(group["results"]) <= 2 for group in results)
+
+    response = client.post("/api/v1/errors/similar/batch", json={"queries": []})
+    assert response.status_code == 422
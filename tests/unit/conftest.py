@@ -0,0 +1,78 @@
+"""Shared fixtures for the unit tests."""
+
+import pytest
+
+from mcp_server_tribal.models.error_record import (
+    ErrorContext,
+    ErrorRecord,
+    ErrorSolution,
+)
+
+LANGUAGES = ["python", "rust", "go", "java"]
+BUCKET = "tribal-test"
+
+
+def create_errors(count, language=None, frameworks=(None,), prefix="pkg"):
+    """Create ImportError records with distinct messages.
+
+    Args:
+        count: Number of records
+        language: Language of every record (None cycles through LANGUAGES)
+        frameworks: Frameworks assigned in turn
+        prefix: Module name prefix of the messages
+    """
+    return [
+        ErrorRecord(
+            error_type="ImportError",
+            context=ErrorContext(
+                language=language or LANGUAGES[i % len(LANGUAGES)],
+                framework=frameworks[i % len(frameworks)],
+                error_message=f"No module named {prefix}_{i}",
+            ),
+            solution=ErrorSolution(description="Install it", explanation="Missing"),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def make_errors():
+    """Get the factory of test error records."""
+    return create_errors
+
+
+@pytest.fixture
+def aws_credentials(monkeypatch):
+    """Point AWS clients at fake credentials."""
+    pytest.importorskip("boto3")
+    pytest.importorskip("moto")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+
+@pytest.fixture
+def s3_client(aws_credentials):
+    """Create a client of a mocked S3."""
+    import boto3
+    import moto
+
+    with moto.mock_aws():
+        yield boto3.client("s3", region_name="us-east-1")
+
+
+@pytest.fixture
+def s3_bucket(s3_client):
+    """Create a bucket on the mocked S3 and get its name."""
+    s3_client.create_bucket(Bucket=BUCKET)
+    return BUCKET
+
+
+@pytest.fixture
+def dynamodb_client(aws_credentials):
+    """Create a client of a mocked DynamoDB."""
+    import boto3
+    import moto
+
+    with moto.mock_aws():
+        yield boto3.client("dynamodb", region_name="us-east-1")
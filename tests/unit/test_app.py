@@ -1,9 +1,14 @@
 """Tests for the main application."""
 
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
 import pytest
 from fastapi.testclient import TestClient
 
+from mcp_server_tribal import app as app_module
 from mcp_server_tribal.app import app
+from mcp_server_tribal.services.storage_interface import StorageInterface
 
 
 @pytest.fixture
@@ -24,3 +29,29 @@ def test_health_check(client):
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
+
+
+def test_storage_shared_across_requests(monkeypatch):
+    """Test that the lifespan opens one storage for all requests and closes it."""
+    created = []
+
+    def fake_create_storage():
+        storage = MagicMock(spec=StorageInterface)
+        storage.get_error = AsyncMock(return_value=None)
+        storage.close = AsyncMock()
+        created.append(storage)
+        return storage
+
+    monkeypatch.setattr(app_module, "create_storage", fake_create_storage)
+    monkeypatch.setitem(
+        app.dependency_overrides, StorageInterface, app_module.get_storage
+    )
+
+    with TestClient(app) as client:
+        for _ in range(3):
+            response = client.get(f"/api/v1/errors/{uuid4()}")
+            assert response.status_code == 404
+
+    assert len(created) == 1
+    assert created[0].get_error.await_count == 3
+    created[0].close.assert_awaited_once()
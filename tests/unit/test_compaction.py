@@ -0,0 +1,164 @@
+"""Tests for storage compaction."""
+
+import asyncio
+
+import chromadb
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_server_tribal.app import app
+from mcp_server_tribal.models.error_record import CompactionReport
+from mcp_server_tribal.services.chroma_storage import (
+    EMBEDDING_FUNCTION_KEY,
+    ChromaStorage,
+)
+from mcp_server_tribal.services.compaction import CompactionScheduler
+from mcp_server_tribal.services.embeddings import (
+    HashingEmbeddingFunction,
+    embedding_model_id,
+)
+from mcp_server_tribal.services.storage_interface import StorageInterface
+
+
+@pytest.mark.parametrize("quantized", [False, True])
+def test_compaction_reclaims_deleted_records(tmp_path, quantized, make_errors):
+    """Test that compaction drops deleted records and keeps the live ones."""
+    storage = ChromaStorage(
+        str(tmp_path),
+        embedding_function=HashingEmbeddingFunction(64),
+        quantized_vectors=quantized,
+    )
+    errors = make_errors(40)
+
+    async def run():
+        await storage.add_errors(errors)
+        for error in errors[:30]:
+            await storage.delete_error(error.id)
+        skipped = await storage.compact(threshold=0.9)
+        compacted = await storage.compact(threshold=0.5)
+        again = await storage.compact(threshold=0.5)
+        similar = await storage.search_similar("No module named pkg_35", 1)
+        return skipped, compacted, again, similar
+
+    skipped, compacted, again, similar = asyncio.run(run())
+
+    assert not skipped.compacted and skipped.deleted_ratio == 0.75
+    assert compacted.compacted and compacted.records == 10
+    assert compacted.bytes_reclaimed > 0
+    assert compacted.search_latency_after_ms is not None
+    assert not again.compacted and again.deleted_ratio == 0.0
+    assert similar[0].id == errors[35].id
+    assert storage.collection.count() == 10
+
+
+def test_compaction_keeps_scores_of_a_migrated_store(tmp_path, make_errors):
+    """Test that rebuilding a migrated schema 1.0.0 store keeps cosine scores."""
+    embed = HashingEmbeddingFunction(64)
+    errors = make_errors(10)
+    for error in errors:
+        error.schema_version = "1.0.0"
+    client = chromadb.PersistentClient(path=str(tmp_path))
+    legacy = client.create_collection(
+        name="error_records",
+        metadata={
+            "hnsw:space": "cosine",
+            "schema_version": "1.0.0",
+            EMBEDDING_FUNCTION_KEY: embedding_model_id(embed),
+        },
+        embedding_function=embed,
+    )
+    legacy.add(
+        ids=[str(error.id) for error in errors],
+        documents=[error.model_dump_json() for error in errors],
+        metadatas=[{"error_type": e.error_type, "language": "python"} for e in errors],
+    )
+    chromadb.api.client.SharedSystemClient.clear_system_cache()
+    storage = ChromaStorage(str(tmp_path), embedding_function=embed)
+    text = "No module named pkg_3"
+
+    async def run():
+        before = await storage.rank_ids(text, 5)
+        report = await storage.compact(force=True)
+        return before, report, await storage.rank_ids(text, 5)
+
+    before, report, after = asyncio.run(run())
+
+    assert storage.collection.metadata["schema_version"] == "1.1.0"
+    assert report.compacted
+    assert [row_id for row_id, _ in after] == [row_id for row_id, _ in before]
+    assert [score for _, score in after] == pytest.approx(
+        [score for _, score in before], abs=1e-5
+    )
+    assert all(score > 0 for _, score in after)
+
+
+def test_interrupted_compaction_is_completed(tmp_path, make_errors):
+    """Test that a rebuilt collection replaces one deleted before a crash."""
+    storage = ChromaStorage(
+        str(tmp_path), embedding_function=HashingEmbeddingFunction(64)
+    )
+    errors = make_errors(3)
+    asyncio.run(storage.add_errors(errors))
+    rows = storage.collection.get(include=["documents", "metadatas", "embeddings"])
+    rebuilt = storage.client.create_collection(
+        "error_records__compacting", metadata=storage.collection.metadata
+    )
+    rebuilt.add(
+        ids=rows["ids"],
+        embeddings=rows["embeddings"],
+        documents=rows["documents"],
+        metadatas=rows["metadatas"],
+    )
+    storage.client.delete_collection("error_records")
+    chromadb.api.client.SharedSystemClient.clear_system_cache()
+
+    reopened = ChromaStorage(
+        str(tmp_path), embedding_function=HashingEmbeddingFunction(64)
+    )
+
+    assert reopened.collection.count() == 3
+    assert reopened.client.list_collections() == ["error_records"]
+    assert asyncio.run(reopened.get_error(errors[1].id)) == errors[1]
+
+
+def test_scheduler_and_route(tmp_path):
+    """Test the scheduled compaction checks and the admin route."""
+
+    class RecordingStorage:
+        """Storage stub recording compaction requests."""
+
+        def __init__(self):
+            """Initialize the stub."""
+            self.thresholds = []
+
+        async def compact(self, threshold=0.2, force=False):
+            """Record a compaction request."""
+            self.thresholds.append(threshold)
+            return CompactionReport(
+                compacted=force,
+                records=0,
+                deleted_ratio=0.0,
+                free_page_ratio=0.0,
+                bytes_before=0,
+                bytes_after=0,
+            )
+
+    stub = RecordingStorage()
+
+    async def run():
+        scheduler = CompactionScheduler(stub, interval=0.01, threshold=0.3)
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    app.dependency_overrides[StorageInterface] = lambda: stub
+    try:
+        response = TestClient(app).post("/api/v1/admin/compact?force=true")
+    finally:
+        app.dependency_overrides.pop(StorageInterface)
+
+    assert len(stub.thresholds) >= 2
+    assert set(stub.thresholds[:-1]) == {0.3}
+    assert response.status_code == 200
+    assert response.json()["compacted"] is True
@@ -0,0 +1,85 @@
+"""Tests for duplicate error fingerprinting and merging."""
+
+from typing import Optional
+
+from mcp_server_tribal.models.error_record import (
+    ErrorContext,
+    ErrorRecord,
+    ErrorSolution,
+)
+from mcp_server_tribal.services.dedup import (
+    ADDITIONAL_SOLUTIONS_KEY,
+    OCCURRENCE_COUNT_KEY,
+    error_fingerprint,
+    merge_duplicate,
+)
+
+
+def make_error(
+    message: str, solution: str = "Install it", framework: Optional[str] = None
+) -> ErrorRecord:
+    """Create an error record with the given message and solution."""
+    return ErrorRecord(
+        error_type="ImportError",
+        context=ErrorContext(
+            language="python", framework=framework, error_message=message
+        ),
+        solution=ErrorSolution(description=solution, explanation="Missing"),
+    )
+
+
+def test_fingerprint_ignores_locations():
+    """Test that repeats differing only in files and lines match."""
+    first = make_error("File \"a.py\", line 3: No module named 'foo'")
+    second = make_error("File \"b.py\", line 97: No module named 'foo'")
+
+    assert error_fingerprint(first) == error_fingerprint(second)
+    assert error_fingerprint(first) != error_fingerprint(
+        make_error("File \"a.py\", line 3: No module named 'foo'", framework="django")
+    )
+
+
+def test_fingerprint_keeps_quoted_names():
+    """Test that errors about different modules or attributes do not match."""
+    fastapi = make_error("No module named 'fastapi'")
+
+    assert error_fingerprint(fastapi) != error_fingerprint(
+        make_error("No module named 'numpy'")
+    )
+    assert error_fingerprint(
+        make_error("'NoneType' object has no attribute 'items'")
+    ) != error_fingerprint(make_error("'NoneType' object has no attribute 'keys'"))
+
+
+def test_merge_counts_occurrences_and_appends_solutions():
+    """Test that merging bumps the count and keeps new solutions once."""
+    existing = make_error("No module named 'foo'")
+
+    merged = merge_duplicate(existing, make_error("No module named 'foo'"))
+    merged = merge_duplicate(merged, make_error("No module named 'foo'", "Use venv"))
+    merged = merge_duplicate(merged, make_error("No module named 'foo'", "Use venv"))
+
+    assert merged.id == existing.id
+    assert merged.solution == existing.solution
+    assert merged.metadata[OCCURRENCE_COUNT_KEY] == 4
+    assert [s["description"] for s in merged.metadata[ADDITIONAL_SOLUTIONS_KEY]] == [
+        "Use venv"
+    ]
+    assert existing.metadata == {}
+
+
+def test_merge_adds_up_merged_records():
+    """Test that merging an already merged record keeps its history."""
+    existing = make_error("No module named 'foo'")
+    duplicate = merge_duplicate(
+        make_error("No module named 'foo'", "Use venv"),
+        make_error("No module named 'foo'", "Use conda"),
+    )
+
+    merged = merge_duplicate(existing, duplicate)
+
+    assert merged.metadata[OCCURRENCE_COUNT_KEY] == 3
+    assert [s["description"] for s in merged.metadata[ADDITIONAL_SOLUTIONS_KEY]] == [
+        "Use venv",
+        "Use conda",
+    ]
@@ -0,0 +1,209 @@
+"""Tests for DynamoDB storage with batched requests and a local vector index."""
+
+import asyncio
+
+import pytest
+
+from mcp_server_tribal.models.error_record import ErrorQuery
+from mcp_server_tribal.services.aws.clients import shared_client
+from mcp_server_tribal.services.aws.storage import DynamoDBStorage
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.storage_factory import create_storage
+
+TABLE = "tribal-test"
+
+
+class ThrottledClient:
+    """A client that leaves part of its first batch write unprocessed."""
+
+    def __init__(self, client, throttled=1):
+        """Wrap a client, throttling the first ``throttled`` batch writes."""
+        self.client = client
+        self.throttled = throttled
+
+    def __getattr__(self, name):
+        """Delegate everything else to the wrapped client."""
+        return getattr(self.client, name)
+
+    def batch_write_item(self, RequestItems):
+        """Process the first five items of a throttled batch only."""
+        if not self.throttled:
+            return self.client.batch_write_item(RequestItems=RequestItems)
+        self.throttled -= 1
+        ((table, requests),) = RequestItems.items()
+        response = self.client.batch_write_item(RequestItems={table: requests[:5]})
+        response["UnprocessedItems"] = {table: requests[5:]}
+        return response
+
+
+def open_dynamodb(client, index_directory, **kwargs):
+    """Open the test store with a hashing embedder."""
+    return DynamoDBStorage(
+        TABLE,
+        client=client,
+        index_directory=str(index_directory),
+        embedding_function=HashingEmbeddingFunction(64),
+        **kwargs,
+    )
+
+
+def test_writes_are_batched_and_survive_reopen(dynamodb_client, tmp_path, make_errors):
+    """Test batched adds, updates and deletes, then reopening without an index."""
+    storage = open_dynamodb(dynamodb_client, tmp_path / "index")
+    errors = make_errors(80)
+
+    async def run():
+        results = await storage.add_errors(errors[:60] + [errors[3]])
+        await storage.add_error(errors[60])
+        with pytest.raises(ValueError, match="already exists"):
+            await storage.add_error(errors[60])
+        await storage.add_errors(errors[61:])
+        updated = errors[2].model_copy(deep=True)
+        updated.context.error_message = "Segmentation fault"
+        await storage.update_error(errors[2].id, updated)
+        await storage.delete_error(errors[5].id)
+
+        reopened = open_dynamodb(dynamodb_client, tmp_path / "cold")
+        return (
+            results,
+            await storage.get_stats(),
+            await reopened.get_errors([errors[2].id, errors[5].id, errors[79].id]),
+            await reopened.get_stats(),
+        )
+
+    results, stats, fetched, reopened_stats = asyncio.run(run())
+
+    assert [r.error for r in results[:3]] == [None, None, None]
+    assert results[60].error == "Duplicate ID in batch"
+    # 60 records take three batches of at most 25 items and 19 records one,
+    # and each call looks the IDs up with one batch of at most 100 keys
+    assert stats["requests"]["add_errors"]["batch_write_item"] == 3 + 1
+    assert stats["requests"]["add_errors"]["batch_get_item"] == 2
+    assert fetched[0].context.error_message == "Segmentation fault"
+    assert fetched[0].created_at == errors[2].created_at
+    assert fetched[1] is None and fetched[2] == errors[79]
+    assert reopened_stats["records"] == 79
+    assert reopened_stats["quantized_index"]["vectors"] == 79
+
+
+def test_unprocessed_items_are_retried(dynamodb_client, tmp_path, make_errors):
+    """Test that items left unprocessed by a throttled batch are resent."""
+    client = ThrottledClient(dynamodb_client)
+    storage = open_dynamodb(client, tmp_path / "index")
+    errors = make_errors(20)
+
+    async def run():
+        await storage.add_errors(errors)
+        return (
+            await storage.get_errors([e.id for e in errors]),
+            await storage.get_stats(),
+        )
+
+    fetched, stats = asyncio.run(run())
+
+    assert fetched == errors
+    assert stats["requests"]["add_errors"]["batch_write_item"] == 2
+
+
+def test_metadata_search_queries_an_index(dynamodb_client, tmp_path, make_errors):
+    """Test that filtered listings query a secondary index and never scan."""
+    storage = open_dynamodb(dynamodb_client, tmp_path / "index")
+    errors = make_errors(40, frameworks=(None, "django"))
+
+    async def run():
+        await storage.add_errors(errors)
+        ids = []
+        query = ErrorQuery(language="python", max_results=3)
+        while True:
+            page = await storage.search_errors_page(query)
+            ids += [record.id for record in page.records]
+            if page.next_cursor is None:
+                break
+            query = query.model_copy(update={"cursor": page.next_cursor})
+        rust = await storage.search_errors(
+            ErrorQuery(language="rust", framework="django", max_results=50)
+        )
+        return ids, rust, await storage.get_stats()
+
+    ids, rust, stats = asyncio.run(run())
+
+    python_ids = [e.id for e in errors if e.context.language == "python"]
+    assert ids == sorted(python_ids, key=str)
+    expected = [e.id for e in errors if e.context.language == "rust"]
+    assert sorted(e.id for e in rust) == sorted(expected, key=str)
+    assert stats["requests"]["search_errors_page"] == {"query": 4}
+    assert stats["requests"]["search_errors"] == {"query": 1}
+
+
+def test_similar_hits_are_read_in_one_batch(dynamodb_client, tmp_path, make_errors):
+    """Test that the hits of several similarity queries are read together."""
+    storage = open_dynamodb(dynamodb_client, tmp_path / "index", read_workers=2)
+    errors = make_errors(40)
+
+    async def run():
+        await storage.add_errors(errors)
+        similar = await storage.search_similar_many(["pkg_7", "pkg_13"], 5)
+        return similar, await storage.get_stats()
+
+    similar, stats = asyncio.run(run())
+
+    assert [len(found) for found in similar] == [5, 5]
+    assert stats["requests"]["search_similar_many"] == {"batch_get_item": 1}
+
+
+def test_compaction_and_missing_table(dynamodb_client, tmp_path, make_errors):
+    """Test compacting the local index and refusing to open a missing table."""
+    storage = open_dynamodb(dynamodb_client, tmp_path / "index")
+    errors = make_errors(15)
+
+    async def run():
+        await storage.add_errors(errors)
+        for error in errors[:10]:
+            await storage.delete_error(error.id)
+        skipped = await storage.compact(threshold=0.9)
+        report = await storage.compact(threshold=0.5)
+        return skipped, report, await storage.search_similar("pkg_12", 1)
+
+    skipped, report, similar = asyncio.run(run())
+
+    assert not skipped.compacted and skipped.deleted_ratio == pytest.approx(2 / 3)
+    assert report.compacted and report.bytes_after < report.bytes_before
+    assert similar[0].id == errors[12].id
+    with pytest.raises(ValueError, match="does not exist"):
+        DynamoDBStorage(
+            "missing",
+            client=dynamodb_client,
+            index_directory=str(tmp_path / "missing"),
+            embedding_function=HashingEmbeddingFunction(64),
+            create_table=False,
+        )
+
+
+def test_factory_opens_dynamodb_with_a_shared_client(
+    dynamodb_client, tmp_path, make_errors
+):
+    """Test that the factory opens DynamoDB storage on the pooled client."""
+    settings = {
+        "storage_backend": "dynamodb",
+        "dynamodb_table": "factory",
+        "persist_directory": str(tmp_path / "data"),
+        "embedding_function": "hashing",
+        "embedding_dim": 64,
+    }
+    storage = create_storage(settings)
+    error = make_errors(1)[0]
+
+    async def run():
+        await storage.add_error(error)
+        found = await storage.get_error(error.id)
+        stats = await storage.get_stats()
+        await storage.close()
+        return found, stats
+
+    found, stats = asyncio.run(run())
+
+    assert found == error and stats["backend"] == "dynamodb"
+    assert storage.client is shared_client("dynamodb")
+    assert shared_client("dynamodb") is not shared_client("s3")
+    with pytest.raises(ValueError, match="DYNAMODB_TABLE"):
+        create_storage({**settings, "dynamodb_table": None})
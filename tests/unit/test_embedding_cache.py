@@ -0,0 +1,72 @@
+"""Tests for the embedding cache."""
+
+import zlib
+
+import numpy as np
+from chromadb.api.types import EmbeddingFunction
+
+from mcp_server_tribal.services.embedding_cache import CachedEmbeddingFunction
+
+
+class CountingEmbeddingFunction(EmbeddingFunction):
+    """Deterministic embedding function that records the texts it embeds."""
+
+    MODEL_NAME = "counting-test-model"
+
+    def __init__(self):
+        """Initialize the embedding function."""
+        self.embedded = []
+
+    def __call__(self, input):
+        """Embed each text as a vector derived from its checksum."""
+        self.embedded.extend(input)
+        return [
+            np.full(8, zlib.crc32(text.encode()) % 1000, dtype=np.float32)
+            for text in input
+        ]
+
+
+def test_repeated_texts_are_embedded_once():
+    """Test that cached texts are not sent to the embedding function again."""
+    inner = CountingEmbeddingFunction()
+    cache = CachedEmbeddingFunction(inner, max_entries=10)
+
+    first = cache(["a", "b", "a"])
+    second = cache(["b", "c"])
+
+    assert inner.embedded == ["a", "b", "c"]
+    np.testing.assert_array_equal(first[1], second[0])
+    metrics = cache.metrics()
+    assert metrics["model_id"] == "counting-test-model"
+    assert metrics["hits"] == 1
+    assert metrics["misses"] == 3
+
+
+def test_least_recently_used_entries_are_evicted():
+    """Test that the in-memory tier stays within its size bound."""
+    inner = CountingEmbeddingFunction()
+    cache = CachedEmbeddingFunction(inner, max_entries=2)
+
+    cache(["a", "b"])
+    cache(["a"])  # "b" is now the least recently used
+    cache(["c"])
+    cache(["a", "b"])
+
+    assert inner.embedded == ["a", "b", "c", "b"]
+    assert cache.metrics()["entries"] == 2
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Test that vectors cached on disk are reused by a new cache."""
+    path = str(tmp_path / "embedding_cache.sqlite3")
+    first = CachedEmbeddingFunction(CountingEmbeddingFunction(), disk_path=path)
+    expected = first(["No module named 'requests'"])
+    first.close()
+
+    inner = CountingEmbeddingFunction()
+    second = CachedEmbeddingFunction(inner, disk_path=path)
+    vectors = second(["No module named 'requests'"])
+
+    assert inner.embedded == []
+    np.testing.assert_array_equal(vectors[0], expected[0])
+    assert second.metrics()["disk_hits"] == 1
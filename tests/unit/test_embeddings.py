@@ -0,0 +1,65 @@
+"""Tests for the embedding function registry."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from mcp_server_tribal.models.error_record import (
+    ErrorContext,
+    ErrorRecord,
+    ErrorSolution,
+)
+from mcp_server_tribal.services.chroma_storage import ChromaStorage
+from mcp_server_tribal.services.embeddings import (
+    HashingEmbeddingFunction,
+    create_embedding_function,
+)
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    """Test that the hashing embedder needs no model and ranks by overlap."""
+    embedder = create_embedding_function("hashing", dim=64)
+    query, close, far = embedder(
+        [
+            "ImportError: No module named requests",
+            "ModuleNotFoundError: No module named requests",
+            "TypeError: unsupported operand types",
+        ]
+    )
+
+    np.testing.assert_array_equal(
+        query,
+        HashingEmbeddingFunction(64)(["ImportError: No module named requests"])[0],
+    )
+    assert len(query) == 64
+    assert np.linalg.norm(query) == pytest.approx(1.0)
+    assert np.dot(query, close) > np.dot(query, far)
+
+
+def test_unknown_embedding_function_is_rejected():
+    """Test that the registry rejects unknown names."""
+    with pytest.raises(ValueError, match="Unknown embedding function"):
+        create_embedding_function("word2vec")
+
+
+def test_embedder_mismatch_is_caught_at_startup(tmp_path):
+    """Test that a store cannot be opened with a different embedder."""
+    storage = ChromaStorage(
+        str(tmp_path), embedding_function=HashingEmbeddingFunction(32)
+    )
+    error = ErrorRecord(
+        error_type="ImportError",
+        context=ErrorContext(language="python", error_message="No module"),
+        solution=ErrorSolution(description="Install it", explanation="Missing"),
+    )
+    asyncio.run(storage.add_error(error))
+    assert storage.collection.metadata["embedding_function"] == "hashing-32"
+
+    reopened = ChromaStorage(
+        str(tmp_path), embedding_function=HashingEmbeddingFunction(32)
+    )
+    assert asyncio.run(reopened.search_similar("No module"))[0].id == error.id
+
+    with pytest.raises(ValueError, match="Embedding function mismatch"):
+        ChromaStorage(str(tmp_path), embedding_function=HashingEmbeddingFunction(64))
@@ -0,0 +1,51 @@
+"""Tests for the storage executor."""
+
+import asyncio
+import time
+
+import pytest
+
+from mcp_server_tribal.services.executor import StorageExecutor
+
+
+def test_calls_overlap_on_pool():
+    """Test that blocking calls on a multi-worker pool run concurrently."""
+    executor = StorageExecutor(max_workers=4, name="test")
+
+    async def run_all():
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(executor.run(lambda i=i: time.sleep(0.1) or i) for i in range(4))
+        )
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(run_all())
+    executor.shutdown()
+
+    assert results == [0, 1, 2, 3]
+    assert elapsed < 0.3
+    assert executor.metrics()["completed"] == 4
+
+
+def test_metrics_record_queue_wait():
+    """Test that calls queued behind a busy worker record wait time."""
+    executor = StorageExecutor(max_workers=1, name="test")
+
+    async def run_all():
+        await asyncio.gather(*(executor.run(time.sleep, 0.05) for _ in range(3)))
+
+    asyncio.run(run_all())
+    metrics = executor.metrics()
+    executor.shutdown()
+
+    assert metrics["workers"] == 1
+    assert metrics["queue_depth"] == 0
+    assert metrics["active"] == 0
+    assert metrics["completed"] == 3
+    assert metrics["max_wait_ms"] >= 50
+
+
+def test_invalid_worker_count():
+    """Test that an executor needs at least one worker."""
+    with pytest.raises(ValueError):
+        StorageExecutor(max_workers=0)
@@ -0,0 +1,131 @@
+"""Tests for the facet index and filtered searches."""
+
+import asyncio
+
+import pytest
+
+from mcp_server_tribal.models.error_record import (
+    ErrorContext,
+    ErrorQuery,
+    ErrorRecord,
+    ErrorSolution,
+)
+from mcp_server_tribal.services.chroma_storage import ChromaStorage
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.facet_index import FacetIndex, build_where
+
+
+def make_error(error_type, language, framework, message):
+    """Create an error record with the given facet values."""
+    return ErrorRecord(
+        error_type=error_type,
+        context=ErrorContext(
+            language=language, framework=framework, error_message=message
+        ),
+        solution=ErrorSolution(description="Fix it", explanation="Broken"),
+    )
+
+
+def test_build_where():
+    """Test that several filters are combined with $and."""
+    assert build_where({}) is None
+    assert build_where({"language": "python"}) == {"language": "python"}
+    assert build_where({"language": "python", "framework": "django"}) == {
+        "$and": [{"language": "python"}, {"framework": "django"}]
+    }
+
+
+def test_facet_index_match_and_counts():
+    """Test matching, counting, replacing and removing records."""
+    index = FacetIndex()
+    index.add(
+        ["a", "b", "c"],
+        [
+            {"error_type": "ImportError", "language": "python", "framework": ""},
+            {"error_type": "ImportError", "language": "python", "framework": "flask"},
+            {"error_type": "TypeError", "language": "javascript", "framework": ""},
+        ],
+    )
+
+    assert index.match({}) == {"a", "b", "c"}
+    assert index.match({"error_type": "ImportError", "framework": "flask"}) == {"b"}
+    assert index.match({"language": "rust"}) == set()
+
+    total, facets = index.counts({"language": "python"})
+    assert total == 2
+    assert facets["error_type"] == {"ImportError": 2}
+    assert facets["framework"] == {"flask": 1}
+
+    index.add(["b"], [{"error_type": "KeyError", "language": "python"}])
+    index.remove(["c", "unknown"])
+    total, facets = index.counts()
+    assert total == 2
+    assert facets["error_type"] == {"ImportError": 1, "KeyError": 1}
+    assert facets["language"] == {"python": 2}
+
+
+def test_facet_index_pages_in_id_order():
+    """Test paging sorted IDs after adds, replacements and removals."""
+    index = FacetIndex()
+    ids = [f"id{i:03d}" for i in range(100)]
+    index.add(
+        ids,
+        [
+            {"language": "python" if i % 2 else "go", "framework": ""}
+            for i in range(100)
+        ],
+    )
+    # Replaced twice in one batch, keeping only the last values
+    index.add(["id001", "id001"], [{"language": "go"}, {"language": "rust"}])
+    index.add(["id150"], [{"language": "python"}])
+    index.remove(["id003"])
+
+    python = [i for i in ids if int(i[2:]) % 2 and i not in ("id001", "id003")]
+    assert index.page({"language": "python"}, None, 3) == python[:3]
+    assert index.page({"language": "python"}, "id050", 2) == ["id051", "id053"]
+    assert index.page({"language": "python"}, "id098", 5) == ["id099", "id150"]
+    assert index.page({"language": "rust"}, None, 5) == ["id001"]
+    assert index.page({"language": "python", "error_type": ""}, "id004", 1) == ["id005"]
+    assert index.page({"language": "java"}, None, 5) == []
+    assert index.page({}, "id000", 3) == ["id001", "id002", "id004"]
+
+
+@pytest.mark.parametrize("quantized", [False, True])
+def test_filtered_search_and_facet_counts(tmp_path, quantized):
+    """Test compound filters with and without text, and facet counts."""
+    storage = ChromaStorage(
+        str(tmp_path),
+        embedding_function=HashingEmbeddingFunction(64),
+        quantized_vectors=quantized,
+    )
+    errors = [
+        make_error("ImportError", "python", "django", "No module named requests"),
+        make_error("ImportError", "python", None, "No module named requests"),
+        make_error("ImportError", "javascript", "react", "Cannot find module x"),
+        make_error("TypeError", "python", "django", "unsupported operand"),
+    ]
+
+    async def run():
+        await storage.add_errors(errors)
+        with_text = await storage.search_errors(
+            ErrorQuery(
+                error_type="ImportError",
+                language="python",
+                framework="django",
+                error_message="No module named requests",
+            )
+        )
+        without_text = await storage.search_errors(
+            ErrorQuery(error_type="ImportError", language="python")
+        )
+        await storage.delete_error(errors[0].id)
+        counts = await storage.facet_counts({"language": "python"})
+        return with_text, without_text, counts
+
+    with_text, without_text, counts = asyncio.run(run())
+
+    assert [error.id for error in with_text] == [errors[0].id]
+    assert {error.id for error in without_text} == {errors[0].id, errors[1].id}
+    assert counts.total == 2
+    assert counts.facets["error_type"] == {"ImportError": 1, "TypeError": 1}
+    assert counts.facets["framework"] == {"django": 1}
@@ -0,0 +1,106 @@
+"""Tests for the BM25 index and hybrid search."""
+
+import asyncio
+
+from mcp_server_tribal.models.error_record import (
+    ErrorContext,
+    ErrorQuery,
+    ErrorRecord,
+    ErrorSolution,
+    SearchMode,
+)
+from mcp_server_tribal.services.chroma_storage import ChromaStorage
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.lexical_index import (
+    BM25Index,
+    reciprocal_rank_fusion,
+)
+
+
+class CountingHashingEmbeddingFunction(HashingEmbeddingFunction):
+    """Hashing embedder that counts the texts it embeds."""
+
+    def __init__(self):
+        """Initialize the embedder."""
+        super().__init__(64)
+        self.calls = 0
+
+    def __call__(self, input):
+        """Embed texts and count the call."""
+        self.calls += 1
+        return super().__call__(input)
+
+
+def test_bm25_ranks_exact_identifiers():
+    """Test that rare identifiers outrank common words."""
+    index = BM25Index()
+    index.add(
+        ["a", "b", "c"],
+        [
+            "ImportError: No module named requests_oauthlib",
+            "ImportError: No module named requests",
+            "TypeError: unsupported operand",
+        ],
+    )
+
+    assert [i for i, _ in index.search("requests_oauthlib import", 3)][0] == "a"
+    assert index.search("requests", 3, allowed=["b", "c"])[0][0] == "b"
+
+    index.add(["a"], ["KeyError: E1101"])
+    index.remove(["b"])
+    assert [i for i, _ in index.search("requests e1101", 3)] == ["a"]
+    assert len(index) == 2
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    """Test that IDs ranked well by both rankings come first."""
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d", "a"]])
+
+    assert fused[:2] == ["b", "a"]
+    assert set(fused) == {"a", "b", "c", "d"}
+
+
+def test_lexical_and_hybrid_search(tmp_path):
+    """Test search modes, and that lexical search skips the embedding model."""
+    embedder = CountingHashingEmbeddingFunction()
+    storage = ChromaStorage(str(tmp_path), embedding_function=embedder)
+    errors = [
+        ErrorRecord(
+            error_type="ImportError",
+            context=ErrorContext(language="python", error_message=message),
+            solution=ErrorSolution(description="Install it", explanation="Missing"),
+        )
+        for message in [
+            "No module named requests_oauthlib",
+            "No module named requests",
+            "cannot import name pydantic_settings",
+        ]
+    ]
+
+    async def run():
+        await storage.add_errors(errors[:2])
+        lexical = await storage.search_errors(
+            ErrorQuery(error_message="requests_oauthlib", mode=SearchMode.LEXICAL)
+        )
+        calls_after_lexical = embedder.calls
+        # Records added after the index was built are indexed incrementally
+        await storage.add_error(errors[2])
+        hybrid = await storage.search_errors(
+            ErrorQuery(
+                error_message="pydantic_settings",
+                max_results=2,
+                mode=SearchMode.HYBRID,
+            )
+        )
+        await storage.delete_error(errors[2].id)
+        after_delete = await storage.search_errors(
+            ErrorQuery(error_message="pydantic_settings", mode=SearchMode.LEXICAL)
+        )
+        return lexical, calls_after_lexical, hybrid, after_delete
+
+    lexical, calls_after_lexical, hybrid, after_delete = asyncio.run(run())
+
+    assert [error.id for error in lexical] == [errors[0].id]
+    assert calls_after_lexical == 1  # Only the batched add was embedded
+    assert hybrid[0].id == errors[2].id and len(hybrid) == 2
+    assert after_delete == []
@@ -0,0 +1,133 @@
+"""Tests for in-memory vector storage."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from mcp_server_tribal.services.dedup import OCCURRENCE_COUNT_KEY
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.memory_storage import InMemoryVectorStorage
+from mcp_server_tribal.services.sqlite_storage import SQLiteStorage
+from mcp_server_tribal.services.storage_factory import create_storage
+from mcp_server_tribal.services.transfer import copy_records
+
+
+def open_memory(**kwargs):
+    """Open an in-memory store with a hashing embedder."""
+    return InMemoryVectorStorage(
+        embedding_function=HashingEmbeddingFunction(64), **kwargs
+    )
+
+
+def test_growth_tombstones_and_compaction(make_errors):
+    """Test that the matrix doubles and compaction drops tombstoned rows."""
+    storage = open_memory(initial_capacity=4, compaction_threshold=0.5)
+    errors = make_errors(10)
+
+    async def run():
+        await storage.add_errors(errors[:3])
+        await storage.add_error(errors[3])
+        await storage.add_errors(errors[4:])
+        grown = await storage.get_stats()
+        for error in errors[:4]:
+            await storage.delete_error(error.id)
+        tombstoned = await storage.get_stats()
+        await storage.delete_error(errors[4].id)
+        compacted = await storage.get_stats()
+        similar = await storage.search_similar("No module named pkg_7", 1)
+        return grown, tombstoned, compacted, similar
+
+    grown, tombstoned, compacted, similar = asyncio.run(run())
+
+    assert grown["capacity"] == 16 and grown["records"] == 10
+    assert tombstoned["tombstones"] == 4 and tombstoned["compactions"] == 0
+    assert compacted["tombstones"] == 0 and compacted["compactions"] == 1
+    assert compacted["capacity"] == 8 and compacted["records"] == 5
+    assert similar[0].id == errors[7].id
+
+
+def test_dedup_merges_repeats(make_errors):
+    """Test that a repeated error is merged into the stored record."""
+    storage = open_memory(dedup=True)
+    errors = make_errors(5)
+
+    async def run():
+        results = await storage.add_errors(errors + make_errors(1))
+        return results, await storage.get_error(errors[0].id), await storage.get_stats()
+
+    results, first, stats = asyncio.run(run())
+
+    assert results[5].deduplicated and results[5].id == errors[0].id
+    assert first.metadata[OCCURRENCE_COUNT_KEY] == 2
+    assert stats["records"] == 5
+
+
+def test_returns_copies(make_errors):
+    """Test that changing returned or added records leaves the stored ones alone."""
+    storage = open_memory()
+    error = make_errors(1)[0]
+
+    async def run():
+        await storage.add_error(error)
+        error.context.error_message = "changed"
+        fetched = await storage.get_error(error.id)
+        fetched.error_type = "changed"
+        return await storage.get_error(error.id)
+
+    stored = asyncio.run(run())
+
+    assert stored.context.error_message == "No module named pkg_0"
+    assert stored.error_type == "ImportError"
+
+
+def test_concurrent_workers_and_copy(tmp_path, make_errors):
+    """Test concurrent reads and writes on pools, then a copy to SQLite."""
+    storage = create_storage(
+        {
+            "storage_backend": "memory",
+            "persist_directory": str(tmp_path / "unused"),
+            "embedding_function": "hashing",
+            "embedding_dim": 64,
+            "storage_read_workers": 4,
+            "storage_write_workers": 2,
+        }
+    )
+    errors = make_errors(200)
+    target = SQLiteStorage(
+        str(tmp_path / "sqlite"), embedding_function=HashingEmbeddingFunction(64)
+    )
+
+    async def run():
+        await asyncio.gather(
+            *(storage.add_errors(errors[i : i + 10]) for i in range(0, 200, 10)),
+            *(storage.search_similar("No module named pkg_1", 3) for _ in range(20)),
+        )
+        await asyncio.gather(*(storage.delete_error(e.id) for e in errors[:100]))
+        result = await copy_records(storage, target, batch_size=32)
+        stats = await storage.get_stats()
+        await storage.close()
+        return result, stats
+
+    result, stats = asyncio.run(run())
+
+    assert isinstance(storage, InMemoryVectorStorage)
+    assert result.imported == result.embeddings_reused == 100
+    assert stats["records"] == 100
+    assert not tmp_path.joinpath("unused").exists()
+
+
+def test_rejects_other_dimensions(make_errors):
+    """Test that vectors of another dimension are refused."""
+    storage = open_memory()
+
+    async def run():
+        await storage.add_error(make_errors(1)[0])
+        return await storage.add_errors_with_embeddings(make_errors(2), [[1.0], None])
+
+    results = asyncio.run(run())
+
+    assert not results[0].success and "dimension" in results[0].error
+    assert results[1].success
+    with pytest.raises(ValueError):
+        storage._vector_search(np.ones((1, 3), np.float32), 1, {})
@@ -9,10 +9,26 @@
 """Tests for the schema migration framework."""
 
 
+import zlib
+
+import chromadb
+import numpy as np
 import pytest
+from chromadb.api.types import EmbeddingFunction
 from unittest.mock import MagicMock, patch
 
-from mcp_server_tribal.services.migration import MigrationManager
+from mcp_server_tribal.models.error_record import (
+    ErrorContext,
+    ErrorRecord,
+    ErrorSolution,
+)
+from mcp_server_tribal.services.chroma_storage import ChromaStorage
+from mcp_server_tribal.services.migration import (
+    MIGRATION_CURSOR_KEY,
+    MigrationManager,
+    collection_creation_metadata,
+    migrate_v1_to_v1_1,
+)
 
 
 class TestMigrationManager:
@@ -192,3 +208,120 @@ class TestMigrationIntegration:
         # Check compatibility
         assert manager.is_compatible("1.0.0") is True
         assert manager.is_compatible("0.0.0") is False
+
+
+class KeywordEmbeddingFunction(EmbeddingFunction):
+    """Deterministic bag-of-words embedding function for tests."""
+
+    def __init__(self):
+        """Initialize the embedding function."""
+
+    def __call__(self, input):
+        """Embed each text as normalized keyword counts."""
+        vectors = []
+        for text in input:
+            vector = np.zeros(32, dtype=np.float32)
+            for word in text.lower().split():
+                vector[zlib.crc32(word.encode()) % 32] += 1.0
+            vectors.append(vector / max(np.linalg.norm(vector), 1.0))
+        return vectors
+
+
+class FailingUpdateCollection:
+    """Collection proxy whose update fails after a number of calls."""
+
+    def __init__(self, collection, allowed_updates):
+        """Wrap a collection."""
+        self._collection = collection
+        self._allowed_updates = allowed_updates
+
+    def update(self, **kwargs):
+        """Update records, failing once the allowance is used up."""
+        if self._allowed_updates == 0:
+            raise RuntimeError("Interrupted")
+        self._allowed_updates -= 1
+        return self._collection.update(**kwargs)
+
+    def __getattr__(self, name):
+        """Forward everything else to the wrapped collection."""
+        return getattr(self._collection, name)
+
+
+class TestEmbeddingTextMigration:
+    """Tests for the 1.0.0 -> 1.1.0 re-embedding migration."""
+
+    @pytest.fixture
+    def legacy_collection(self, tmp_path):
+        """Create a schema 1.0.0 collection holding JSON documents."""
+        client = chromadb.PersistentClient(path=str(tmp_path))
+        collection = client.create_collection(
+            name="error_records",
+            metadata={"hnsw:space": "cosine", "schema_version": "1.0.0"},
+            embedding_function=KeywordEmbeddingFunction(),
+        )
+        records = [
+            ErrorRecord(
+                error_type="ImportError",
+                context=ErrorContext(
+                    language="python", error_message=f"No module named 'mod{i}'"
+                ),
+                solution=ErrorSolution(
+                    description=f"Install mod{i}", explanation="Missing package"
+                ),
+                schema_version="1.0.0",
+            )
+            for i in range(5)
+        ]
+        collection.add(
+            ids=[str(record.id) for record in records],
+            documents=[record.model_dump_json() for record in records],
+            metadatas=[
+                {"error_type": r.error_type, "language": "python", "framework": ""}
+                for r in records
+            ],
+        )
+        return collection, records
+
+    def test_migration_resumes_after_interruption(self, legacy_collection):
+        """Test that an interrupted migration resumes and completes."""
+        collection, records = legacy_collection
+        storage = MagicMock()
+        storage._create_embedding_text = ChromaStorage._create_embedding_text.__get__(
+            storage
+        )
+        storage._error_to_metadata = ChromaStorage._error_to_metadata.__get__(storage)
+
+        storage.collection = FailingUpdateCollection(collection, allowed_updates=1)
+        with pytest.raises(RuntimeError):
+            migrate_v1_to_v1_1(storage, batch_size=2)
+        assert collection.metadata[MIGRATION_CURSOR_KEY] == 2
+        assert collection.metadata["schema_version"] == "1.0.0"
+
+        storage.collection = collection
+        migrate_v1_to_v1_1(storage, batch_size=2)
+
+        assert collection.metadata["schema_version"] == "1.1.0"
+        assert MIGRATION_CURSOR_KEY not in collection.metadata
+        result = collection.get(include=["documents", "metadatas"])
+        assert len(result["ids"]) == len(records)
+        for document, metadata in zip(result["documents"], result["metadatas"]):
+            record = ErrorRecord.model_validate_json(metadata["record"])
+            assert record.schema_version == "1.1.0"
+            assert document.startswith("ImportError python No module named")
+
+    def test_migration_keeps_the_distance_function(self, legacy_collection):
+        """Test that metadata updates keep the HNSW settings readable."""
+        collection, _ = legacy_collection
+        storage = MagicMock()
+        storage._create_embedding_text = ChromaStorage._create_embedding_text.__get__(
+            storage
+        )
+        storage._error_to_metadata = ChromaStorage._error_to_metadata.__get__(storage)
+        storage.collection = collection
+
+        migrate_v1_to_v1_1(storage, batch_size=2)
+
+        metadata = collection_creation_metadata(collection.metadata)
+        assert metadata["hnsw:space"] == "cosine"
+        assert metadata["schema_version"] == "1.1.0"
+        assert not any(key.startswith("tribal:") for key in metadata)
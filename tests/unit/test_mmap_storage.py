@@ -0,0 +1,95 @@
+"""Tests for memory-mapped snapshot files."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.memory_storage import InMemoryVectorStorage
+from mcp_server_tribal.services.mmap_storage import (
+    MmapSnapshotStorage,
+    write_mmap_snapshot,
+)
+from mcp_server_tribal.services.storage_factory import create_storage
+
+
+def embedder():
+    """Create the hashing embedder both stores use."""
+    return HashingEmbeddingFunction(64)
+
+
+def write_snapshot(tmp_path, errors, quantized=False):
+    """Fill an in-memory store and write it to a snapshot file."""
+    source = InMemoryVectorStorage(embedding_function=embedder())
+    path = str(tmp_path / "snapshots" / "tribal.mmap")
+
+    async def run():
+        await source.add_errors(errors)
+        return await write_mmap_snapshot(source, path, quantized=quantized)
+
+    return asyncio.run(run())
+
+
+async def collect(storage):
+    """Collect every record of a store with its vector."""
+    return [pair async for pair in storage.iter_errors_with_embeddings(7)]
+
+
+def test_quantized_snapshot(tmp_path, make_errors):
+    """Test that int8 snapshots are smaller and rank the same top hit."""
+    errors = make_errors(40)
+    full = write_snapshot(tmp_path / "full", errors)
+    small = write_snapshot(tmp_path / "small", errors, quantized=True)
+    storage = MmapSnapshotStorage(small["path"], embedding_function=embedder())
+
+    similar = asyncio.run(storage.search_similar("No module named pkg_21", 3))
+    vectors = [v for _, v in asyncio.run(collect(storage))]
+
+    assert full["records"] == small["records"] == 40
+    assert full["dtype"] == "float32" and small["dtype"] == "int8"
+    assert small["bytes"] < full["bytes"]
+    assert similar[0].id == errors[21].id
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=0.02)
+
+
+def test_read_only_and_invalid_files(tmp_path, make_errors):
+    """Test that writes and foreign files are refused."""
+    info = write_snapshot(tmp_path, make_errors(3))
+    storage = MmapSnapshotStorage(info["path"], embedding_function=embedder())
+    other = tmp_path / "other.mmap"
+    other.write_bytes(b"not a snapshot at all")
+
+    with pytest.raises(NotImplementedError):
+        asyncio.run(storage.add_error(make_errors(1)[0]))
+    with pytest.raises(ValueError, match="not a Tribal mmap snapshot"):
+        MmapSnapshotStorage(str(other), embedding_function=embedder())
+
+
+def test_factory_serves_snapshot(tmp_path, make_errors):
+    """Test that the factory opens the mmap backend without write-behind."""
+    errors = make_errors(5)
+    info = write_snapshot(tmp_path, errors)
+    settings = {
+        "storage_backend": "mmap",
+        "mmap_snapshot_path": info["path"],
+        "persist_directory": str(tmp_path / "unused"),
+        "embedding_function": "hashing",
+        "embedding_dim": 64,
+        "write_behind_enabled": True,
+        "storage_read_workers": 2,
+    }
+    storage = create_storage(settings)
+
+    async def run():
+        found = await storage.get_error(errors[2].id)
+        stats = await storage.get_stats()
+        await storage.close()
+        return found, stats
+
+    found, stats = asyncio.run(run())
+
+    assert found == errors[2]
+    assert stats["backend"] == "mmap" and stats["records"] == 5
+    with pytest.raises(ValueError, match="MMAP_SNAPSHOT_PATH"):
+        create_storage({**settings, "mmap_snapshot_path": None})
@@ -0,0 +1,111 @@
+"""Tests for cursor pagination of searches."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_server_tribal.app import app
+from mcp_server_tribal.models.error_record import ErrorQuery
+from mcp_server_tribal.services.chroma_storage import ChromaStorage
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.pagination import decode_cursor, encode_cursor
+from mcp_server_tribal.services.storage_interface import StorageInterface
+
+
+def walk(storage, query):
+    """Collect every page of a search."""
+
+    async def run():
+        pages = []
+        cursor = None
+        while True:
+            page = await storage.search_errors_page(
+                query.model_copy(update={"cursor": cursor})
+            )
+            pages.append(page.records)
+            cursor = page.next_cursor
+            if cursor is None:
+                return pages
+
+    return asyncio.run(run())
+
+
+def test_cursor_belongs_to_its_search():
+    """Test that cursors are rejected by other searches and when malformed."""
+    query = ErrorQuery(language="python")
+    cursor = encode_cursor(query, {"after": "a"})
+
+    assert decode_cursor(query.model_copy(update={"cursor": cursor})) == {"after": "a"}
+    # The page size may change between pages
+    assert decode_cursor(
+        query.model_copy(update={"cursor": cursor, "max_results": 9})
+    ) == {"after": "a"}
+    with pytest.raises(ValueError):
+        decode_cursor(ErrorQuery(language="rust", cursor=cursor))
+    with pytest.raises(ValueError):
+        decode_cursor(ErrorQuery(language="python", cursor="not a cursor"))
+
+
+def test_metadata_listing_pages_in_id_order(tmp_path, make_errors):
+    """Test that a filtered listing visits every match once, in ID order."""
+    storage = ChromaStorage(
+        str(tmp_path), embedding_function=HashingEmbeddingFunction(64)
+    )
+    python = make_errors(12, language="python")
+    asyncio.run(storage.add_errors(python + make_errors(5, language="rust")))
+
+    pages = walk(storage, ErrorQuery(language="python", max_results=5))
+
+    assert [len(page) for page in pages] == [5, 5, 2]
+    ids = [str(error.id) for page in pages for error in page]
+    assert ids == sorted(str(error.id) for error in python)
+
+
+def test_ranked_pages_are_stable(tmp_path, make_errors):
+    """Test that ranked pages keep their order while records are added."""
+    storage = ChromaStorage(
+        str(tmp_path), embedding_function=HashingEmbeddingFunction(64)
+    )
+    errors = make_errors(9, language="python")
+    query = ErrorQuery(error_message="No module named pkg_3", max_results=4)
+
+    async def run():
+        await storage.add_errors(errors)
+        first = await storage.search_errors_page(query)
+        await storage.add_errors(make_errors(3, language="python"))
+        second = await storage.search_errors_page(
+            query.model_copy(update={"cursor": first.next_cursor})
+        )
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first.records[0].context.error_message == "No module named pkg_3"
+    seen = [error.id for error in first.records + second.records]
+    assert len(seen) == len(set(seen)) == 8
+    assert set(seen) <= {error.id for error in errors}
+
+
+def test_search_route_returns_next_cursor(tmp_path, make_errors):
+    """Test the X-Next-Cursor header of the search route."""
+    storage = ChromaStorage(
+        str(tmp_path), embedding_function=HashingEmbeddingFunction(64)
+    )
+    asyncio.run(storage.add_errors(make_errors(3)))
+    app.dependency_overrides[StorageInterface] = lambda: storage
+    try:
+        client = TestClient(app)
+        first = client.get("/api/v1/errors/", params={"max_results": 2})
+        second = client.get(
+            "/api/v1/errors/",
+            params={"max_results": 2, "cursor": first.headers["X-Next-Cursor"]},
+        )
+        invalid = client.get("/api/v1/errors/", params={"cursor": "bogus"})
+    finally:
+        app.dependency_overrides.pop(StorageInterface)
+
+    assert len(first.json()) == 2
+    assert len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
+    assert invalid.status_code == 400
@@ -0,0 +1,128 @@
+"""Tests for the int8 quantized vector index."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from mcp_server_tribal.models.error_record import (
+    ErrorContext,
+    ErrorRecord,
+    ErrorSolution,
+)
+from mcp_server_tribal.services.chroma_storage import ChromaStorage
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.quantized_index import QuantizedVectorIndex
+
+
+def test_search_matches_exact_cosine_ranking(tmp_path):
+    """Test that re-scored results match a full-precision search."""
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 32)).astype(np.float32)
+    ids = [f"{i:036d}" for i in range(len(vectors))]
+    index = QuantizedVectorIndex(str(tmp_path), rescore_factor=4)
+    index.add(ids, vectors)
+
+    queries = vectors[:10] + rng.normal(scale=0.1, size=(10, 32))
+    results = index.search(queries, k=5)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    for query, matches in zip(queries, results):
+        exact = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+        assert [i for i, _ in matches] == [ids[i] for i in exact]
+
+
+def test_index_persists_updates_and_removals(tmp_path):
+    """Test that a reopened index keeps replaced and removed vectors."""
+    index = QuantizedVectorIndex(str(tmp_path))
+    index.add(["a", "b", "c"], np.eye(3, dtype=np.float32))
+    index.add(["a"], [[0.0, 0.0, 1.0]])
+    index.remove(["b"])
+
+    reopened = QuantizedVectorIndex(str(tmp_path))
+    results = reopened.search([[0.0, 0.0, 1.0]], k=3)[0]
+
+    assert len(reopened) == 2 and "b" not in reopened
+    assert sorted(i for i, _ in results) == ["a", "c"]
+    assert results[0][1] == results[1][1] == 1.0
+    assert reopened.search([[1.0, 0.0, 0.0]], k=2, allowed=["a"])[0][0][0] == "a"
+
+
+def test_index_without_full_precision_vectors(tmp_path):
+    """Test that a rescore factor of 0 keeps no float32 vectors on disk."""
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(200, 32)).astype(np.float32)
+    ids = [f"{i:036d}" for i in range(len(vectors))]
+    index = QuantizedVectorIndex(str(tmp_path), rescore_factor=0)
+    index.add(ids, vectors)
+    index.remove(ids[:50])
+    index.compact()
+
+    reopened = QuantizedVectorIndex(str(tmp_path), rescore_factor=4)
+    results = reopened.search(vectors[50:60], k=3)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    assert not (tmp_path / "vectors.f32").exists()
+    assert not reopened.full_precision
+    assert reopened.metrics()["full_precision_bytes"] == 0
+    assert [matches[0][0] for matches in results] == ids[50:60]
+    assert [matches[0][1] for matches in results] == pytest.approx(
+        [1.0] * 10, abs=1e-2
+    )
+    assert np.allclose(reopened.vectors([ids[70]])[0], normalized[70], atol=1e-2)
+
+
+def test_reopened_index_without_vectors_returns_k_hits(tmp_path):
+    """Test that reopening with a higher rescore factor keeps k results."""
+    rng = np.random.default_rng(2)
+    vectors = rng.normal(size=(100, 16)).astype(np.float32)
+    ids = [f"{i:036d}" for i in range(len(vectors))]
+    QuantizedVectorIndex(str(tmp_path), rescore_factor=0).add(ids, vectors)
+
+    reopened = QuantizedVectorIndex(str(tmp_path), rescore_factor=4)
+    results = reopened.search(vectors[:5], k=3)
+
+    assert [len(matches) for matches in results] == [3] * 5
+    for matches in results:
+        scores = [score for _, score in matches]
+        assert scores == sorted(scores, reverse=True)
+
+
+def test_chroma_storage_quantized_mode(tmp_path):
+    """Test ChromaStorage with vectors kept in the quantized index."""
+    errors = [
+        ErrorRecord(
+            error_type="ImportError",
+            context=ErrorContext(language="python", error_message=message),
+            solution=ErrorSolution(description="Install it", explanation="Missing"),
+        )
+        for message in [
+            "No module named requests",
+            "cannot import name Flask from flask",
+            "No module named numpy",
+        ]
+    ]
+
+    def open_storage():
+        return ChromaStorage(
+            str(tmp_path),
+            embedding_function=HashingEmbeddingFunction(64),
+            quantized_vectors=True,
+        )
+
+    async def run():
+        storage = open_storage()
+        await storage.add_errors(errors)
+        found = await storage.search_similar("cannot import name Flask", 1)
+        await storage.delete_error(errors[1].id)
+        # Simulate a crash that lost a vector write
+        storage.vector_index.remove([str(errors[0].id)])
+        reopened = open_storage()
+        after = await reopened.search_similar("No module named", 3)
+        return found, after, await reopened.get_stats()
+
+    found, after, stats = asyncio.run(run())
+
+    assert found[0].id == errors[1].id
+    assert {error.id for error in after} == {errors[0].id, errors[2].id}
+    assert stats["quantized_index"]["vectors"] == 2
@@ -0,0 +1,129 @@
+"""Tests for the search result cache."""
+
+import asyncio
+from typing import List, Optional
+from uuid import UUID
+
+from mcp_server_tribal.models.error_record import (
+    ErrorContext,
+    ErrorQuery,
+    ErrorRecord,
+    ErrorSolution,
+)
+from mcp_server_tribal.services.result_cache import ResultCacheStorage
+from mcp_server_tribal.services.storage_interface import StorageInterface
+
+
+class CountingStorage(StorageInterface):
+    """In-memory storage that counts searches and tracks a generation."""
+
+    def __init__(self):
+        """Initialize the storage."""
+        self.errors: List[ErrorRecord] = []
+        self.searches = 0
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every committed write."""
+        return self._generation
+
+    async def add_error(self, error: ErrorRecord) -> ErrorRecord:
+        """Add a new error record to storage."""
+        self.errors.append(error)
+        self._generation += 1
+        return error
+
+    async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
+        """Retrieve an error record by ID."""
+        return next((e for e in self.errors if e.id == error_id), None)
+
+    async def update_error(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record."""
+        return None
+
+    async def delete_error(self, error_id: UUID) -> bool:
+        """Delete an error record by ID."""
+        return False
+
+    async def search_errors(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query."""
+        self.searches += 1
+        return [e for e in self.errors if e.error_type == query.error_type]
+
+    async def search_similar(
+        self, text_query: str, max_results: int = 5
+    ) -> List[ErrorRecord]:
+        """Search for error records with similar text content."""
+        self.searches += 1
+        return self.errors[:max_results]
+
+
+def make_error(error_type: str = "ImportError") -> ErrorRecord:
+    """Create an error record of the given type."""
+    return ErrorRecord(
+        error_type=error_type,
+        context=ErrorContext(language="python", error_message="No module"),
+        solution=ErrorSolution(description="Install it", explanation="Missing"),
+    )
+
+
+def test_repeated_queries_are_served_from_cache():
+    """Test that equivalent queries reach the backend only once."""
+    inner = CountingStorage()
+    storage = ResultCacheStorage(inner, max_entries=10, ttl=60)
+
+    async def run():
+        await storage.add_error(make_error())
+        first = await storage.search_errors(ErrorQuery(error_type="ImportError"))
+        second = await storage.search_errors(ErrorQuery(error_type=" ImportError "))
+        await storage.search_similar("no  module", 3)
+        await storage.search_similar("no module", 3)
+        return first, second, await storage.get_stats()
+
+    first, second, stats = asyncio.run(run())
+
+    assert inner.searches == 2
+    assert first == second
+    assert stats["result_cache"]["hits"] == 2
+
+
+def test_writes_invalidate_cached_results():
+    """Test that results are recomputed after a write through any layer."""
+    inner = CountingStorage()
+    storage = ResultCacheStorage(inner, max_entries=10, ttl=60)
+    query = ErrorQuery(error_type="ImportError")
+
+    async def run():
+        before = await storage.search_errors(query)
+        await storage.add_error(make_error())
+        after_add = await storage.search_errors(query)
+        # A write committed below the cache, e.g. a write-behind flush
+        await inner.add_error(make_error())
+        after_flush = await storage.search_errors(query)
+        return before, after_add, after_flush
+
+    before, after_add, after_flush = asyncio.run(run())
+
+    assert (len(before), len(after_add), len(after_flush)) == (0, 1, 2)
+    assert inner.searches == 3
+
+
+def test_entries_expire_and_are_evicted():
+    """Test the TTL and LRU bounds of the cache."""
+    inner = CountingStorage()
+    expiring = ResultCacheStorage(inner, max_entries=10, ttl=0)
+    bounded = ResultCacheStorage(inner, max_entries=1, ttl=60)
+
+    async def run():
+        await expiring.search_similar("a")
+        await expiring.search_similar("a")
+        await bounded.search_similar("a")
+        await bounded.search_similar("b")
+        await bounded.search_similar("a")
+
+    asyncio.run(run())
+
+    assert inner.searches == 5
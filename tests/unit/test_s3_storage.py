@@ -0,0 +1,135 @@
+"""Tests for S3 storage over packed segment objects."""
+
+import asyncio
+
+import pytest
+
+from mcp_server_tribal.services.aws.storage import S3Storage
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.storage_factory import create_storage
+
+
+def open_s3(client, bucket, cache_directory, **kwargs):
+    """Open the test store with a hashing embedder."""
+    return S3Storage(
+        bucket,
+        client=client,
+        cache_directory=str(cache_directory),
+        embedding_function=HashingEmbeddingFunction(64),
+        **kwargs,
+    )
+
+
+def test_reopen_reads_segment_indexes(s3_client, s3_bucket, tmp_path, make_errors):
+    """Test the segments written and the requests of a reopen with a cold cache."""
+    storage = open_s3(s3_client, s3_bucket, tmp_path / "cache")
+    errors = make_errors(12)
+
+    async def run():
+        await storage.add_errors(errors[:8])
+        await storage.add_error(errors[8])
+        await storage.add_errors(errors[9:])
+        updated = errors[2].model_copy(deep=True)
+        updated.context.error_message = "Segmentation fault"
+        await storage.update_error(errors[2].id, updated)
+        await storage.delete_error(errors[5].id)
+
+        reopened = open_s3(s3_client, s3_bucket, tmp_path / "cold")
+        fetched = await reopened.get_errors(
+            [errors[2].id, errors[0].id, errors[1].id, errors[11].id]
+        )
+        return fetched, await reopened.get_stats()
+
+    fetched, stats = asyncio.run(run())
+
+    assert fetched[0].context.error_message == "Segmentation fault"
+    assert fetched[1:] == [errors[0], errors[1], errors[11]]
+    # Each batch, single add, update and delete writes one segment; opening
+    # reads each segment's index, and the lookup coalesces the two records of
+    # the first segment into one ranged GET
+    assert stats["segments"] == 5
+    assert stats["requests"]["open"] == {"get": 1, "ranged_get": 5}
+    assert stats["requests"]["get_errors"] == {"ranged_get": 3}
+
+
+def test_cache_eviction_and_ranged_reads(s3_client, s3_bucket, tmp_path, make_errors):
+    """Test that a small cache evicts segments and lookups use ranged GETs."""
+    errors = make_errors(30)
+    writer = open_s3(s3_client, s3_bucket, tmp_path / "writer")
+
+    async def run():
+        for start in range(0, 30, 10):
+            await writer.add_errors(errors[start : start + 10])
+        reader = open_s3(s3_client, s3_bucket, tmp_path / "reader", cache_bytes=1)
+        await reader.get_error(errors[0].id)
+        await reader.search_similar("No module named pkg_3", 3)
+        await reader.search_similar("No module named pkg_3", 3)
+        return await reader.get_stats()
+
+    stats = asyncio.run(run())
+
+    assert stats["requests"]["get_errors"] == {"ranged_get": 1}
+    # The cache only holds the last segment downloaded, so every search
+    # downloads all three
+    assert stats["requests"]["search_similar_many"]["get"] == 6
+    assert stats["cache"]["files"] == 1 and stats["cache"]["evictions"] == 5
+
+
+def test_compaction_merges_segments(s3_client, s3_bucket, tmp_path, make_errors):
+    """Test that compaction drops dead rows and deletes the old segments."""
+    storage = open_s3(s3_client, s3_bucket, tmp_path / "cache", segment_records=8)
+    errors = make_errors(20)
+
+    async def run():
+        for error in errors:
+            await storage.add_error(error)
+        for error in errors[:10]:
+            await storage.delete_error(error.id)
+        skipped = await storage.compact(threshold=0.9)
+        report = await storage.compact(threshold=0.2)
+        reopened = open_s3(s3_client, s3_bucket, tmp_path / "cold")
+        return (
+            skipped,
+            report,
+            await storage.search_similar("No module named pkg_15", 1),
+            await reopened.get_stats(),
+        )
+
+    skipped, report, similar, stats = asyncio.run(run())
+
+    # 10 of 20 rows are dead, and so are the 10 deletes
+    assert not skipped.compacted and skipped.deleted_ratio == pytest.approx(2 / 3)
+    assert report.compacted and report.records == 10
+    assert report.bytes_after < report.bytes_before
+    assert similar[0].id == errors[15].id
+    assert stats["records"] == 10 and stats["segments"] == 2
+    listed = s3_client.list_objects_v2(Bucket=s3_bucket, Prefix="errors/segments/")
+    assert len(listed["Contents"]) == 2
+
+
+def test_factory_opens_s3(s3_client, s3_bucket, tmp_path, make_errors):
+    """Test that the factory opens S3 storage with a cache in the persist directory."""
+    settings = {
+        "storage_backend": "s3",
+        "s3_bucket": s3_bucket,
+        "s3_prefix": "factory/",
+        "persist_directory": str(tmp_path / "data"),
+        "embedding_function": "hashing",
+        "embedding_dim": 64,
+    }
+    storage = create_storage(settings)
+    error = make_errors(1)[0]
+
+    async def run():
+        await storage.add_error(error)
+        found = await storage.get_error(error.id)
+        stats = await storage.get_stats()
+        await storage.close()
+        return found, stats
+
+    found, stats = asyncio.run(run())
+
+    assert found == error and stats["backend"] == "s3"
+    assert stats["cache"]["directory"] == str(tmp_path / "data" / "s3_cache")
+    with pytest.raises(ValueError, match="S3_BUCKET"):
+        create_storage({**settings, "s3_bucket": None})
@@ -0,0 +1,98 @@
+"""Tests for sharded storage."""
+
+import asyncio
+import os
+
+import pytest
+
+from mcp_server_tribal.models.error_record import ErrorQuery
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.sharded_storage import (
+    ShardedStorage,
+    jump_hash,
+    language_key,
+)
+from mcp_server_tribal.services.storage_factory import (
+    create_storage,
+    reshard_storage,
+)
+
+
+def open_sharded(path, strategy, count=3):
+    """Open a sharded store with a hashing embedder."""
+    return ShardedStorage.open(
+        str(path),
+        count,
+        strategy,
+        embedding_function=HashingEmbeddingFunction(64),
+    )
+
+
+def test_jump_hash_moves_few_keys():
+    """Test that adding a shard only moves keys onto the new shard."""
+    keys = range(0, 10**6, 997)
+    moved = [key for key in keys if jump_hash(key, 4) != jump_hash(key, 5)]
+
+    assert all(jump_hash(key, 5) == 4 for key in moved)
+    assert 0.1 < len(moved) / len(keys) < 0.3
+
+
+@pytest.mark.parametrize("strategy", ["hash", "language"])
+def test_records_spread_and_move_between_shards(tmp_path, strategy, make_errors):
+    """Test that records spread over shards and follow a changed language."""
+    errors = make_errors(24)
+    storage = open_sharded(tmp_path, strategy)
+
+    async def run():
+        await storage.add_errors(errors)
+        updated = errors[5].model_copy(deep=True)
+        updated.context.language = "python"
+        await storage.update_error(errors[5].id, updated)
+        return (
+            await storage.get_error(errors[5].id),
+            await storage.search_errors(ErrorQuery(language="python", max_results=50)),
+        )
+
+    moved, python = asyncio.run(run())
+
+    assert moved.context.language == "python"
+    assert errors[5].id in [e.id for e in python] and len(python) == 7
+    holding = [
+        shard
+        for shard in storage.shards
+        if shard.collection.get(ids=[str(errors[5].id)])["ids"]
+    ]
+    assert len(holding) == 1
+    if strategy == "language":
+        assert holding[0] is storage.shards[jump_hash(language_key("python"), 3)]
+    non_empty = [shard for shard in storage.shards if shard.collection.count()]
+    assert len(non_empty) > 1
+
+
+def test_reshard_round_trip(tmp_path, make_errors):
+    """Test resharding an unsharded store and back without re-embedding."""
+    settings = {
+        "persist_directory": str(tmp_path / "store"),
+        "embedding_function": "hashing",
+        "embedding_dim": 64,
+    }
+    errors = make_errors(10)
+    storage = create_storage(settings)
+    asyncio.run(storage.add_errors(errors))
+    asyncio.run(storage.close())
+
+    result = asyncio.run(reshard_storage(settings, 3, "language"))
+    with pytest.raises(ValueError, match="sharded"):
+        create_storage(settings)
+    sharded = create_storage(
+        {**settings, "shard_count": 3, "shard_strategy": "language"}
+    )
+    found = asyncio.run(sharded.get_errors([error.id for error in errors]))
+    asyncio.run(sharded.close())
+    back = asyncio.run(reshard_storage(settings, 1, "hash"))
+
+    assert result["records"] == back["records"] == 10
+    assert found == errors
+    assert os.path.isdir(result["previous_directory"])
+    unsharded = create_storage(settings)
+    assert asyncio.run(unsharded.get_error(errors[3].id)) == errors[3]
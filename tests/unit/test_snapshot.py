@@ -0,0 +1,119 @@
+"""Tests for storage snapshots and restores."""
+
+import asyncio
+import json
+import os
+import threading
+
+import chromadb
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_server_tribal.app import app
+from mcp_server_tribal.services.chroma_storage import ChromaStorage
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.snapshot import (
+    MANIFEST_NAME,
+    AccessGate,
+    create_snapshot,
+    restore_snapshot,
+)
+from mcp_server_tribal.services.storage_factory import restore_storage
+from mcp_server_tribal.services.storage_interface import StorageInterface
+
+
+def test_unchanged_files_are_linked(tmp_path):
+    """Test that a second snapshot only copies the files that changed."""
+    source = tmp_path / "data"
+    source.mkdir()
+    (source / "large.bin").write_bytes(b"x" * 4096)
+    (source / "small.bin").write_bytes(b"a")
+
+    first = create_snapshot(str(source), str(tmp_path / "snapshots"))
+    (source / "small.bin").write_bytes(b"bb")
+    second = create_snapshot(str(source), str(tmp_path / "snapshots"))
+
+    assert first.bytes_copied == 4097 and first.bytes_linked == 0
+    assert second.bytes_copied == 2 and second.bytes_linked == 4096
+    assert os.path.samefile(
+        os.path.join(first.path, "large.bin"), os.path.join(second.path, "large.bin")
+    )
+    manifest = json.loads(
+        (tmp_path / "snapshots" / second.name / MANIFEST_NAME).read_text()
+    )
+    assert len(manifest["files"]["small.bin"]["sha256"]) == 64
+
+
+def test_restore_rejects_corrupt_files(tmp_path):
+    """Test that a restore verifies checksums and leaves the target alone."""
+    source = tmp_path / "data"
+    source.mkdir()
+    (source / "segment.bin").write_bytes(b"original")
+    info = create_snapshot(str(source), str(tmp_path / "snapshots"))
+    # Replace rather than modify, since the file may be linked elsewhere
+    os.remove(os.path.join(info.path, "segment.bin"))
+    with open(os.path.join(info.path, "segment.bin"), "wb") as f:
+        f.write(b"tampered")
+
+    with pytest.raises(ValueError, match="corrupt"):
+        restore_snapshot(info.path, str(source))
+    assert (source / "segment.bin").read_bytes() == b"original"
+    assert not (tmp_path / "data.partial").exists()
+
+
+def test_quiesce_waits_for_writes():
+    """Test that writes wait while the gate is quiesced."""
+    gate = AccessGate()
+    events = []
+
+    def write():
+        with gate.hold():
+            events.append("write")
+
+    with gate.quiesce():
+        writer = threading.Thread(target=write)
+        writer.start()
+        writer.join(timeout=0.2)
+        events.append("snapshot")
+    writer.join()
+
+    assert events == ["snapshot", "write"]
+
+
+def test_snapshot_and_restore_storage(tmp_path, monkeypatch, make_errors):
+    """Test restoring a storage snapshot over newer data."""
+    persist_directory = str(tmp_path / "chroma")
+    storage = ChromaStorage(
+        persist_directory,
+        write_workers=1,
+        embedding_function=HashingEmbeddingFunction(64),
+    )
+    kept = make_errors(3)
+    asyncio.run(storage.add_errors(kept))
+    monkeypatch.setenv("SNAPSHOT_DIRECTORY", str(tmp_path / "snapshots"))
+    app.dependency_overrides[StorageInterface] = lambda: storage
+    try:
+        response = TestClient(app).post("/api/v1/admin/snapshot")
+    finally:
+        app.dependency_overrides.pop(StorageInterface)
+    asyncio.run(storage.add_errors(make_errors(2, prefix="later")))
+    asyncio.run(storage.close())
+
+    settings = {
+        "persist_directory": persist_directory,
+        "embedding_function": "hashing",
+        "embedding_dim": 64,
+    }
+    manifest = restore_storage(response.json()["path"], settings)
+    # Chroma caches clients by path; a new process would start without them
+    chromadb.api.client.SharedSystemClient.clear_system_cache()
+    restored = ChromaStorage(
+        persist_directory, embedding_function=HashingEmbeddingFunction(64)
+    )
+
+    assert response.status_code == 200
+    assert response.json()["metadata"]["records"] == 3
+    assert manifest["metadata"]["embedding_model"] == "hashing-64"
+    assert restored.collection.count() == 3
+    similar = asyncio.run(restored.search_similar("No module named pkg_1", 1))
+    assert similar[0].id == kept[1].id
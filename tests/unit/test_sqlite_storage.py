@@ -0,0 +1,112 @@
+"""Tests for SQLite storage."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from mcp_server_tribal.services import sqlite_storage
+from mcp_server_tribal.services.dedup import OCCURRENCE_COUNT_KEY
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.sqlite_storage import SQLiteStorage
+from mcp_server_tribal.services.storage_factory import (
+    create_storage,
+    restore_storage,
+)
+
+
+def open_sqlite(path, **kwargs):
+    """Open a SQLite store with a hashing embedder."""
+    return SQLiteStorage(
+        str(path), embedding_function=HashingEmbeddingFunction(64), **kwargs
+    )
+
+
+def test_dedup_merges_repeats(tmp_path, make_errors):
+    """Test that repeated errors are merged into the stored record."""
+    storage = open_sqlite(tmp_path, dedup=True)
+    first = make_errors(1)[0]
+    repeats = [make_errors(1)[0] for _ in range(3)]
+
+    async def run():
+        await storage.add_error(first)
+        results = await storage.add_errors(repeats)
+        stats = await storage.get_stats()
+        return results, await storage.get_error(first.id), stats
+
+    results, stored, stats = asyncio.run(run())
+
+    assert all(r.deduplicated and r.id == first.id for r in results)
+    assert stored.metadata[OCCURRENCE_COUNT_KEY] == 4
+    assert stats["records"] == 1
+    assert stats["dedup"]["duplicates_absorbed"] == 3
+
+
+def test_compaction_snapshot_and_restore(tmp_path, make_errors):
+    """Test compaction and restoring a snapshot through the factory."""
+    settings = {
+        "storage_backend": "sqlite",
+        "persist_directory": str(tmp_path / "db"),
+        "embedding_function": "hashing",
+        "embedding_dim": 64,
+    }
+    storage = create_storage(settings)
+    errors = make_errors(40)
+
+    async def run():
+        await storage.add_errors(errors)
+        for error in errors[:20]:
+            await storage.delete_error(error.id)
+        report = await storage.compact(threshold=0.3)
+        info = await storage.snapshot(str(tmp_path / "snapshots"))
+        await storage.delete_error(errors[30].id)
+        await storage.close()
+        return report, info
+
+    report, info = asyncio.run(run())
+    manifest = restore_storage(info.path, settings)
+
+    async def reopen():
+        restored = create_storage(settings)
+        count = (await restored.get_stats())["records"]
+        await restored.close()
+        return count
+
+    assert isinstance(storage, SQLiteStorage)
+    assert report.compacted and report.deleted_ratio == 0.5
+    assert manifest["metadata"]["backend"] == "sqlite"
+    assert asyncio.run(reopen()) == 20
+    with pytest.raises(ValueError):
+        restore_storage(info.path, {**settings, "storage_backend": "chroma"})
+
+
+def test_snapshot_waits_for_a_checkpoint(tmp_path, monkeypatch, make_errors):
+    """Test that a snapshot is refused while a reader holds the WAL."""
+    monkeypatch.setattr(sqlite_storage, "SQLITE_BUSY_TIMEOUT", 0.1)
+    storage = open_sqlite(tmp_path / "db")
+    errors = make_errors(6)
+    reader = sqlite3.connect(storage.database_path)
+
+    async def run():
+        await storage.add_errors(errors[:3])
+        reader.execute("BEGIN")
+        reader.execute("SELECT COUNT(*) FROM records").fetchone()
+        await storage.add_errors(errors[3:])
+        with pytest.raises(RuntimeError, match="checkpoint"):
+            await storage.snapshot(str(tmp_path / "snapshots"))
+        reader.close()
+        info = await storage.snapshot(str(tmp_path / "snapshots"))
+        await storage.close()
+        return info
+
+    info = asyncio.run(run())
+
+    settings = {
+        "storage_backend": "sqlite",
+        "persist_directory": str(tmp_path / "restored"),
+        "embedding_function": "hashing",
+        "embedding_dim": 64,
+    }
+    manifest = restore_storage(info.path, settings)
+
+    assert manifest["metadata"]["records"] == 6
@@ -0,0 +1,456 @@
+"""Contract tests every storage backend must pass."""
+
+import asyncio
+import contextlib
+import itertools
+
+import numpy as np
+import pytest
+
+from mcp_server_tribal.models.error_record import ErrorQuery, SearchMode
+from mcp_server_tribal.services.chroma_storage import ChromaStorage
+from mcp_server_tribal.services.embeddings import (
+    HashingEmbeddingFunction,
+    embedding_text,
+)
+from mcp_server_tribal.services.memory_storage import InMemoryVectorStorage
+from mcp_server_tribal.services.mmap_storage import (
+    MmapSnapshotStorage,
+    write_mmap_snapshot,
+)
+from mcp_server_tribal.services.sharded_storage import ShardedStorage
+from mcp_server_tribal.services.sqlite_storage import SQLiteStorage
+from mcp_server_tribal.services.storage_ipc import RemoteStorage, StorageServer
+from mcp_server_tribal.services.transfer import copy_records
+
+
+def embedder(dim=64):
+    """Create the hashing embedder the stores use."""
+    return HashingEmbeddingFunction(dim)
+
+
+class Backend:
+    """Opens stores of one backend for the contract tests."""
+
+    # Whether records can be written, and a store reopened from its files
+    writable = True
+    persistent = True
+    # How far similarity scores may be from the exact cosine similarity
+    score_tolerance = 1e-6
+
+    def __init__(self, request, tmp_path):
+        """Keep the test's fixtures and directory."""
+        self.request = request
+        self.path = tmp_path
+        self._opened = itertools.count()
+
+    def create(self, embedding_function):
+        """Create or reopen the store (blocking)."""
+        raise NotImplementedError
+
+    @contextlib.asynccontextmanager
+    async def open(self, errors=(), embedding_function=None):
+        """Open the store holding the given records, closing it afterwards."""
+        storage = self.create(embedding_function or embedder())
+        if errors:
+            await storage.add_errors(list(errors))
+        try:
+            yield storage
+        finally:
+            await storage.close()
+
+
+class ChromaBackend(Backend):
+    """ChromaDB with its HNSW index."""
+
+    def create(self, embedding_function):
+        """Open the store."""
+        return ChromaStorage(
+            str(self.path / "chroma"), embedding_function=embedding_function
+        )
+
+
+class QuantizedChromaBackend(Backend):
+    """ChromaDB with vectors in the int8 index."""
+
+    score_tolerance = 1e-2
+
+    def create(self, embedding_function):
+        """Open the store."""
+        return ChromaStorage(
+            str(self.path / "chroma"),
+            embedding_function=embedding_function,
+            quantized_vectors=True,
+        )
+
+
+class SQLiteBackend(Backend):
+    """SQLite with an FTS5 lexical index and a block scan of the vectors."""
+
+    def create(self, embedding_function):
+        """Open the store."""
+        return SQLiteStorage(
+            str(self.path / "sqlite"), embedding_function=embedding_function
+        )
+
+
+class MemoryBackend(Backend):
+    """The in-memory store."""
+
+    persistent = False
+
+    def create(self, embedding_function):
+        """Create the store."""
+        return InMemoryVectorStorage(embedding_function=embedding_function)
+
+
+class MmapBackend(Backend):
+    """A read-only snapshot file written from an in-memory store."""
+
+    writable = False
+
+    def create(self, embedding_function):
+        """Open the snapshot file."""
+        return MmapSnapshotStorage(
+            str(self.path / "tribal.mmap"), embedding_function=embedding_function
+        )
+
+    @contextlib.asynccontextmanager
+    async def open(self, errors=(), embedding_function=None):
+        """Write the records to a snapshot file and open it."""
+        if errors:
+            source = InMemoryVectorStorage(embedding_function=embedder())
+            await source.add_errors(list(errors))
+            await write_mmap_snapshot(source, str(self.path / "tribal.mmap"))
+        async with super().open((), embedding_function) as storage:
+            yield storage
+
+
+class ShardedBackend(Backend):
+    """Three ChromaDB shards assigned by hash."""
+
+    def create(self, embedding_function):
+        """Open the store."""
+        return ShardedStorage.open(
+            str(self.path / "sharded"), 3, "hash", embedding_function=embedding_function
+        )
+
+
+class S3Backend(Backend):
+    """Packed segment objects on a mocked S3."""
+
+    def create(self, embedding_function):
+        """Open the store with a cold cache."""
+        from mcp_server_tribal.services.aws.storage import S3Storage
+
+        return S3Storage(
+            self.request.getfixturevalue("s3_bucket"),
+            client=self.request.getfixturevalue("s3_client"),
+            cache_directory=str(self.path / f"cache{next(self._opened)}"),
+            embedding_function=embedding_function,
+        )
+
+
+class DynamoDBBackend(Backend):
+    """A mocked DynamoDB table with a local int8 vector index."""
+
+    score_tolerance = 1e-2
+
+    def create(self, embedding_function):
+        """Open the store with an empty local index."""
+        from mcp_server_tribal.services.aws.storage import DynamoDBStorage
+
+        return DynamoDBStorage(
+            "tribal-test",
+            client=self.request.getfixturevalue("dynamodb_client"),
+            index_directory=str(self.path / f"index{next(self._opened)}"),
+            embedding_function=embedding_function,
+        )
+
+
+class RemoteBackend(Backend):
+    """A ChromaDB store served over a Unix socket."""
+
+    persistent = False
+
+    def create(self, embedding_function):
+        """Open the served store."""
+        return ChromaStorage(
+            str(self.path / "chroma"), embedding_function=embedding_function
+        )
+
+    @contextlib.asynccontextmanager
+    async def open(self, errors=(), embedding_function=None):
+        """Serve the store and connect to it."""
+        async with super().open((), embedding_function) as storage:
+            server = StorageServer(storage, str(self.path / "storage.sock"))
+            await server.start()
+            remote = RemoteStorage(server.socket_path)
+            try:
+                # Connecting caches the owner's properties, which would
+                # otherwise be read with a blocking call on this event loop
+                await remote.get_stats()
+                if errors:
+                    await remote.add_errors(list(errors))
+                yield remote
+            finally:
+                await remote.close()
+                await server.close()
+
+
+BACKENDS = {
+    "chroma": ChromaBackend,
+    "chroma_int8": QuantizedChromaBackend,
+    "sqlite": SQLiteBackend,
+    "memory": MemoryBackend,
+    "mmap": MmapBackend,
+    "sharded": ShardedBackend,
+    "s3": S3Backend,
+    "dynamodb": DynamoDBBackend,
+    "remote": RemoteBackend,
+}
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request, tmp_path):
+    """Get each storage backend in turn."""
+    return BACKENDS[request.param](request, tmp_path)
+
+
+@pytest.fixture
+def errors(make_errors):
+    """Create 40 records across languages, every other one with a framework."""
+    return make_errors(40, frameworks=(None, "django"))
+
+
+def similarities(errors, text):
+    """Score records by cosine similarity to a text, the slow way."""
+    embed = embedder()
+    vectors = np.array(embed([embedding_text(e) for e in errors]))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    query = np.array(embed([text])[0])
+    return vectors @ (query / np.linalg.norm(query))
+
+
+def assert_best(backend, found, candidates, text, k):
+    """Check that results hold the best scores, best first.
+
+    The hashing embedder gives many records equal scores, so ties may come
+    back in any order.
+    """
+    expected = np.sort(similarities(candidates, text))[::-1][:k]
+    assert np.allclose(
+        similarities(found, text), expected, atol=backend.score_tolerance
+    )
+
+
+async def walk(storage, query):
+    """Collect the IDs of every page of a search."""
+    ids = []
+    while True:
+        page = await storage.search_errors_page(query)
+        ids += [record.id for record in page.records]
+        if page.next_cursor is None:
+            return ids
+        query = query.model_copy(update={"cursor": page.next_cursor})
+
+
+def writable(backend):
+    """Skip a test on read-only backends."""
+    if not backend.writable:
+        pytest.skip(f"{type(backend).__name__} is read-only")
+
+
+def test_crud_and_batch_results(backend, make_errors):
+    """Test adds, per-item batch failures, updates and deletes."""
+    writable(backend)
+    errors = make_errors(5)
+
+    async def run():
+        async with backend.open() as storage:
+            await storage.add_error(errors[0])
+            results = await storage.add_errors(errors + [errors[1]])
+            updated = errors[2].model_copy(deep=True)
+            updated.context.error_message = "Segmentation fault in pkg_2"
+            await storage.update_error(errors[2].id, updated)
+            deleted = await storage.delete_error(errors[3].id)
+            return (
+                results,
+                deleted,
+                await storage.delete_error(errors[3].id),
+                await storage.get_errors([errors[2].id, errors[3].id, errors[4].id]),
+            )
+
+    results, deleted, deleted_again, fetched = asyncio.run(run())
+
+    assert [r.success for r in results] == [False, True, True, True, True, False]
+    assert results[0].error == "Error record already exists"
+    assert results[5].error == "Duplicate ID in batch"
+    assert deleted is True and deleted_again is False
+    assert fetched[0].context.error_message == "Segmentation fault in pkg_2"
+    assert fetched[0].created_at == errors[2].created_at
+    assert fetched[1] is None and fetched[2] == errors[4]
+
+
+def test_reopen_keeps_writes(backend, errors):
+    """Test that a reopened store holds the records written before."""
+    writable(backend)
+    if not backend.persistent:
+        pytest.skip(f"{type(backend).__name__} keeps nothing to reopen")
+
+    async def run():
+        async with backend.open(errors) as storage:
+            await storage.delete_error(errors[5].id)
+        async with backend.open() as reopened:
+            return (
+                await reopened.get_errors([errors[5].id, errors[7].id]),
+                await reopened.search_similar("No module named pkg_7", 1),
+                await reopened.facet_counts(),
+            )
+
+    fetched, similar, facets = asyncio.run(run())
+
+    assert fetched == [None, errors[7]]
+    assert similar[0].id == errors[7].id
+    assert facets.total == 39
+
+
+def test_rejects_another_embedder(backend, errors):
+    """Test that a store embedded with another embedder is not reopened."""
+    if not backend.persistent:
+        pytest.skip(f"{type(backend).__name__} keeps nothing to reopen")
+
+    async def run():
+        async with backend.open(errors[:3]):
+            pass
+
+    asyncio.run(run())
+
+    with pytest.raises(ValueError, match="Embedding function mismatch"):
+        backend.create(embedder(32))
+
+
+def test_vector_searches_match_brute_force(backend, errors):
+    """Test similarity searches, with and without filters, against exact scores."""
+    text = "No module named pkg_7"
+
+    async def run():
+        async with backend.open(errors) as storage:
+            return (
+                await storage.search_similar_many([text, "pkg_12"], 5),
+                await storage.search_errors(
+                    ErrorQuery(
+                        error_message=text, language="go", mode=SearchMode.VECTOR
+                    )
+                ),
+            )
+
+    similar, filtered = asyncio.run(run())
+
+    assert [len(found) for found in similar] == [5, 5]
+    assert similar[0][0].id == errors[7].id
+    assert_best(backend, similar[0], errors, text, 5)
+    assert_best(backend, similar[1], errors, "pkg_12", 5)
+    go = [e for e in errors if e.context.language == "go"]
+    assert filtered and all(e.context.language == "go" for e in filtered)
+    assert_best(backend, filtered, go, text, len(filtered))
+
+
+def test_lexical_and_hybrid_searches(backend, errors):
+    """Test that lexical and hybrid searches find an exact token."""
+
+    async def run():
+        async with backend.open(errors) as storage:
+            return (
+                await storage.search_errors(
+                    ErrorQuery(error_message="pkg_9", mode=SearchMode.LEXICAL)
+                ),
+                await storage.search_errors(ErrorQuery(error_message="pkg_11")),
+            )
+
+    lexical, hybrid = asyncio.run(run())
+
+    assert lexical[0].id == errors[9].id
+    assert errors[11].id in [e.id for e in hybrid]
+
+
+def test_pages_cover_every_match(backend, errors):
+    """Test that listings page in ID order and ranked pages visit every match."""
+
+    async def run():
+        async with backend.open(errors) as storage:
+            return (
+                await walk(storage, ErrorQuery(language="python", max_results=3)),
+                await walk(storage, ErrorQuery(max_results=7)),
+                await walk(
+                    storage, ErrorQuery(error_message="No module named", max_results=9)
+                ),
+            )
+
+    python, listed, ranked = asyncio.run(run())
+
+    python_ids = [e.id for e in errors if e.context.language == "python"]
+    assert python == sorted(python_ids, key=str)
+    assert listed == sorted((e.id for e in errors), key=str)
+    assert sorted(ranked, key=str) == listed
+
+
+def test_facet_counts(backend, errors):
+    """Test counting records per facet value, with and without filters."""
+
+    async def run():
+        async with backend.open(errors) as storage:
+            return (
+                await storage.facet_counts(),
+                await storage.facet_counts({"framework": "django"}),
+            )
+
+    everything, django = asyncio.run(run())
+
+    assert everything.total == 40
+    assert everything.facets["language"] == {
+        lang: 10 for lang in ("python", "rust", "go", "java")
+    }
+    assert django.total == 20
+    assert django.facets["language"] == {"rust": 10, "java": 10}
+    assert django.facets["framework"] == {"django": 20}
+
+
+def test_iteration_and_copy_out_reuse_vectors(backend, errors):
+    """Test iterating over records with their stored vectors, and copying them out."""
+
+    async def run():
+        target = InMemoryVectorStorage(embedding_function=embedder())
+        async with backend.open(errors) as storage:
+            iterated = [
+                (record.id, len(embedding))
+                async for record, embedding in storage.iter_errors_with_embeddings(7)
+            ]
+            return iterated, await copy_records(storage, target, batch_size=8)
+
+    iterated, result = asyncio.run(run())
+
+    assert sorted(record_id for record_id, _ in iterated) == sorted(
+        e.id for e in errors
+    )
+    assert {dim for _, dim in iterated} == {64}
+    assert result.imported == result.embeddings_reused == 40
+
+
+def test_copy_in_reuses_vectors(backend, errors):
+    """Test that records copied in with their vectors are not re-embedded."""
+    writable(backend)
+
+    async def run():
+        source = InMemoryVectorStorage(embedding_function=embedder())
+        await source.add_errors(errors)
+        async with backend.open() as storage:
+            return (
+                await copy_records(source, storage, batch_size=8),
+                await storage.search_similar("No module named pkg_4", 1),
+            )
+
+    result, similar = asyncio.run(run())
+
+    assert result.imported == result.embeddings_reused == 40
+    assert similar[0].id == errors[4].id
@@ -0,0 +1,165 @@
+"""Tests for serving storage to worker processes over a Unix socket."""
+
+import asyncio
+import multiprocessing
+from uuid import uuid4
+
+import chromadb
+import pytest
+
+from mcp_server_tribal.models.error_record import (
+    ErrorQuery,
+    ErrorRecord,
+)
+from mcp_server_tribal.services.chroma_storage import ChromaStorage
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.result_cache import ResultCacheStorage
+from mcp_server_tribal.services.storage_factory import (
+    create_storage,
+    run_storage_server,
+    serve_storage,
+)
+from mcp_server_tribal.services.storage_ipc import (
+    STREAM_CHUNK,
+    RemoteStorage,
+    StorageServer,
+    decode_value,
+    encode_value,
+)
+
+
+def test_values_round_trip(make_errors):
+    """Test that models, UUIDs and nested containers survive encoding."""
+    error = make_errors(1)[0]
+    value = {"records": [error, None], "ids": (error.id, uuid4()), "n": 1.5}
+
+    decoded = decode_value(encode_value(value))
+
+    assert decoded == {**value, "ids": list(value["ids"])}
+    assert isinstance(decoded["records"][0], ErrorRecord)
+
+
+def test_remote_storage_forwards_calls(tmp_path, make_errors):
+    """Test concurrent calls, iteration and errors through the socket."""
+    storage = ChromaStorage(
+        str(tmp_path / "db"), embedding_function=HashingEmbeddingFunction(64)
+    )
+    server = StorageServer(storage, str(tmp_path / "storage.sock"))
+    remote = RemoteStorage(server.socket_path)
+    errors = make_errors(STREAM_CHUNK + 20, language="python")
+
+    async def run():
+        await server.start()
+        try:
+            added = await asyncio.gather(*(remote.add_error(e) for e in errors))
+            iterated = [
+                (record.id, len(embedding))
+                async for record, embedding in remote.iter_errors_with_embeddings()
+            ]
+            async for _ in remote.iter_errors():
+                break
+            similar = await remote.search_similar("No module named pkg_7", 1)
+            fetched = await remote.get_errors([errors[3].id, uuid4()])
+            deleted = await remote.delete_error(errors[3].id)
+            with pytest.raises(ValueError):
+                await remote.search_errors_page(ErrorQuery(cursor="bogus"))
+            stats = await remote.get_stats()
+            return added, iterated, similar, fetched, deleted, stats
+        finally:
+            await remote.close()
+            await server.close()
+
+    added, iterated, similar, fetched, deleted, stats = asyncio.run(run())
+
+    assert added == errors
+    assert sorted(record_id for record_id, _ in iterated) == sorted(
+        e.id for e in errors
+    )
+    assert {dim for _, dim in iterated} == {64}
+    assert similar[0].id == errors[7].id
+    assert fetched == [errors[3], None]
+    assert deleted is True
+    assert remote.generation == storage.generation > 0
+    assert remote.embedding_model == storage.embedding_model
+    assert stats["remote"]["pending"] == 0
+    assert storage.collection.count() == len(errors) - 1
+
+
+def test_owner_process_serves_workers(tmp_path, make_errors):
+    """Test the owner process end to end, including a graceful shutdown."""
+    settings = {
+        "persist_directory": str(tmp_path / "db"),
+        "embedding_function": "hashing",
+        "embedding_dim": 64,
+        "write_behind_enabled": True,
+    }
+    socket_path = str(tmp_path / "storage.sock")
+    owner = multiprocessing.get_context("spawn").Process(
+        target=run_storage_server, args=(settings, socket_path)
+    )
+    owner.start()
+    errors = make_errors(10)
+
+    async def worker(batch):
+        # Each worker process has its own client
+        remote = create_storage({**settings, "storage_socket": socket_path})
+        try:
+            for error in batch:
+                await remote.add_error(error)
+            return await remote.get_error(batch[0].id)
+        finally:
+            await remote.close()
+
+    async def run():
+        return await asyncio.gather(worker(errors[:5]), worker(errors[5:]))
+
+    try:
+        found = asyncio.run(run())
+    finally:
+        owner.terminate()
+        owner.join(30)
+
+    assert found == [errors[0], errors[5]]
+    assert owner.exitcode == 0
+    chromadb.api.client.SharedSystemClient.clear_system_cache()
+    reopened = ChromaStorage(
+        settings["persist_directory"], embedding_function=HashingEmbeddingFunction(64)
+    )
+    assert reopened.collection.count() == 10
+
+
+def test_owner_caches_results_for_all_workers(tmp_path, make_errors):
+    """Test that a write through one worker invalidates every worker's results."""
+    settings = {
+        "persist_directory": str(tmp_path / "db"),
+        "embedding_function": "hashing",
+        "embedding_dim": 64,
+        "result_cache_size": 16,
+    }
+    socket_path = str(tmp_path / "storage.sock")
+    first, second = make_errors(2, language="python", prefix="shared")
+    worker_settings = {**settings, "storage_socket": socket_path}
+    workers = [create_storage(worker_settings) for _ in range(2)]
+
+    async def run():
+        stop = asyncio.Event()
+        owner = asyncio.create_task(serve_storage(settings, socket_path, stop))
+        try:
+            await workers[0].add_error(first)
+            before = await workers[0].search_similar("No module named shared", 5)
+            await workers[1].add_error(second)
+            after = await workers[0].search_similar("No module named shared", 5)
+            stats = await workers[0].get_stats()
+        finally:
+            for worker in workers:
+                await worker.close()
+            stop.set()
+            await owner
+        return before, after, stats
+
+    before, after, stats = asyncio.run(run())
+
+    assert [e.id for e in before] == [first.id]
+    assert {e.id for e in after} == {first.id, second.id}
+    assert stats["result_cache"]["entries"] >= 1
+    assert not any(isinstance(worker, ResultCacheStorage) for worker in workers)
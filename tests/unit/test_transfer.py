@@ -0,0 +1,142 @@
+"""Tests for NDJSON export and import."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_server_tribal.app import app
+from mcp_server_tribal.services.chroma_storage import ChromaStorage
+from mcp_server_tribal.services.embeddings import HashingEmbeddingFunction
+from mcp_server_tribal.services.storage_interface import StorageInterface
+from mcp_server_tribal.services.transfer import export_ndjson, import_ndjson
+
+
+class CountingHashingEmbeddingFunction(HashingEmbeddingFunction):
+    """Hashing embedder that counts the texts it embeds."""
+
+    def __init__(self, dim=64):
+        """Initialize the embedder."""
+        super().__init__(dim)
+        self.texts = 0
+
+    def __call__(self, input):
+        """Embed texts and count them."""
+        self.texts += len(input)
+        return super().__call__(input)
+
+
+def export_lines(storage, include_embeddings):
+    """Collect the lines of an export."""
+
+    async def run():
+        return [
+            line
+            async for line in export_ndjson(
+                storage, batch_size=2, include_embeddings=include_embeddings
+            )
+        ]
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("quantized", [False, True])
+def test_round_trip_reuses_embeddings(tmp_path, quantized, make_errors):
+    """Test that an export with embeddings imports without re-embedding."""
+    source = ChromaStorage(
+        str(tmp_path / "source"),
+        embedding_function=HashingEmbeddingFunction(64),
+        quantized_vectors=quantized,
+    )
+    errors = make_errors(5, language="python")
+    asyncio.run(source.add_errors(errors))
+    lines = export_lines(source, include_embeddings=True)
+
+    embedder = CountingHashingEmbeddingFunction()
+    target = ChromaStorage(
+        str(tmp_path / "target"),
+        embedding_function=embedder,
+        quantized_vectors=quantized,
+    )
+    result = asyncio.run(import_ndjson(target, lines, batch_size=2))
+
+    assert json.loads(lines[0])["embedding_model"] == "hashing-64"
+    assert len(lines) == 6
+    assert result.imported == result.embeddings_reused == 5
+    assert embedder.texts == 0
+    similar = asyncio.run(target.search_similar("No module named pkg_3", 1))
+    assert similar[0].id == errors[3].id
+
+
+def test_import_reports_failures_and_reembeds(tmp_path, make_errors):
+    """Test re-embedding for another embedder and per-line failures."""
+    source = ChromaStorage(
+        str(tmp_path / "source"), embedding_function=HashingEmbeddingFunction(32)
+    )
+    errors = make_errors(3)
+    asyncio.run(source.add_errors(errors))
+    lines = export_lines(source, include_embeddings=True)
+
+    embedder = CountingHashingEmbeddingFunction()
+    target = ChromaStorage(str(tmp_path / "target"), embedding_function=embedder)
+    asyncio.run(target.add_error(errors[0]))
+    embedder.texts = 0
+    result = asyncio.run(
+        import_ndjson(target, lines + ["not json\n", '{"error_type": 1}\n'])
+    )
+
+    assert result.imported == 2 and result.embeddings_reused == 0
+    assert embedder.texts == 2
+    assert result.failed == 3
+    failures = {item.index: item for item in result.failures}
+    assert sorted(failures)[-2:] == [5, 6]
+    (existing,) = [item for item in result.failures if item.index < 5]
+    assert existing.id == errors[0].id
+    assert existing.error == "Error record already exists"
+
+
+def test_export_and_import_routes(tmp_path, make_errors):
+    """Test streaming an export from one store into another over HTTP."""
+    source = ChromaStorage(
+        str(tmp_path / "source"), embedding_function=HashingEmbeddingFunction(64)
+    )
+    target = ChromaStorage(
+        str(tmp_path / "target"), embedding_function=HashingEmbeddingFunction(64)
+    )
+    asyncio.run(source.add_errors(make_errors(4)))
+    client = TestClient(app)
+    try:
+        app.dependency_overrides[StorageInterface] = lambda: source
+        exported = client.get(
+            "/api/v1/errors/export", params={"embeddings": True, "batch_size": 3}
+        )
+        app.dependency_overrides[StorageInterface] = lambda: target
+        imported = client.post("/api/v1/errors/import", content=exported.content)
+    finally:
+        app.dependency_overrides.pop(StorageInterface)
+
+    assert exported.headers["content-type"] == "application/x-ndjson"
+    assert imported.status_code == 200
+    assert imported.json()["imported"] == 4
+    assert imported.json()["embeddings_reused"] == 4
+
+
+def test_iteration_pages_ids_in_order(tmp_path, make_errors):
+    """Test that iteration reads batches in ID order and skips deletions."""
+    storage = ChromaStorage(
+        str(tmp_path), embedding_function=HashingEmbeddingFunction(64)
+    )
+    errors = make_errors(10)
+    ids = sorted(str(error.id) for error in errors)
+
+    async def run():
+        await storage.add_errors(errors)
+        seen = []
+        async for record in storage.iter_errors(batch_size=3):
+            seen.append(str(record.id))
+            if len(seen) == 1:
+                await storage.delete_error(ids[5])
+        return seen
+
+    assert asyncio.run(run()) == ids[:5] + ids[6:]
@@ -0,0 +1,240 @@
+"""Tests for the write-behind storage buffer."""
+
+import asyncio
+from typing import Dict, List, Optional
+from uuid import UUID
+
+import pytest
+
+from mcp_server_tribal.models.error_record import (
+    BatchItemResult,
+    ErrorContext,
+    ErrorQuery,
+    ErrorRecord,
+    ErrorSolution,
+)
+from mcp_server_tribal.services.dedup import OCCURRENCE_COUNT_KEY
+from mcp_server_tribal.services.storage_factory import create_storage
+from mcp_server_tribal.services.storage_interface import StorageInterface
+from mcp_server_tribal.services.write_behind import WriteBehindStorage
+
+
+class RecordingStorage(StorageInterface):
+    """In-memory storage that records each batched write."""
+
+    def __init__(self):
+        """Initialize the storage."""
+        self.errors: Dict[str, ErrorRecord] = {}
+        self.batches: List[int] = []
+        self.closed = False
+
+    async def add_error(self, error: ErrorRecord) -> ErrorRecord:
+        """Add a new error record to storage."""
+        self.errors[str(error.id)] = error
+        return error
+
+    async def add_errors(self, errors: List[ErrorRecord]) -> List[BatchItemResult]:
+        """Add several error records and record the batch size.
+
+        Records whose ID is already stored are rejected.
+        """
+        self.batches.append(len(errors))
+        results = []
+        for index, error in enumerate(errors):
+            stored = str(error.id) in self.errors
+            self.errors.setdefault(str(error.id), error)
+            results.append(
+                BatchItemResult(
+                    index=index,
+                    id=error.id,
+                    success=not stored,
+                    error="Error record already exists" if stored else None,
+                )
+            )
+        return results
+
+    async def get_error(self, error_id: UUID) -> Optional[ErrorRecord]:
+        """Retrieve an error record by ID."""
+        return self.errors.get(str(error_id))
+
+    async def update_error(
+        self, error_id: UUID, error: ErrorRecord
+    ) -> Optional[ErrorRecord]:
+        """Update an existing error record."""
+        if str(error_id) not in self.errors:
+            return None
+        self.errors[str(error_id)] = error
+        return error
+
+    async def delete_error(self, error_id: UUID) -> bool:
+        """Delete an error record by ID."""
+        return self.errors.pop(str(error_id), None) is not None
+
+    async def search_errors(self, query: ErrorQuery) -> List[ErrorRecord]:
+        """Search for error records based on the provided query."""
+        return list(self.errors.values())[: query.max_results]
+
+    async def search_similar(
+        self, text_query: str, max_results: int = 5
+    ) -> List[ErrorRecord]:
+        """Search for error records with similar text content."""
+        return list(self.errors.values())[:max_results]
+
+    async def close(self) -> None:
+        """Mark the storage as closed."""
+        self.closed = True
+
+
+def make_error(message: str) -> ErrorRecord:
+    """Create an error record with the given message."""
+    return ErrorRecord(
+        error_type="ImportError",
+        context=ErrorContext(language="python", error_message=message),
+        solution=ErrorSolution(description="Install it", explanation="Missing"),
+    )
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    """Path of the journal file for a test."""
+    return str(tmp_path / "write_behind.journal")
+
+
+def test_writes_are_coalesced_into_batches(journal_path):
+    """Test that concurrent add_error calls are written as one batch."""
+    inner = RecordingStorage()
+    storage = WriteBehindStorage(inner, journal_path, max_batch=10, max_delay=1.0)
+    errors = [make_error(f"No module named 'mod{i}'") for i in range(10)]
+
+    async def run():
+        await asyncio.gather(*(storage.add_error(error) for error in errors))
+        # The batch is full, so the flusher does not wait for the delay
+        await asyncio.sleep(0.1)
+        stats = await storage.get_stats()
+        await storage.close()
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert inner.batches == [10]
+    assert len(inner.errors) == 10
+    assert stats["write_behind"]["flushed_records"] == 10
+    assert inner.closed
+
+
+def test_buffered_records_are_visible_before_flush(journal_path):
+    """Test that get_error returns records that are still buffered."""
+    inner = RecordingStorage()
+    storage = WriteBehindStorage(inner, journal_path, max_batch=100, max_delay=60)
+    error = make_error("No module named 'fastapi'")
+
+    async def run():
+        await storage.add_error(error)
+        found = await storage.get_error(error.id)
+        flushed_before_close = list(inner.batches)
+        await storage.close()
+        return found, flushed_before_close
+
+    found, flushed_before_close = asyncio.run(run())
+
+    assert found is not None and found.id == error.id
+    assert flushed_before_close == []
+    assert inner.batches == [1]
+
+
+def test_journal_replayed_after_crash(journal_path):
+    """Test that records journaled but never flushed survive a restart."""
+    errors = [make_error(f"No module named 'mod{i}'") for i in range(3)]
+
+    async def crash():
+        storage = WriteBehindStorage(
+            RecordingStorage(), journal_path, max_batch=100, max_delay=60
+        )
+        for error in errors:
+            await storage.add_error(error)
+        # Simulate a crash: the process ends without flushing or closing
+
+    asyncio.run(crash())
+
+    inner = RecordingStorage()
+    storage = WriteBehindStorage(inner, journal_path, max_batch=100, max_delay=60)
+
+    async def restart():
+        found = await storage.get_error(errors[0].id)
+        await storage.close()
+        return found
+
+    found = asyncio.run(restart())
+
+    assert found is not None
+    assert inner.batches == [3]
+    assert set(inner.errors) == {str(error.id) for error in errors}
+
+
+def test_concurrent_adds_share_journal_syncs(journal_path):
+    """Test that adds arriving together are journaled with one sync per group."""
+    inner = RecordingStorage()
+    storage = WriteBehindStorage(inner, journal_path, max_batch=100, max_delay=60)
+    errors = [make_error(f"No module named 'mod{i}'") for i in range(50)]
+
+    async def run():
+        await asyncio.gather(*(storage.add_error(error) for error in errors))
+        stats = await storage.get_stats()
+        await storage.close()
+        return stats
+
+    stats = asyncio.run(run())
+
+    # The first add is written alone, the ones queued meanwhile together
+    assert stats["write_behind"]["journal_syncs"] <= 2
+    assert len(inner.errors) == 50
+
+
+def test_rejected_records_are_kept(journal_path):
+    """Test that records the inner storage rejects move to the rejected journal."""
+    inner = RecordingStorage()
+    stored = make_error("No module named 'fastapi'")
+    inner.errors[str(stored.id)] = stored
+    storage = WriteBehindStorage(inner, journal_path, max_batch=100, max_delay=60)
+    duplicate = stored.model_copy(update={"error_type": "ModuleNotFoundError"})
+
+    async def run():
+        await storage.add_error(duplicate)
+        await storage.add_error(make_error("No module named 'numpy'"))
+        await storage.close()
+        return await storage.get_stats()
+
+    stats = asyncio.run(run())
+
+    with open(storage.rejected_path, encoding="utf-8") as rejected:
+        kept = [ErrorRecord.model_validate_json(line) for line in rejected]
+    assert kept == [duplicate]
+    assert stats["write_behind"]["failed_records"] == 1
+    assert stats["write_behind"]["flushed_records"] == 1
+
+
+def test_dedup_disables_write_behind(tmp_path):
+    """Test that a deduplicated add returns an ID that exists after a flush."""
+    storage = create_storage(
+        {
+            "persist_directory": str(tmp_path / "db"),
+            "embedding_function": "hashing",
+            "embedding_dim": 64,
+            "dedup_enabled": True,
+            "write_behind_enabled": True,
+        }
+    )
+    first = make_error("No module named 'fastapi'")
+    repeat = make_error("No module named 'fastapi'")
+
+    async def run():
+        added = [await storage.add_error(first), await storage.add_error(repeat)]
+        found = await storage.get_error(added[1].id)
+        await storage.close()
+        return added, found
+
+    added, found = asyncio.run(run())
+
+    assert added[1].id == first.id
+    assert found is not None and found.metadata[OCCURRENCE_COUNT_KEY] == 2
+    assert not isinstance(storage, WriteBehindStorage)